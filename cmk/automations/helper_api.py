@@ -4,9 +4,40 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 from collections.abc import Sequence
+from typing import Final
 
 from pydantic import BaseModel
 
+UNIX_SOCKET_NAME: Final = "automation-helper.sock"
+LONG_RUNNING_UNIX_SOCKET_NAME: Final = "automation-helper-long-running.sock"
+
+# These automations may take minutes. The automation helper serves them with workers of their
+# own, so that they never delay the short automations the GUI is waiting for.
+# Previews and diagnostics are interactive as well: they stay with the short automations
+# instead of queueing behind a restart.
+LONG_RUNNING_AUTOMATIONS: Final = frozenset(
+    {
+        "service-discovery",
+        "autodiscovery",
+        "rename-hosts",
+        "restart",
+        "reload",
+        "scan-parents",
+        "update-dns-cache",
+        "notification-replay",
+        "create-diagnostics-dump",
+        "bake-agents",
+    }
+)
+
+
+def unix_socket_name(automation_name: str) -> str:
+    return (
+        LONG_RUNNING_UNIX_SOCKET_NAME
+        if automation_name in LONG_RUNNING_AUTOMATIONS
+        else UNIX_SOCKET_NAME
+    )
+
 
 class AutomationPayload(BaseModel, frozen=True):
     name: str
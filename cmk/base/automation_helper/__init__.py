@@ -11,6 +11,7 @@ import signal
 import sys
 from pathlib import Path
 
+from fastapi import FastAPI
 from setproctitle import setproctitle
 
 from cmk.base import config
@@ -21,20 +22,24 @@ from cmk.checkengine.plugin_backend import (
     extract_known_discovery_rulesets,
 )
 from cmk.checkengine.plugins import AgentBasedPlugins
+from cmk.utils import ip_lookup
 from cmk.utils.caching import cache_manager
 from cmk.utils.paths import omd_root
 from cmk.utils.redis import get_redis_client
 
 from ._app import make_application
 from ._cache import Cache
-from ._config import config_from_disk_or_default_config
+from ._config import Config, config_from_disk_or_default_config
 from ._log import configure_logger, LOGGER
 from ._server import run as run_server
+from ._server import run_long_running as run_long_running_server
 from ._tracer import configure_tracer
 from ._watcher import run as run_watcher
 
 _RELATIVE_RUN_DIRECTORY = Path("tmp", "run")
 _RELATIVE_LOG_DIRECTORY = Path("var", "log", "automation-helper")
+# The items of discovered services keep changing between configuration reloads
+_MAX_CACHED_FINAL_SERVICE_DESCRIPTIONS = 100_000
 
 
 def main() -> int:
@@ -76,9 +81,16 @@ def _main() -> int:
             log_directory=log_directory,
         )
 
-        with run_watcher(
-            config.watcher_config,
-            Cache.setup(client=get_redis_client()),
+        # The long running server is forked, so it has to be started before the watcher threads
+        with (
+            run_long_running_server(
+                config.server_config,
+                f"cmk.base.automation_helper:{_long_running_application.__name__}",
+            ),
+            run_watcher(
+                config.watcher_config,
+                Cache.setup(client=get_redis_client()),
+            ),
         ):
             try:
                 run_server(
@@ -98,14 +110,35 @@ def _main() -> int:
 
 
 def _application():
-    config = config_from_disk_or_default_config(
+    config = _config_from_disk_or_default_config()
+    return _make_application(
+        config,
+        num_workers=config.server_config.num_workers,
+        worker_title="cmk-automation-helper[worker]",
+    )
+
+
+def _long_running_application():
+    config = _config_from_disk_or_default_config()
+    return _make_application(
+        config,
+        num_workers=config.server_config.num_long_running_workers,
+        worker_title="cmk-automation-helper[long-running-worker]",
+    )
+
+
+def _config_from_disk_or_default_config() -> Config:
+    return config_from_disk_or_default_config(
         omd_root=omd_root,
         run_directory=omd_root / _RELATIVE_RUN_DIRECTORY,
         log_directory=omd_root / _RELATIVE_LOG_DIRECTORY,
     )
-    if config.server_config.num_workers > 1:
+
+
+def _make_application(config: Config, *, num_workers: int, worker_title: str) -> FastAPI:
+    if num_workers > 1:
         # uvicorn will spawn subprocesses in this case, so we need to re-initialize
-        setproctitle("cmk-automation-helper[worker]")
+        setproctitle(worker_title)
         os.unsetenv("LANG")
         # When running in a uvicorn worker launched via multiprocessing (n_workers > 1), the global
         # multiprocessing start method is set to "spawn" by the uvicorn multiprocessing code (could be
@@ -114,6 +147,7 @@ def _application():
         configure_tracer(omd_root)
         configure_logger(omd_root / _RELATIVE_LOG_DIRECTORY)
 
+    cache_manager.set_maxsize("final_service_description", _MAX_CACHED_FINAL_SERVICE_DESCRIPTIONS)
     return make_application(
         engine=automations,
         cache=Cache.setup(client=get_redis_client()),
@@ -130,6 +164,7 @@ def _reset_global_multiprocessing_start_method_to_platform_default() -> None:
 
 def _reload_automation_config(plugins: AgentBasedPlugins) -> config.LoadingResult:
     cache_manager.clear()
+    ip_lookup.reset_ip_lookup_cache()
     discovery_rulesets = extract_known_discovery_rulesets(plugins)
     return config.load(discovery_rulesets, validate_hosts=False)
 
@@ -5,9 +5,10 @@
 
 import asyncio
 import io
+import os
 import sys
 import time
-from collections.abc import AsyncGenerator, Awaitable, Callable, Iterator
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterator, Mapping
 from contextlib import asynccontextmanager, contextmanager, redirect_stderr, redirect_stdout
 from dataclasses import dataclass
 from typing import assert_never, Protocol
@@ -25,6 +26,7 @@ from cmk.ccc import tty
 from cmk.ccc import version as cmk_version
 from cmk.checkengine.plugins import AgentBasedPlugins
 from cmk.utils import paths
+from cmk.utils.caching import cache_manager, CacheStatistics
 from cmk.utils.log import logger as cmk_logger
 
 from ._cache import Cache, CacheError
@@ -65,6 +67,12 @@ class HealthCheckResponse(BaseModel, frozen=True):
     last_reload_at: float
 
 
+class CacheStatisticsResponse(BaseModel, frozen=True):
+    pid: int
+    caches: Mapping[str, CacheStatistics]
+    config_cache_sizes: Mapping[str, int]
+
+
 def make_application(
     *,
     engine: AutomationEngine,
@@ -95,6 +103,7 @@ def make_application(
 
     app.post("/automation")(_automation_endpoint)
     app.get("/health")(_health_endpoint)
+    app.get("/caches")(_caches_endpoint)
 
     FastAPIInstrumentor.instrument_app(app)
 
@@ -302,3 +311,21 @@ def _redirect_stdin(stream: io.StringIO) -> Iterator[None]:
 async def _health_endpoint(request: Request) -> HealthCheckResponse:
     dependencies: _ApplicationDependencies = request.app.state.dependencies
     return HealthCheckResponse(last_reload_at=dependencies.state.last_reload_at)
+
+
+async def _caches_endpoint(request: Request) -> CacheStatisticsResponse:
+    """The cache statistics of the worker process serving this request
+
+    With several workers, each one has caches of its own. Successive requests may be
+    served by different workers, which is why the pid is part of the response. The
+    caches of the configuration are only reported by their size, see
+    ConfigCache.cache_sizes()."""
+    dependencies: _ApplicationDependencies = request.app.state.dependencies
+    loading_result = dependencies.state.loading_result
+    return CacheStatisticsResponse(
+        pid=os.getpid(),
+        caches=cache_manager.dump_statistics(),
+        config_cache_sizes={}
+        if loading_result is None
+        else loading_result.config_cache.cache_sizes(),
+    )
@@ -8,6 +8,8 @@ from pathlib import Path
 
 from pydantic import BaseModel
 
+from cmk.automations.helper_api import LONG_RUNNING_UNIX_SOCKET_NAME, UNIX_SOCKET_NAME
+
 RELATIVE_CONFIG_PATH_FOR_TESTING = "automation_helper_config.json"
 
 
@@ -18,6 +20,9 @@ class ServerConfig(BaseModel, frozen=True):
     access_log: Path
     error_log: Path
     num_workers: int
+    # Long running automations are served by workers of their own, if configured
+    long_running_unix_socket_path: Path | None = None
+    num_long_running_workers: int = 1
 
 
 class Schedule(BaseModel, frozen=True):
@@ -51,7 +56,7 @@ def default_config(
 ) -> Config:
     return Config(
         server_config=ServerConfig(
-            unix_socket_path=run_directory / "automation-helper.sock",
+            unix_socket_path=run_directory / UNIX_SOCKET_NAME,
             unix_socket_permissions=0o600,
             pid_file=run_directory / "automation-helper.pid",
             access_log=log_directory / "access.log",
@@ -68,6 +73,10 @@ def default_config(
             # possible that the reloader task is never executed. This is not a problem, since the
             # automation endpoint anyway reloads on its own if needed.
             num_workers=2,
+            # Service discoveries and the like must not keep the GUI waiting for the short
+            # automations. Only a few of them run at the same time, so one worker suffices.
+            long_running_unix_socket_path=run_directory / LONG_RUNNING_UNIX_SOCKET_NAME,
+            num_long_running_workers=1,
         ),
         watcher_config=WatcherConfig(
             schedules=[
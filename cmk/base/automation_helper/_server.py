@@ -3,80 +3,172 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
 import socket
+import sys
+import threading
 from collections.abc import Generator
 from contextlib import contextmanager
 from pathlib import Path
 
+from setproctitle import setproctitle
 from uvicorn import run as run_uvicorn_server
 
 from ._config import ServerConfig
+from ._log import LOGGER
 
 
-def run(
-    config: ServerConfig,
-    application_factory_import_path: str,
-) -> None:
+def run(config: ServerConfig, application_factory_import_path: str) -> None:
     with _provide_unix_socket(
         path=config.unix_socket_path,
         permissions=config.unix_socket_permissions,
-    ) as socket_file_descriptor:
-        run_uvicorn_server(
+    ) as sock:
+        _run_uvicorn_server(
+            config,
             application_factory_import_path,
-            factory=True,
-            fd=socket_file_descriptor,
-            workers=config.num_workers,
-            log_config={
-                "version": 1,
-                "disable_existing_loggers": False,
-                "formatters": {
-                    "default": {
-                        "()": "uvicorn.logging.DefaultFormatter",
-                        "fmt": "%(asctime)s [%(levelno)s] [%(process)d] %(message)s",
-                        "use_colors": None,
-                    },
-                    "access": {
-                        "()": "uvicorn.logging.AccessFormatter",
-                        "fmt": "%(asctime)s %(message)s",
-                    },
+            sock.fileno(),
+            config.num_workers,
+        )
+
+
+@contextmanager
+def run_long_running(config: ServerConfig, application_factory_import_path: str) -> Generator[None]:
+    """Serve the long running automations while in this context
+
+    In case a socket for long running automations is configured, these are served by a pool of
+    workers of their own, running in a forked process. It has to be entered before any threads
+    are started. The helper is shut down if the process dies, otherwise requests would pile up
+    in the backlog of its socket without ever being answered."""
+    if (socket_path := config.long_running_unix_socket_path) is None:
+        yield
+        return
+
+    stopping = threading.Event()
+    died = threading.Event()
+    with _provide_unix_socket(
+        path=socket_path,
+        permissions=config.unix_socket_permissions,
+    ) as sock:
+        long_running_server = multiprocessing.get_context("fork").Process(
+            target=_run_long_running_server,
+            args=(config, application_factory_import_path, sock.fileno()),
+            name="automation-helper-long-running",
+        )
+        long_running_server.start()
+        # Only the child serves the socket. Once it is gone, connecting fails instead of hanging.
+        sock.close()
+
+        def _watch() -> None:
+            multiprocessing.connection.wait([long_running_server.sentinel])
+            if stopping.is_set():
+                return
+            died.set()
+            LOGGER.error(
+                "Server for long running automations died (exit code %s), shutting down",
+                long_running_server.exitcode,
+            )
+            socket_path.unlink(missing_ok=True)
+            _shut_down()
+
+        threading.Thread(target=_watch, name="long-running-watch", daemon=True).start()
+        try:
+            yield
+        finally:
+            stopping.set()
+            long_running_server.terminate()
+            long_running_server.join()
+
+    if died.is_set():
+        raise SystemExit(1)
+
+
+def _shut_down() -> None:
+    # Terminates the main server, see the signal handling in _main
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+def _run_long_running_server(
+    config: ServerConfig,
+    application_factory_import_path: str,
+    socket_file_descriptor: int,
+) -> None:
+    setproctitle("cmk-automation-helper[long-running]")
+    if config.num_long_running_workers == 1:
+        # See the single worker mode of the main server
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    _run_uvicorn_server(
+        config,
+        application_factory_import_path,
+        socket_file_descriptor,
+        config.num_long_running_workers,
+    )
+
+
+def _run_uvicorn_server(
+    config: ServerConfig,
+    application_factory_import_path: str,
+    socket_file_descriptor: int,
+    num_workers: int,
+) -> None:
+    run_uvicorn_server(
+        application_factory_import_path,
+        factory=True,
+        fd=socket_file_descriptor,
+        workers=num_workers,
+        log_config={
+            "version": 1,
+            "disable_existing_loggers": False,
+            "formatters": {
+                "default": {
+                    "()": "uvicorn.logging.DefaultFormatter",
+                    "fmt": "%(asctime)s [%(levelno)s] [%(process)d] %(message)s",
+                    "use_colors": None,
+                },
+                "access": {
+                    "()": "uvicorn.logging.AccessFormatter",
+                    "fmt": "%(asctime)s %(message)s",
                 },
-                "handlers": {
-                    "default": {
-                        "class": "logging.FileHandler",
-                        "filename": str(config.error_log),
-                        "formatter": "default",
-                    },
-                    "access": {
-                        "class": "logging.FileHandler",
-                        "filename": str(config.access_log),
-                        "formatter": "access",
-                    },
+            },
+            "handlers": {
+                "default": {
+                    "class": "logging.FileHandler",
+                    "filename": str(config.error_log),
+                    "formatter": "default",
                 },
-                "loggers": {
-                    "uvicorn": {
-                        "handlers": ["default"],
-                        "level": "INFO",
-                        "propagate": False,
-                    },
-                    "uvicorn.error": {
-                        "level": "INFO",
-                    },
-                    "uvicorn.access": {
-                        "handlers": ["access"],
-                        "level": "INFO",
-                        "propagate": False,
-                    },
+                "access": {
+                    "class": "logging.FileHandler",
+                    "filename": str(config.access_log),
+                    "formatter": "access",
                 },
             },
-        )
+            "loggers": {
+                "uvicorn": {
+                    "handlers": ["default"],
+                    "level": "INFO",
+                    "propagate": False,
+                },
+                "uvicorn.error": {
+                    "level": "INFO",
+                },
+                "uvicorn.access": {
+                    "handlers": ["access"],
+                    "level": "INFO",
+                    "propagate": False,
+                },
+            },
+        },
+    )
 
 
 @contextmanager
-def _provide_unix_socket(path: Path, permissions: int) -> Generator[int]:
+def _provide_unix_socket(path: Path, permissions: int) -> Generator[socket.socket]:
     try:
         with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
             sock.bind(str(path))
             path.chmod(permissions)
-            yield sock.fileno()
+            yield sock
     finally:
         path.unlink(missing_ok=True)
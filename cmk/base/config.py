@@ -12,10 +12,12 @@ import copy
 import dataclasses
 import enum
 import itertools
+import mmap
 import numbers
 import os
 import pickle
 import socket
+import struct
 import sys
 import time
 from collections.abc import Callable, Container, Iterable, Iterator, Mapping, Sequence
@@ -596,7 +598,9 @@ def load(
 # This function still mostly manipulates a global state.
 # Passing the discovery rulesets as an argument is a first step to make it more functional.
 def load_packed_config(
-    config_path: Path, discovery_rulesets: Iterable[RuleSetName]
+    config_path: Path,
+    discovery_rulesets: Iterable[RuleSetName],
+    hostnames: Iterable[HostName] | None = None,
 ) -> LoadingResult:
     """Load the configuration for the CMK helpers of CMC
 
@@ -607,12 +611,15 @@ def load_packed_config(
 
     The validations which are performed during load() also don't need to be performed.
 
+    Helpers that only deal with some hosts can pass their names to skip reading the
+    host specific configuration of all other hosts (see PackedConfigStore.read()).
+
     See Also:
         cmk.base.core.nagios._dump_precompiled_hostcheck()
 
     """
     _initialize_config()
-    globals().update(PackedConfigStore.from_serial(config_path).read())
+    globals().update(PackedConfigStore.from_serial(config_path).read(hostnames))
     return _perform_post_config_loading_actions(discovery_rulesets)
 
 
@@ -903,6 +910,25 @@ def get_derived_config_variable_names() -> set[str]:
     return {"service_service_levels", "host_service_levels"}
 
 
+def get_host_config_variable_names() -> set[str]:
+    """These variables map host names to the configuration of the individual hosts.
+
+    Together with all_hosts, clusters and explicit_host_conf they make up the host specific part
+    of the configuration."""
+    return {
+        "host_tags",
+        "host_labels",
+        "host_paths",
+        "host_attributes",
+        "ipaddresses",
+        "ipv6addresses",
+        "explicit_snmp_communities",
+        "management_ipmi_credentials",
+        "management_snmp_credentials",
+        "management_protocol",
+    }
+
+
 def save_packed_config(
     config_path: Path,
     config_cache: ConfigCache,
@@ -1033,8 +1059,26 @@ class PackedConfigGenerator:
         return helper_config | {str(k): v for k, v in self._discovery_rules.items()}
 
 
+_PACKED_CONFIG_MAGIC: Final = b"CMKPACK1"
+_PACKED_CONFIG_HEADER_SIZE: Final = struct.Struct("!Q")
+
+
+class _PackedConfigHeader(NamedTuple):
+    # Location of a pickled value: offset relative to the end of the header and length
+    variables: Mapping[str, tuple[int, int]]
+    # The empty values of the host specific variables, filled from the host entries
+    host_variables: Mapping[str, Any]
+    hosts: Mapping[str, tuple[int, int]]
+    clusters: Mapping[str, Sequence[str]]
+
+
 class PackedConfigStore:
-    """Caring about persistence of the packed configuration"""
+    """Caring about persistence of the packed configuration
+
+    Every configuration variable and the host specific configuration of every host are pickled
+    separately. A header indexes their location in the file, so that a helper can map the file
+    and only deserialize the entries of the hosts it deals with.
+    """
 
     def __init__(self, path: Path) -> None:
         self.path: Final = path
@@ -1048,15 +1092,136 @@ class PackedConfigStore:
         return config_path / "precompiled_check_config.mk"
 
     def write(self, helper_config: Mapping[str, Any]) -> None:
+        header, blobs = _pack_helper_config(helper_config)
+        raw_header = pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL)
         self.path.parent.mkdir(parents=True, exist_ok=True)
         tmp_path = self.path.with_suffix(f"{self.path.suffix}.compiled")
         with tmp_path.open("wb") as compiled_file:
-            pickle.dump(helper_config, compiled_file)
+            compiled_file.write(_PACKED_CONFIG_MAGIC)
+            compiled_file.write(_PACKED_CONFIG_HEADER_SIZE.pack(len(raw_header)))
+            compiled_file.write(raw_header)
+            compiled_file.writelines(blobs)
         tmp_path.rename(self.path)
 
-    def read(self) -> Mapping[str, Any]:
+    def read(self, hostnames: Iterable[HostName] | None = None) -> Mapping[str, Any]:
+        """Read the packed configuration
+
+        In case host names are given, only the host specific configuration of these hosts and
+        the clusters and nodes related to them is read."""
         with self.path.open("rb") as f:
-            return pickle.load(f)  # nosec B301 # BNS:c3c5e9
+            if f.read(len(_PACKED_CONFIG_MAGIC)) != _PACKED_CONFIG_MAGIC:
+                # Written by a version without indexed packed configuration
+                f.seek(0)
+                return pickle.load(f)  # nosec B301 # BNS:c3c5e9
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _unpack_helper_config(mapped, hostnames)
+
+
+def _pack_helper_config(
+    helper_config: Mapping[str, Any],
+) -> tuple[_PackedConfigHeader, Sequence[bytes]]:
+    host_config_variable_names = get_host_config_variable_names()
+    host_variables: dict[str, Any] = {}
+    host_entries: dict[str, dict[str, Any]] = {}
+    variables: dict[str, Any] = {}
+
+    def _host_entry(hostname: str, varname: str, empty: Any) -> Any:
+        return host_entries.setdefault(hostname, {}).setdefault(varname, empty)
+
+    for varname, value in helper_config.items():
+        if varname == "all_hosts":
+            host_variables[varname] = []
+            for entry in value:
+                _host_entry(entry.split("|", 1)[0], varname, []).append(entry)
+        elif varname == "clusters":
+            host_variables[varname] = {}
+            for entry, nodes in value.items():
+                _host_entry(entry.split("|", 1)[0], varname, {})[entry] = nodes
+        elif varname == "explicit_host_conf":
+            host_variables[varname] = {attribute: {} for attribute in value}
+            for attribute, values in value.items():
+                for hostname, attribute_value in values.items():
+                    _host_entry(hostname, varname, {}).setdefault(attribute, {})[hostname] = (
+                        attribute_value
+                    )
+        elif varname in host_config_variable_names:
+            host_variables[varname] = {}
+            for hostname, host_value in value.items():
+                _host_entry(hostname, varname, {})[hostname] = host_value
+        else:
+            variables[varname] = value
+
+    blobs: list[bytes] = []
+    offset = 0
+
+    def _add(value: object) -> tuple[int, int]:
+        nonlocal offset
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        blobs.append(blob)
+        location = offset, len(blob)
+        offset += len(blob)
+        return location
+
+    return (
+        _PackedConfigHeader(
+            variables={varname: _add(value) for varname, value in variables.items()},
+            host_variables=host_variables,
+            hosts={hostname: _add(entry) for hostname, entry in host_entries.items()},
+            clusters={
+                entry.split("|", 1)[0]: nodes
+                for entry, nodes in helper_config.get("clusters", {}).items()
+            },
+        ),
+        blobs,
+    )
+
+
+def _unpack_helper_config(
+    mapped: mmap.mmap, hostnames: Iterable[HostName] | None
+) -> Mapping[str, Any]:
+    header_start = len(_PACKED_CONFIG_MAGIC) + _PACKED_CONFIG_HEADER_SIZE.size
+    (header_size,) = _PACKED_CONFIG_HEADER_SIZE.unpack_from(mapped, len(_PACKED_CONFIG_MAGIC))
+    header: _PackedConfigHeader = pickle.loads(  # nosec B301 # BNS:c3c5e9
+        mapped[header_start : header_start + header_size]
+    )
+    blobs_start = header_start + header_size
+
+    def _load(location: tuple[int, int]) -> Any:
+        offset, length = location
+        return pickle.loads(  # nosec B301 # BNS:c3c5e9
+            mapped[blobs_start + offset : blobs_start + offset + length]
+        )
+
+    helper_config = {varname: _load(location) for varname, location in header.variables.items()}
+    helper_config |= copy.deepcopy(header.host_variables)
+
+    related_hosts = None if hostnames is None else _related_hosts(hostnames, header.clusters)
+    for hostname, location in header.hosts.items():
+        if related_hosts is not None and hostname not in related_hosts:
+            continue
+        for varname, value in _load(location).items():
+            if varname == "all_hosts":
+                helper_config[varname].extend(value)
+            elif varname == "explicit_host_conf":
+                for attribute, values in value.items():
+                    helper_config[varname][attribute].update(values)
+            else:
+                helper_config[varname].update(value)
+
+    return helper_config
+
+
+def _related_hosts(
+    hostnames: Iterable[HostName], clusters: Mapping[str, Sequence[str]]
+) -> set[str]:
+    """The given hosts, the clusters they are nodes of and all nodes of these clusters"""
+    requested: set[str] = set(hostnames)
+    related: set[str] = set(requested)
+    for cluster, nodes in clusters.items():
+        if cluster in requested or not requested.isdisjoint(nodes):
+            related.add(cluster)
+            related.update(nodes)
+    return related
 
 
 @contextlib.contextmanager
@@ -1814,6 +1979,16 @@ class ConfigCache:
             SNMPSectionName(s) for s in checking_sections if SectionName(s) in plugins.snmp_sections
         )
 
+    def cache_sizes(self) -> dict[str, int]:
+        """The number of entries of the caches living as long as this configuration"""
+        return {
+            "effective_host": len(self._effective_host_cache),
+            **{
+                f"ruleset_matcher.{name}": size
+                for name, size in self.ruleset_matcher.cache_sizes().items()
+            },
+        }
+
     def invalidate_host_config(self) -> None:
         self.__enforced_services_table.clear()
         self.__is_piggyback_host.clear()
@@ -2079,6 +2254,9 @@ class ConfigCache:
         ):
             parent_candidates.update(parent_names.split(","))
 
+        if not parent_candidates:
+            return []
+
         return list(
             parent_candidates.intersection(
                 hn for hn in self.hosts_config.hosts if self.is_active(hn) and self.is_online(hn)
@@ -4,6 +4,7 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 """All core related things like direct communication with the running core"""
 
+import itertools
 import os
 import shutil
 import socket
@@ -19,12 +20,13 @@ import cmk.utils.password_store
 import cmk.utils.paths
 from cmk import trace
 from cmk.base.config import ConfigCache
-from cmk.ccc import tty
+from cmk.ccc import store, tty
 from cmk.ccc.config_path import VersionedConfigPath
 from cmk.ccc.exceptions import MKBailOut, MKGeneralException
 from cmk.ccc.hostaddress import HostAddress, HostName, Hosts
 from cmk.ccc.store import activation_lock
 from cmk.checkengine.checkerplugin import ConfiguredService
+from cmk.checkengine.plugin_backend import plugin_manifest
 from cmk.checkengine.plugins import AgentBasedPlugins, ServiceID
 from cmk.utils import config_warnings, ip_lookup
 from cmk.utils.labels import Labels
@@ -291,6 +293,18 @@ def _create_core_config(
     passwords = config_cache.collect_passwords()
     cmk.utils.password_store.save(passwords, cmk.utils.password_store.pending_password_store_path())
 
+    # Resolve all host names at once instead of one after another while creating the config
+    with tracer.span("prefetch_dns_lookups"):
+        ip_address_of.prefetch(
+            hosts_to_update
+            if hosts_to_update is not None
+            else [
+                host_name
+                for host_name in itertools.chain(hosts_config.hosts, hosts_config.clusters)
+                if config_cache.is_active(host_name) and config_cache.is_online(host_name)
+            ]
+        )
+
     config_path = VersionedConfigPath.next(cmk.utils.paths.omd_root)
     with config_path.create(is_cmc=core.is_cmc()), _backup_objects_file(core):
         core.create_config(
@@ -310,6 +324,10 @@ def _create_core_config(
             service_depends_on=service_depends_on,
             passwords=passwords,
         )
+        store.save_text_to_file(
+            plugin_manifest.make_manifest_file(Path(config_path)),
+            plugin_manifest.create_plugin_manifest(plugins),
+        )
 
     cmk.utils.password_store.save(
         passwords, cmk.utils.password_store.core_password_store_path(Path(config_path))
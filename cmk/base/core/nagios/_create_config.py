@@ -6,6 +6,7 @@
 
 import base64
 import itertools
+import multiprocessing
 import os
 import socket
 import subprocess
@@ -65,6 +66,7 @@ from cmk.utils.rulesets.ruleset_matcher import RuleSpec
 from cmk.utils.servicename import MAX_SERVICE_NAME_LEN, ServiceName
 from cmk.utils.timeperiod import add_builtin_timeperiods
 
+from ._host_blocks import HostBlock, HostBlockFingerprinter, HostBlockStore
 from ._precompile_host_checks import precompile_hostchecks, PrecompileMode
 
 _ContactgroupName = str
@@ -139,6 +141,7 @@ class NagiosCore(MonitoringCore):
             default_address_family,
             ip_address_of,
             service_depends_on,
+            previous_config_path=config_path.latest,
         )
         store.save_text_to_file(
             plugin_index.make_index_file(Path(config_path)),
@@ -155,6 +158,7 @@ class NagiosCore(MonitoringCore):
             precompile_mode=(
                 PrecompileMode.DELAYED if config.delay_precompile else PrecompileMode.INSTANT
             ),
+            previous_config_path=config_path.latest,
         )
 
     def _create_core_config(
@@ -176,6 +180,8 @@ class NagiosCore(MonitoringCore):
         ],
         ip_address_of: ip_lookup.IPLookup,
         service_depends_on: Callable[[HostAddress, ServiceName], Sequence[ServiceName]],
+        *,
+        previous_config_path: Path,
     ) -> None:
         """Tries to create a new Checkmk object configuration file for the Nagios core
 
@@ -209,6 +215,8 @@ class NagiosCore(MonitoringCore):
             default_address_family=default_address_family,
             ip_address_of=ip_address_of,
             service_depends_on=service_depends_on,
+            previous_config_path=previous_config_path,
+            processes=os.cpu_count() or 1,
         )
 
         store.save_text_to_file(self.objects_file_path, config_buffer.getvalue())
@@ -226,6 +234,7 @@ class NagiosCore(MonitoringCore):
         ip_address_of: ip_lookup.IPLookup,
         *,
         precompile_mode: PrecompileMode,
+        previous_config_path: Path,
     ) -> None:
         with suppress(IOError):
             sys.stdout.write("Precompiling host checks...")
@@ -240,6 +249,7 @@ class NagiosCore(MonitoringCore):
             get_ip_stack_config,
             ip_address_of,
             precompile_mode=precompile_mode,
+            previous_config_path=previous_config_path,
         )
         with suppress(IOError):
             sys.stdout.write(tty.ok + "\n")
@@ -309,30 +319,60 @@ def create_config(
     ],
     ip_address_of: ip_lookup.IPLookup,
     service_depends_on: Callable[[HostAddress, ServiceName], Sequence[ServiceName]],
+    *,
+    previous_config_path: Path | None = None,
+    processes: int = 1,
 ) -> None:
+    """Create the Nagios object configuration
+
+    The objects of the hosts are rendered by up to `processes` worker processes. The rendered
+    blocks of hosts whose inputs did not change since the configuration found at
+    `previous_config_path` are reused."""
     cfg = NagiosConfig(outfile, hostnames)
 
     _output_conf_header(cfg)
 
-    licensing_counter = Counter("services")
-    all_notify_host_configs: dict[HostName, NotificationHostConfig] = {}
-    for hostname in hostnames:
-        all_notify_host_configs[hostname] = _create_nagios_config_host(
-            cfg,
+    def render(
+        hostname: HostName,
+        ip_stack_config: IPStackConfig,
+        host_ip_family: Literal[socket.AddressFamily.AF_INET, socket.AddressFamily.AF_INET6],
+        host_attrs: ObjectAttributes,
+    ) -> HostBlock:
+        return _render_host_block(
             config_cache,
             final_service_name_config,
             passive_service_name_config,
             enforced_services_table,
             plugins,
             hostname,
-            get_ip_stack_config(hostname),
-            default_address_family(hostname),
+            ip_stack_config,
+            host_ip_family,
+            host_attrs,
             passwords,
-            licensing_counter,
             ip_address_of,
             service_depends_on,
         )
 
+    host_blocks = _make_host_blocks(
+        config_path,
+        config_cache,
+        hostnames,
+        render,
+        HostBlockFingerprinter(config_cache, plugins, passwords),
+        get_ip_stack_config,
+        default_address_family,
+        ip_address_of,
+        previous_config_path=previous_config_path,
+        processes=processes,
+    )
+
+    licensing_counter = Counter("services")
+    all_notify_host_configs: dict[HostName, NotificationHostConfig] = {}
+    for hostname in hostnames:
+        all_notify_host_configs[hostname] = _add_host_block(
+            cfg, host_blocks[hostname], licensing_counter
+        )
+
     _validate_licensing(config_cache.hosts_config, licensing_handler, licensing_counter)
 
     write_notify_host_file(config_path, all_notify_host_configs)
@@ -361,6 +401,195 @@ def _output_conf_header(cfg: NagiosConfig) -> None:
     )
 
 
+_RenderHostBlock = Callable[
+    [
+        HostName,
+        IPStackConfig,
+        Literal[socket.AddressFamily.AF_INET, socket.AddressFamily.AF_INET6],
+        ObjectAttributes,
+    ],
+    HostBlock,
+]
+
+_MAX_RENDER_PROCESSES: Final = 8
+_HOSTS_PER_RENDER_TASK: Final = 50
+
+
+def _make_host_blocks(
+    config_path: Path,
+    config_cache: ConfigCache,
+    hostnames: Sequence[HostName],
+    render: _RenderHostBlock,
+    fingerprinter: HostBlockFingerprinter,
+    get_ip_stack_config: Callable[[HostName], IPStackConfig],
+    default_address_family: Callable[
+        [HostName], Literal[socket.AddressFamily.AF_INET, socket.AddressFamily.AF_INET6]
+    ],
+    ip_address_of: ip_lookup.IPLookup,
+    *,
+    previous_config_path: Path | None,
+    processes: int,
+) -> Mapping[HostName, HostBlock]:
+    previous_host_blocks = (
+        {}
+        if previous_config_path is None
+        or not previous_config_path.exists()
+        or previous_config_path.resolve() == config_path.resolve()
+        else HostBlockStore.from_serial(previous_config_path).read()
+    )
+
+    host_blocks: dict[HostName, HostBlock] = {}
+    fingerprints: dict[HostName, str] = {}
+    render_args: list[
+        tuple[
+            HostName,
+            IPStackConfig,
+            Literal[socket.AddressFamily.AF_INET, socket.AddressFamily.AF_INET6],
+            ObjectAttributes,
+        ]
+    ] = []
+    for hostname in hostnames:
+        ip_stack_config = get_ip_stack_config(hostname)
+        host_ip_family = default_address_family(hostname)
+        host_attrs = config_cache.get_host_attributes(hostname, host_ip_family, ip_address_of)
+        fingerprint = fingerprinter.fingerprint(
+            hostname, host_attrs, ip_stack_config, host_ip_family
+        )
+        if fingerprint is not None:
+            fingerprints[hostname] = fingerprint
+            previous_fingerprint, previous_host_block = previous_host_blocks.get(
+                hostname, (None, None)
+            )
+            if previous_host_block is not None and previous_fingerprint == fingerprint:
+                host_blocks[hostname] = previous_host_block
+                for warning in previous_host_block.warnings:
+                    config_warnings.warn(warning)
+                continue
+        render_args.append((hostname, ip_stack_config, host_ip_family, host_attrs))
+
+    processes = min(processes, _MAX_RENDER_PROCESSES, len(render_args) // _HOSTS_PER_RENDER_TASK)
+    if processes > 1:
+        with multiprocessing.get_context("fork").Pool(
+            processes=processes,
+            initializer=_set_render_host_block,
+            initargs=(render,),
+        ) as pool:
+            for (hostname, *_args), host_block in zip(
+                render_args,
+                pool.imap(_render_host_block_in_worker, render_args, _HOSTS_PER_RENDER_TASK),
+            ):
+                host_blocks[hostname] = host_block
+                for warning in host_block.warnings:
+                    config_warnings.warn(warning)
+    else:
+        for hostname, ip_stack_config, host_ip_family, host_attrs in render_args:
+            host_blocks[hostname] = render(hostname, ip_stack_config, host_ip_family, host_attrs)
+
+    HostBlockStore.from_serial(config_path).write(
+        {
+            hostname: (fingerprint, host_blocks[hostname])
+            for hostname, fingerprint in fingerprints.items()
+        }
+    )
+
+    return host_blocks
+
+
+def _set_render_host_block(render: _RenderHostBlock) -> None:
+    # The worker processes are forked, so that the render function does not need to be
+    # pickled. See BICompiler._get_multiprocessing_pool for the same trick.
+    _render_host_block_in_worker.render = render  # type: ignore[attr-defined]
+
+
+def _render_host_block_in_worker(
+    args: tuple[
+        HostName,
+        IPStackConfig,
+        Literal[socket.AddressFamily.AF_INET, socket.AddressFamily.AF_INET6],
+        ObjectAttributes,
+    ],
+) -> HostBlock:
+    return _render_host_block_in_worker.render(*args)  # type: ignore[attr-defined]
+
+
+def _render_host_block(
+    config_cache: ConfigCache,
+    final_service_name_config: Callable[
+        [HostName, ServiceName, Callable[[HostName], Labels]], ServiceName
+    ],
+    passive_service_name_config: Callable[[HostName, ServiceID, str | None], ServiceName],
+    enforced_services_table: Callable[
+        [HostName], Mapping[ServiceID, tuple[object, ConfiguredService]]
+    ],
+    plugins: Mapping[CheckPluginName, CheckPlugin],
+    hostname: HostName,
+    ip_stack_config: IPStackConfig,
+    host_ip_family: Literal[socket.AddressFamily.AF_INET, socket.AddressFamily.AF_INET6],
+    host_attrs: ObjectAttributes,
+    stored_passwords: Mapping[str, str],
+    ip_address_of: ip_lookup.IPLookup,
+    service_depends_on: Callable[[HostAddress, ServiceName], Sequence[ServiceName]],
+) -> HostBlock:
+    outfile = StringIO()
+    cfg = NagiosConfig(outfile, [hostname])
+    license_counter = Counter("services")
+    num_warnings = len(config_warnings.g_configuration_warnings)
+    notify_host_config = _create_nagios_config_host(
+        cfg,
+        config_cache,
+        final_service_name_config,
+        passive_service_name_config,
+        enforced_services_table,
+        plugins,
+        hostname,
+        ip_stack_config,
+        host_ip_family,
+        host_attrs,
+        stored_passwords,
+        license_counter,
+        ip_address_of,
+        service_depends_on,
+    )
+    return HostBlock(
+        objects=outfile.getvalue(),
+        hostgroups=frozenset(cfg.hostgroups_to_define),
+        servicegroups=frozenset(cfg.servicegroups_to_define),
+        contactgroups=frozenset(cfg.contactgroups_to_define),
+        checknames=frozenset(cfg.checknames_to_define),
+        active_checks=cfg.active_checks_to_define,
+        custom_commands=frozenset(cfg.custom_commands_to_define),
+        hostcheck_commands=cfg.hostcheck_commands_to_define,
+        services=license_counter["services"],
+        notify_host_config=notify_host_config,
+        warnings=config_warnings.g_configuration_warnings[num_warnings:],
+    )
+
+
+def _add_host_block(
+    cfg: NagiosConfig, host_block: HostBlock, license_counter: Counter
+) -> NotificationHostConfig:
+    objects = host_block.objects
+    for command, command_line in host_block.hostcheck_commands:
+        # The commands are numbered per host while rendering the block
+        numbered_command = "check-mk-host-custom-%d" % (len(cfg.hostcheck_commands_to_define) + 1)
+        objects = objects.replace(
+            "  %-29s %s\n" % ("check_command", command),
+            "  %-29s %s\n" % ("check_command", numbered_command),
+            1,
+        )
+        cfg.hostcheck_commands_to_define.append((numbered_command, command_line))
+
+    cfg.write_str(objects)
+    cfg.hostgroups_to_define.update(host_block.hostgroups)
+    cfg.servicegroups_to_define.update(host_block.servicegroups)
+    cfg.contactgroups_to_define.update(host_block.contactgroups)
+    cfg.checknames_to_define.update(host_block.checknames)
+    cfg.active_checks_to_define.update(host_block.active_checks)
+    cfg.custom_commands_to_define.update(host_block.custom_commands)
+    license_counter["services"] += host_block.services
+    return host_block.notify_host_config
+
+
 def _create_nagios_config_host(
     cfg: NagiosConfig,
     config_cache: ConfigCache,
@@ -375,6 +604,7 @@ def _create_nagios_config_host(
     hostname: HostName,
     ip_stack_config: IPStackConfig,
     host_ip_family: Literal[socket.AddressFamily.AF_INET, socket.AddressFamily.AF_INET6],
+    host_attrs: ObjectAttributes,
     stored_passwords: Mapping[str, str],
     license_counter: Counter,
     ip_address_of: ip_lookup.IPLookup,
@@ -384,7 +614,6 @@ def _create_nagios_config_host(
     cfg.write_str("# %s\n" % hostname)
     cfg.write_str("# ----------------------------------------------------\n")
 
-    host_attrs = config_cache.get_host_attributes(hostname, host_ip_family, ip_address_of)
     if config.generate_hostconf:
         host_spec = create_nagios_host_spec(
             cfg, config_cache, hostname, host_ip_family, host_attrs, ip_address_of
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Rendered host blocks of the Nagios object configuration
+
+The object definitions of a host and its services only depend on the global configuration,
+the configuration of that host and which of its parents are monitored. We remember the rendered block of every host together
+with a fingerprint of these inputs, so that the next configuration generation can reuse
+the blocks of all hosts whose inputs did not change.
+"""
+
+import hashlib
+import importlib.util
+import os
+import pickle
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from socket import AddressFamily
+from typing import Final, Literal, NamedTuple
+
+import cmk.ccc.debug
+from cmk.base import config
+from cmk.base.config import ConfigCache, HostgroupName, ObjectAttributes, ServicegroupName
+from cmk.base.core.shared import CoreCommand, CoreCommandName
+from cmk.ccc.hostaddress import HostName
+from cmk.ccc.version import __version__
+from cmk.checkengine.plugins import CheckPlugin, CheckPluginName
+from cmk.discover_plugins import PluginLocation
+from cmk.server_side_calls_backend import load_active_checks
+from cmk.utils.ip_lookup import IPStackConfig
+from cmk.utils.notify import NotificationHostConfig
+
+
+class HostBlock(NamedTuple):
+    """The object definitions of a host and what they need to be defined globally"""
+
+    objects: str
+    hostgroups: frozenset[HostgroupName]
+    servicegroups: frozenset[ServicegroupName]
+    contactgroups: frozenset[str]
+    checknames: frozenset[CheckPluginName]
+    active_checks: Mapping[str, str]
+    custom_commands: frozenset[CoreCommandName]
+    hostcheck_commands: Sequence[tuple[CoreCommand, str]]
+    services: int
+    notify_host_config: NotificationHostConfig
+    warnings: Sequence[str]
+
+
+class HostBlockStore:
+    """Caring about persistence of the rendered host blocks"""
+
+    def __init__(self, path: Path) -> None:
+        self.path: Final = path
+
+    @classmethod
+    def from_serial(cls, config_path: Path) -> "HostBlockStore":
+        return cls(config_path / "nagios_host_blocks.pkl")
+
+    def write(self, host_blocks: Mapping[HostName, tuple[str, HostBlock]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f"{self.path.suffix}.new")
+        with tmp_path.open("wb") as f:
+            pickle.dump(dict(host_blocks), f)
+        tmp_path.rename(self.path)
+
+    def read(self) -> Mapping[HostName, tuple[str, HostBlock]]:
+        try:
+            with self.path.open("rb") as f:
+                return pickle.load(f)  # nosec B301 # BNS:c3c5e9
+        except FileNotFoundError:
+            return {}
+        except Exception:
+            if cmk.ccc.debug.enabled():
+                raise
+            return {}
+
+
+class HostBlockFingerprinter:
+    """Compute the fingerprints of the inputs of the host blocks
+
+    Clusters are always rendered again: Their objects depend on the addresses of their nodes."""
+
+    def __init__(
+        self,
+        config_cache: ConfigCache,
+        plugins: Mapping[CheckPluginName, CheckPlugin],
+        stored_passwords: Mapping[str, str],
+    ) -> None:
+        self._config_cache: Final = config_cache
+        self._host_config_by_host = _host_config_by_host(config.all_hosts, config.clusters.items())
+        self._global_fingerprint: Final = _global_fingerprint(plugins, stored_passwords)
+
+    def fingerprint(
+        self,
+        hostname: HostName,
+        host_attrs: ObjectAttributes,
+        ip_stack_config: IPStackConfig,
+        host_ip_family: Literal[AddressFamily.AF_INET, AddressFamily.AF_INET6],
+    ) -> str | None:
+        if hostname in self._config_cache.hosts_config.clusters:
+            return None
+        return _sha256(
+            (
+                self._global_fingerprint,
+                hostname,
+                sorted(host_attrs.items()),
+                ip_stack_config,
+                host_ip_family,
+                self._host_config(hostname),
+                [
+                    (cluster, self._host_config(cluster))
+                    for cluster in self._config_cache.clusters_of(hostname)
+                ],
+                self._config_cache.autochecks_memoizer.read(hostname),
+                # Only the parents that exist and are monitored make it into the objects
+                sorted(self._config_cache.parents(hostname)),
+            )
+        )
+
+    def _host_config(self, hostname: HostName) -> object:
+        return (
+            self._host_config_by_host.get(hostname),
+            [
+                getattr(config, varname).get(hostname)
+                for varname in sorted(config.get_host_config_variable_names())
+            ],
+            sorted(
+                (attribute, values.get(hostname))
+                for attribute, values in config.explicit_host_conf.items()
+            ),
+        )
+
+
+def _host_config_by_host(
+    all_hosts: Iterable[str], clusters: Iterable[tuple[str, Sequence[str]]]
+) -> Mapping[str, tuple[Sequence[str], Sequence[tuple[str, Sequence[str]]]]]:
+    host_entries: dict[str, list[str]] = {}
+    for entry in all_hosts:
+        host_entries.setdefault(entry.split("|", 1)[0], []).append(entry)
+    cluster_entries: dict[str, list[tuple[str, Sequence[str]]]] = {}
+    for entry, nodes in clusters:
+        cluster_entries.setdefault(entry.split("|", 1)[0], []).append((entry, nodes))
+    return {
+        hostname: (host_entries.get(hostname, []), cluster_entries.get(hostname, []))
+        for hostname in host_entries.keys() | cluster_entries.keys()
+    }
+
+
+def _global_fingerprint(
+    plugins: Mapping[CheckPluginName, CheckPlugin], stored_passwords: Mapping[str, str]
+) -> str:
+    skipped = {
+        "all_hosts",
+        "clusters",
+        "explicit_host_conf",
+        *config.get_host_config_variable_names(),
+    }
+    return _sha256(
+        (
+            __version__,
+            sorted(
+                (varname, getattr(config, varname))
+                for varname in (
+                    *config.get_default_config(),
+                    *config.get_derived_config_variable_names(),
+                )
+                # default_config also exposes the names it imports for its type hints
+                if varname not in skipped and not callable(getattr(config, varname))
+            ),
+            sorted(
+                (str(name), _check_plugin_fingerprint(plugin)) for name, plugin in plugins.items()
+            ),
+            sorted(stored_passwords.items()),
+            sorted(config.get_resource_macros().items()),
+            sorted(
+                (location.module, _module_mtime(location.module))
+                for location in load_active_checks(raise_errors=cmk.ccc.debug.enabled())
+            ),
+        )
+    )
+
+
+def _check_plugin_fingerprint(plugin: CheckPlugin) -> object:
+    # The service descriptions and the enforced services of the blocks depend on the
+    # plug-in's properties, so a changed plug-in file must invalidate the blocks.
+    return (
+        plugin.location,
+        (
+            _module_mtime(plugin.location.module)
+            if isinstance(plugin.location, PluginLocation)
+            else _file_mtime(plugin.location.file_name)
+        ),
+        plugin.service_name,
+        plugin.sections,
+        plugin.check_ruleset_name,
+        plugin.check_default_parameters,
+        plugin.cluster_check_function is not None,
+    )
+
+
+def _file_mtime(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _module_mtime(module_name: str) -> int | None:
+    try:
+        if (spec := importlib.util.find_spec(module_name)) is None or spec.origin is None:
+            return None
+        return os.stat(spec.origin).st_mtime_ns
+    except (ImportError, ValueError, OSError):
+        return None
+
+
+def _sha256(value: object) -> str:
+    return hashlib.sha256(repr(_canonical(value)).encode()).hexdigest()
+
+
+def _canonical(value: object) -> object:
+    # The iteration order of sets depends on the hash seed of the process
+    match value:
+        case set() | frozenset():
+            return ("set", sorted((_canonical(v) for v in value), key=repr))
+        case dict():
+            return ("dict", [(_canonical(k), _canonical(v)) for k, v in value.items()])
+        case list() | tuple():
+            return (type(value).__name__, [_canonical(v) for v in value])
+    return value
@@ -92,6 +92,7 @@ def main() -> int:
         loading_result = config.load_packed_config(
             VersionedConfigPath.make_latest_path(omd_root),
             discovery_rulesets=extract_known_discovery_rulesets(plugins),
+            hostnames=[CONFIG.hostname],
         )
 
         config.ipaddresses = CONFIG.ipaddresses
@@ -11,14 +11,19 @@ all saves substantial CPU resources as opposed to running Checkmk
 in adhoc mode (about 75%).
 """
 
+import dataclasses
 import enum
+import hashlib
+import importlib.util
 import itertools
 import os
 import py_compile
 import re
+import shutil
 import socket
 import sys
 from collections.abc import Callable, Iterable, Mapping, Sequence
+from multiprocessing.pool import Pool
 from pathlib import Path
 from typing import assert_never
 
@@ -56,6 +61,8 @@ _INSTANTIATION_PATTERN = re.compile(
     re.DOTALL,
 )
 
+_MAX_PRECOMPILE_POOL_SIZE = 8
+
 
 class PrecompileMode(enum.Enum):
     DELAYED = enum.auto()
@@ -75,6 +82,10 @@ class HostCheckStore:
         path = HostCheckStore.host_check_file_path(config_path, hostname)
         return path.with_suffix(path.suffix + ".py")
 
+    @staticmethod
+    def fingerprints_file_path(config_path: Path) -> Path:
+        return config_path / "host_check_fingerprints.mk"
+
     def write(
         self,
         config_path: Path,
@@ -83,28 +94,60 @@ class HostCheckStore:
         *,
         precompile_mode: PrecompileMode,
     ) -> None:
-        compiled_filename = self.host_check_file_path(config_path, hostname)
-        source_filename = self.host_check_source_file_path(config_path, hostname)
-
-        compiled_filename.parent.mkdir(mode=0o770, exist_ok=True, parents=True)
-        store.save_text_to_file(source_filename, host_check)
+        self.write_source(config_path, hostname, host_check)
 
         # compile python (either now or delayed - see host_check code for delay_precompile handling)
         match precompile_mode:
             case PrecompileMode.DELAYED:
-                compiled_filename.symlink_to(hostname + ".py")
+                self.host_check_file_path(config_path, hostname).symlink_to(hostname + ".py")
             case PrecompileMode.INSTANT:
-                py_compile.compile(
-                    file=str(source_filename),
-                    cfile=str(compiled_filename),
-                    dfile=str(compiled_filename),
-                    doraise=True,
-                )
-                os.chmod(compiled_filename, 0o750)  # nosec B103 # BNS:c29b0e
+                self.compile(config_path, hostname)
             case other:
                 assert_never(other)
 
-        console.verbose(f" ==> {compiled_filename}.", file=sys.stderr)
+        console.verbose(
+            f" ==> {self.host_check_file_path(config_path, hostname)}.", file=sys.stderr
+        )
+
+    def write_source(self, config_path: Path, hostname: HostName, host_check: str) -> None:
+        source_filename = self.host_check_source_file_path(config_path, hostname)
+        source_filename.parent.mkdir(mode=0o770, exist_ok=True, parents=True)
+        store.save_text_to_file(source_filename, host_check)
+
+    @staticmethod
+    def compile(config_path: Path, hostname: HostName) -> None:
+        compiled_filename = HostCheckStore.host_check_file_path(config_path, hostname)
+        py_compile.compile(
+            file=str(HostCheckStore.host_check_source_file_path(config_path, hostname)),
+            cfile=str(compiled_filename),
+            dfile=str(compiled_filename),
+            doraise=True,
+        )
+        os.chmod(compiled_filename, 0o750)  # nosec B103 # BNS:c29b0e
+
+    def reuse(
+        self, previous_config_path: Path, config_path: Path, hostname: HostName, host_check: str
+    ) -> bool:
+        """Take over the instantly compiled host check of the previous configuration
+
+        The compiled code still refers to the source file of the previous configuration,
+        which is only used by delayed precompilation."""
+        self.write_source(config_path, hostname, host_check)
+        try:
+            shutil.copy2(
+                self.host_check_file_path(previous_config_path, hostname),
+                self.host_check_file_path(config_path, hostname),
+            )
+        except OSError:
+            return False
+        console.verbose(" ==> unchanged.", file=sys.stderr)
+        return True
+
+    def load_fingerprints(self, config_path: Path) -> Mapping[HostName, str]:
+        return store.load_object_from_file(self.fingerprints_file_path(config_path), default={})
+
+    def save_fingerprints(self, config_path: Path, fingerprints: Mapping[HostName, str]) -> None:
+        store.save_object_to_file(self.fingerprints_file_path(config_path), dict(fingerprints))
 
 
 def precompile_hostchecks(
@@ -120,7 +163,13 @@ def precompile_hostchecks(
     ip_address_of: IPLookup,
     *,
     precompile_mode: PrecompileMode,
+    previous_config_path: Path | None = None,
 ) -> None:
+    """Precompile the host checks of all active hosts
+
+    Host checks whose fingerprint did not change since the configuration found at
+    `previous_config_path` are taken over from there. The remaining host checks are
+    compiled in a process pool."""
     console.verbose("Creating precompiled host check config...")
     hosts_config = config_cache.hosts_config
 
@@ -129,6 +178,16 @@ def precompile_hostchecks(
     console.verbose("Precompiling host checks...")
 
     host_check_store = HostCheckStore()
+    previous_fingerprints: Mapping[HostName, str] = (
+        {}
+        if previous_config_path is None
+        or not previous_config_path.exists()
+        or previous_config_path.resolve() == config_path.resolve()
+        else host_check_store.load_fingerprints(previous_config_path)
+    )
+    template_fingerprint = hashlib.sha256(_TEMPLATE_FILE.read_bytes()).hexdigest()
+    fingerprints: dict[HostName, str] = {}
+    hosts_to_compile: list[HostName] = []
     for hostname in {
         # Inconsistent with `create_config` above.
         hn
@@ -139,7 +198,7 @@ def precompile_hostchecks(
             console.verbose_no_lf(
                 f"{tty.bold}{tty.blue}{hostname:<16}{tty.normal}:", file=sys.stderr
             )
-            host_check = dump_precompiled_hostcheck(
+            host_check_config = _make_host_check_config(
                 config_cache,
                 passive_service_name_config,
                 enforced_services_table,
@@ -148,12 +207,31 @@ def precompile_hostchecks(
                 get_ip_stack_config,
                 plugins,
                 ip_address_of=ip_address_of,
+                verify_site_python=True,
                 precompile_mode=precompile_mode,
             )
-
-            host_check_store.write(
-                config_path, hostname, host_check, precompile_mode=precompile_mode
-            )
+            host_check = _render_host_check(host_check_config)
+            fingerprint = _fingerprint_host_check_config(host_check_config, template_fingerprint)
+
+            match precompile_mode:
+                case PrecompileMode.DELAYED:
+                    host_check_store.write(
+                        config_path, hostname, host_check, precompile_mode=precompile_mode
+                    )
+                case PrecompileMode.INSTANT:
+                    if (
+                        previous_config_path is None
+                        or previous_fingerprints.get(hostname) != fingerprint
+                        or not host_check_store.reuse(
+                            previous_config_path, config_path, hostname, host_check
+                        )
+                    ):
+                        host_check_store.write_source(config_path, hostname, host_check)
+                        hosts_to_compile.append(hostname)
+                        console.verbose(" ==> queued.", file=sys.stderr)
+                case other:
+                    assert_never(other)
+            fingerprints[hostname] = fingerprint
         except MKIPAddressLookupError as e:
             console.error(f"Error precompiling checks for host {hostname}: {e}", file=sys.stderr)
         except Exception as e:
@@ -162,6 +240,44 @@ def precompile_hostchecks(
             console.error(f"Error precompiling checks for host {hostname}: {e}", file=sys.stderr)
             sys.exit(5)
 
+    try:
+        _compile_host_checks(config_path, hosts_to_compile)
+    except Exception as e:
+        if cmk.ccc.debug.enabled():
+            raise
+        console.error(f"Error precompiling host checks: {e}", file=sys.stderr)
+        sys.exit(5)
+
+    host_check_store.save_fingerprints(config_path, fingerprints)
+
+
+def _compile_host_checks(config_path: Path, hostnames: Sequence[HostName]) -> None:
+    if len(hostnames) <= 1:
+        for hostname in hostnames:
+            HostCheckStore.compile(config_path, hostname)
+        return
+
+    with Pool(
+        processes=min(len(hostnames), os.cpu_count() or 1, _MAX_PRECOMPILE_POOL_SIZE)
+    ) as pool:
+        pool.starmap(HostCheckStore.compile, ((config_path, hostname) for hostname in hostnames))
+
+
+def _fingerprint_host_check_config(
+    host_check_config: HostCheckConfig, template_fingerprint: str
+) -> str:
+    # The paths only depend on the config path and the host name. The byte code must not be
+    # reused by another interpreter version, e.g. after an update.
+    return hashlib.sha256(
+        repr(
+            (
+                dataclasses.replace(host_check_config, src="", dst=""),
+                template_fingerprint,
+                importlib.util.MAGIC_NUMBER,
+            )
+        ).encode()
+    ).hexdigest()
+
 
 def dump_precompiled_hostcheck(
     config_cache: ConfigCache,
@@ -178,6 +294,37 @@ def dump_precompiled_hostcheck(
     verify_site_python: bool = True,
     precompile_mode: PrecompileMode,
 ) -> str:
+    return _render_host_check(
+        _make_host_check_config(
+            config_cache,
+            passive_service_name_config,
+            enforced_services_table,
+            config_path,
+            hostname,
+            get_ip_stack_config,
+            plugins,
+            ip_address_of=ip_address_of,
+            verify_site_python=verify_site_python,
+            precompile_mode=precompile_mode,
+        )
+    )
+
+
+def _make_host_check_config(
+    config_cache: ConfigCache,
+    passive_service_name_config: Callable[[HostName, ServiceID, str | None], ServiceName],
+    enforced_services_table: Callable[
+        [HostName], Mapping[ServiceID, tuple[object, ConfiguredService]]
+    ],
+    config_path: Path,
+    hostname: HostName,
+    get_ip_stack_config: Callable[[HostName], IPStackConfig],
+    plugins: AgentBasedPlugins,
+    *,
+    ip_address_of: IPLookup,
+    verify_site_python: bool,
+    precompile_mode: PrecompileMode,
+) -> HostCheckConfig:
     locations, legacy_checks_to_load = _make_needed_plugins_locations(
         config_cache, passive_service_name_config, enforced_services_table, hostname, plugins
     )
@@ -217,7 +364,7 @@ def dump_precompiled_hostcheck(
             needed_ipv6addresses[hostname] = ip_address_of(hostname, socket.AddressFamily.AF_INET6)
 
     # assign the values here, just to let the type checker do its job
-    host_check_config = HostCheckConfig(
+    return HostCheckConfig(
         delay_precompile=precompile_mode
         is PrecompileMode.DELAYED,  # propagation of enum would break b/c of the repr() below :-(
         src=str(HostCheckStore.host_check_source_file_path(config_path, hostname)),
@@ -230,6 +377,8 @@ def dump_precompiled_hostcheck(
         hostname=hostname,
     )
 
+
+def _render_host_check(host_check_config: HostCheckConfig) -> str:
     template = _TEMPLATE_FILE.read_text()
     if (m_placeholder := _INSTANTIATION_PATTERN.search(template)) is None:
         raise ValueError(f"broken template at: {_TEMPLATE_FILE})")
@@ -36,6 +36,14 @@ notification_parameter: NotificationParameterSpecs = {}
 # Check every 10 seconds for ripe bulks
 notification_bulk_interval = 10
 notification_plugin_timeout = 60
+# Number of notification plug-ins executed in parallel by the keepalive mode.
+# 0 -> one plug-in after the other
+notification_parallel_plugins = 0
+# Maximum number of parallel executions per notification plug-in
+notification_plugin_concurrency: dict[NotificationPluginNameStr, int] = {}
+# Execute the shipped HTTP based notification plug-ins within the keepalive
+# process instead of starting a new interpreter for each notification
+notification_in_process_plugins = False
 
 # Notification Spooling.
 
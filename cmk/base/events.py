@@ -14,7 +14,8 @@ import sys
 import time
 import traceback
 from collections.abc import Callable, Iterable, Mapping
-from typing import Any, cast, Literal
+from contextlib import suppress
+from typing import Any, cast, Literal, NamedTuple
 from urllib.parse import quote, urlencode
 
 import livestatus
@@ -43,6 +44,14 @@ Matcher = Callable[[EventRule, EventContext, bool, TimeperiodSpecs], str | None]
 logger = logging.getLogger("cmk.base.events")
 
 
+class KeepaliveFunctions(NamedTuple):
+    """The configuration dependent parts of a keepalive loop"""
+
+    event_function: Callable[[EventContext], object]
+    call_every_loop: Callable[[], object] | None
+    loop_interval: int | None
+
+
 def _send_reply_ready() -> None:
     sys.stdout.write("*\n")
     sys.stdout.flush()
@@ -53,8 +62,10 @@ def event_keepalive(
     call_every_loop: Callable[[], object] | None = None,
     loop_interval: int | None = None,
     shutdown_function: Callable[[], object] | None = None,
+    reload_function: Callable[[], KeepaliveFunctions] | None = None,
 ) -> None:
     last_config_timestamp = config_timestamp()
+    last_code_timestamp = code_timestamp() if reload_function else 0.0
 
     # Send signal that we are ready to receive the next event, but
     # not after a config-reload-restart (see below)
@@ -69,6 +80,31 @@ def event_keepalive(
             # Invalidate timeperiod caches
             cleanup_timeperiod_caches()
 
+            data_available = event_data_available(loop_interval)
+            current_config_timestamp = config_timestamp()
+
+            # If the configuration has changed and a reload function is given, we
+            # load the new configuration within this process. This is also done
+            # while being idle, so the next event does not have to wait for it.
+            # Changed Python code can not be reloaded this way. In this case, and
+            # in case the reload fails, we fall back to the restart below. The
+            # code is only looked at once per configuration change.
+            if reload_function is not None and last_config_timestamp != current_config_timestamp:
+                if last_code_timestamp != code_timestamp():
+                    logger.info("Python code has changed, restarting with the next event")
+                    reload_function = None
+                else:
+                    try:
+                        event_function, call_every_loop, loop_interval = _reload_configuration(
+                            reload_function
+                        )
+                        last_config_timestamp = current_config_timestamp
+                    except Exception:
+                        if cmk.ccc.debug.enabled():
+                            raise
+                        logger.exception("Cannot reload configuration, falling back to restart:")
+                        reload_function = None
+
             # If the configuration has changed, we do a restart. But we do
             # this check just before the next event arrives. We must
             # *not* read data from stdin, just peek! There is still one
@@ -77,8 +113,8 @@ def event_keepalive(
             # has been sent. We do this by setting the environment variable
             # CMK_EVENT_RESTART=1
 
-            if event_data_available(loop_interval):
-                if last_config_timestamp != config_timestamp():
+            if data_available:
+                if last_config_timestamp != current_config_timestamp:
                     logger.info("Configuration has changed. Restarting myself.")
                     if shutdown_function:
                         shutdown_function()
@@ -159,6 +195,27 @@ def config_timestamp() -> float:
     return mtime
 
 
+def code_timestamp() -> float:
+    """Newest modification time of the locally installed Python code
+
+    Changes to modules which have already been imported can not be picked up
+    by reloading the configuration in-process."""
+    mtime = 0.0
+    for dirpath, _unused_dirnames, filenames in os.walk(str(cmk.utils.paths.local_lib_dir)):
+        for f in filenames:
+            with suppress(OSError):
+                mtime = max(mtime, os.stat(dirpath + "/" + f).st_mtime)
+    return mtime
+
+
+def _reload_configuration(reload_function: Callable[[], KeepaliveFunctions]) -> KeepaliveFunctions:
+    logger.info("Configuration has changed. Reloading.")
+    start_time = time.monotonic()
+    functions = reload_function()
+    logger.info("Reloaded configuration in %.3f seconds", time.monotonic() - start_time)
+    return functions
+
+
 def event_data_available(loop_interval: int | None) -> bool:
     return bool(select.select([0], [], [], loop_interval)[0])
 
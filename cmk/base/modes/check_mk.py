@@ -56,6 +56,7 @@ from cmk.base.snmp_plugin_store import make_plugin_store
 from cmk.base.sources import make_parser
 from cmk.base.utils import register_sigint_handler
 from cmk.ccc import store, tty
+from cmk.ccc.config_path import VersionedConfigPath
 from cmk.ccc.cpu_tracking import CPUTracker
 from cmk.ccc.exceptions import MKBailOut, MKGeneralException, MKTimeout, OnError
 from cmk.ccc.hostaddress import HostAddress, HostName, Hosts
@@ -68,6 +69,7 @@ from cmk.checkengine.checking import (
 )
 from cmk.checkengine.checkresults import ActiveCheckResult
 from cmk.checkengine.discovery import (
+    AutochecksStore,
     commandline_discovery,
     execute_check_discovery,
     remove_autochecks_of_host,
@@ -83,6 +85,8 @@ from cmk.checkengine.parser import (
 from cmk.checkengine.plugin_backend import (
     extract_known_discovery_rulesets,
     filter_relevant_raw_sections,
+    load_selected_plugins,
+    plugin_manifest,
 )
 from cmk.checkengine.plugins import (
     AgentBasedPlugins,
@@ -174,6 +178,58 @@ def load_checks() -> AgentBasedPlugins:
     return plugins
 
 
+def load_plugin_manifest() -> plugin_manifest.PluginManifest | None:
+    try:
+        return plugin_manifest.load_plugin_manifest(
+            VersionedConfigPath.make_latest_path(cmk.utils.paths.omd_root)
+        )
+    except FileNotFoundError:
+        return None
+
+
+def load_plugins_of_host(
+    manifest: plugin_manifest.PluginManifest,
+    loading_result: config.LoadingResult,
+    host_name: HostName,
+) -> AgentBasedPlugins | None:
+    """Only import the plug-ins needed for checking the host
+
+    The same plug-ins are used as for the precompiled host checks: the check plug-ins
+    of the discovered and enforced services of the host (and its nodes) and the section
+    plug-ins they subscribe to. Returns None if the manifest does not know all of them,
+    for instance because plug-ins have been added after the last activation.
+    """
+    config_cache = loading_result.config_cache
+    host_names = [
+        host_name,
+        *(config_cache.nodes(host_name) if host_name in config_cache.hosts_config.clusters else ()),
+    ]
+    enforced_services_config = BundledHostRulesetMatcher(
+        loading_result.loaded_config.static_checks,
+        config_cache.ruleset_matcher,
+        config_cache.label_manager.labels_of_host,
+    )
+    check_plugin_names = {
+        *(entry.check_plugin_name for hn in host_names for entry in AutochecksStore(hn).read()),
+        *(
+            CheckPluginName(maincheckify(str(entry[0])))
+            for hn in host_names
+            for entries in enforced_services_config(hn).values()
+            for entry in entries
+        ),
+    }
+    try:
+        index = manifest.plugin_index(
+            check_plugin_names,
+            inventory=config_cache.hwsw_inventory_parameters(host_name).status_data_inventory,
+        )
+    except KeyError:
+        return None
+
+    _errors, sections, checks = config.load_and_convert_legacy_checks(index.legacy)
+    return load_selected_plugins(index.locations, sections, checks, validate=False)
+
+
 # .
 #   .--General options-----------------------------------------------------.
 #   |       ____                           _               _               |
@@ -2058,8 +2114,34 @@ modes.register(
 def mode_notify(options: dict, args: list[str]) -> int | None:
     from cmk.base import notify
 
-    with store.lock_checkmk_configuration(configuration_lockfile):
-        loading_result = config.load(discovery_rulesets=(), with_conf_d=True, validate_hosts=False)
+    def load_notification_config() -> notify.NotificationConfig:
+        with store.lock_checkmk_configuration(configuration_lockfile):
+            loading_result = config.load(
+                discovery_rulesets=(), with_conf_d=True, validate_hosts=False
+            )
+        return notify.NotificationConfig(
+            define_servicegroups=config.define_servicegroups,
+            host_parameters_cb=lambda hostname,
+            plugin: loading_result.config_cache.notification_plugin_parameters(hostname, plugin),
+            rules=config.notification_rules,
+            parameters=config.notification_parameter,
+            get_http_proxy=config.get_http_proxy,
+            ensure_nagios=notify.make_ensure_nagios(loading_result.loaded_config.monitoring_core),
+            bulk_interval=config.notification_bulk_interval,
+            plugin_timeout=config.notification_plugin_timeout,
+            config_contacts=config.contacts,
+            fallback_email=config.notification_fallback_email,
+            fallback_format=config.notification_fallback_format,
+            spooling=ConfigCache.notification_spooling(),
+            backlog_size=config.notification_backlog,
+            logging_level=ConfigCache.notification_logging_level(),
+            all_timeperiods=load_timeperiods(),
+            parallel_plugins=config.notification_parallel_plugins,
+            plugin_concurrency=config.notification_plugin_concurrency,
+            in_process_plugins=config.notification_in_process_plugins,
+        )
+
+    notification_config = load_notification_config()
 
     keepalive = "keepalive" in options and (
         cmk_version.edition(cmk.utils.paths.omd_root) is not cmk_version.Edition.CRE
@@ -2070,23 +2152,26 @@ def mode_notify(options: dict, args: list[str]) -> int | None:
     return notify.do_notify(
         options,
         args,
-        define_servicegroups=config.define_servicegroups,
-        host_parameters_cb=lambda hostname,
-        plugin: loading_result.config_cache.notification_plugin_parameters(hostname, plugin),
-        rules=config.notification_rules,
-        parameters=config.notification_parameter,
-        get_http_proxy=config.get_http_proxy,
-        ensure_nagios=notify.make_ensure_nagios(loading_result.loaded_config.monitoring_core),
-        bulk_interval=config.notification_bulk_interval,
-        plugin_timeout=config.notification_plugin_timeout,
-        config_contacts=config.contacts,
-        fallback_email=config.notification_fallback_email,
-        fallback_format=config.notification_fallback_format,
-        spooling=ConfigCache.notification_spooling(),
-        backlog_size=config.notification_backlog,
-        logging_level=ConfigCache.notification_logging_level(),
+        define_servicegroups=notification_config.define_servicegroups,
+        host_parameters_cb=notification_config.host_parameters_cb,
+        rules=notification_config.rules,
+        parameters=notification_config.parameters,
+        get_http_proxy=notification_config.get_http_proxy,
+        ensure_nagios=notification_config.ensure_nagios,
+        bulk_interval=notification_config.bulk_interval,
+        plugin_timeout=notification_config.plugin_timeout,
+        config_contacts=notification_config.config_contacts,
+        fallback_email=notification_config.fallback_email,
+        fallback_format=notification_config.fallback_format,
+        spooling=notification_config.spooling,
+        backlog_size=notification_config.backlog_size,
+        logging_level=notification_config.logging_level,
         keepalive=keepalive,
-        all_timeperiods=load_timeperiods(),
+        all_timeperiods=notification_config.all_timeperiods,
+        parallel_plugins=notification_config.parallel_plugins,
+        plugin_concurrency=notification_config.plugin_concurrency,
+        in_process_plugins=notification_config.in_process_plugins,
+        reload_config=load_notification_config if keepalive else None,
     )
 
 
@@ -2691,8 +2776,17 @@ _CheckingOptions = TypedDict(
 
 
 def mode_check(options: _CheckingOptions, args: list[str]) -> ServiceState:
-    plugins = load_checks()
-    loading_result = load_config(plugins)
+    plugins: AgentBasedPlugins | None = None
+    if (
+        not {"detect-plugins", "detect-sections", "plugins"}.intersection(options)
+        and args
+        and (manifest := load_plugin_manifest()) is not None
+    ):
+        loading_result = config.load(discovery_rulesets=manifest.discovery_rulesets)
+        plugins = load_plugins_of_host(manifest, loading_result, HostName(args[0]))
+    if plugins is None:
+        plugins = load_checks()
+        loading_result = load_config(plugins)
     loaded_config = loading_result.loaded_config
     ruleset_matcher = loading_result.config_cache.ruleset_matcher
     label_manager = loading_result.config_cache.label_manager
@@ -2861,6 +2955,14 @@ def run_checking(
             clusters=hosts_config.clusters,
             rtc_package=None,
         )
+        submitter = get_submitter(
+            check_submission=config.check_submission,
+            monitoring_core=monitoring_core,
+            dry_run=dry_run,
+            host_name=hostname,
+            perfdata_format=("pnp" if config.perfdata_format == "pnp" else "standard"),
+            show_perfdata=options.get("perfdata", False),
+        )
         with CPUTracker(console.debug) as tracker:
             checks_result = execute_checkmk_checks(
                 hostname=hostname,
@@ -2894,14 +2996,7 @@ def run_checking(
                 service_labels: config_cache.check_period_of_service(
                     hostname, service_name, service_labels
                 ),
-                submitter=get_submitter(
-                    check_submission=config.check_submission,
-                    monitoring_core=monitoring_core,
-                    dry_run=dry_run,
-                    host_name=hostname,
-                    perfdata_format=("pnp" if config.perfdata_format == "pnp" else "standard"),
-                    show_perfdata=options.get("perfdata", False),
-                ),
+                submitter=submitter,
                 exit_spec=config_cache.exit_code_spec(hostname),
             )
 
@@ -2912,6 +3007,7 @@ def run_checking(
                 tuple((f[0], f[2]) for f in fetched),
                 perfdata_with_times=config.check_mk_perfdata_with_times,
             ),
+            *((submitter.stats.as_result(),) if config.check_mk_perfdata_with_times else ()),
         ]
 
     if error_handler.result is not None:
@@ -15,22 +15,28 @@
 #    => These already bear all information about the contact, the plug-in
 #       to call and its parameters.
 
+import ast
+import dataclasses
 import datetime
 import io
 import itertools
 import logging
 import os
 import re
+import signal
 import subprocess
 import sys
+import threading
 import time
 import traceback
 import uuid
-from collections.abc import Callable, Iterable, Mapping, Sequence
-from contextlib import suppress
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from functools import partial
 from pathlib import Path
-from typing import cast, Literal
+from typing import cast, Literal, TypedDict
 
 import cmk.ccc.debug
 import cmk.utils.paths
@@ -55,7 +61,7 @@ from cmk.utils import log
 from cmk.utils.http_proxy_config import HTTPProxyConfig
 from cmk.utils.log import console
 from cmk.utils.macros import replace_macros_in_str
-from cmk.utils.notify import find_wato_folder
+from cmk.utils.notify import find_wato_folder, NotificationBacklog
 from cmk.utils.notify_types import (
     Contact,
     ContactName,
@@ -88,6 +94,10 @@ logger = logging.getLogger("cmk.base.notify")
 
 _log_to_stdout = False
 notify_mode = "notify"
+# Only set in keepalive mode if parallel plug-in execution is configured
+_plugin_executor: "ParallelPluginExecutor | None" = None
+# Only set in keepalive mode if in-process execution of plug-ins is configured
+_in_process_plugins = False
 
 _ContactgroupName = str
 
@@ -107,6 +117,33 @@ Notifications = dict[NotificationKey, NotificationValue]
 
 _FallbackFormat = tuple[NotificationPluginNameStr, NotifyPluginParamsDict]
 
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class NotificationConfig:
+    """The configuration the notification keepalive mode is running with"""
+
+    host_parameters_cb: Callable[[HostName, NotificationPluginNameStr], Mapping[str, object]]
+    get_http_proxy: Callable[[tuple[str, str]], HTTPProxyConfig]
+    ensure_nagios: Callable[[str], object]
+    rules: Iterable[EventRule]
+    parameters: NotificationParameterSpecs
+    define_servicegroups: Mapping[str, str]
+    fallback_email: str
+    fallback_format: _FallbackFormat
+    config_contacts: ConfigContacts
+    plugin_timeout: int
+    bulk_interval: int
+    spooling: Literal["local", "remote", "both", "off"]
+    backlog_size: int
+    logging_level: int
+    all_timeperiods: TimeperiodSpecs
+    parallel_plugins: int = 0
+    plugin_concurrency: Mapping[NotificationPluginNameStr, int] = dataclasses.field(
+        default_factory=dict
+    )
+    in_process_plugins: bool = False
+
+
 #   .--Configuration-------------------------------------------------------.
 #   |    ____             __ _                       _   _                 |
 #   |   / ___|___  _ __  / _(_) __ _ _   _ _ __ __ _| |_(_) ___  _ __      |
@@ -238,6 +275,10 @@ def do_notify(
     logging_level: int,
     keepalive: bool,
     all_timeperiods: TimeperiodSpecs,
+    parallel_plugins: int = 0,
+    plugin_concurrency: Mapping[NotificationPluginNameStr, int] | None = None,
+    in_process_plugins: bool = False,
+    reload_config: Callable[[], NotificationConfig] | None = None,
 ) -> int | None:
     global _log_to_stdout, notify_mode
     _log_to_stdout = options.get("log-to-stdout", _log_to_stdout)
@@ -284,21 +325,27 @@ def do_notify(
 
         if keepalive:
             notify_keepalive(
-                host_parameters_cb,
-                get_http_proxy,
-                ensure_nagios,
-                rules=rules,
-                parameters=parameters,
-                define_servicegroups=define_servicegroups,
-                bulk_interval=bulk_interval,
-                fallback_email=fallback_email,
-                fallback_format=fallback_format,
-                plugin_timeout=plugin_timeout,
-                config_contacts=config_contacts,
-                spooling=spooling,
-                backlog_size=backlog_size,
-                logging_level=logging_level,
-                all_timeperiods=all_timeperiods,
+                NotificationConfig(
+                    host_parameters_cb=host_parameters_cb,
+                    get_http_proxy=get_http_proxy,
+                    ensure_nagios=ensure_nagios,
+                    rules=rules,
+                    parameters=parameters,
+                    define_servicegroups=define_servicegroups,
+                    bulk_interval=bulk_interval,
+                    fallback_email=fallback_email,
+                    fallback_format=fallback_format,
+                    plugin_timeout=plugin_timeout,
+                    config_contacts=config_contacts,
+                    spooling=spooling,
+                    backlog_size=backlog_size,
+                    logging_level=logging_level,
+                    all_timeperiods=all_timeperiods,
+                    parallel_plugins=parallel_plugins,
+                    plugin_concurrency=plugin_concurrency or {},
+                    in_process_plugins=in_process_plugins,
+                ),
+                reload_config=reload_config,
             )
         elif notify_mode == "replay":
             try:
@@ -676,51 +723,81 @@ def notification_test(
 
 # TODO: Make use of the generic do_keepalive() mechanism?
 def notify_keepalive(
-    host_parameters_cb: Callable[[HostName, NotificationPluginNameStr], Mapping[str, object]],
-    get_http_proxy: Callable[[tuple[str, str]], HTTPProxyConfig],
-    ensure_nagios: Callable[[str], object],
-    *,
-    rules: Iterable[EventRule],
-    parameters: NotificationParameterSpecs,
-    define_servicegroups: Mapping[str, str],
-    fallback_email: str,
-    fallback_format: _FallbackFormat,
-    config_contacts: ConfigContacts,
-    plugin_timeout: int,
-    bulk_interval: int,
-    spooling: Literal["local", "remote", "both", "off"],
-    backlog_size: int,
-    logging_level: int,
-    all_timeperiods: TimeperiodSpecs,
+    config: NotificationConfig,
+    reload_config: Callable[[], NotificationConfig] | None = None,
 ) -> None:
+    functions = _keepalive_functions(config)
     events.event_keepalive(
+        event_function=functions.event_function,
+        call_every_loop=functions.call_every_loop,
+        loop_interval=functions.loop_interval,
+        shutdown_function=_shutdown_plugin_executor,
+        reload_function=(
+            None if reload_config is None else partial(_reload_keepalive_functions, reload_config)
+        ),
+    )
+
+
+def _reload_keepalive_functions(
+    reload_config: Callable[[], NotificationConfig],
+) -> events.KeepaliveFunctions:
+    config = reload_config()
+    log.logger.setLevel(config.logging_level)
+    return _keepalive_functions(config)
+
+
+def _keepalive_functions(config: NotificationConfig) -> events.KeepaliveFunctions:
+    global _plugin_executor, _in_process_plugins
+    _in_process_plugins = config.in_process_plugins
+    if config.parallel_plugins <= 0:
+        # Plug-ins executed sequentially must not overtake the queued ones
+        _shutdown_plugin_executor()
+    elif _plugin_executor is not None:
+        # Do not let a reload wait for the queued plug-in calls
+        _plugin_executor.reconfigure(
+            max_workers=config.parallel_plugins,
+            plugin_limits=config.plugin_concurrency,
+        )
+    else:
+        _plugin_executor = ParallelPluginExecutor(
+            max_workers=config.parallel_plugins,
+            plugin_limits=config.plugin_concurrency,
+        )
+    return events.KeepaliveFunctions(
         event_function=partial(
             notify_notify,
-            define_servicegroups=define_servicegroups,
-            host_parameters_cb=host_parameters_cb,
-            get_http_proxy=get_http_proxy,
-            ensure_nagios=ensure_nagios,
-            rules=rules,
-            parameters=parameters,
-            fallback_email=fallback_email,
-            fallback_format=fallback_format,
-            config_contacts=config_contacts,
-            plugin_timeout=plugin_timeout,
-            spooling=spooling,
-            backlog_size=backlog_size,
-            logging_level=logging_level,
-            all_timeperiods=all_timeperiods,
+            define_servicegroups=config.define_servicegroups,
+            host_parameters_cb=config.host_parameters_cb,
+            get_http_proxy=config.get_http_proxy,
+            ensure_nagios=config.ensure_nagios,
+            rules=config.rules,
+            parameters=config.parameters,
+            fallback_email=config.fallback_email,
+            fallback_format=config.fallback_format,
+            config_contacts=config.config_contacts,
+            plugin_timeout=config.plugin_timeout,
+            spooling=config.spooling,
+            backlog_size=config.backlog_size,
+            logging_level=config.logging_level,
+            all_timeperiods=config.all_timeperiods,
         ),
         call_every_loop=partial(
             send_ripe_bulks,
-            get_http_proxy,
-            bulk_interval=bulk_interval,
-            plugin_timeout=plugin_timeout,
+            config.get_http_proxy,
+            bulk_interval=config.bulk_interval,
+            plugin_timeout=config.plugin_timeout,
         ),
-        loop_interval=bulk_interval,
+        loop_interval=config.bulk_interval,
     )
 
 
+def _shutdown_plugin_executor() -> None:
+    global _plugin_executor
+    if _plugin_executor is not None:
+        _plugin_executor.shutdown()
+        _plugin_executor = None
+
+
 # .
 #   .--Rule-Based-Notifications--------------------------------------------.
 #   |            ____        _      _                        _             |
@@ -967,7 +1044,7 @@ def _process_notifications(
                     else rbn_split_plugin_context(plugin_context)
                 )
                 for context in plugin_contexts:
-                    call_notification_script(plugin_name, context, plugin_timeout=plugin_timeout)
+                    deliver_via_plugin(plugin_name, context, plugin_timeout=plugin_timeout)
             else:
                 logger.info("No rule matched, would notify fallback contacts, but none configured")
     else:
@@ -1023,9 +1100,7 @@ def _process_notifications(
                     else:
                         if dispatch and plugin_name != dispatch:
                             continue
-                        call_notification_script(
-                            plugin_name, context, plugin_timeout=plugin_timeout
-                        )
+                        deliver_via_plugin(plugin_name, context, plugin_timeout=plugin_timeout)
 
             except Exception as e:
                 if cmk.ccc.debug.enabled():
@@ -1775,8 +1850,60 @@ def call_notification_script(
     if not path:
         return 2
 
+    if _in_process_plugins and Path(path).parent == cmk.utils.paths.notifications_dir:
+        # Imported here, as it pulls in requests and the plug-ins
+        from cmk.notification_plugins import (  # pylint: disable=cmk-module-layer-violation
+            in_process,
+        )
+
+        run_in_process = plugin_name in in_process.IN_PROCESS_PLUGINS
+    else:
+        run_in_process = False
+
+    if run_in_process:
+        plugin_log("executing %s in-process" % plugin_name)
+        exitcode, output_lines = in_process.run_plugin(
+            plugin_name, _limit_context_values(plugin_context), timeout=plugin_timeout
+        )
+        for output in output_lines:
+            plugin_log("Output: %s" % output)
+            if _log_to_stdout:
+                with suppress(IOError):
+                    sys.stdout.write(output + "\n")
+                    sys.stdout.flush()
+    else:
+        exitcode, output_lines = _call_notification_script_subprocess(
+            path, plugin_context, plugin_timeout=plugin_timeout, plugin_log=plugin_log
+        )
+
+    if exitcode:
+        plugin_log("Plug-in exited with code %d" % exitcode)
+
+    # Result is already logged to history for spoolfiles by
+    # mknotifyd.spool_handler
+    if not is_spoolfile:
+        log_to_history(
+            notification_result_message(
+                plugin=NotificationPluginName(plugin_name),
+                context=plugin_context,
+                exit_code=NotificationResultCode(exitcode),
+                output=output_lines,
+            )
+        )
+
+    return exitcode
+
+
+def _call_notification_script_subprocess(
+    path: str,
+    plugin_context: NotificationContext,
+    *,
+    plugin_timeout: int,
+    plugin_log: Callable[[str], None],
+) -> tuple[int, list[str]]:
     plugin_log("executing %s" % path)
 
+    in_main_thread = threading.current_thread() is threading.main_thread()
     with subprocess.Popen(
         [path],
         stdout=subprocess.PIPE,
@@ -1784,13 +1911,16 @@ def call_notification_script(
         env=notification_script_env(plugin_context),
         encoding="utf-8",
         close_fds=True,
+        # Worker threads kill the whole process group on timeout, see _KillTimer
+        start_new_session=not in_main_thread,
     ) as p:
         output_lines: list[str] = []
         assert p.stdout is not None
 
-        with Timeout(
-            plugin_timeout,
-            message="Notification plug-in timed out",
+        with (
+            Timeout(plugin_timeout, message="Notification plug-in timed out")
+            if in_main_thread
+            else _KillTimer(plugin_timeout, p, plugin_log)
         ) as timeout_guard:
             try:
                 while True:
@@ -1812,26 +1942,221 @@ def call_notification_script(
                 )
                 p.kill()
 
-    if exitcode := 1 if timeout_guard.signaled else p.returncode:
-        plugin_log("Plug-in exited with code %d" % exitcode)
+    return (1 if timeout_guard.signaled else p.returncode), output_lines
 
-    # Result is already logged to history for spoolfiles by
-    # mknotifyd.spool_handler
-    if not is_spoolfile:
-        log_to_history(
-            notification_result_message(
-                plugin=NotificationPluginName(plugin_name),
-                context=plugin_context,
-                exit_code=NotificationResultCode(exitcode),
-                output=output_lines,
-            )
+
+class _KillTimer:
+    """Plug-in timeout for worker threads
+
+    Signal handlers can only be installed in the main thread, so the
+    plug-in is killed by a timer instead of interrupting the reading. The
+    whole process group is killed, because child processes of the plug-in
+    would otherwise keep its output pipe open.
+    """
+
+    def __init__(
+        self, timeout: int, process: subprocess.Popen[str], plugin_log: Callable[[str], None]
+    ) -> None:
+        self._timeout = timeout
+        self._process = process
+        self._plugin_log = plugin_log
+        self._timer = threading.Timer(timeout, self._kill)
+        self._signaled = False
+
+    @property
+    def signaled(self) -> bool:
+        return self._signaled
+
+    def _kill(self) -> None:
+        self._signaled = True
+        self._plugin_log(
+            "Notification plug-in did not finish within %d seconds. Terminating." % self._timeout
         )
+        with suppress(ProcessLookupError):
+            os.killpg(self._process.pid, signal.SIGKILL)
 
-    return exitcode
+    def __enter__(self) -> "_KillTimer":
+        self._timer.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._timer.cancel()
+
+
+def deliver_via_plugin(
+    plugin_name: NotificationPluginNameStr,
+    plugin_context: NotificationContext,
+    *,
+    plugin_timeout: int,
+) -> None:
+    """Call the notification plug-in, in parallel mode only queue the call"""
+    if _plugin_executor is None:
+        call_notification_script(plugin_name, plugin_context, plugin_timeout=plugin_timeout)
+        return
+    _plugin_executor.submit(plugin_name, plugin_context, plugin_timeout=plugin_timeout)
+
+
+@dataclasses.dataclass(frozen=True)
+class _PluginCall:
+    plugin_name: NotificationPluginNameStr
+    plugin_context: NotificationContext
+    plugin_timeout: int
+    queued_at: float
+
+    @property
+    def ordering_key(self) -> tuple[str, str, str]:
+        return (
+            self.plugin_context.get("CONTACTNAME", ""),
+            self.plugin_context.get("HOSTNAME", ""),
+            self.plugin_context.get("SERVICEDESC", ""),
+        )
+
+
+class ParallelPluginExecutor:
+    """Executes notification plug-ins in a bounded pool of worker threads
+
+    The plug-ins are subprocesses, so threads are sufficient for waiting on
+    them. Calls for the same contact and object are executed in the order
+    they have been submitted. The number of parallel executions of single
+    plug-ins can be limited.
+    """
+
+    def __init__(
+        self, *, max_workers: int, plugin_limits: Mapping[NotificationPluginNameStr, int]
+    ) -> None:
+        self._max_workers = max_workers
+        self._plugin_limits = plugin_limits
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notify")
+        self._condition = threading.Condition()
+        self._pending: list[_PluginCall] = []
+        self._running_keys: set[tuple[str, str, str]] = set()
+        self._running_plugins: Counter[NotificationPluginNameStr] = Counter()
+
+    @property
+    def queue_depth(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def submit(
+        self,
+        plugin_name: NotificationPluginNameStr,
+        plugin_context: NotificationContext,
+        *,
+        plugin_timeout: int,
+    ) -> None:
+        with self._condition:
+            self._pending.append(
+                _PluginCall(plugin_name, plugin_context, plugin_timeout, time.monotonic())
+            )
+            self._dispatch()
+            logger.info(
+                "     queued %s, %d running, %d waiting",
+                plugin_name,
+                len(self._running_keys),
+                len(self._pending),
+            )
+
+    def reconfigure(
+        self, *, max_workers: int, plugin_limits: Mapping[NotificationPluginNameStr, int]
+    ) -> None:
+        """Apply new limits without waiting for the queued plug-in calls
+
+        The queued calls are kept, so their order is preserved. A pool of a
+        different size replaces the current one, whose running calls finish in
+        the background."""
+        with self._condition:
+            old_pool = None
+            if max_workers != self._max_workers:
+                old_pool = self._pool
+                self._pool = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="notify"
+                )
+            self._max_workers = max_workers
+            self._plugin_limits = plugin_limits
+            self._dispatch()
+        if old_pool is not None:
+            old_pool.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        """Wait for all queued plug-in calls to be finished"""
+        with self._condition:
+            if self._pending or self._running_keys:
+                logger.info(
+                    "Waiting for %d queued notifications",
+                    len(self._pending) + len(self._running_keys),
+                )
+            self._condition.wait_for(lambda: not self._pending and not self._running_keys)
+        self._pool.shutdown(wait=True)
+
+    def _dispatch(self) -> None:
+        # Must be called with the condition being held
+        waiting: list[_PluginCall] = []
+        blocked_keys: set[tuple[str, str, str]] = set()
+        for call in self._pending:
+            key = call.ordering_key
+            if (
+                len(self._running_keys) >= self._max_workers
+                or key in self._running_keys
+                or key in blocked_keys
+                or self._running_plugins[call.plugin_name]
+                >= self._plugin_limits.get(call.plugin_name, self._max_workers)
+            ):
+                # Keep the order of the calls for this key
+                blocked_keys.add(key)
+                waiting.append(call)
+                continue
+            self._running_keys.add(key)
+            self._running_plugins[call.plugin_name] += 1
+            self._pool.submit(self._execute, call)
+        self._pending = waiting
+
+    def _execute(self, call: _PluginCall) -> None:
+        started_at = time.monotonic()
+        try:
+            call_notification_script(
+                call.plugin_name, call.plugin_context, plugin_timeout=call.plugin_timeout
+            )
+        except Exception as e:
+            logger.exception("    ERROR:")
+            log_to_history(
+                notification_result_message(
+                    plugin=NotificationPluginName(call.plugin_name),
+                    context=call.plugin_context,
+                    exit_code=NotificationResultCode(2),
+                    output=[str(e)],
+                )
+            )
+        finally:
+            finished_at = time.monotonic()
+            with self._condition:
+                self._running_keys.discard(call.ordering_key)
+                self._running_plugins[call.plugin_name] -= 1
+                self._dispatch()
+                logger.info(
+                    "     %s for %s finished (latency: %.2f s, queued: %.2f s, %d waiting)",
+                    call.plugin_name,
+                    call.plugin_context.get("CONTACTNAME", ""),
+                    finished_at - call.queued_at,
+                    started_at - call.queued_at,
+                    len(self._pending),
+                )
+                self._condition.notify_all()
 
 
 # Construct the environment for the notification script
 def notification_script_env(plugin_context: NotificationContext) -> PluginNotificationContext:
+    notify_env = os.environ.copy()
+    notify_env.update(
+        {
+            "NOTIFY_" + variable: value
+            for variable, value in _limit_context_values(plugin_context).items()
+        }
+    )
+
+    return notify_env
+
+
+def _limit_context_values(plugin_context: NotificationContext) -> PluginNotificationContext:
     # Use half of the maximum allowed string length MAX_ARG_STRLEN
     # which is usually 32 pages on Linux (see "man execve").
     #
@@ -1851,12 +2176,7 @@ def notification_script_env(plugin_context: NotificationContext) -> PluginNotifi
             )
         return value
 
-    notify_env = os.environ.copy()
-    notify_env.update(
-        {"NOTIFY_" + variable: format_(value) for variable, value in plugin_context.items()}
-    )
-
-    return notify_env
+    return {variable: format_(value) for variable, value in plugin_context.items()}
 
 
 # .
@@ -2093,8 +2413,10 @@ def do_bulk_notify(
     notify_uuid = str(uuid.uuid4())
     filename_new = bulk_dir / f"{notify_uuid}.new"
     filename_final = bulk_dir / notify_uuid
-    filename_new.write_text(f"{(params, plugin_context)!r}\n")
-    filename_new.rename(filename_final)  # We need an atomic creation!
+    with store.locked(_bulk_index_path()):
+        filename_new.write_text(f"{(params, plugin_context)!r}\n")
+        filename_new.rename(filename_final)  # We need an atomic creation!
+        _journal_spooled_notification(str(bulk_dir), filename_final.stat().st_mtime)
     logger.info("        - stored in %s", filename_final)
 
 
@@ -2165,92 +2487,280 @@ def remove_if_orphaned(bulk_dir: str, max_age: float, ref_time: float | None = N
             logger.info("    -> Error removing it: %s", e)
 
 
-def find_bulks(only_ripe: bool, *, bulk_interval: int) -> NotifyBulks:
-    if not os.path.exists(notification_bulkdir):
-        return []
+# The bulk index keeps the age, size and parameters of all bulks, so that the
+# ripeness of the bulks can be checked without walking the whole spool on every
+# call. The spool itself is left untouched, the index only lives besides it in a
+# hidden file. It is updated by every process storing or sending bulks and
+# rebuilt from the spool from time to time, to pick up bulks created or removed
+# behind its back.
+# Spooling a notification only appends a line to a journal next to the index.
+# The journal is folded into the index whenever the index is written anyway.
+_BULK_INDEX_RESCAN_INTERVAL = 3600
+
+
+class _BulkIndexEntry(TypedDict):
+    oldest: float
+    count: int
+    interval: int | None
+    timeperiod: str | None
+    max_count: int
+
+
+class _BulkIndex(TypedDict):
+    scanned: float
+    bulks: dict[str, _BulkIndexEntry]
+
+
+def _bulk_index_path() -> Path:
+    return Path(notification_bulkdir, ".index.mk")
+
+
+def _bulk_index_journal_path() -> Path:
+    return Path(notification_bulkdir, ".index.journal")
+
+
+@dataclasses.dataclass
+class _LoadedBulkIndex:
+    path: Path
+    identity: tuple[int, int, int] | None
+    journal_offset: int
+    index: _BulkIndex
+
+
+# Keeps the keepalive from reading the whole index and journal on every call
+_loaded_bulk_index: _LoadedBulkIndex | None = None
+
+
+def _file_identity(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _load_bulk_index() -> _BulkIndex:
+    """Load the index and apply the journal
+
+    As long as the index file stays the same, only the lines appended to the journal
+    since the last call are applied to the index loaded before."""
+    global _loaded_bulk_index
+    path = _bulk_index_path()
+    identity = _file_identity(path)
+    if (
+        _loaded_bulk_index is None
+        or _loaded_bulk_index.path != path
+        or _loaded_bulk_index.identity != identity
+    ):
+        _loaded_bulk_index = _LoadedBulkIndex(
+            path=path,
+            identity=identity,
+            journal_offset=0,
+            index=store.load_object_from_file(path, default={"scanned": 0.0, "bulks": {}}),
+        )
+    loaded = _loaded_bulk_index
+
+    try:
+        with _bulk_index_journal_path().open("rb") as journal:
+            journal.seek(loaded.journal_offset)
+            appended = journal.read()
+    except FileNotFoundError:
+        return loaded.index
+
+    # The last line may still be written by a process spooling a notification
+    appended = appended[: appended.rfind(b"\n") + 1]
+    loaded.journal_offset += len(appended)
+    for line in appended.decode("utf-8").splitlines():
+        try:
+            key, mtime = ast.literal_eval(line)
+        except (ValueError, SyntaxError):
+            logger.info("Skipping invalid line in bulk index journal: %r", line)
+            continue
+        _index_spooled_notification(loaded.index, os.path.join(notification_bulkdir, key), mtime)
+    return loaded.index
+
+
+@contextmanager
+def _locked_bulk_index() -> Iterator[_BulkIndex]:
+    global _loaded_bulk_index
+    path = _bulk_index_path()
+    with store.locked(path):
+        index = _load_bulk_index()
+        try:
+            yield index
+            store.save_object_to_file(path, index)
+            _bulk_index_journal_path().unlink(missing_ok=True)
+        except BaseException:
+            # The index loaded before may have been changed without being saved
+            _loaded_bulk_index = None
+            raise
+        _loaded_bulk_index = _LoadedBulkIndex(
+            path=path, identity=_file_identity(path), journal_offset=0, index=index
+        )
 
+
+def _journal_spooled_notification(bulk_dir: str, mtime: float) -> None:
+    """Record a spooled notification without rewriting the whole index
+
+    Needs to be called with the index locked."""
+    with _bulk_index_journal_path().open("a") as journal:
+        journal.write(f"{(_bulk_index_key(bulk_dir), mtime)!r}\n")
+
+
+def _bulk_index_key(bulk_dir: str) -> str:
+    return os.path.relpath(bulk_dir, notification_bulkdir)
+
+
+def _index_spooled_notification(index: _BulkIndex, bulk_dir: str, mtime: float) -> None:
+    key = _bulk_index_key(bulk_dir)
+    if (entry := index["bulks"].get(key)) is not None:
+        entry["count"] += 1
+        entry["oldest"] = min(entry["oldest"], mtime)
+        return
+
+    method_dir, bulk = os.path.split(bulk_dir)
+    if (parts := bulk_parts(method_dir, bulk)) is None:
+        return
+    interval, timeperiod, max_count = parts
+    index["bulks"][key] = _BulkIndexEntry(
+        oldest=mtime, count=1, interval=interval, timeperiod=timeperiod, max_count=max_count
+    )
+
+
+def _reindex_bulk(index: _BulkIndex, bulk_dir: str) -> UUIDs:
+    """Update the index entry of a single bulk from the files in its directory"""
+    key = _bulk_index_key(bulk_dir)
+    try:
+        uuids, oldest = bulk_uuids(bulk_dir)
+    except FileNotFoundError:
+        uuids, oldest = [], 0.0
+
+    method_dir, bulk = os.path.split(bulk_dir)
+    if not uuids or (parts := bulk_parts(method_dir, bulk)) is None:
+        index["bulks"].pop(key, None)
+        return uuids
+
+    interval, timeperiod, max_count = parts
+    index["bulks"][key] = _BulkIndexEntry(
+        oldest=oldest,
+        count=len(uuids),
+        interval=interval,
+        timeperiod=timeperiod,
+        max_count=max_count,
+    )
+    return uuids
+
+
+def _rebuild_bulk_index(now: float) -> _BulkIndex:
     def listdir_visible(path: str) -> list[str]:
         return [x for x in os.listdir(path) if not x.startswith(".")]
 
-    bulks: NotifyBulks = []
-    now = time.time()
-    for contact in listdir_visible(notification_bulkdir):
-        contact_dir = os.path.join(notification_bulkdir, contact)
-        for method in listdir_visible(contact_dir):
-            method_dir = os.path.join(contact_dir, method)
-            for bulk in listdir_visible(method_dir):
-                bulk_dir = os.path.join(method_dir, bulk)
-
-                uuids, oldest = bulk_uuids(bulk_dir)
-                if not uuids:
-                    remove_if_orphaned(bulk_dir, max_age=60, ref_time=now)
-                    continue
-                age = now - oldest
+    with _locked_bulk_index() as index:
+        logger.info("Rebuilding bulk index from %s", notification_bulkdir)
+        index["bulks"].clear()
+        for contact in listdir_visible(notification_bulkdir):
+            contact_dir = os.path.join(notification_bulkdir, contact)
+            for method in listdir_visible(contact_dir):
+                method_dir = os.path.join(contact_dir, method)
+                for bulk in listdir_visible(method_dir):
+                    bulk_dir = os.path.join(method_dir, bulk)
+                    if not _reindex_bulk(index, bulk_dir):
+                        remove_if_orphaned(bulk_dir, max_age=60, ref_time=now)
+        index["scanned"] = now
+    return index
+
+
+def _bulk_is_ripe(
+    bulk_dir: str, entry: _BulkIndexEntry, age: float, now: float, *, bulk_interval: int
+) -> bool:
+    count, max_count = entry["count"], entry["max_count"]
+    if (interval := entry["interval"]) is not None:
+        if age >= interval:
+            logger.info("Bulk %s is ripe: age %d >= %d", bulk_dir, age, interval)
+            return True
+        if count >= max_count:
+            logger.info("Bulk %s is ripe: count %d >= %d", bulk_dir, count, max_count)
+            return True
+        logger.info("Bulk %s is not ripe yet (age: %d, count: %d)!", bulk_dir, age, count)
+        return False
 
-                # e.g. 60,10,host,localhost OR timeperiod:late_night,1000,host,localhost
-                parts = bulk_parts(method_dir, bulk)
-                if parts is None:
-                    continue
-                interval, timeperiod, count = parts
+    timeperiod = entry["timeperiod"]
+    assert timeperiod is not None
+    try:
+        active = timeperiod_active(TimeperiodName(timeperiod))
+    except Exception:
+        # This prevents sending bulk notifications if a
+        # livestatus connection error appears. It also implies
+        # that an ongoing connection error will hold back bulk
+        # notifications.
+        logger.info(
+            "Error while checking activity of time period %s: assuming active",
+            timeperiod,
+        )
+        active = True
 
-                if interval is not None:
-                    if age >= interval:
-                        logger.info("Bulk %s is ripe: age %d >= %d", bulk_dir, age, interval)
-                    elif len(uuids) >= count:
-                        logger.info("Bulk %s is ripe: count %d >= %d", bulk_dir, len(uuids), count)
-                    else:
-                        logger.info(
-                            "Bulk %s is not ripe yet (age: %d, count: %d)!",
-                            bulk_dir,
-                            age,
-                            len(uuids),
-                        )
-                        if only_ripe:
-                            continue
+    if active is True and count < max_count:
+        # Only add a log entry every 10 minutes since timeperiods
+        # can be very long (The default would be 10s).
+        if now % 600 <= bulk_interval:
+            logger.info(
+                "Bulk %s is not ripe yet (time period %s: active, count: %d)",
+                bulk_dir,
+                timeperiod,
+                count,
+            )
+        return False
+    if active is False:
+        logger.info("Bulk %s is ripe: time period %s has ended", bulk_dir, timeperiod)
+    elif count >= max_count:
+        logger.info("Bulk %s is ripe: count %d >= %d", bulk_dir, count, max_count)
+    else:
+        logger.info(
+            "Bulk %s is ripe: time period %s is not known anymore",
+            bulk_dir,
+            timeperiod,
+        )
+    return True
 
-                    bulks.append((bulk_dir, age, interval, "n.a.", count, uuids))
-                else:
-                    assert timeperiod is not None  # TODO: Improve typing of bulk_parts()
-                    try:
-                        active = timeperiod_active(TimeperiodName(timeperiod))
-                    except Exception:
-                        # This prevents sending bulk notifications if a
-                        # livestatus connection error appears. It also implies
-                        # that an ongoing connection error will hold back bulk
-                        # notifications.
-                        logger.info(
-                            "Error while checking activity of time period %s: assuming active",
-                            timeperiod,
-                        )
-                        active = True
-
-                    if active is True and len(uuids) < count:
-                        # Only add a log entry every 10 minutes since timeperiods
-                        # can be very long (The default would be 10s).
-                        if now % 600 <= bulk_interval:
-                            logger.info(
-                                "Bulk %s is not ripe yet (time period %s: active, count: %d)",
-                                bulk_dir,
-                                timeperiod,
-                                len(uuids),
-                            )
-
-                        if only_ripe:
-                            continue
-                    elif active is False:
-                        logger.info(
-                            "Bulk %s is ripe: time period %s has ended", bulk_dir, timeperiod
-                        )
-                    elif len(uuids) >= count:
-                        logger.info("Bulk %s is ripe: count %d >= %d", bulk_dir, len(uuids), count)
-                    else:
-                        logger.info(
-                            "Bulk %s is ripe: time period %s is not known anymore",
-                            bulk_dir,
-                            timeperiod,
-                        )
 
-                    bulks.append((bulk_dir, age, "n.a.", timeperiod, count, uuids))
+def find_bulks(only_ripe: bool, *, bulk_interval: int) -> NotifyBulks:
+    if not os.path.exists(notification_bulkdir):
+        return []
+
+    now = time.time()
+    index = _load_bulk_index()
+    if now - index["scanned"] >= _BULK_INDEX_RESCAN_INTERVAL or index["scanned"] > now:
+        index = _rebuild_bulk_index(now)
+
+    bulks: NotifyBulks = []
+    # Reindexing an empty bulk below changes the index
+    for key, entry in list(index["bulks"].items()):
+        # e.g. 60,10,host,localhost OR timeperiod:late_night,1000,host,localhost
+        bulk_dir = os.path.join(notification_bulkdir, key)
+        age = now - entry["oldest"]
+        if not _bulk_is_ripe(bulk_dir, entry, age, now, bulk_interval=bulk_interval) and only_ripe:
+            continue
+
+        # Only the bulks which are going to be used are read from the disk
+        try:
+            uuids, oldest = bulk_uuids(bulk_dir)
+        except FileNotFoundError:
+            uuids, oldest = [], now
+        if not uuids:
+            with _locked_bulk_index() as locked_index:
+                _reindex_bulk(locked_index, bulk_dir)
+            continue
+
+        bulks.append(
+            (
+                bulk_dir,
+                now - oldest,
+                "n.a." if entry["interval"] is None else entry["interval"],
+                "n.a." if entry["timeperiod"] is None else entry["timeperiod"],
+                entry["max_count"],
+                uuids,
+            )
+        )
     return bulks
 
 
@@ -2363,11 +2873,13 @@ def notify_bulk(
         notify_bulk(dirname, unhandled_uuids, get_http_proxy, plugin_timeout=plugin_timeout)
 
     # Remove directory. Not necessary if emtpy
-    try:
-        os.rmdir(dirname)
-    except Exception as e:
-        if not unhandled_uuids:
-            logger.info("Warning: cannot remove directory %s: %s", dirname, e)
+    with _locked_bulk_index() as index:
+        try:
+            os.rmdir(dirname)
+        except Exception as e:
+            if not unhandled_uuids:
+                logger.info("Warning: cannot remove directory %s: %s", dirname, e)
+        _reindex_bulk(index, dirname)
 
 
 def call_bulk_notification_script(
@@ -2431,29 +2943,18 @@ def call_bulk_notification_script(
 
 
 def store_notification_backlog(raw_context: EventContext, *, backlog_size: int) -> None:
-    path = notification_logdir / "backlog.mk"
-    if not backlog_size:
-        if path.exists():
-            path.unlink()
-        return
-
-    backlog = store.load_object_from_file(
-        path,
-        default=[],
-        lock=True,
-    )[: backlog_size - 1]
-    store.save_object_to_file(path, [raw_context] + backlog, pprint_value=False)
+    NotificationBacklog(notification_logdir / "backlog").append(raw_context, size=backlog_size)
 
 
 def raw_context_from_backlog(nr: int) -> EventContext:
-    backlog = store.load_object_from_file(notification_logdir / "backlog.mk", default=[])
+    raw_context = NotificationBacklog(notification_logdir / "backlog").get(nr)
 
-    if nr < 0 or nr >= len(backlog):
+    if raw_context is None:
         console.error(f"No notification number {nr} in backlog.", file=sys.stderr)
         sys.exit(2)
 
     logger.info("Replaying notification %d from backlog...\n", nr)
-    return backlog[nr]
+    return cast(EventContext, raw_context)
 
 
 def raw_context_from_env(environ: Mapping[str, str]) -> EventContext:
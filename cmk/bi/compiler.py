@@ -5,8 +5,10 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
 import time
+from collections.abc import Collection
 from multiprocessing.pool import Pool
 from pathlib import Path
 from typing import TypedDict
@@ -20,9 +22,9 @@ from cmk.bi import storage
 from cmk.bi.aggregation import BIAggregation
 from cmk.bi.data_fetcher import BIStructureFetcher, SiteProgramStart
 from cmk.bi.filesystem import BIFileSystem, get_default_site_filesystem
-from cmk.bi.lib import SitesCallback
+from cmk.bi.lib import BIHostData, SitesCallback
 from cmk.bi.packs import BIAggregationPacks
-from cmk.bi.searcher import BISearcher
+from cmk.bi.searcher import BIHostDependencies, BISearcher
 from cmk.bi.trees import BICompiledAggregation, BICompiledRule, FrozenBIInfo
 from cmk.ccc import store
 from cmk.ccc.exceptions import MKGeneralException
@@ -60,6 +62,7 @@ class BICompiler:
         self._aggregation_store = storage.AggregationStore(self._fs.cache)
         self._metadata_store = storage.MetadataStore(self._fs)
         self._frozen_store = storage.FrozenAggregationStore(self._fs.var)
+        self._branch_index = storage.BranchIndex(self._fs.cache)
         self._lookup_store = storage.LookupStore(redis_client or get_redis_client())
 
         self._bi_packs = BIAggregationPacks(bi_configuration_file)
@@ -70,6 +73,9 @@ class BICompiler:
     def compiled_aggregations(self) -> dict[str, BICompiledAggregation]:
         return self._compiled_aggregations
 
+    def get_last_compilation(self) -> float:
+        return self._metadata_store.get_last_compilation()
+
     def get_aggregation_by_name(
         self, aggr_name: str
     ) -> tuple[BICompiledAggregation, BICompiledRule] | None:
@@ -85,6 +91,50 @@ class BICompiler:
         finally:
             self._load_compiled_aggregations()
 
+    def load_compiled_branches(
+        self,
+        *,
+        aggr_ids: Collection[str] = (),
+        branch_titles: Collection[str] = (),
+        hosts: Collection[str] = (),
+        services: Collection[tuple[str, str]] = (),
+    ) -> bool:
+        """Load only the compiled branches matching all of the given criteria
+
+        Returns False if the branches could not be determined via the branch index. The caller
+        has to load all compiled aggregations in this case.
+        """
+        if not (aggr_ids or branch_titles or hosts or services):
+            return False
+
+        self._check_compilation_status()
+        if self._compiled_aggregations:
+            # Everything has just been compiled
+            return True
+        if not self._branch_index.exists():
+            return False
+
+        compiled_aggregations: dict[str, BICompiledAggregation] = {}
+        for aggr_id, branch_title in self._branch_index.find(
+            aggr_ids=aggr_ids, branch_titles=branch_titles, hosts=hosts, services=services
+        ):
+            if (aggregation := self._branch_index.load(aggr_id, branch_title)) is None:
+                return False
+            if (
+                frozen_info := aggregation.frozen_info
+            ) is not None and not self._frozen_store.exists(
+                frozen_info.based_on_aggregation_id, frozen_info.based_on_branch_title
+            ):
+                # The branch has been unfrozen, it is frozen again on a complete load
+                return False
+            if (loaded := compiled_aggregations.get(aggr_id)) is None:
+                compiled_aggregations[aggr_id] = aggregation
+            else:
+                loaded.branches.extend(aggregation.branches)
+
+        self._compiled_aggregations = compiled_aggregations
+        return True
+
     def get_frozen_aggr_id(self, frozen_info: FrozenBIInfo) -> str:
         return f"frozen_{frozen_info.based_on_aggregation_id}_{frozen_info.based_on_branch_title}"
 
@@ -157,6 +207,7 @@ class BICompiler:
 
         if computed_new_frozen_branch:
             self._lookup_store.generate_aggregation_lookups(updated_aggregations)
+            self._branch_index.update(updated_aggregations)
 
         return updated_aggregations
 
@@ -192,19 +243,77 @@ class BICompiler:
 
             self.prepare_for_compilation(current_configstatus["online_sites"])
 
+            previous_fingerprints = self._metadata_store.get_compilation_fingerprints()
+            hosts = self.bi_searcher.hosts
+            dependencies_by_aggr_id: dict[str, BIHostDependencies] = {}
+            fingerprints = storage.CompilationFingerprints(
+                hosts={
+                    host_name: _fingerprint_host(host_data)
+                    for host_name, host_data in hosts.items()
+                },
+                aggregations={
+                    aggregation.id: self._fingerprint_aggregation(aggregation)
+                    for aggregation in self._bi_packs.get_all_aggregations()
+                },
+                host_matches={
+                    host_name: _fingerprint_host_match(host_data)
+                    for host_name, host_data in hosts.items()
+                },
+                dependencies=dependencies_by_aggr_id,
+            )
+            changed_hosts = {
+                host_name
+                for host_name in fingerprints.hosts.keys() | previous_fingerprints.hosts.keys()
+                if fingerprints.hosts.get(host_name) != previous_fingerprints.hosts.get(host_name)
+            }
+            host_matches_changed = any(
+                fingerprints.host_matches.get(host_name)
+                != previous_fingerprints.host_matches.get(host_name)
+                for host_name in changed_hosts
+            )
+
+            reused_aggr_ids = set()
             for aggregation in self._bi_packs.get_all_aggregations():
+                if (
+                    (fingerprint := fingerprints.aggregations[aggregation.id]) is not None
+                    and fingerprint == previous_fingerprints.aggregations.get(aggregation.id)
+                    and (dependencies := previous_fingerprints.dependencies.get(aggregation.id))
+                    is not None
+                    and not _depends_on_changed_hosts(
+                        dependencies, changed_hosts, host_matches_changed
+                    )
+                    and (compiled_aggregation := self._load_stored_aggregation(aggregation.id))
+                ):
+                    self._compiled_aggregations[aggregation.id] = compiled_aggregation
+                    dependencies_by_aggr_id[aggregation.id] = dependencies
+                    reused_aggr_ids.add(aggregation.id)
+                    continue
+
                 start = time.perf_counter()
-                self._compiled_aggregations[aggregation.id] = aggregation.compile(self.bi_searcher)
+                with self.bi_searcher.record_dependencies() as dependencies:
+                    self._compiled_aggregations[aggregation.id] = aggregation.compile(
+                        self.bi_searcher
+                    )
+                dependencies_by_aggr_id[aggregation.id] = dependencies
                 end = time.perf_counter()
                 _LOGGER.debug(f"Compilation of {aggregation.id} took {end - start:f}")
 
+            _LOGGER.debug(
+                "Reused %d compiled aggregations, %d hosts changed",
+                len(reused_aggr_ids),
+                len(changed_hosts),
+            )
+
             self._verify_aggregation_title_uniqueness(self._compiled_aggregations)
 
-            for compiled_aggregation in self._compiled_aggregations.values():
-                self._store_compiled_aggregation(compiled_aggregation)
+            for aggr_id, compiled_aggregation in self._compiled_aggregations.items():
+                if aggr_id not in reused_aggr_ids:
+                    self._store_compiled_aggregation(compiled_aggregation)
 
             self._compiled_aggregations = self._manage_frozen_branches(self._compiled_aggregations)
             self._lookup_store.generate_aggregation_lookups(self._compiled_aggregations)
+            self._branch_index.update(self._compiled_aggregations, reused_aggr_ids)
+            self._metadata_store.update_compilation_fingerprints(fingerprints)
 
             known_sites = {kv[0]: kv[1] for kv in current_configstatus.get("known_sites", set())}
             self._cleanup_vanished_aggregations()
@@ -213,6 +322,24 @@ class BICompiler:
                 current_configstatus["configfile_timestamp"]
             )
 
+    def _fingerprint_aggregation(self, aggregation: BIAggregation) -> str | None:
+        try:
+            rule_ids = self._bi_packs.get_rule_ids_of_aggregation(aggregation.id)
+            rules = [
+                self._bi_packs.get_rule_mandatory(rule_id).serialize()
+                for rule_id in sorted(rule_ids)
+            ]
+        except (KeyError, MKGeneralException):
+            # Broken configuration, always compiled
+            return None
+        return hashlib.sha256(repr((aggregation.serialize(), rules)).encode()).hexdigest()
+
+    def _load_stored_aggregation(self, aggr_id: str) -> BICompiledAggregation | None:
+        try:
+            return self._aggregation_store.get(aggr_id)
+        except storage.AggregationNotFound:
+            return None
+
     def _get_multiprocessing_pool(self, aggregation_count: int) -> Pool:
         # HACK: due to known constraints with multiprocessing in Python, this is a simple way to
         # "inject" the BI searcher dependency to our separate processes. An alternative approach
@@ -329,6 +456,51 @@ class BICompiler:
         return self._lookup_store.aggregation_lookup_exists(host_name, service_description)
 
 
+def _depends_on_changed_hosts(
+    dependencies: BIHostDependencies, changed_hosts: set[str], host_matches_changed: bool
+) -> bool:
+    if not changed_hosts:
+        return False
+    if dependencies.all_hosts or (dependencies.host_index and host_matches_changed):
+        return True
+    return not dependencies.host_names.isdisjoint(changed_hosts)
+
+
+def _fingerprint_host_match(host_data: BIHostData) -> str:
+    # The data the host index is built of
+    return hashlib.sha256(
+        repr(
+            (
+                sorted(host_data.tags),
+                sorted(host_data.labels.items()),
+                host_data.folder,
+                host_data.name,
+            )
+        ).encode()
+    ).hexdigest()
+
+
+def _fingerprint_host(host_data: BIHostData) -> str:
+    return hashlib.sha256(
+        repr(
+            (
+                host_data.site_id,
+                sorted(host_data.tags),
+                sorted(host_data.labels.items()),
+                host_data.folder,
+                sorted(
+                    (description, sorted(service.tags), sorted(service.labels.items()))
+                    for description, service in host_data.services.items()
+                ),
+                host_data.children,
+                host_data.parents,
+                host_data.alias,
+                host_data.name,
+            )
+        ).encode()
+    ).hexdigest()
+
+
 def _get_multiprocessing_pool_size(aggregation_count: int) -> int:
     current_process = psutil.Process(os.getpid())
 
@@ -4,12 +4,20 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import copy
-from collections.abc import Iterator
+from collections.abc import Iterator, Mapping
 from typing import NamedTuple, override
 
 from cmk.bi.data_fetcher import BIStatusFetcher
-from cmk.bi.lib import NodeResultBundle, RequiredBIElement
-from cmk.bi.trees import BICompiledAggregation, BICompiledRule
+from cmk.bi.lib import (
+    ABCBICompiledNode,
+    ABCBIStatusFetcher,
+    BIAggregationComputationOptions,
+    BIHostSpec,
+    BIHostStatusInfoRow,
+    NodeResultBundle,
+    RequiredBIElement,
+)
+from cmk.bi.trees import BICompiledAggregation, BICompiledLeaf, BICompiledRule
 from cmk.ccc.hostaddress import HostName
 from cmk.ccc.plugin_registry import Registry
 from cmk.utils.servicename import ServiceName
@@ -53,14 +61,150 @@ class BIComputerPostprocessingRegistry(Registry[ABCPostprocessComputeResult]):
 bi_computer_postprocessing_registry = BIComputerPostprocessingRegistry()
 
 
+class _CachedBranch(NamedTuple):
+    branch: BICompiledRule
+    states: Mapping[BIHostSpec, BIHostStatusInfoRow | None]
+    # Host -> ids of the nodes depending on it, i.e. its leaves and all rules above them
+    dependents: Mapping[BIHostSpec, frozenset[int]]
+    node_results: Mapping[int, NodeResultBundle | None]
+    result: NodeResultBundle | None
+
+
+class BIResultCache:
+    """Remembers the computed node results of the compiled branches
+
+    On the next computation only the nodes depending on hosts whose status rows have changed
+    are evaluated again, all other node results are reused. The cache is meant to live as long
+    as the process and has to be invalidated via set_generation once the aggregations have been
+    compiled again.
+    """
+
+    def __init__(self) -> None:
+        self._generation: float | None = None
+        self._branches: dict[tuple[str, str], _CachedBranch] = {}
+
+    def set_generation(self, generation: float) -> None:
+        if generation != self._generation:
+            self._generation = generation
+            self._branches = {}
+
+    def compute_branches(
+        self,
+        compiled_aggregation: BICompiledAggregation,
+        branches: list[BICompiledRule],
+        bi_status_fetcher: ABCBIStatusFetcher,
+    ) -> list[NodeResultBundle]:
+        if compiled_aggregation.frozen_info is not None:
+            # Frozen branches may be replaced without a new compilation
+            return compiled_aggregation.compute_branches(branches, bi_status_fetcher)
+
+        assumed_state_ids = set(bi_status_fetcher.assumed_states)
+        aggregation_results = []
+        for bi_compiled_branch in branches:
+            if assumed_state_ids.intersection(bi_compiled_branch.required_elements()):
+                # Assumed states are user specific, these results are never cached
+                result = bi_compiled_branch.compute(
+                    compiled_aggregation.computation_options, bi_status_fetcher, use_assumed=True
+                )
+            else:
+                result = self._compute_branch(
+                    compiled_aggregation, bi_compiled_branch, bi_status_fetcher
+                )
+            if result is not None:
+                aggregation_results.append(result)
+        return aggregation_results
+
+    def _compute_branch(
+        self,
+        compiled_aggregation: BICompiledAggregation,
+        branch: BICompiledRule,
+        bi_status_fetcher: ABCBIStatusFetcher,
+    ) -> NodeResultBundle | None:
+        key = (compiled_aggregation.id, branch.properties.title)
+        cached = self._branches.get(key)
+        if cached is None or cached.branch.required_elements() != branch.required_elements():
+            dependents: Mapping[BIHostSpec, frozenset[int]] = _collect_dependents(branch)
+            states = {host: bi_status_fetcher.states.get(host) for host in dependents}
+            dirty_nodes: set[int] = set()
+            node_results: dict[int, NodeResultBundle | None] = {}
+        else:
+            branch = cached.branch
+            dependents = cached.dependents
+            states = {host: bi_status_fetcher.states.get(host) for host in dependents}
+            dirty_nodes = {
+                node_id
+                for host, row in states.items()
+                if row != cached.states[host]
+                for node_id in dependents[host]
+            }
+            if not dirty_nodes:
+                return cached.result
+            node_results = dict(cached.node_results)
+
+        result = _compute_node(
+            branch,
+            compiled_aggregation.computation_options,
+            bi_status_fetcher,
+            dirty_nodes,
+            node_results,
+        )
+        self._branches[key] = _CachedBranch(branch, states, dependents, node_results, result)
+        return result
+
+
+def _collect_dependents(branch: BICompiledRule) -> dict[BIHostSpec, frozenset[int]]:
+    dependents: dict[BIHostSpec, set[int]] = {}
+
+    def collect(node: ABCBICompiledNode, ancestors: tuple[int, ...]) -> None:
+        if isinstance(node, BICompiledRule):
+            for child in node.nodes:
+                collect(child, (*ancestors, id(node)))
+        elif isinstance(node, BICompiledLeaf):
+            dependents.setdefault(BIHostSpec(node.site_id, node.host_name), set()).update(
+                (*ancestors, id(node))
+            )
+
+    collect(branch, ())
+    return {host: frozenset(node_ids) for host, node_ids in dependents.items()}
+
+
+def _compute_node(
+    node: ABCBICompiledNode,
+    computation_options: BIAggregationComputationOptions,
+    bi_status_fetcher: ABCBIStatusFetcher,
+    dirty_nodes: set[int],
+    node_results: dict[int, NodeResultBundle | None],
+) -> NodeResultBundle | None:
+    node_id = id(node)
+    if node_id in node_results and node_id not in dirty_nodes:
+        return node_results[node_id]
+
+    if isinstance(node, BICompiledRule):
+        result = node.aggregate_results(
+            [
+                _compute_node(
+                    child, computation_options, bi_status_fetcher, dirty_nodes, node_results
+                )
+                for child in node.nodes
+            ],
+            computation_options,
+        )
+    else:
+        result = node.compute(computation_options, bi_status_fetcher)
+    node_results[node_id] = result
+    return result
+
+
 class BIComputer:
     def __init__(
         self,
         compiled_aggregations: dict[str, BICompiledAggregation],
         bi_status_fetcher: BIStatusFetcher,
+        result_cache: BIResultCache | None = None,
     ) -> None:
         self._compiled_aggregations = compiled_aggregations
         self._bi_status_fetcher = bi_status_fetcher
+        self._result_cache = result_cache
         self._legacy_branch_cache: dict = {}
 
     def compute_aggregation_result(
@@ -113,10 +257,17 @@ class BIComputer:
     ) -> list[tuple[BICompiledAggregation, list[NodeResultBundle]]]:
         results = []
         for compiled_aggregation, branches in required_aggregations:
-            node_result_bundles = compiled_aggregation.compute_branches(
-                branches,
-                self._bi_status_fetcher,
-            )
+            if self._result_cache is None:
+                node_result_bundles = compiled_aggregation.compute_branches(
+                    branches,
+                    self._bi_status_fetcher,
+                )
+            else:
+                node_result_bundles = self._result_cache.compute_branches(
+                    compiled_aggregation,
+                    branches,
+                    self._bi_status_fetcher,
+                )
 
             # Postprocess results. Custom user plugins may add additional information for each node
             node_result_bundles = list(
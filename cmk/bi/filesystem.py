@@ -34,16 +34,34 @@ class BIFileSystemCache:
     def last_compilation(self) -> Path:
         return self._root / "last_compilation"
 
+    @functools.cached_property
+    def compilation_fingerprints(self) -> Path:
+        return self._root / "compilation_fingerprints"
+
+    @functools.cached_property
+    def compiled_branches(self) -> Path:
+        return self._root / "compiled_branches"
+
+    @functools.cached_property
+    def branch_index(self) -> Path:
+        return self._root / "branch_index.sqlite"
+
     def get_site_structure_data_path(self, site_id: str, timestamp: str) -> Path:
         return self.site_structure_data / f"{BI_SITE_CACHE_PREFIX}.{site_id}.{timestamp}"
 
     def clear_compilation_cache(self) -> None:
         self.compilation_lock.unlink(missing_ok=True)
         self.last_compilation.unlink(missing_ok=True)
+        self.compilation_fingerprints.unlink(missing_ok=True)
+        self.branch_index.unlink(missing_ok=True)
 
         for compilation_path in self.compiled_aggregations.iterdir():
             compilation_path.unlink(missing_ok=True)
 
+        if self.compiled_branches.exists():
+            for branch_path in self.compiled_branches.iterdir():
+                branch_path.unlink(missing_ok=True)
+
     @staticmethod
     def is_site_cache(fpath: Path) -> bool:
         return fpath.name.startswith(BI_SITE_CACHE_PREFIX)
@@ -3,14 +3,17 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
-from collections.abc import Iterable, Mapping
+import bisect
+from collections.abc import ItemsView, Iterable, Iterator, KeysView, Mapping, ValuesView
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from typing import Any, override
 
 from cmk.bi.lib import ABCBISearcher, BIHostData, BIHostSearchMatch, BIServiceSearchMatch
 from cmk.utils.labels import LabelGroups
 from cmk.utils.regex import regex
 from cmk.utils.rulesets.ruleset_matcher import matches_labels, matches_tag_condition, TagCondition
-from cmk.utils.tags import TagGroupID
+from cmk.utils.tags import TagGroupID, TagID
 
 #   .--Defines-------------------------------------------------------------.
 #   |                  ____        __ _                                    |
@@ -33,8 +36,177 @@ from cmk.utils.tags import TagGroupID
 #   +----------------------------------------------------------------------+
 
 
+@dataclass
+class BIHostDependencies:
+    """The hosts the result of searches depends on, see BISearcher.record_dependencies()
+
+    A search only evaluates each host on its own. Its result does not change as long as the
+    hosts it looked at do not change and no other host starts to match it. Hosts not looked at
+    can only start to match a search that looks at all hosts, or that takes its candidates
+    from the index and therefore depends on the tags, labels, folder and name of all hosts.
+    """
+
+    host_names: set[str] = field(default_factory=set)
+    all_hosts: bool = False
+    host_index: bool = False
+
+
+class _RecordingHosts(Mapping[str, BIHostData]):
+    """Records the hosts looked up by name, be it by the searcher or by the nodes
+
+    Iterating over all hosts is not recorded: the searcher records that on its own."""
+
+    def __init__(self, hosts: Mapping[str, BIHostData], dependencies: BIHostDependencies) -> None:
+        self._hosts = hosts
+        self._dependencies = dependencies
+
+    def __getitem__(self, key: str) -> BIHostData:
+        self._dependencies.host_names.add(key)
+        return self._hosts[key]
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, str):
+            self._dependencies.host_names.add(key)
+        return key in self._hosts
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._hosts)
+
+    def __len__(self) -> int:
+        return len(self._hosts)
+
+    def keys(self) -> KeysView[str]:
+        return self._hosts.keys()
+
+    def values(self) -> ValuesView[BIHostData]:
+        return self._hosts.values()
+
+    def items(self) -> ItemsView[str, BIHostData]:
+        return self._hosts.items()
+
+
+class _BIHostIndex:
+    """Postings of the hosts by tag, label, folder and host name prefix
+
+    The postings are only used to narrow down the hosts before the actual conditions are
+    evaluated, so they may yield more hosts than the conditions match, but never less.
+    """
+
+    def __init__(self, hosts: Mapping[str, BIHostData]) -> None:
+        self._hosts: dict[str, BIHostData] = {host.name: host for host in hosts.values()}
+        self._positions = {host_name: idx for idx, host_name in enumerate(self._hosts)}
+        self._sorted_names = sorted(self._hosts)
+        self._by_tag: dict[tuple[TagGroupID, TagID], set[str]] = {}
+        self._by_label: dict[tuple[str, str], set[str]] = {}
+        self._by_folder: dict[str, set[str]] = {}
+        for host in self._hosts.values():
+            for tag in host.tags:
+                self._by_tag.setdefault(tag, set()).add(host.name)
+            for label in host.labels.items():
+                self._by_label.setdefault(label, set()).add(host.name)
+            # Folder conditions match all hosts in the folder and its subfolders
+            for idx, char in enumerate(host.folder):
+                if char == "/":
+                    self._by_folder.setdefault(host.folder[: idx + 1], set()).add(host.name)
+
+    def candidates(self, conditions: dict) -> list[BIHostData] | None:
+        """Hosts possibly matching the folder, tag and label conditions, None if unrestricted"""
+        postings: list[set[str]] = []
+        if folder_path := conditions["host_folder"]:
+            postings.append(self._by_folder.get(f"{folder_path}/", set()))
+
+        for taggroup_id, tag_condition in conditions["host_tags"].items():
+            if not isinstance(tag_condition, dict):
+                postings.append(self._by_tag.get((taggroup_id, tag_condition), set()))
+            elif "$or" in tag_condition:
+                postings.append(
+                    set().union(
+                        *(
+                            self._by_tag.get((taggroup_id, tag_id), set())
+                            for tag_id in tag_condition["$or"]
+                        )
+                    )
+                )
+
+        postings.extend(
+            self._by_label.get(label, set())
+            for label in _required_labels(conditions["host_label_groups"])
+        )
+
+        if not postings:
+            return None
+        postings.sort(key=len)
+        return self._ordered(postings[0].intersection(*postings[1:]))
+
+    def with_name_prefix(self, prefix: str) -> list[BIHostData]:
+        host_names: set[str] = set()
+        for host_name in self._sorted_names[bisect.bisect_left(self._sorted_names, prefix) :]:
+            if not host_name.startswith(prefix):
+                break
+            host_names.add(host_name)
+        return self._ordered(host_names)
+
+    def _ordered(self, host_names: set[str]) -> list[BIHostData]:
+        return [self._hosts[name] for name in sorted(host_names, key=self._positions.__getitem__)]
+
+
+def _required_labels(label_groups: LabelGroups) -> Iterator[tuple[str, str]]:
+    # Labels can only be required if no "or" operator allows to skip them
+    if any(group_operator == "or" for group_operator, _label_group in label_groups):
+        return
+    for group_operator, label_group in label_groups:
+        if group_operator != "and" or any(operator == "or" for operator, _label in label_group):
+            continue
+        for operator, label in label_group:
+            if operator == "and" and label.count(":") == 1:
+                key, value = label.split(":")
+                yield key, value
+
+
+def _literal_prefix(pattern: str) -> str:
+    """The prefix every host name matching the regex pattern starts with"""
+    if "|" in pattern:
+        return ""
+    prefix: list[str] = []
+    for char in pattern:
+        if char in ".^$*+?{}[]()\\":
+            if char in "*?{" and prefix:
+                # The last character is optional
+                prefix.pop()
+            break
+        prefix.append(char)
+    return "".join(prefix)
+
+
 class BISearcher(ABCBISearcher):
-    def set_hosts(self, hosts: dict[str, BIHostData]) -> None:
+    def __init__(self) -> None:
+        super().__init__()
+        self._host_index: _BIHostIndex | None = None
+        self._dependencies: BIHostDependencies | None = None
+
+    @contextmanager
+    def record_dependencies(self) -> Iterator[BIHostDependencies]:
+        """Record the hosts the searches and lookups within this context depend on"""
+        hosts = self.hosts
+        dependencies = BIHostDependencies()
+        self.hosts = _RecordingHosts(hosts, dependencies)
+        self._dependencies = dependencies
+        try:
+            yield dependencies
+        finally:
+            self.hosts = hosts
+            self._dependencies = None
+
+    def _depends_on_all_hosts(self) -> None:
+        if self._dependencies is not None:
+            self._dependencies.all_hosts = True
+
+    def _depends_on_host_index(self, candidates: Iterable[BIHostData]) -> None:
+        if self._dependencies is not None:
+            self._dependencies.host_index = True
+            self._dependencies.host_names.update(host.name for host in candidates)
+
+    def set_hosts(self, hosts: Mapping[str, BIHostData]) -> None:
         self.cleanup()
         # The key may be a pattern / regex, so `str` is the correct type for the key.
         self.hosts = hosts
@@ -43,13 +215,27 @@ class BISearcher(ABCBISearcher):
         # Note: Do not call clear() on hosts
         #       This would clear the reference we've got on set_hosts
         self.hosts = {}
+        self._host_index = None
         self._host_regex_match_cache.clear()
         self._host_regex_miss_cache.clear()
 
+    def _get_host_index(self) -> _BIHostIndex:
+        if self._host_index is None:
+            self._host_index = _BIHostIndex(self.hosts)
+        return self._host_index
+
     @override
     def search_hosts(self, conditions: dict) -> list[BIHostSearchMatch]:
+        candidates = self._get_host_index().candidates(conditions)
+        if candidates is None:
+            if conditions["host_choice"]["type"] != "host_name_regex":
+                # A host name regex records the hosts it looks at on its own
+                self._depends_on_all_hosts()
+        else:
+            self._depends_on_host_index(candidates)
         hosts, matched_re_groups = self.filter_host_choice(
-            list(self.hosts.values()), conditions["host_choice"]
+            list(self.hosts.values()) if candidates is None else candidates,
+            conditions["host_choice"],
         )
         matched_hosts = self.filter_host_folder(hosts, conditions["host_folder"])
         matched_hosts = self.filter_host_tags(matched_hosts, conditions["host_tags"])
@@ -83,6 +269,8 @@ class BISearcher(ABCBISearcher):
         pattern: str,
     ) -> tuple[list[BIHostData], dict]:
         if pattern == "(.*)":
+            if len(hosts) == len(self.hosts):
+                self._depends_on_all_hosts()
             return hosts, self._host_match_groups(hosts)
 
         is_regex_match = any(map(lambda x: x in pattern, ["(", ")", "*", "$", "|", "[", "]"]))
@@ -97,6 +285,16 @@ class BISearcher(ABCBISearcher):
         if not pattern_with_anchor.endswith("$"):
             pattern_with_anchor += "$"
 
+        if prefix := _literal_prefix(pattern):
+            if len(hosts) == len(self.hosts):
+                # All hosts are searched, the candidates can be taken from the index
+                hosts = self._get_host_index().with_name_prefix(prefix)
+                self._depends_on_host_index(hosts)
+            else:
+                hosts = [host for host in hosts if host.name.startswith(prefix)]
+        elif len(hosts) == len(self.hosts):
+            self._depends_on_all_hosts()
+
         matched_hosts = []
         matched_re_groups = {}
         regex_pattern = regex(pattern_with_anchor)
@@ -6,20 +6,23 @@
 from __future__ import annotations
 
 import ast
+import hashlib
 import pickle
 import re
 import shutil
+import sqlite3
 import uuid
-from collections.abc import Generator
-from contextlib import contextmanager
+from collections.abc import Collection, Generator, Mapping
+from contextlib import closing, contextmanager
 from pathlib import Path
-from typing import Final, NewType
+from typing import Final, NamedTuple, NewType
 
 from redis import Redis
 
 from cmk.bi.aggregation import BIAggregation
 from cmk.bi.filesystem import BIFileSystem, BIFileSystemCache, BIFileSystemVar
-from cmk.bi.trees import BICompiledAggregation
+from cmk.bi.searcher import BIHostDependencies
+from cmk.bi.trees import BICompiledAggregation, BICompiledRule
 from cmk.ccc import store
 
 # The actual uuid value that is used here is arbitrary. The most important thing is that this
@@ -99,6 +102,166 @@ class FrozenAggregationStore:
         )
 
 
+_BRANCH_INDEX_SCHEMA: Final = """
+CREATE TABLE branches (
+    aggr_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    identifier TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (aggr_id, title)
+);
+CREATE INDEX branches_title ON branches (title);
+CREATE TABLE elements (
+    host_name TEXT NOT NULL,
+    service_description TEXT,
+    aggr_id TEXT NOT NULL,
+    title TEXT NOT NULL
+);
+CREATE INDEX elements_host ON elements (host_name, service_description);
+"""
+
+
+class BranchIndex:
+    """Index of the compiled branches by aggregation ID, branch title, host and service
+
+    Each branch is pickled as an aggregation of its own, so it can be loaded without loading
+    and rebuilding all compiled aggregations from their schema.
+    """
+
+    def __init__(self, fs_cache: BIFileSystemCache) -> None:
+        self.fs_cache = fs_cache
+
+    def exists(self) -> bool:
+        return self.fs_cache.branch_index.exists()
+
+    def update(
+        self,
+        compiled_aggregations: Mapping[str, BICompiledAggregation],
+        unchanged_aggr_ids: Collection[str] = (),
+    ) -> None:
+        """Index the given aggregations
+
+        The stored branches of the aggregations in unchanged_aggr_ids are not written again,
+        nor are the branches of other aggregations which did not change.
+        """
+        self.fs_cache.compiled_branches.mkdir(parents=True, exist_ok=True)
+        stored_digests = self._load_digests()
+        branches = []
+        elements: list[tuple[str, str | None, str, str]] = []
+        for aggr_id, compiled_aggregation in compiled_aggregations.items():
+            for branch in compiled_aggregation.branches:
+                title = branch.properties.title
+                identifier = generate_identifier(f"{aggr_id}\t{title}")
+                path = self.fs_cache.compiled_branches / identifier
+                stored_digest = stored_digests.get(identifier)
+                if aggr_id in unchanged_aggr_ids and stored_digest and path.exists():
+                    digest = stored_digest
+                else:
+                    data = pickle.dumps(_single_branch_aggregation(compiled_aggregation, branch))
+                    digest = hashlib.sha256(data).hexdigest()
+                    if digest != stored_digest or not path.exists():
+                        store.save_bytes_to_file(path, data)
+                branches.append((aggr_id, title, identifier, digest))
+                elements.extend(
+                    (element.host_name, element.service_description, aggr_id, title)
+                    for element in branch.required_elements()
+                )
+
+        # Readers must never see a partially written index
+        new_index = self.fs_cache.branch_index.with_suffix(".new")
+        new_index.unlink(missing_ok=True)
+        with closing(sqlite3.connect(new_index)) as connection, connection:
+            connection.executescript(_BRANCH_INDEX_SCHEMA)
+            connection.executemany("INSERT INTO branches VALUES (?, ?, ?, ?)", branches)
+            connection.executemany("INSERT INTO elements VALUES (?, ?, ?, ?)", elements)
+        new_index.replace(self.fs_cache.branch_index)
+
+        current_identifiers = {identifier for _aggr_id, _title, identifier, _digest in branches}
+        for path in self.fs_cache.compiled_branches.iterdir():
+            if path.name not in current_identifiers:
+                path.unlink(missing_ok=True)
+
+    def _load_digests(self) -> dict[str, str]:
+        """The digests of the currently stored branches by their identifier"""
+        if not self.exists():
+            return {}
+        try:
+            with closing(sqlite3.connect(self.fs_cache.branch_index)) as connection:
+                return dict(connection.execute("SELECT identifier, digest FROM branches"))
+        except sqlite3.Error:
+            # E.g. an index written before the digests were added
+            return {}
+
+    def find(
+        self,
+        *,
+        aggr_ids: Collection[str] = (),
+        branch_titles: Collection[str] = (),
+        hosts: Collection[str] = (),
+        services: Collection[tuple[str, str]] = (),
+    ) -> list[tuple[str, str]]:
+        """Find the branches matching all of the given criteria"""
+        conditions = []
+        parameters: list[str] = []
+        if aggr_ids:
+            conditions.append(f"aggr_id IN ({', '.join('?' * len(aggr_ids))})")
+            parameters.extend(aggr_ids)
+        if branch_titles:
+            conditions.append(f"title IN ({', '.join('?' * len(branch_titles))})")
+            parameters.extend(branch_titles)
+        if hosts:
+            conditions.append(
+                "(aggr_id, title) IN (SELECT aggr_id, title FROM elements"
+                f" WHERE host_name IN ({', '.join('?' * len(hosts))}))"
+            )
+            parameters.extend(hosts)
+        if services:
+            conditions.append(
+                "(aggr_id, title) IN (SELECT aggr_id, title FROM elements"
+                f" WHERE (host_name, service_description) IN"
+                f" (VALUES {', '.join(['(?, ?)'] * len(services))}))"
+            )
+            parameters.extend(value for service in services for value in service)
+
+        query = "SELECT aggr_id, title FROM branches"
+        if conditions:
+            query += f" WHERE {' AND '.join(conditions)}"
+        with closing(sqlite3.connect(self.fs_cache.branch_index)) as connection:
+            return [(aggr_id, title) for aggr_id, title in connection.execute(query, parameters)]
+
+    def load(self, aggregation_id: str, branch_title: str) -> BICompiledAggregation | None:
+        """Load a single branch as an aggregation containing only this branch"""
+        path = self.fs_cache.compiled_branches / generate_identifier(
+            f"{aggregation_id}\t{branch_title}"
+        )
+        aggregation = store.load_object_from_pickle_file(path, default=None)
+        return aggregation if isinstance(aggregation, BICompiledAggregation) else None
+
+
+def _single_branch_aggregation(
+    compiled_aggregation: BICompiledAggregation, branch: BICompiledRule
+) -> BICompiledAggregation:
+    aggregation = BICompiledAggregation(
+        compiled_aggregation.id,
+        [branch],
+        compiled_aggregation.computation_options,
+        compiled_aggregation.aggregation_visualization,
+        compiled_aggregation.groups,
+    )
+    aggregation.frozen_info = compiled_aggregation.frozen_info
+    return aggregation
+
+
+class CompilationFingerprints(NamedTuple):
+    """Fingerprints of the inputs of the last compilation"""
+
+    hosts: Mapping[str, str]
+    aggregations: Mapping[str, str | None]
+    # The tags, labels, folder and name of the hosts, see BIHostDependencies
+    host_matches: Mapping[str, str] = {}
+    dependencies: Mapping[str, BIHostDependencies] = {}
+
+
 class MetadataStore:
     def __init__(self, fs: BIFileSystem) -> None:
         self.fs = fs
@@ -111,6 +274,17 @@ class MetadataStore:
             return float(self.fs.cache.last_compilation.read_text())
         return 0.0
 
+    def update_compilation_fingerprints(self, fingerprints: CompilationFingerprints) -> None:
+        store.save_bytes_to_file(self.fs.cache.compilation_fingerprints, pickle.dumps(fingerprints))
+
+    def get_compilation_fingerprints(self) -> CompilationFingerprints:
+        fingerprints = store.load_object_from_pickle_file(
+            self.fs.cache.compilation_fingerprints, default=None
+        )
+        if isinstance(fingerprints, CompilationFingerprints):
+            return fingerprints
+        return CompilationFingerprints({}, {})
+
     def get_last_config_change(self) -> float:
         # NOTE: we are looking for the latest change in the config itself and all the configurations
         # hosted in the `multisite.d` directory.
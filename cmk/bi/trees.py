@@ -5,7 +5,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from typing import Any, Literal, NamedTuple, NotRequired, override, TypedDict
 
 from marshmallow import pre_dump
@@ -410,14 +410,22 @@ class BICompiledRule(ABCBICompiledNode):
         bi_status_fetcher: ABCBIStatusFetcher,
         use_assumed: bool = False,
     ) -> NodeResultBundle | None:
-        bundled_results = [
-            bundle
-            for bundle in [
+        return self.aggregate_results(
+            [
                 node.compute(computation_options, bi_status_fetcher, use_assumed)
                 for node in self.nodes
-            ]
-            if bundle is not None
-        ]
+            ],
+            computation_options,
+            use_assumed,
+        )
+
+    def aggregate_results(
+        self,
+        node_results: Iterable[NodeResultBundle | None],
+        computation_options: BIAggregationComputationOptions,
+        use_assumed: bool = False,
+    ) -> NodeResultBundle | None:
+        bundled_results = [bundle for bundle in node_results if bundle is not None]
         if not bundled_results:
             return None
         actual_result = self._process_node_compute_result(
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""The plug-in manifest tells where to find the plug-ins without importing all of them
+
+It is written when the configuration is activated. Helpers processing a single host
+can use it to import only the modules of the plug-ins that the host actually uses.
+"""
+
+import json
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from cmk.checkengine.plugins import (
+    AgentBasedPlugins,
+    CheckPluginName,
+    LegacyPluginLocation,
+    ParsedSectionName,
+    SectionPlugin,
+)
+from cmk.discover_plugins import PluginLocation
+from cmk.utils.rulesets import RuleSetName
+
+from .plugin_index import PluginIndex
+from .utils import extract_known_discovery_rulesets
+
+_MANIFEST_FILE_NAME = "plugin_manifest.json"
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    location: PluginLocation | LegacyPluginLocation
+    # The parsed sections a check or inventory plug-in subscribes to,
+    # or the one parsed section created by a section plug-in.
+    sections: Sequence[ParsedSectionName]
+
+    def serialize(self) -> Mapping[str, object]:
+        return {
+            **(
+                {"legacy": self.location.file_name}
+                if isinstance(self.location, LegacyPluginLocation)
+                else {"location": str(self.location)}
+            ),
+            "sections": [str(s) for s in self.sections],
+        }
+
+    @classmethod
+    def deserialize(cls, raw: Mapping[str, object]) -> "ManifestEntry":
+        return cls(
+            location=(
+                LegacyPluginLocation(str(raw["legacy"]))
+                if "legacy" in raw
+                else PluginLocation.from_str(str(raw["location"]))
+            ),
+            sections=[ParsedSectionName(str(s)) for s in _as_list(raw["sections"])],
+        )
+
+
+@dataclass(frozen=True)
+class PluginManifest:
+    discovery_rulesets: Collection[RuleSetName]
+    sections: Mapping[str, ManifestEntry]
+    check_plugins: Mapping[CheckPluginName, ManifestEntry]
+    inventory_plugins: Mapping[str, ManifestEntry]
+
+    def plugin_index(
+        self, check_plugin_names: Iterable[CheckPluginName], *, inventory: bool
+    ) -> PluginIndex:
+        """Return where to find the given plug-ins and the sections they need
+
+        Raises a KeyError for check plug-ins that are not part of the manifest.
+        """
+        consumers = [
+            *(self.check_plugins[name] for name in check_plugin_names),
+            *(self.inventory_plugins.values() if inventory else ()),
+        ]
+        parsed_section_names = {s for consumer in consumers for s in consumer.sections}
+        entries = [
+            *consumers,
+            *(e for e in self.sections.values() if e.sections[0] in parsed_section_names),
+        ]
+        return PluginIndex(
+            legacy=sorted(
+                {
+                    e.location.file_name
+                    for e in entries
+                    if isinstance(e.location, LegacyPluginLocation)
+                }
+            ),
+            locations=sorted(
+                {e.location for e in entries if isinstance(e.location, PluginLocation)},
+                key=lambda l: (l.module, l.name),
+            ),
+        )
+
+
+def make_manifest_file(config_path: Path) -> Path:
+    return Path(config_path, _MANIFEST_FILE_NAME)
+
+
+def load_plugin_manifest(config_path: Path) -> PluginManifest:
+    raw = json.loads(make_manifest_file(config_path).read_text())
+    return PluginManifest(
+        discovery_rulesets=[RuleSetName(r) for r in raw["discovery_rulesets"]],
+        sections={name: ManifestEntry.deserialize(e) for name, e in raw["sections"].items()},
+        check_plugins={
+            CheckPluginName(name): ManifestEntry.deserialize(e)
+            for name, e in raw["check_plugins"].items()
+        },
+        inventory_plugins={
+            name: ManifestEntry.deserialize(e) for name, e in raw["inventory_plugins"].items()
+        },
+    )
+
+
+def create_plugin_manifest(plugins: AgentBasedPlugins) -> str:
+    sections: list[SectionPlugin] = [
+        *plugins.agent_sections.values(),
+        *plugins.snmp_sections.values(),
+    ]
+    raw = {
+        "discovery_rulesets": sorted(str(r) for r in extract_known_discovery_rulesets(plugins)),
+        "sections": {
+            str(s.name): ManifestEntry(s.location, [s.parsed_section_name]).serialize()
+            for s in sections
+            if s.location is not None
+        },
+        "check_plugins": {
+            str(p.name): ManifestEntry(p.location, p.sections).serialize()
+            for p in plugins.check_plugins.values()
+        },
+        "inventory_plugins": {
+            str(p.name): ManifestEntry(p.location, p.sections).serialize()
+            for p in plugins.inventory_plugins.values()
+        },
+    }
+    return json.dumps(raw)
+
+
+def _as_list(raw: object) -> list[object]:
+    if not isinstance(raw, list):
+        raise TypeError(raw)
+    return raw
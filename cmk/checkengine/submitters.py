@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import abc
 import os
+import select
 import time
 from collections.abc import Iterable, Iterator
 from contextlib import contextmanager
@@ -19,7 +20,7 @@ from cmk.ccc import tty
 from cmk.ccc.exceptions import MKGeneralException
 from cmk.ccc.hostaddress import HostName
 from cmk.ccc.timeout import Timeout
-from cmk.checkengine.checkresults import ServiceCheckResult
+from cmk.checkengine.checkresults import ActiveCheckResult, ServiceCheckResult
 from cmk.utils.log import console
 from cmk.utils.servicename import ServiceName
 
@@ -29,6 +30,9 @@ ServiceState = int
 ServiceDetails = str
 ServiceAdditionalDetails = str
 
+# Writes up to this size are not interleaved with the writes of other processes
+_PIPE_BUF: Final = select.PIPE_BUF
+
 
 def _sanitize_perftext(
     result: ServiceCheckResult, perfdata_format: Literal["pnp", "standard"]
@@ -123,6 +127,39 @@ class FormattedSubmittee:
     pending: bool
 
 
+@dataclass
+class SubmissionStats:
+    writes: int = 0
+    duration: float = 0.0
+
+    def as_result(self) -> ActiveCheckResult:
+        return ActiveCheckResult(
+            metrics=(
+                f"cmk_submission_writes={self.writes}",
+                f"cmk_time_submission={self.duration:.3f}",
+            )
+        )
+
+
+def _batch_commands(commands: Iterable[bytes], size: int) -> Iterator[bytes]:
+    """Join the commands to chunks of the given size
+
+    Commands are never split. A command larger than the size makes up a chunk
+    of its own.
+
+    >>> list(_batch_commands([b"a\\n", b"bb\\n", b"c\\n", b"ddddd\\n"], 5))
+    [b'a\\nbb\\n', b'c\\n', b'ddddd\\n']
+    """
+    batch = bytearray()
+    for command in commands:
+        if batch and len(batch) + len(command) > size:
+            yield bytes(batch)
+            batch.clear()
+        batch += command
+    if batch:
+        yield bytes(batch)
+
+
 class Submitter(abc.ABC):
     def __init__(
         self,
@@ -134,6 +171,7 @@ class Submitter(abc.ABC):
         self.host_name: Final = host_name
         self.perfdata_format: Final = perfdata_format
         self.show_perfdata: Final = show_perfdata
+        self.stats: Final = SubmissionStats()
 
     @final
     def submit(self, submittees: Iterable[Submittee]) -> None:
@@ -152,7 +190,9 @@ class Submitter(abc.ABC):
             _output_check_result(submittee, show_perfdata=self.show_perfdata)
 
         if formatted_submittees:
+            start = time.monotonic()
             self._submit(s for s in formatted_submittees if not s.pending)
+            self.stats.duration += time.monotonic() - start
 
     @abc.abstractmethod
     def _submit(self, formatted_submittees: Iterable[FormattedSubmittee]) -> None: ...
@@ -199,18 +239,27 @@ class PipeSubmitter(Submitter):
         if not (pipe := PipeSubmitter._open_command_pipe()):
             return
 
-        for submittee in formatted_submittees:
-            msg = "[%d] PROCESS_SERVICE_CHECK_RESULT;%s;%s;%d;%s\n" % (
-                time.time(),
-                self.host_name,
-                submittee.name,
-                submittee.state,
-                submittee.details.replace("\n", "\\n"),
-            )
-            pipe.write(msg.encode())
-            # Important: Nagios needs the complete command in one single write() block!
-            # Python buffers and sends chunks of 4096 bytes, if we do not flush.
+        now = time.time()
+        commands = (
+            (
+                "[%d] PROCESS_SERVICE_CHECK_RESULT;%s;%s;%d;%s\n"
+                % (
+                    now,
+                    self.host_name,
+                    submittee.name,
+                    submittee.state,
+                    submittee.details.replace("\n", "\\n"),
+                )
+            ).encode()
+            for submittee in formatted_submittees
+        )
+        # Important: Nagios needs every command complete in one single write() block!
+        # Python buffers and sends chunks of 4096 bytes, if we do not flush. Writes of
+        # up to PIPE_BUF bytes are atomic, so we send as many commands as fit into that.
+        for batch in _batch_commands(commands, _PIPE_BUF):
+            pipe.write(batch)
             pipe.flush()
+            self.stats.writes += 1
 
 
 class _RandomNameSequence:
@@ -247,25 +296,33 @@ class FileSubmitter(Submitter):
     def _submit(self, formatted_submittees: Iterable[FormattedSubmittee]) -> None:
         now = time.time()
 
+        results = "".join(
+            self._format_check_result(submittee, now) for submittee in formatted_submittees
+        ).encode()
+
         with self._open_checkresult_file() as fd:
-            for submittee in formatted_submittees:
-                output = submittee.details.replace("\n", "\\n")
-                os.write(
-                    fd,
-                    (
-                        f"host_name={self.host_name}\n"
-                        f"service_description={submittee.name}\n"
-                        "check_type=1\n"
-                        "check_options=0\n"
-                        "reschedule_check\n"
-                        "latency=0.0\n"
-                        f"start_time={now:.1f}\n"
-                        f"finish_time={now:.1f}\n"
-                        f"return_code={submittee.state}\n"
-                        f"output={output}\n"
-                        "\n"
-                    ).encode(),
-                )
+            # The core reads the file not before the .ok file is created, so there is
+            # no need to keep the results apart.
+            view = memoryview(results)
+            while view:
+                view = view[os.write(fd, view) :]
+                self.stats.writes += 1
+
+    def _format_check_result(self, submittee: FormattedSubmittee, now: float) -> str:
+        output = submittee.details.replace("\n", "\\n")
+        return (
+            f"host_name={self.host_name}\n"
+            f"service_description={submittee.name}\n"
+            "check_type=1\n"
+            "check_options=0\n"
+            "reschedule_check\n"
+            "latency=0.0\n"
+            f"start_time={now:.1f}\n"
+            f"finish_time={now:.1f}\n"
+            f"return_code={submittee.state}\n"
+            f"output={output}\n"
+            "\n"
+        )
 
     @classmethod
     @contextmanager
@@ -5,7 +5,9 @@
 
 import functools
 import re
-from collections.abc import Callable, Collection, Iterable
+from collections import defaultdict
+from collections.abc import Callable, Collection, Generator, Iterable, Iterator, Mapping
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass
 from logging import Logger
 
@@ -16,7 +18,10 @@ from cmk.ccc.tty import format_warning
 from cmk.helper_interface import FetcherError
 from cmk.snmplib import (
     get_single_oid,
+    OID,
+    prefetch_oids,
     SNMPBackend,
+    SNMPContext,
     SNMPDetectAtom,
     SNMPDetectBaseType,
     SNMPSectionName,
@@ -82,6 +87,7 @@ def _snmp_scan(
 
 
 def _prefetch_description_object(*, backend: SNMPBackend) -> None:
+    _prefetch_oids({None: (OID_SYS_DESCR, OID_SYS_OBJ)}, backend=backend)
     for oid, name in (
         (OID_SYS_DESCR, "system description"),
         (OID_SYS_OBJ, "system object"),
@@ -117,37 +123,107 @@ def _find_sections(
     on_error: OnError,
     backend: SNMPBackend,
 ) -> frozenset[SNMPSectionName]:
+    """Evaluate the detect specs of all sections at once
+
+    Every section is evaluated just like _evaluate_snmp_detection() would do it.
+    But instead of fetching the OIDs one after another, all sections are advanced
+    as far as the already known OID values allow. The OIDs they are waiting for
+    are then fetched together, and so on. The result of each detect atom is shared
+    among all sections using it.
+    """
+    single_oid_cache = snmp_cache.single_oid_cache()
+    atom_results: dict[SNMPDetectAtom, bool] = {}
+
+    def atom_result(atom: SNMPDetectAtom) -> bool | None:
+        with suppress(KeyError):
+            return atom_results[atom]
+        oid = atom[0] if atom[0].startswith(".") else f".{atom[0]}"
+        if oid not in single_oid_cache:
+            return None
+        return atom_results.setdefault(atom, _evaluate_atom(atom, single_oid_cache[oid]))
+
     found_sections: set[SNMPSectionName] = set()
-    for name, specs in sections:
-        oid_value_getter = functools.partial(
-            get_single_oid,
-            section_name=name,
-            single_oid_cache=snmp_cache.single_oid_cache(),
-            backend=backend,
-            log=backend.logger.debug,
-        )
-        try:
-            if _evaluate_snmp_detection(
-                detect_spec=specs,
-                oid_value_getter=oid_value_getter,
-            ):
-                found_sections.add(name)
-        except MKTimeout:
-            raise
-        except MKGeneralException:
-            # some error messages which we explicitly want to show to the user
-            # should be raised through this
-            raise
-        except Exception:
-            if on_error is OnError.RAISE:
-                raise
-            if on_error is OnError.WARN:
-                backend.logger.warning(
-                    format_warning(f"   Exception in SNMP scan function of {name}")
+    pending = {name: _detection(specs, atom_result) for name, specs in sections}
+    while pending:
+        waiting_for: dict[SNMPSectionName, OID] = {}
+        for name, detection in pending.items():
+            with _section_errors(name, on_error=on_error, logger=backend.logger):
+                try:
+                    waiting_for[name] = next(detection)
+                except StopIteration as stop:
+                    if stop.value:
+                        found_sections.add(name)
+
+        # Sections having their own SNMP contexts are left to get_single_oid()
+        prefetch: dict[SNMPSectionName | None, set[OID]] = defaultdict(set)
+        for name, oid in waiting_for.items():
+            prefetch[name if backend.config.snmpv3_contexts_of(name).section else None].add(oid)
+        _prefetch_oids(prefetch, backend=backend)
+
+        still_pending = {}
+        for name, oid in waiting_for.items():
+            with _section_errors(name, on_error=on_error, logger=backend.logger):
+                get_single_oid(
+                    oid,
+                    section_name=name,
+                    single_oid_cache=single_oid_cache,
+                    backend=backend,
+                    log=backend.logger.debug,
                 )
+                still_pending[name] = pending[name]
+        pending = still_pending
     return frozenset(found_sections)
 
 
+def _prefetch_oids(
+    oids_by_section: Mapping[SNMPSectionName | None, Iterable[OID]], *, backend: SNMPBackend
+) -> None:
+    for section_name, oids in oids_by_section.items():
+        # With multiple contexts the first answer wins, which is up to get_single_oid()
+        match backend.config.snmpv3_contexts_of(section_name).contexts:
+            case [SNMPContext() as context]:
+                prefetch_oids(
+                    oids,
+                    context=context,
+                    single_oid_cache=snmp_cache.single_oid_cache(),
+                    backend=backend,
+                    log=backend.logger.debug,
+                )
+
+
+@contextmanager
+def _section_errors(name: SNMPSectionName, *, on_error: OnError, logger: Logger) -> Iterator[None]:
+    try:
+        yield
+    except MKTimeout:
+        raise
+    except MKGeneralException:
+        # some error messages which we explicitly want to show to the user
+        # should be raised through this
+        raise
+    except Exception:
+        if on_error is OnError.RAISE:
+            raise
+        if on_error is OnError.WARN:
+            logger.warning(format_warning(f"   Exception in SNMP scan function of {name}"))
+
+
+def _detection(
+    detect_spec: SNMPDetectBaseType,
+    atom_result: Callable[[SNMPDetectAtom], bool | None],
+) -> Generator[OID, None, bool]:
+    """Evaluate a SNMP detection specification, yielding the OIDs that are not known yet"""
+    for alternative in detect_spec:
+        for atom in alternative:
+            while (result := atom_result(atom)) is None:
+                yield atom[0]
+            if not result:
+                break
+        else:
+            return True
+    return False
+
+
 def _evaluate_snmp_detection(
     *,
     detect_spec: SNMPDetectBaseType,
@@ -158,23 +234,21 @@ def _evaluate_snmp_detection(
     Return True if and and only if at least all conditions in one "line" are True
     """
 
-    def _impl(
-        atom: SNMPDetectAtom,
-        oid_value_getter: Callable[[str], str | None],
-    ) -> bool:
-        oid, pattern, flag = atom
-        value = oid_value_getter(oid)
-        if value is None:
-            # check for "not_exists"
-            return pattern == ".*" and not flag
-        # ignore case!
-        return bool(_regex_cache(pattern, re.IGNORECASE | re.DOTALL).fullmatch(value)) is flag
-
     return any(
-        all(_impl(atom, oid_value_getter) for atom in alternative) for alternative in detect_spec
+        all(_evaluate_atom(atom, oid_value_getter(atom[0])) for atom in alternative)
+        for alternative in detect_spec
     )
 
 
+def _evaluate_atom(atom: SNMPDetectAtom, value: str | None) -> bool:
+    _oid, pattern, flag = atom
+    if value is None:
+        # check for "not_exists"
+        return pattern == ".*" and not flag
+    # ignore case!
+    return bool(_regex_cache(pattern, re.IGNORECASE | re.DOTALL).fullmatch(value)) is flag
+
+
 @functools.cache
 def _regex_cache(pattern: str, flags: int) -> re.Pattern[str]:
     """
@@ -4,7 +4,7 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import subprocess
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from typing import assert_never, Literal, TypeAlias
 
 from cmk.ccc import tty
@@ -18,6 +18,9 @@ __all__ = ["ClassicSNMPBackend"]
 
 CommandType: TypeAlias = Literal["snmpget", "snmpgetnext", "snmpwalk"]
 
+# Keep the response of a single snmpget well below the usual maximum message size
+_MAX_OIDS_PER_GET = 32
+
 
 def _sanitize_tuple(tuple_: object) -> str:
     """For the snmp credentials, we don't want to print secrets...
@@ -85,12 +88,7 @@ class ClassicSNMPBackend(SNMPBackend):
         item = parts[0]
         value = parts[1].strip()
         self._logger.debug(f"SNMP answer: ==> [{value}]")
-        if (
-            value.startswith("No more variables")
-            or value.startswith("End of MIB")
-            or value.startswith("No Such Object available")
-            or value.startswith("No Such Instance currently exists")
-        ):
+        if _is_error_value(value):
             return None
 
         # In case of .*, check if prefix is the one we are looking for
@@ -99,6 +97,70 @@ class ClassicSNMPBackend(SNMPBackend):
 
         return strip_snmp_value(value)
 
+    def get_many(
+        self, /, oids: Sequence[OID], *, context: SNMPContext
+    ) -> Mapping[OID, SNMPRawValue | None]:
+        # GETNEXT requests can not be combined: We would not know which answer
+        # belongs to which request.
+        values = {oid: self.get(oid, context=context) for oid in oids if oid.endswith(".*")}
+        plain_oids = [oid for oid in oids if not oid.endswith(".*")]
+        for start in range(0, len(plain_oids), _MAX_OIDS_PER_GET):
+            values.update(
+                self._get_chunk(plain_oids[start : start + _MAX_OIDS_PER_GET], context=context)
+            )
+        return values
+
+    def _get_chunk(
+        self, oids: Sequence[OID], *, context: SNMPContext
+    ) -> Mapping[OID, SNMPRawValue | None]:
+        protospec = self._snmp_proto_spec()
+        ipaddress = self.config.ipaddress or "0.0.0.0"
+        if self.config.is_ipv6_primary:
+            ipaddress = "[" + ipaddress + "]"
+        portspec = self._snmp_port_spec()
+        command = self._snmp_base_command("snmpget", context) + [
+            "-On",
+            "-OQ",
+            "-Oe",
+            "-Ot",
+            f"{protospec}{ipaddress}{portspec}",
+            *oids,
+        ]
+
+        self._logger.debug(f"Running '{subprocess.list2cmdline(command)}'")
+
+        with subprocess.Popen(
+            command,
+            close_fds=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+        ) as snmp_process:
+            assert snmp_process.stdout
+            assert snmp_process.stderr
+            try:
+                answers = list(_iter_answers(snmp_process.stdout))
+                error = snmp_process.stderr.read()
+            except MKTimeout:
+                snmp_process.kill()
+                raise
+
+        # snmpget retries without the failed OIDs (e.g. on noSuchName with SNMPv1)
+        # and still exits with an error, so we use what we got anyway. OIDs without
+        # an answer are left out and fetched one by one by the caller.
+        if snmp_process.returncode:
+            self._logger.debug(f"{tty.red}{tty.bold}ERROR: {tty.normal}SNMP error: {error.strip()}")
+
+        requested = set(oids)
+        values: dict[OID, SNMPRawValue | None] = {}
+        for oid, value in answers:
+            if oid not in requested:
+                continue
+            self._logger.debug(f"SNMP answer: {oid} ==> [{value}]")
+            values[oid] = None if _is_error_value(value) else strip_snmp_value(value)
+        return values
+
     def walk(
         self,
         /,
@@ -145,44 +207,12 @@ class ClassicSNMPBackend(SNMPBackend):
         return rowinfo
 
     def _get_rowinfo_from_walk_output(self, lines: Iterable[str]) -> SNMPRowInfo:
-        # Ugly(1): in some cases snmpwalk inserts line feed within one
-        # dataset. This happens for example on hexdump outputs longer
-        # than a few bytes. Those dumps are enclosed in double quotes.
-        # So if the value begins with a double quote, but the line
-        # does not end with a double quote, we take the next line(s) as
-        # a continuation line.
-        rowinfo = []
-        line_iter = iter(lines)
-        while True:
-            try:
-                line = next(line_iter).strip()
-            except StopIteration:
-                break
-
-            parts = line.split("=", 1)
-            if len(parts) < 2:
-                continue  # broken line, must contain =
-            oid = parts[0].strip()
-            value = parts[1].strip()
+        return [
+            (oid, strip_snmp_value(value))
+            for oid, value in _iter_answers(lines)
             # Filter out silly error messages from snmpwalk >:-P
-            if (
-                value.startswith("No more variables")
-                or value.startswith("End of MIB")
-                or value.startswith("No Such Object available")
-                or value.startswith("No Such Instance currently exists")
-            ):
-                continue
-
-            if value == '"' or (
-                len(value) > 1 and value[0] == '"' and (value[-1] != '"')
-            ):  # to be continued
-                while True:  # scan for end of this dataset
-                    nextline = next(line_iter).strip()
-                    value += " " + nextline
-                    if value[-1] == '"':
-                        break
-            rowinfo.append((oid, strip_snmp_value(value)))
-        return rowinfo
+            if not _is_error_value(value)
+        ]
 
     def _snmp_proto_spec(self) -> str:
         if self.config.is_ipv6_primary:
@@ -302,6 +332,48 @@ class ClassicSNMPBackend(SNMPBackend):
         return command + options
 
 
+def _iter_answers(lines: Iterable[str]) -> Iterator[tuple[OID, str]]:
+    # Ugly(1): in some cases snmpwalk inserts line feed within one
+    # dataset. This happens for example on hexdump outputs longer
+    # than a few bytes. Those dumps are enclosed in double quotes.
+    # So if the value begins with a double quote, but the line
+    # does not end with a double quote, we take the next line(s) as
+    # a continuation line.
+    line_iter = iter(lines)
+    while True:
+        try:
+            line = next(line_iter).strip()
+        except StopIteration:
+            break
+
+        parts = line.split("=", 1)
+        if len(parts) < 2:
+            continue  # broken line, must contain =
+        oid = parts[0].strip()
+        value = parts[1].strip()
+
+        if value == '"' or (len(value) > 1 and value[0] == '"' and (value[-1] != '"')):
+            # to be continued
+            while True:  # scan for end of this dataset
+                try:
+                    nextline = next(line_iter).strip()
+                except StopIteration:
+                    return  # truncated output
+                value += " " + nextline
+                if value[-1] == '"':
+                    break
+        yield oid, value
+
+
+def _is_error_value(value: str) -> bool:
+    return (
+        value.startswith("No more variables")
+        or value.startswith("End of MIB")
+        or value.startswith("No Such Object available")
+        or value.startswith("No Such Instance currently exists")
+    )
+
+
 def _auth_proto_for(proto_name: str) -> str:
     if proto_name in {"md5", "sha", "SHA-224", "SHA-256", "SHA-384", "SHA-512"}:
         return proto_name
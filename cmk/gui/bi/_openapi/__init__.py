@@ -311,7 +311,6 @@ def bi_aggregation_state_get(params: Mapping[str, Any]) -> Response:
 def _aggregation_state(
     filter_names: list[str] | None = None, filter_groups: list[str] | None = None
 ) -> dict[str, object]:
-    bi_manager = BIManager()
     bi_aggregation_filter = BIAggregationFilter(
         [],
         [],
@@ -320,6 +319,7 @@ def _aggregation_state(
         filter_groups or [],
         [],
     )
+    bi_manager = BIManager(bi_aggregation_filter)
 
     def collect_infos(
         node_result_bundle: NodeResultBundle, is_single_host_aggregation: bool
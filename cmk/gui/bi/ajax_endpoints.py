@@ -55,8 +55,6 @@ def ajax_render_tree(config: Config) -> None:
     only_problems = bool(request.var("only_problems"))
     show_frozen_difference = bool(request.var("show_frozen_difference"))
 
-    bi_manager = BIManager()
-    bi_manager.status_fetcher.set_assumed_states(user.bi_assumptions)
     aggregation_id = request.get_str_input_mandatory("aggregation_id")
     bi_aggregation_filter = BIAggregationFilter(
         [],
@@ -66,6 +64,8 @@ def ajax_render_tree(config: Config) -> None:
         [aggr_group] if aggr_group is not None else [],
         [],
     )
+    bi_manager = BIManager(bi_aggregation_filter)
+    bi_manager.status_fetcher.set_assumed_states(user.bi_assumptions)
     row = bi_manager.computer.compute_legacy_result_for_filter(bi_aggregation_filter)[0]
     if show_frozen_difference:
         row, _aggregations_are_equal = convert_tree_to_frozen_diff_tree(row)
@@ -9,10 +9,10 @@ from pathlib import Path
 from livestatus import LivestatusResponse, Query
 
 from cmk.bi.compiler import BICompiler
-from cmk.bi.computer import BIComputer
+from cmk.bi.computer import BIAggregationFilter, BIComputer, BIResultCache
 from cmk.bi.data_fetcher import BIStatusFetcher
 from cmk.bi.lib import SitesCallback
-from cmk.bi.storage import AggregationNotFound, AggregationStore
+from cmk.bi.storage import AggregationNotFound, AggregationStore, BranchIndex
 from cmk.bi.trees import BICompiledAggregation, BICompiledRule
 from cmk.ccc.exceptions import MKGeneralException
 from cmk.ccc.site import SiteId
@@ -21,14 +21,27 @@ from cmk.gui.bi.filesystem import bi_fs
 from cmk.gui.hooks import request_memoize
 from cmk.gui.i18n import _
 
+# Node results are kept across requests, only changed host states trigger a recomputation
+_result_cache = BIResultCache()
+
 
 class BIManager:
-    def __init__(self) -> None:
+    def __init__(self, bi_aggregation_filter: BIAggregationFilter | None = None) -> None:
+        """Only the branches possibly matching bi_aggregation_filter are loaded, if given"""
         sites_callback = SitesCallback(all_sites_with_id_and_online, bi_livestatus_query, _)
         self.compiler = BICompiler(self.bi_configuration_file(), sites_callback)
-        self.compiler.load_compiled_aggregations()
+        if bi_aggregation_filter is None or not self.compiler.load_compiled_branches(
+            aggr_ids=bi_aggregation_filter.aggr_ids,
+            branch_titles=bi_aggregation_filter.aggr_titles,
+            hosts=bi_aggregation_filter.hosts,
+            services=bi_aggregation_filter.services,
+        ):
+            self.compiler.load_compiled_aggregations()
         self.status_fetcher = BIStatusFetcher(sites_callback)
-        self.computer = BIComputer(self.compiler.compiled_aggregations, self.status_fetcher)
+        _result_cache.set_generation(self.compiler.get_last_compilation())
+        self.computer = BIComputer(
+            self.compiler.compiled_aggregations, self.status_fetcher, _result_cache
+        )
 
     @classmethod
     def bi_configuration_file(cls) -> Path:
@@ -58,7 +71,9 @@ def bi_livestatus_query(
 
 @request_memoize(maxsize=10000)
 def load_compiled_branch(aggr_id: str, branch_title: str) -> BICompiledRule:
-    if compiled_aggregation := _load_compiled_aggregation(aggr_id):
+    if (compiled_aggregation := BranchIndex(bi_fs.cache).load(aggr_id, branch_title)) is None:
+        compiled_aggregation = _load_compiled_aggregation(aggr_id)
+    if compiled_aggregation:
         for branch in compiled_aggregation.branches:
             if branch.properties.title == branch_title:
                 return branch
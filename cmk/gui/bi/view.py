@@ -243,7 +243,7 @@ def table(
     all_active_filters: Iterable[Filter],
 ) -> list[dict]:
     bi_aggregation_filter = compute_bi_aggregation_filter(context, all_active_filters)
-    bi_manager = BIManager()
+    bi_manager = BIManager(bi_aggregation_filter)
     bi_manager.status_fetcher.set_assumed_states(user.bi_assumptions)
     return bi_manager.computer.compute_legacy_result_for_filter(bi_aggregation_filter)
 
@@ -323,9 +323,9 @@ def singlehost_table(
     host_columns = [c for c in columns if c.startswith("host_")]
 
     rows = []
-    bi_manager = BIManager()
-    bi_manager.status_fetcher.set_assumed_states(user.bi_assumptions)
     bi_aggregation_filter = compute_bi_aggregation_filter(context, all_active_filters)
+    bi_manager = BIManager(bi_aggregation_filter)
+    bi_manager.status_fetcher.set_assumed_states(user.bi_assumptions)
     required_aggregations = bi_manager.computer.get_required_aggregations(bi_aggregation_filter)
     bi_manager.status_fetcher.update_states_filtered(
         filterheaders, only_sites, limit, host_columns, bygroup, required_aggregations
@@ -903,7 +903,9 @@ def convert_tree_to_frozen_diff_tree(row: Row) -> tuple[Row, bool]:
     bi_ref_aggregation, bi_ref_branch = found_aggr
 
     # Load other aggregation from disk
-    other_aggr = storage.AggregationStore(bi_fs.cache).get(other_aggregation)
+    other_aggr = storage.BranchIndex(bi_fs.cache).load(
+        other_aggregation, other_branch
+    ) or storage.AggregationStore(bi_fs.cache).get(other_aggregation)
 
     aggregations_are_equal = True
     for bi_other_branch in other_aggr.branches:
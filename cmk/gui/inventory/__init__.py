@@ -28,6 +28,7 @@ from ._tree import (
     get_raw_status_data_via_livestatus,
     InventoryPath,
     load_delta_tree,
+    load_indexed_table_rows,
     load_latest_delta_tree,
     load_tree,
     parse_internal_raw_path,
@@ -49,6 +50,7 @@ __all__ = [
     "get_history",
     "get_raw_status_data_via_livestatus",
     "load_delta_tree",
+    "load_indexed_table_rows",
     "load_latest_delta_tree",
     "load_tree",
     "parse_internal_raw_path",
@@ -488,12 +488,20 @@ def _compute_classified_history_files(
                 path=file_path, timestamp=current_timestamp
             )
 
+    # Archived trees in between may have been replaced by delta records. Then the delta
+    # cache file of the current archived tree starts at the removed predecessor.
+    delta_cache_ts_by_current_ts = {c_ts: (p_ts, c_ts) for p_ts, c_ts in delta_cache_files_by_ts}
     sorted_archive_ts = sorted(archive_file_paths_by_ts)
     bundles: dict[tuple[int, int], _File | _ArchiveBundle] = {
         (previous_timestamp, current_timestamp): _ArchiveBundle(
             previous=archive_file_paths_by_ts[previous_timestamp],
             current=archive_file_paths_by_ts[current_timestamp],
-            delta_cache=delta_cache_files_by_ts.pop((previous_timestamp, current_timestamp), None),
+            delta_cache=delta_cache_files_by_ts.pop(
+                delta_cache_ts_by_current_ts.get(
+                    current_timestamp, (previous_timestamp, current_timestamp)
+                ),
+                None,
+            ),
             timestamp=current_timestamp,
         )
         for previous_timestamp, current_timestamp in zip(sorted_archive_ts, sorted_archive_ts[1:])
@@ -16,6 +16,7 @@ from cmk.gui.openapi.restful_objects.constructors import collection_href
 from cmk.gui.openapi.restful_objects.endpoint_family import EndpointFamily, EndpointFamilyRegistry
 from cmk.gui.utils import permission_verification as permissions
 
+from ._get_inventory_tables import get_inventory_tables
 from ._get_inventory_trees import get_inventory_trees
 
 INVENTORY_FAMILY = EndpointFamily(
@@ -48,6 +49,17 @@ ENDPOINT_INVENTORY_TREES = VersionedEndpoint(
     versions={APIVersion.UNSTABLE: EndpointHandler(handler=get_inventory_trees)},
 )
 
+ENDPOINT_INVENTORY_TABLES = VersionedEndpoint(
+    metadata=EndpointMetadata(
+        path=collection_href("inventory", "tables"),
+        link_relation="cmk/list",
+        method="get",
+    ),
+    permissions=ENDPOINT_INVENTORY_TREES.permissions,
+    doc=EndpointDoc(family=INVENTORY_FAMILY.name),
+    versions={APIVersion.UNSTABLE: EndpointHandler(handler=get_inventory_tables)},
+)
+
 
 def register(
     endpoint_family_registry: EndpointFamilyRegistry,
@@ -59,3 +71,6 @@ def register(
     versioned_endpoint_registry.register(
         ENDPOINT_INVENTORY_TREES, ignore_duplicates=ignore_duplicates
     )
+    versioned_endpoint_registry.register(
+        ENDPOINT_INVENTORY_TABLES, ignore_duplicates=ignore_duplicates
+    )
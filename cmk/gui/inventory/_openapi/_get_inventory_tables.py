@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+from collections.abc import Mapping, Sequence
+from typing import Annotated, Literal
+
+from cmk.ccc.hostaddress import HostName
+from cmk.gui.openapi.framework import QueryParam
+from cmk.gui.openapi.framework.model import api_field, api_model
+from cmk.gui.openapi.framework.model.base_models import DomainObjectCollectionModel, LinkModel
+from cmk.gui.openapi.restful_objects.constructors import collection_href
+from cmk.inventory.structured_data import parse_visible_raw_path
+
+from .._tree import (
+    get_raw_status_data_via_livestatus,
+    load_indexed_table_rows,
+    load_tree,
+    verify_permission,
+)
+
+
+@api_model
+class HostInventoryTable:
+    host_name: str = api_field(
+        description="The host name",
+    )
+    rows: Sequence[Mapping[str, int | float | str | bool | None]] = api_field(
+        description="The rows of the inventory table whereas each row consists of key-value pairs"
+    )
+
+
+@api_model
+class InventoryTablesCollectionModel(DomainObjectCollectionModel):
+    domainType: Literal["inventory"] = api_field(
+        description="The domain type of the objects in the collection",
+        example="inventory",
+    )
+    value: list[HostInventoryTable] = api_field(
+        description="The rows of an HW/SW Inventory table of hosts",
+        example=[
+            {
+                "host_name": "hostname",
+                "rows": [{"name": "package", "version": "1.0"}],
+            }
+        ],
+    )
+
+
+def get_inventory_tables(
+    host_names: Annotated[
+        list[str],
+        QueryParam(
+            description="List of host names",
+            example="hostname",
+            is_list=True,
+        ),
+    ],
+    path: Annotated[
+        str,
+        QueryParam(
+            description="The path of the table in the HW/SW Inventory tree",
+            example="software.packages",
+        ),
+    ],
+) -> InventoryTablesCollectionModel:
+    """Get an HW/SW Inventory table of given hosts.
+
+    Frequently used tables like software packages or network interfaces are read from the
+    inventory index without loading the whole HW/SW Inventory trees.
+    """
+    sd_path = parse_visible_raw_path(path)
+    raw_status_data_trees = {}
+    for raw_host_name in host_names:
+        host_name = HostName(raw_host_name)
+        verify_permission(None, host_name)
+        raw_status_data_trees[host_name] = get_raw_status_data_via_livestatus(None, host_name)
+
+    indexed_rows = load_indexed_table_rows(sd_path, raw_status_data_trees)
+    value = []
+    for host_name, raw_status_data_tree in raw_status_data_trees.items():
+        if (rows := indexed_rows.get(host_name)) is None:
+            table = load_tree(
+                host_name=host_name, raw_status_data_tree=raw_status_data_tree
+            ).get_tree(sd_path)
+            rows = table.table.rows_with_retentions
+        if rows:
+            value.append(
+                HostInventoryTable(
+                    host_name=host_name,
+                    rows=[{str(k): v for k, (v, _r) in r.items()} for r in rows],
+                )
+            )
+
+    return InventoryTablesCollectionModel(
+        id="inventory_tables",
+        domainType="inventory",
+        value=value,
+        links=[LinkModel.create("self", collection_href("inventory", "tables"))],
+    )
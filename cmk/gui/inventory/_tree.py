@@ -5,7 +5,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Mapping, Sequence
 from dataclasses import dataclass
 from enum import auto, Enum
 from pathlib import Path
@@ -32,6 +32,8 @@ from cmk.inventory.structured_data import (
     HistoryStore,
     ImmutableDeltaTree,
     ImmutableTree,
+    IndexedValues,
+    InventoryIndex,
     InventoryStore,
     load_history,
     merge_trees,
@@ -256,6 +258,34 @@ def load_tree(*, host_name: HostName | None, raw_status_data_tree: bytes) -> Imm
     return merged_tree
 
 
+def load_indexed_table_rows(
+    path: SDPath, raw_status_data_trees: Mapping[HostName, bytes]
+) -> Mapping[HostName, Sequence[IndexedValues]]:
+    """Load the table rows of the given hosts from the inventory index
+
+    Hosts whose rows cannot be taken from the index are missing in the result, their trees
+    have to be loaded instead. This is the case if the host is not indexed, if its status
+    data tree has rows in this table, too, or if the user may only see parts of the trees.
+    """
+    index = InventoryIndex(cmk.utils.paths.omd_root)
+    if not index.is_indexed(path) or _get_permitted_inventory_paths() is not None:
+        return {}
+
+    return {
+        host_name: rows
+        for host_name, rows in index.query_table(
+            path, host_names=[h for h in raw_status_data_trees if h and "/" not in h]
+        ).items()
+        if not (
+            parse_from_raw_status_data_tree(raw)
+            if (raw := raw_status_data_trees[host_name])
+            else _load_tree_from_file(tree_type="status_data", host_name=host_name)
+        )
+        .get_tree(path)
+        .table
+    }
+
+
 def get_raw_status_data_via_livestatus(site: SiteId | None, host_name: HostName) -> bytes:
     query = (
         "GET hosts\nColumns: host_structured_status\nFilter: host_name = %s\n"
@@ -4,7 +4,7 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import re
-from collections.abc import Callable, Iterable, Sequence
+from collections.abc import Callable, Iterable, Mapping, Sequence
 from functools import partial
 
 from cmk.gui import query_filters
@@ -36,8 +36,9 @@ from cmk.gui.visuals.filter.components import (
     RadioButton,
     TextInput,
 )
+from cmk.inventory.structured_data import SDKey, SDNodeName, SDValue
 
-from ._tree import InventoryPath
+from ._tree import InventoryPath, load_indexed_table_rows, load_tree
 
 
 class FilterInvBool(FilterOption):
@@ -439,6 +440,8 @@ class FilterHasInv(FilterOption):
 
 
 class FilterInvHasSoftwarePackage(Filter):
+    _packages_path = (SDNodeName("software"), SDNodeName("packages"))
+
     def __init__(self) -> None:
         self._varprefix = "invswpac_host_"
         super().__init__(
@@ -458,7 +461,8 @@ class FilterInvHasSoftwarePackage(Filter):
         )
 
     def need_inventory(self, value: FilterHTTPVariables) -> bool:
-        return bool(value.get(self._varprefix + "name"))
+        # The packages are taken from the inventory index, see filter_table()
+        return False
 
     def display(self, value: FilterHTTPVariables) -> None:
         # keep this in sync with components(), remove once all filter menus are switched to vue
@@ -550,14 +554,35 @@ class FilterInvHasSoftwarePackage(Filter):
                     ),
                 )
 
+        indexed_packages = load_indexed_table_rows(
+            self._packages_path,
+            {row["host_name"]: row.get("host_structured_status", b"") for row in rows},
+        )
         new_rows = []
         for row in rows:
-            packages = row["host_inventory"].get_rows(("software", "packages"))
+            packages: Sequence[Mapping[SDKey, SDValue]] = (
+                self._load_packages(row)
+                if (indexed := indexed_packages.get(row["host_name"])) is None
+                else [{k: v for k, (v, _r) in p.items()} for p in indexed]
+            )
             is_in = self.find_package(packages, name, from_version, to_version)
             if is_in != negate:
                 new_rows.append(row)
         return new_rows
 
+    def _load_packages(self, row: Row) -> Sequence[Mapping[SDKey, SDValue]]:
+        if "host_inventory" in row:
+            return row["host_inventory"].get_rows(self._packages_path)
+        try:
+            tree = load_tree(
+                host_name=row["host_name"],
+                raw_status_data_tree=row.get("host_structured_status", b""),
+            )
+        except Exception:
+            # Same as for corrupted trees of hosts in views, see _add_inventory_data
+            return []
+        return tree.get_rows(self._packages_path)
+
     def find_package(self, packages, name, from_version, to_version):
         for package in packages:
             if isinstance(name, str):
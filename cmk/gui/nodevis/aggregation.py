@@ -59,7 +59,9 @@ class AjaxFetchAggregationData(AjaxPage):
         filter_names = json.loads(aggregations_var)
 
         bi_aggregation_filter = BIAggregationFilter([], [], [], filter_names, [], [])
-        results = bi.BIManager().computer.compute_result_for_filter(bi_aggregation_filter)
+        results = bi.BIManager(bi_aggregation_filter).computer.compute_result_for_filter(
+            bi_aggregation_filter
+        )
 
         aggregation_info: dict[str, Any] = {"aggregation": {}}
 
@@ -293,6 +293,9 @@ class CREConfig:
 
     debug_livestatus_queries: bool = False
 
+    # Let Livestatus sort the rows of views which are cut to the row limit
+    sort_views_in_livestatus: bool = False
+
     # Show livestatus errors in multi site setup if some sites are
     # not reachable.
     show_livestatus_errors: bool = True
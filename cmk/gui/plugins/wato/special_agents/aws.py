@@ -12,11 +12,13 @@ from cmk.gui.exceptions import MKUserError
 from cmk.gui.i18n import _
 from cmk.gui.utils.urls import DocReference
 from cmk.gui.valuespec import (
+    Age,
     CascadingDropdown,
     Dictionary,
     DictionaryEntry,
     DropdownChoice,
     FixedValue,
+    Integer,
     ListChoice,
     ListOf,
     ListOfStrings,
@@ -566,6 +568,8 @@ def _valuespec_special_agents_aws() -> Migrate:
                 "overall_tags",
                 "proxy_details",
                 "import_tags",
+                "max_workers",
+                "region_timeout",
             ],
             elements=[
                 (
@@ -822,6 +826,32 @@ def _valuespec_special_agents_aws() -> Migrate:
                         ),
                     ),
                 ),
+                (
+                    "max_workers",
+                    Integer(
+                        title=_("Number of sections fetched in parallel"),
+                        help=_(
+                            "The number of sections the special agent fetches at the same time "
+                            "across all regions. By default, the regions and their sections are "
+                            "fetched one after another."
+                        ),
+                        minvalue=1,
+                        default_value=4,
+                    ),
+                ),
+                (
+                    "region_timeout",
+                    Age(
+                        title=_("Time budget per region"),
+                        help=_(
+                            "If sections are fetched in parallel, the time the sections of a "
+                            "region may take. Sections exceeding it are abandoned and reported as "
+                            "exceptions."
+                        ),
+                        display=["minutes", "seconds"],
+                        default_value=60,
+                    ),
+                ),
             ],
         ),
         migrate=_migrate,
@@ -16,6 +16,7 @@ from livestatus import (
     MultiSiteConnection,
     NetworkSocketDetails,
     NetworkSocketInfo,
+    OrderBy,
     sanitize_site_configuration,
     SiteConfiguration,
     SiteConfigurations,
@@ -551,6 +552,15 @@ def set_limit(limit: int | None) -> Iterator[None]:
         live().set_limit()  # removes limit
 
 
+@contextmanager
+def set_order_by(order_by: OrderBy | None) -> Iterator[None]:
+    live().set_order_by(order_by)
+    try:
+        yield
+    finally:
+        live().set_order_by()
+
+
 class GroupedSiteState(NamedTuple):
     readable: str
     site_ids: list[SiteId]
@@ -4,7 +4,7 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import abc
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Mapping, Sequence
 
 from livestatus import LivestatusResponse, OnlySites
 
@@ -17,13 +17,23 @@ from cmk.gui.display_options import display_options
 from cmk.gui.exceptions import MKUserError
 from cmk.gui.htmllib.html import html
 from cmk.gui.i18n import _
-from cmk.gui.inventory._tree import get_history, InventoryPath, load_tree
+from cmk.gui.inventory._tree import (
+    get_history,
+    InventoryPath,
+    load_indexed_table_rows,
+    load_tree,
+)
 from cmk.gui.painter.v0 import Cell
 from cmk.gui.type_defs import ColumnName, Row, Rows, SingleInfos, VisualContext
 from cmk.gui.utils.user_errors import user_errors
 from cmk.gui.visuals import get_livestatus_filter_headers
 from cmk.gui.visuals.filter import Filter
-from cmk.inventory.structured_data import HistoryStore, RetentionInterval, SDValue
+from cmk.inventory.structured_data import (
+    HistoryStore,
+    IndexedValues,
+    RetentionInterval,
+    SDValue,
+)
 
 
 class ABCDataSourceInventory(ABCDataSource):
@@ -83,9 +93,10 @@ class ABCRowTable(RowTable):
 
         # Now create big table of all inventory entries of these hosts
         headers = ["site", *host_columns]
+        hostrows: list[Row] = [dict(zip(headers, row)) for row in data]
+        self._prepare_rows(hostrows)
         rows = []
-        for row in data:
-            hostrow: Row = dict(zip(headers, row))
+        for hostrow in hostrows:
             for subrow in self._get_rows(hostrow):
                 subrow.update(hostrow)
                 rows.append(subrow)
@@ -96,6 +107,9 @@ class ABCRowTable(RowTable):
         with sites.only_sites(only_sites), sites.prepend_site():
             return sites.live().query(query)
 
+    def _prepare_rows(self, hostrows: Sequence[Row]) -> None:
+        """Fetch data needed by _get_rows() for all hosts at once"""
+
     @abc.abstractmethod
     def _get_rows(self, hostrow: Row) -> Iterable[Row]:
         raise NotImplementedError()
@@ -108,21 +122,37 @@ class RowTableInventory(ABCRowTable):
     def __init__(self, info_name: str, inventory_path: InventoryPath) -> None:
         super().__init__([info_name], ["host_structured_status", "host_childs"])
         self._inventory_path = inventory_path
+        self._indexed_rows: Mapping[HostName, Sequence[IndexedValues]] = {}
+
+    def _prepare_rows(self, hostrows: Sequence[Row]) -> None:
+        # One index query for all hosts, the trees of the remaining hosts are loaded one by one
+        try:
+            self._indexed_rows = load_indexed_table_rows(
+                self._inventory_path.path,
+                {
+                    host_name: hostrow.get("host_structured_status", b"")
+                    for hostrow in hostrows
+                    if (host_name := hostrow.get("host_name"))
+                },
+            )
+        except Exception:
+            # Errors of single hosts are reported when loading their trees, see _get_rows()
+            self._indexed_rows = {}
 
     def _get_rows(self, hostrow: Row) -> Iterable[Row]:
         if not (self._info_names and (info_name := self._info_names[0])):
             return
 
         host_name = hostrow.get("host_name")
+        raw_status_data_tree = hostrow.get("host_structured_status", b"")
         try:
-            table_rows = (
-                load_tree(
-                    host_name=host_name,
-                    raw_status_data_tree=hostrow.get("host_structured_status", b""),
+            table_rows = self._indexed_rows.get(host_name) if host_name else None
+            if table_rows is None:
+                table_rows = (
+                    load_tree(host_name=host_name, raw_status_data_tree=raw_status_data_tree)
+                    .get_tree(self._inventory_path.path)
+                    .table.rows_with_retentions
                 )
-                .get_tree(self._inventory_path.path)
-                .table.rows_with_retentions
-            )
         except Exception as e:
             if active_config.debug:
                 html.show_warning("%s" % e)
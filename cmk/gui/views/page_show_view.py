@@ -19,10 +19,10 @@ import livestatus
 from cmk.ccc.cpu_tracking import CPUTracker, Snapshot
 from cmk.ccc.site import omd_site, SiteId
 from cmk.ccc.user import UserId
-from cmk.gui import log, visuals
+from cmk.gui import log, sites, visuals
 from cmk.gui.config import active_config, Config
 from cmk.gui.ctx_stack import g
-from cmk.gui.data_source import data_source_registry
+from cmk.gui.data_source import data_source_registry, RowTableLivestatus
 from cmk.gui.display_options import display_options
 from cmk.gui.exceptions import MKMissingDataError, MKUserError
 from cmk.gui.exporter import exporter_registry
@@ -381,22 +381,23 @@ def _fetch_rows_from_livestatus(view: View, all_active_filters: list[Filter]) ->
     (e.g. Adding service row info to host rows (For join painters))"""
     # We test for limit here and not inside view.row_limit, because view.row_limit is used
     # for rendering limits.
-    row_data: Rows | tuple[Rows, int] = view.datasource.table.query(
-        view.datasource,
-        view.row_cells,
-        _get_needed_regular_columns(
+    with sites.set_order_by(_livestatus_order_by(view)):
+        row_data: Rows | tuple[Rows, int] = view.datasource.table.query(
+            view.datasource,
+            view.row_cells,
+            _get_needed_regular_columns(
+                all_active_filters,
+                view,
+            ),
+            view.context,
+            (
+                "".join(get_livestatus_filter_headers(view.context, all_active_filters))
+                + view.spec.get("add_headers", "")
+            ),
+            view.only_sites,
+            None if view.datasource.ignore_limit else view.row_limit,
             all_active_filters,
-            view,
-        ),
-        view.context,
-        (
-            "".join(get_livestatus_filter_headers(view.context, all_active_filters))
-            + view.spec.get("add_headers", "")
-        ),
-        view.only_sites,
-        None if view.datasource.ignore_limit else view.row_limit,
-        all_active_filters,
-    )
+        )
 
     if isinstance(row_data, tuple):
         rows, unfiltered_amount_of_rows = row_data
@@ -407,6 +408,35 @@ def _fetch_rows_from_livestatus(view: View, all_active_filters: list[Filter]) ->
     return rows, unfiltered_amount_of_rows
 
 
+def _livestatus_order_by(view: View) -> livestatus.OrderBy | None:
+    """Let the sites sort the rows in case they are cut to the row limit
+
+    Each site then only sends its first rows and these are merged, instead of
+    fetching all rows of all sites just to show the first of them. Only the
+    first sorter can be handed over to Livestatus, all sorters are applied by
+    _sort_data() afterwards just like before.
+    """
+    if not active_config.sort_views_in_livestatus or not view.sorters:
+        return None
+
+    datasource = view.datasource
+    if view.row_limit is None or datasource.ignore_limit or datasource.merge_by:
+        return None
+
+    # Other row tables issue several or different queries
+    if type(datasource.table) is not RowTableLivestatus:
+        return None
+
+    entry = view.sorters[0]
+    if entry.join_key or (order_by := entry.sorter.livestatus_order_by) is None:
+        return None
+
+    if order_by.column in datasource.add_columns:
+        return None
+
+    return order_by._replace(descending=order_by.descending != entry.negate)
+
+
 def _show_view(
     view_renderer: ABCViewRenderer,
     unfiltered_amount_of_rows: int,
@@ -669,6 +699,48 @@ def _sort_data(data: Rows, sorters: list[SorterEntry]) -> None:
     if not sorters:
         return
 
+    if all(entry.sorter.sort_key is not None for entry in sorters):
+        _sort_data_by_keys(data, sorters)
+        return
+
+    _sort_data_by_cmp(data, sorters)
+
+
+def _sort_data_by_keys(data: Rows, sorters: list[SorterEntry]) -> None:
+    """Sort by computing the key of every row once per sorter
+
+    Python sorts are stable, so sorting by the least significant sorter first
+    and by the most significant one last gives the same order as comparing
+    the rows sorter by sorter.
+    """
+    for entry in reversed(sorters):
+        data.sort(key=_row_sort_key(entry), reverse=entry.negate)
+
+
+def _row_sort_key(entry: SorterEntry) -> Callable[[Row], Any]:
+    sort_key = entry.sorter.sort_key
+    assert sort_key is not None
+
+    def key(row: Row) -> Any:
+        return sort_key(row, parameters=entry.parameters, config=active_config, request=request)
+
+    if not entry.join_key:
+        return key
+
+    join_key = entry.join_key
+
+    # Rows without the join column come first, just like in _sort_data_by_cmp()
+    def join_column_key(row: Row) -> tuple[bool] | tuple[bool, Any]:
+        if (joined_row := row["JOIN"].get(join_key)) is None:
+            return (False,)
+        return True, key(joined_row)
+
+    return join_column_key
+
+
+def _sort_data_by_cmp(data: Rows, sorters: list[SorterEntry]) -> None:
+    """Sort using the compare functions, needed as long as not all sorters have keys"""
+
     # Handle case where join columns are not present for all rows
     def safe_compare(
         compfunc: SorterProtocol,
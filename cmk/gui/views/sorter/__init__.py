@@ -4,7 +4,7 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 
-from .base import ParameterizedSorter, Sorter, SorterEntry, SorterProtocol
+from .base import ParameterizedSorter, Sorter, SorterEntry, SorterProtocol, SortKeyProtocol
 from .helpers import (
     cmp_custom_variable,
     cmp_insensitive_string,
@@ -14,6 +14,14 @@ from .helpers import (
     cmp_simple_string,
     cmp_string_list,
     compare_ips,
+    key_insensitive_string,
+    key_ip_address,
+    key_simple_number,
+    key_simple_string,
+    key_string_list,
+    ReversedKey,
+    row_key_num_split,
+    SortKeyFunction,
 )
 from .registry import (
     all_sorters,
@@ -30,6 +38,8 @@ __all__ = [
     "SorterProtocol",
     "ParameterizedSorter",
     "SorterEntry",
+    "SortKeyFunction",
+    "SortKeyProtocol",
     "SorterRegistry",
     "all_sorters",
     "cmp_custom_variable",
@@ -40,6 +50,13 @@ __all__ = [
     "cmp_simple_string",
     "cmp_string_list",
     "compare_ips",
+    "key_insensitive_string",
+    "key_ip_address",
+    "key_simple_number",
+    "key_simple_string",
+    "key_string_list",
+    "ReversedKey",
+    "row_key_num_split",
     "declare_simple_sorter",
     "declare_1to1_sorter",
     "sorter_registry",
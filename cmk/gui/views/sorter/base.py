@@ -8,6 +8,8 @@ from __future__ import annotations
 from collections.abc import Callable, Mapping, Sequence
 from typing import Any, NamedTuple, Protocol
 
+from livestatus import OrderBy
+
 from cmk.gui.config import Config
 from cmk.gui.http import Request
 from cmk.gui.type_defs import ColumnName, ColumnSpec, Row
@@ -42,6 +44,23 @@ class SorterProtocol(Protocol):
         """
 
 
+class SortKeyProtocol(Protocol):
+    def __call__(
+        self,
+        row: Row,
+        *,
+        parameters: Mapping[str, Any] | None,
+        config: Config,
+        request: Request,
+    ) -> Any:
+        """The optional function sort_key computes a key for a data row, so that
+        comparing the keys of two rows gives the same result as the cmp function.
+
+        It is called only once per row, while cmp is called for every comparison. A
+        view is sorted using the keys in case all of its sorters provide this function.
+        """
+
+
 class SorterEntry(NamedTuple):
     sorter: Sorter
     negate: bool
@@ -59,12 +78,17 @@ class Sorter:
         columns: Sequence[ColumnName],
         sort_function: SorterProtocol,
         load_inv: bool = False,
+        sort_key: SortKeyProtocol | None = None,
+        livestatus_order_by: OrderBy | None = None,
     ):
         self.ident = ident
         self._title = title
         self.columns = columns
         self.cmp = sort_function
         self.load_inv = load_inv
+        self.sort_key = sort_key
+        # Set in case Livestatus sorts the rows by this column the same way as this sorter
+        self.livestatus_order_by = livestatus_order_by
 
     @property
     def title(self) -> str:
@@ -80,6 +104,7 @@ class ParameterizedSorter(Sorter):
         sort_function: SorterProtocol,
         parameter_valuespec: Callable[[Config, Sequence[ColumnSpec]], Dictionary],
         load_inv: bool = False,
+        sort_key: SortKeyProtocol | None = None,
     ):
-        super().__init__(ident, title, columns, sort_function, load_inv)
+        super().__init__(ident, title, columns, sort_function, load_inv, sort_key)
         self.vs_parameters = parameter_valuespec
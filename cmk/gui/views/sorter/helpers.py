@@ -3,11 +3,17 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
-from typing import Literal
+from collections.abc import Callable
+from typing import Any, Literal, Self
+
+from livestatus import OrderBy
 
 from cmk.gui.num_split import cmp_num_split as _cmp_num_split
+from cmk.gui.num_split import num_split
 from cmk.gui.type_defs import ColumnName, Row, SorterFunction
 
+SortKeyFunction = Callable[[ColumnName, Row], Any]
+
 
 def cmp_simple_number(column: ColumnName, r1: Row, r2: Row) -> int:
     v1 = r1[column]
@@ -50,22 +56,90 @@ def cmp_ip_address(column: ColumnName, r1: Row, r2: Row) -> int:
 
 
 def compare_ips(ip1: str, ip2: str, ipv: Literal["ipv4", "ipv6"] = "ipv4") -> int:
-    def split_ip(ip: str) -> tuple:
-        if ipv == "ipv4":
-            try:
-                return tuple(int(part) for part in ip.split("."))
-            except ValueError:
-                # Make hostnames comparable with IPv4 address representations
-                return (255, 255, 255, 255, ip)
-
-        # ipv == "ipv6"
-        if not ip:
-            return ("ffff",) * 8
-        return tuple(part for part in ip.split(":"))
-
-    v1, v2 = split_ip(ip1), split_ip(ip2)
+    v1, v2 = split_ip(ip1, ipv), split_ip(ip2, ipv)
     return (v1 > v2) - (v1 < v2)
 
 
+def split_ip(ip: str, ipv: Literal["ipv4", "ipv6"] = "ipv4") -> tuple:
+    if ipv == "ipv4":
+        try:
+            return tuple(int(part) for part in ip.split("."))
+        except ValueError:
+            # Make hostnames comparable with IPv4 address representations
+            return (255, 255, 255, 255, ip)
+
+    # ipv == "ipv6"
+    if not ip:
+        return ("ffff",) * 8
+    return tuple(part for part in ip.split(":"))
+
+
 def _get_custom_var(row: Row, key: str) -> str:
     return row["custom_variables"].get(key, "")
+
+
+# The sort keys matching the comparison functions above
+
+
+def key_simple_number(column: ColumnName, row: Row) -> Any:
+    return row[column]
+
+
+def row_key_num_split(column: ColumnName, row: Row) -> tuple[int | str, ...]:
+    return num_split(row[column].lower())
+
+
+def key_simple_string(column: ColumnName, row: Row) -> tuple[str, str]:
+    return key_insensitive_string(row.get(column, ""))
+
+
+def key_insensitive_string(v: str) -> tuple[str, str]:
+    # see cmp_insensitive_string() for the strict order
+    return v.lower(), v
+
+
+def key_string_list(column: ColumnName, row: Row) -> tuple[str, str]:
+    return key_insensitive_string("".join(row.get(column, [])))
+
+
+def key_ip_address(column: ColumnName, row: Row) -> tuple:
+    return split_ip(row.get(column, ""))
+
+
+class ReversedKey:
+    """Turns the order of a sort key around"""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Any) -> None:
+        self.key = key
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ReversedKey) and self.key == other.key
+
+    def __lt__(self, other: Self) -> bool:
+        return bool(other.key < self.key)
+
+
+_SORT_KEYS: dict[SorterFunction, SortKeyFunction] = {
+    cmp_simple_number: key_simple_number,
+    cmp_num_split: row_key_num_split,
+    cmp_simple_string: key_simple_string,
+    cmp_string_list: key_string_list,
+    cmp_ip_address: key_ip_address,
+}
+
+
+def sort_key_of(func: SorterFunction) -> SortKeyFunction | None:
+    """Return the sort key matching one of the comparison functions above"""
+    return _SORT_KEYS.get(func)
+
+
+def livestatus_order_by_of(
+    func: SorterFunction, column: ColumnName, *, descending: bool = False
+) -> OrderBy | None:
+    """Return how to let Livestatus sort like the comparison function, if possible"""
+    # Livestatus compares the values of a column just like cmp_simple_number()
+    if func is cmp_simple_number:
+        return OrderBy(column, descending=descending)
+    return None
@@ -29,6 +29,7 @@ def host_tag_config_based_sorters(hashable_tag_groups: HashableTagGroups) -> dic
             columns=["host_tags"],
             load_inv=False,
             sort_function=partial(_cmp_host_tag, tag_group_id=tag_group.id),
+            sort_key=partial(_host_tag_key, tag_group_id=tag_group.id),
         )
         for tag_group in hashable_tag_groups.tag_groups
     }
@@ -48,6 +49,17 @@ def _cmp_host_tag(
     return (host_tag_1 > host_tag_2) - (host_tag_1 < host_tag_2)
 
 
+def _host_tag_key(
+    row: Row,
+    *,
+    parameters: Mapping[str, object] | None,
+    config: Config,
+    request: Request,
+    tag_group_id: TagGroupID,
+) -> str:
+    return _get_tag_group_value(row, "host", tag_group_id, config=config)
+
+
 def _get_tag_group_value(row: Row, what: str, tag_group_id: TagGroupID, *, config: Config) -> str:
     tag_id = get_tag_groups(row, what).get(tag_group_id)
 
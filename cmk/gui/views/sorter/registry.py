@@ -19,6 +19,7 @@ from cmk.gui.type_defs import ColumnName, PainterName, SorterFunction
 from cmk.gui.utils.roles import UserPermissions
 
 from .base import Sorter
+from .helpers import livestatus_order_by_of, ReversedKey, sort_key_of, SortKeyFunction
 from .host_tag_sorters import host_tag_config_based_sorters
 
 
@@ -49,19 +50,32 @@ def register_sorter(ident: str, spec: dict[str, Any]) -> None:
     )
 
 
-def declare_simple_sorter(name: str, title: str, column: ColumnName, func: SorterFunction) -> None:
+def declare_simple_sorter(
+    name: str,
+    title: str,
+    column: ColumnName,
+    func: SorterFunction,
+    key: SortKeyFunction | None = None,
+) -> None:
+    key = key or sort_key_of(func)
     sorter_registry.register(
         Sorter(
             ident=name,
             title=title,
             columns=[column],
             sort_function=lambda r1, r2, **_kwargs: func(column, r1, r2),
+            sort_key=None if key is None else lambda row, **_kwargs: key(column, row),
+            livestatus_order_by=livestatus_order_by_of(func, column),
         )
     )
 
 
 def declare_1to1_sorter(
-    painter_name: PainterName, func: SorterFunction, col_num: int = 0, reverse: bool = False
+    painter_name: PainterName,
+    func: SorterFunction,
+    col_num: int = 0,
+    reverse: bool = False,
+    key: SortKeyFunction | None = None,
 ) -> PainterName:
     painter = painter_registry[painter_name](
         config=active_config,
@@ -72,6 +86,7 @@ def declare_1to1_sorter(
         user_permissions=UserPermissions({}, {}, {}, []),
     )
 
+    key = key or sort_key_of(func)
     sorter_registry.register(
         Sorter(
             ident=painter_name,
@@ -82,6 +97,16 @@ def declare_1to1_sorter(
                 if reverse
                 else lambda r1, r2, **_kwargs: func(painter.columns[col_num], r1, r2)
             ),
+            sort_key=(
+                None
+                if key is None
+                else (lambda row, **_kwargs: ReversedKey(key(painter.columns[col_num], row)))
+                if reverse
+                else lambda row, **_kwargs: key(painter.columns[col_num], row)
+            ),
+            livestatus_order_by=livestatus_order_by_of(
+                func, painter.columns[col_num], descending=reverse
+            ),
         )
     )
 
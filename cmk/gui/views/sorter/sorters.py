@@ -15,7 +15,7 @@ from cmk.gui.i18n import _, _l
 from cmk.gui.painter.v0.helpers import get_tag_groups
 from cmk.gui.painter.v0.painters import _get_docker_container_status_outputs
 from cmk.gui.painter.v1.helpers import get_perfdata_nth_value
-from cmk.gui.type_defs import ColumnSpec, Row
+from cmk.gui.type_defs import ColumnName, ColumnSpec, Row
 from cmk.gui.valuespec import Dictionary, DropdownChoice
 from cmk.gui.view_utils import get_labels
 
@@ -28,6 +28,9 @@ from .helpers import (
     cmp_simple_string,
     cmp_string_list,
     compare_ips,
+    key_insensitive_string,
+    row_key_num_split,
+    split_ip,
 )
 from .registry import declare_1to1_sorter, declare_simple_sorter, SorterRegistry
 
@@ -59,7 +62,13 @@ def register_sorters(registry: SorterRegistry) -> None:
     registry.register(SorterNumProblems)
     registry.register(SorterHostDockerNode)
 
-    declare_simple_sorter("svcdescr", _("Service name"), "service_description", cmp_service_name)
+    declare_simple_sorter(
+        "svcdescr",
+        _("Service name"),
+        "service_description",
+        cmp_service_name,
+        key=key_service_name,
+    )
     declare_simple_sorter(
         "svcdispname",
         _("Service alternative display name"),
@@ -146,7 +155,7 @@ def register_sorters(registry: SorterRegistry) -> None:
     declare_1to1_sorter("host_group_memberlist", cmp_string_list)
     declare_1to1_sorter("host_contacts", cmp_string_list)
     declare_1to1_sorter("host_contact_groups", cmp_string_list)
-    declare_1to1_sorter("host_docker_node", cmp_docker_nodes)
+    declare_1to1_sorter("host_docker_node", cmp_docker_nodes, key=key_docker_nodes)
 
     # Host group
     declare_1to1_sorter("hg_num_services", cmp_simple_number)
@@ -219,9 +228,9 @@ def register_sorters(registry: SorterRegistry) -> None:
     declare_1to1_sorter("log_time", cmp_simple_number)
     declare_1to1_sorter("log_lineno", cmp_simple_number)
 
-    declare_1to1_sorter("log_what", cmp_log_what)
+    declare_1to1_sorter("log_what", cmp_log_what, key=key_log_what)
 
-    declare_1to1_sorter("log_date", cmp_date)
+    declare_1to1_sorter("log_date", cmp_date, key=key_date)
 
     # Alert statistics
     declare_simple_sorter(
@@ -286,11 +295,22 @@ def _sort_service_state(
     return (cmp_state_equiv(r1) > cmp_state_equiv(r2)) - (cmp_state_equiv(r1) < cmp_state_equiv(r2))
 
 
+def _sort_key_service_state(
+    row: Row,
+    *,
+    parameters: Mapping[str, Any] | None,
+    config: Config,
+    request: Request,
+) -> int:
+    return cmp_state_equiv(row)
+
+
 SorterSvcstate = Sorter(
     ident="svcstate",
     title=_l("Service state"),
     columns=["service_state", "service_has_been_checked"],
     sort_function=_sort_service_state,
+    sort_key=_sort_key_service_state,
 )
 
 
@@ -307,11 +327,22 @@ def _sort_host_state(
     )
 
 
+def _sort_key_host_state(
+    row: Row,
+    *,
+    parameters: Mapping[str, Any] | None,
+    config: Config,
+    request: Request,
+) -> int:
+    return cmp_host_state_equiv(row)
+
+
 SorterHoststate = Sorter(
     ident="hoststate",
     title=_l("Host state"),
     columns=["host_state", "host_has_been_checked"],
     sort_function=_sort_host_state,
+    sort_key=_sort_key_host_state,
 )
 
 
@@ -328,11 +359,22 @@ def _sort_site_host(
     )
 
 
+def _sort_key_site_host(
+    row: Row,
+    *,
+    parameters: Mapping[str, Any] | None,
+    config: Config,
+    request: Request,
+) -> tuple[str, tuple[int | str, ...]]:
+    return row["site"], row_key_num_split("host_name", row)
+
+
 SorterSiteHost = Sorter(
     ident="site_host",
     title=_l("Host site and name"),
     columns=["site", "host_name"],
     sort_function=_sort_site_host,
+    sort_key=_sort_key_site_host,
 )
 
 
@@ -347,11 +389,22 @@ def _sort_host_name(
     return cmp_num_split("host_name", r1, r2)
 
 
+def _sort_key_host_name(
+    row: Row,
+    *,
+    parameters: Mapping[str, Any] | None,
+    config: Config,
+    request: Request,
+) -> tuple[int | str, ...]:
+    return row_key_num_split("host_name", row)
+
+
 SorterHostName = Sorter(
     ident="host_name",
     title=_l("Host name"),
     columns=["host_name"],
     sort_function=_sort_host_name,
+    sort_key=_sort_key_host_name,
 )
 
 
@@ -368,11 +421,22 @@ def _sort_site_alias(
     )
 
 
+def _sort_key_site_alias(
+    row: Row,
+    *,
+    parameters: Mapping[str, Any] | None,
+    config: Config,
+    request: Request,
+) -> str:
+    return config.sites[row["site"]]["alias"]
+
+
 SorterSitealias = Sorter(
     ident="sitealias",
     title=_l("Site Alias"),
     columns=["site"],
     sort_function=_sort_site_alias,
+    sort_key=_sort_key_site_alias,
 )
 
 
@@ -390,11 +454,23 @@ def _sort_tags(
     return (tag_groups_1 > tag_groups_2) - (tag_groups_1 < tag_groups_2)
 
 
+def _sort_key_tags(
+    row: Row,
+    *,
+    parameters: Mapping[str, Any] | None,
+    config: Config,
+    request: Request,
+    object_type: str,
+) -> list[tuple[str, str]]:
+    return sorted(get_tag_groups(row, object_type).items())
+
+
 SorterHostTags = Sorter(
     ident="host",
     title=_l("Host Tags"),
     columns=["host_tags"],
     sort_function=partial(_sort_tags, object_type="host"),
+    sort_key=partial(_sort_key_tags, object_type="host"),
 )
 
 SorterServiceTags = Sorter(
@@ -402,6 +478,7 @@ SorterServiceTags = Sorter(
     title=_l("Service Tags"),
     columns=["service_tags"],
     sort_function=partial(_sort_tags, object_type="service"),
+    sort_key=partial(_sort_key_tags, object_type="service"),
 )
 
 
@@ -419,11 +496,23 @@ def _sort_labels(
     return (labels_1 > labels_2) - (labels_1 < labels_2)
 
 
+def _sort_key_labels(
+    row: Row,
+    *,
+    parameters: Mapping[str, Any] | None,
+    config: Config,
+    request: Request,
+    object_type: str,
+) -> list[tuple[str, str]]:
+    return sorted(get_labels(row, object_type).items())
+
+
 SorterHostLabels = Sorter(
     ident="host_labels",
     title=_l("Host labels"),
     columns=["host_labels"],
     sort_function=partial(_sort_labels, object_type="host"),
+    sort_key=partial(_sort_key_labels, object_type="host"),
 )
 
 
@@ -432,6 +521,7 @@ SorterServiceLabels = Sorter(
     title=_l("Service labels"),
     columns=["service_labels"],
     sort_function=partial(_sort_labels, object_type="service"),
+    sort_key=partial(_sort_key_labels, object_type="service"),
 )
 
 
@@ -441,6 +531,10 @@ def cmp_service_name(column, r1, r2):
     ) or cmp_num_split(column, r1, r2)
 
 
+def key_service_name(column: ColumnName, row: Row) -> tuple[int, tuple[int | str, ...]]:
+    return utils.cmp_service_name_equiv(row[column]), row_key_num_split(column, row)
+
+
 def _sort_service_perf_val(
     r1: Row,
     r2: Row,
@@ -455,11 +549,23 @@ def _sort_service_perf_val(
     return (v1 > v2) - (v1 < v2)
 
 
+def _sort_key_service_perf_val(
+    row: Row,
+    *,
+    parameters: Mapping[str, Any] | None,
+    config: Config,
+    request: Request,
+    num: int,
+) -> float:
+    return utils.savefloat(get_perfdata_nth_value(row, num - 1, True))
+
+
 SorterSvcPerfVal01 = Sorter(
     ident="svc_perf_val01",
     title=_("Service performance data - value number 01"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=1),
+    sort_key=partial(_sort_key_service_perf_val, num=1),
 )
 
 SorterSvcPerfVal02 = Sorter(
@@ -467,6 +573,7 @@ SorterSvcPerfVal02 = Sorter(
     title=_("Service performance data - value number 02"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=2),
+    sort_key=partial(_sort_key_service_perf_val, num=2),
 )
 
 SorterSvcPerfVal03 = Sorter(
@@ -474,6 +581,7 @@ SorterSvcPerfVal03 = Sorter(
     title=_("Service performance data - value number 03"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=3),
+    sort_key=partial(_sort_key_service_perf_val, num=3),
 )
 
 
@@ -482,6 +590,7 @@ SorterSvcPerfVal04 = Sorter(
     title=_("Service performance data - value number 04"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=4),
+    sort_key=partial(_sort_key_service_perf_val, num=4),
 )
 
 SorterSvcPerfVal05 = Sorter(
@@ -489,6 +598,7 @@ SorterSvcPerfVal05 = Sorter(
     title=_("Service performance data - value number 05"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=5),
+    sort_key=partial(_sort_key_service_perf_val, num=5),
 )
 
 
@@ -497,6 +607,7 @@ SorterSvcPerfVal06 = Sorter(
     title=_("Service performance data - value number 06"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=6),
+    sort_key=partial(_sort_key_service_perf_val, num=6),
 )
 
 SorterSvcPerfVal07 = Sorter(
@@ -504,6 +615,7 @@ SorterSvcPerfVal07 = Sorter(
     title=_("Service performance data - value number 07"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=7),
+    sort_key=partial(_sort_key_service_perf_val, num=7),
 )
 
 SorterSvcPerfVal08 = Sorter(
@@ -511,6 +623,7 @@ SorterSvcPerfVal08 = Sorter(
     title=_("Service performance data - value number 08"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=8),
+    sort_key=partial(_sort_key_service_perf_val, num=8),
 )
 
 SorterSvcPerfVal09 = Sorter(
@@ -518,6 +631,7 @@ SorterSvcPerfVal09 = Sorter(
     title=_("Service performance data - value number 09"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=9),
+    sort_key=partial(_sort_key_service_perf_val, num=9),
 )
 
 SorterSvcPerfVal10 = Sorter(
@@ -525,6 +639,7 @@ SorterSvcPerfVal10 = Sorter(
     title=_("Service performance data - value number 10"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=10),
+    sort_key=partial(_sort_key_service_perf_val, num=10),
 )
 
 
@@ -538,15 +653,29 @@ def _sort_host_custom_variable(
 ) -> int:
     assert parameters is not None
     variable_name = parameters["ident"].upper()
+    return cmp_insensitive_string(
+        _get_host_custom_variable(r1, variable_name),
+        _get_host_custom_variable(r2, variable_name),
+    )
+
+
+def _sort_key_host_custom_variable(
+    row: Row,
+    *,
+    parameters: Mapping[str, Any] | None,
+    config: Config,
+    request: Request,
+) -> tuple[str, str]:
+    assert parameters is not None
+    return key_insensitive_string(_get_host_custom_variable(row, parameters["ident"].upper()))
 
-    def _get_value(row: Row) -> str:
-        try:
-            index = row["host_custom_variable_names"].index(variable_name)
-        except ValueError:
-            return ""
-        return row["host_custom_variable_values"][index]
 
-    return cmp_insensitive_string(_get_value(r1), _get_value(r2))
+def _get_host_custom_variable(row: Row, variable_name: str) -> str:
+    try:
+        index = row["host_custom_variable_names"].index(variable_name)
+    except ValueError:
+        return ""
+    return row["host_custom_variable_values"][index]
 
 
 def _sort_host_custom_variable_parameter_valuespec(
@@ -577,6 +706,7 @@ SorterCustomHostVariable = ParameterizedSorter(
     columns=["host_custom_variable_names", "host_custom_variable_values"],
     sort_function=_sort_host_custom_variable,
     parameter_valuespec=_sort_host_custom_variable_parameter_valuespec,
+    sort_key=_sort_key_host_custom_variable,
 )
 
 
@@ -589,25 +719,38 @@ def _sort_host_ip_addresses(
     config: Config,
     request: Request,
 ) -> int:
-    def get_address(row: Row, ipv: Literal["ipv4", "ipv6"]) -> str:
-        custom_vars = dict(
-            zip(row["host_custom_variable_names"], row["host_custom_variable_values"])
-        )
-        if ipv == "ipv4":
-            return custom_vars.get("ADDRESS_4", "")
-        return custom_vars.get("ADDRESS_6", "")
-
     for ipv in ip_versions:
-        if (result := compare_ips(get_address(r1, ipv), get_address(r2, ipv), ipv)) != 0:
+        if (
+            result := compare_ips(_get_host_address(r1, ipv), _get_host_address(r2, ipv), ipv)
+        ) != 0:
             return result
     return 0
 
 
+def _sort_key_host_ip_addresses(
+    ip_versions: Sequence[Literal["ipv4", "ipv6"]],
+    row: Row,
+    *,
+    parameters: Mapping[str, Any] | None,
+    config: Config,
+    request: Request,
+) -> tuple[tuple, ...]:
+    return tuple(split_ip(_get_host_address(row, ipv), ipv) for ipv in ip_versions)
+
+
+def _get_host_address(row: Row, ipv: Literal["ipv4", "ipv6"]) -> str:
+    custom_vars = dict(zip(row["host_custom_variable_names"], row["host_custom_variable_values"]))
+    if ipv == "ipv4":
+        return custom_vars.get("ADDRESS_4", "")
+    return custom_vars.get("ADDRESS_6", "")
+
+
 SorterHostIpv4Address = Sorter(
     ident="host_ipv4_address",
     title=_l("Host IPv4 address"),
     columns=["host_custom_variable_names", "host_custom_variable_values"],
     sort_function=partial(_sort_host_ip_addresses, ["ipv4"]),
+    sort_key=partial(_sort_key_host_ip_addresses, ["ipv4"]),
 )
 
 
@@ -616,6 +759,7 @@ SorterHostIpv6Address = Sorter(
     title=_l("Host IPv6 address"),
     columns=["host_custom_variable_names", "host_custom_variable_values"],
     sort_function=partial(_sort_host_ip_addresses, ["ipv6"]),
+    sort_key=partial(_sort_key_host_ip_addresses, ["ipv6"]),
 )
 
 
@@ -624,6 +768,7 @@ SorterHostIpAddresses = Sorter(
     title=_l("Host addresses (IPv4/IPv6)"),
     columns=["host_custom_variable_names", "host_custom_variable_values"],
     sort_function=partial(_sort_host_ip_addresses, ["ipv4", "ipv6"]),
+    sort_key=partial(_sort_key_host_ip_addresses, ["ipv4", "ipv6"]),
 )
 
 
@@ -644,11 +789,22 @@ def _sort_num_problems(
     )
 
 
+def _sort_key_num_problems(
+    row: Row,
+    *,
+    parameters: Mapping[str, Any] | None,
+    config: Config,
+    request: Request,
+) -> int:
+    return row["host_num_services"] - row["host_num_services_ok"] - row["host_num_services_pending"]
+
+
 SorterNumProblems = Sorter(
     ident="num_problems",
     title=_l("Number of problems"),
     columns=["host_num_services", "host_num_services_ok", "host_num_services_pending"],
     sort_function=_sort_num_problems,
+    sort_key=_sort_key_num_problems,
 )
 
 
@@ -656,6 +812,10 @@ def cmp_log_what(col, a, b):
     return (log_what(a[col]) > log_what(b[col])) - (log_what(a[col]) < log_what(b[col]))
 
 
+def key_log_what(col: ColumnName, row: Row) -> int:
+    return log_what(row[col])
+
+
 def log_what(t):
     if "HOST" in t:
         return 1
@@ -679,6 +839,11 @@ def cmp_date(column, r1, r2):
     return (r2_date > r1_date) - (r2_date < r1_date)
 
 
+def key_date(column: ColumnName, row: Row) -> int:
+    # newest day first, see cmp_date()
+    return -get_day_start_timestamp(row[column])[0]
+
+
 def _get_docker_nodes(row: Row) -> str:
     if row.get("host_labels", {}).get("cmk/docker_object") != "container":
         return ""
@@ -697,6 +862,10 @@ def cmp_docker_nodes(column, r1, r2):
     return _sort_docker_nodes_(r1, r2, parameters=None, config=None, request=None)
 
 
+def key_docker_nodes(column: ColumnName, row: Row) -> tuple[str, str]:
+    return key_insensitive_string(_get_docker_nodes(row=row))
+
+
 def _sort_docker_nodes_(
     r1: Row,
     r2: Row,
@@ -710,9 +879,20 @@ def _sort_docker_nodes_(
     return cmp_insensitive_string(val1, val2)
 
 
+def _sort_key_docker_nodes(
+    row: Row,
+    *,
+    parameters: Mapping[str, Any] | None,
+    config: Config,
+    request: Request,
+) -> tuple[str, str]:
+    return key_insensitive_string(_get_docker_nodes(row=row))
+
+
 SorterHostDockerNode = Sorter(
     ident="host_docker_node",
     title=_l("Node name"),
     columns=["host_labels", "host_label_sources"],
     sort_function=_sort_docker_nodes_,
+    sort_key=_sort_key_docker_nodes,
 )
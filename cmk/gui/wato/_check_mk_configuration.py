@@ -133,6 +133,7 @@ def register(
     config_variable_registry.register(ConfigVariableDebug)
     config_variable_registry.register(ConfigVariableGUIProfile)
     config_variable_registry.register(ConfigVariableDebugLivestatusQueries)
+    config_variable_registry.register(ConfigVariableSortViewsInLivestatus)
     config_variable_registry.register(ConfigVariableSelectionLivetime)
     config_variable_registry.register(ConfigVariableShowLivestatusErrors)
     config_variable_registry.register(ConfigVariableEnableSounds)
@@ -559,6 +560,23 @@ ConfigVariableDebugLivestatusQueries = ConfigVariable(
     ),
 )
 
+ConfigVariableSortViewsInLivestatus = ConfigVariable(
+    group=ConfigVariableGroupUserInterface,
+    domain=ConfigDomainGUI,
+    ident="sort_views_in_livestatus",
+    valuespec=lambda: Checkbox(
+        title=_("Sort large views in Livestatus"),
+        label=_("let the sites sort the rows of views"),
+        help=_(
+            "Views showing more rows than their row limit fetch all matching rows from "
+            "all sites and only show the first of them. With this option turned on, the "
+            "sites sort their rows by the first sorter of the view and only send their "
+            "first rows, which are then merged. This is only done in case the first sorter "
+            "sorts by the plain value of a single Livestatus column."
+        ),
+    ),
+)
+
 ConfigVariableSelectionLivetime = ConfigVariable(
     group=ConfigVariableGroupUserInterface,
     domain=ConfigDomainGUI,
@@ -10,9 +10,13 @@ from cmk.gui.utils.rule_specs.legacy_converter import convert_to_legacy_valuespe
 from cmk.gui.valuespec import (
     Age,
     CascadingDropdown,
+    Checkbox,
     DropdownChoice,
     EmailAddress,
     Integer,
+    ListOf,
+    Transform,
+    Tuple,
     ValueSpec,
 )
 from cmk.gui.watolib.config_domain_name import (
@@ -24,6 +28,7 @@ from cmk.gui.watolib.config_variable_groups import ConfigVariableGroupNotificati
 from cmk.gui.watolib.notification_parameter import (
     notification_parameter_registry,
 )
+from cmk.gui.watolib.users import notification_script_choices
 from cmk.gui.watolib.utils import site_neutral_path
 from cmk.rulesets.v1.rule_specs import NotificationParameters
 
@@ -34,6 +39,9 @@ def register(config_variable_registry: ConfigVariableRegistry) -> None:
     config_variable_registry.register(ConfigVariableNotificationBacklog)
     config_variable_registry.register(ConfigVariableNotificationBulkInterval)
     config_variable_registry.register(ConfigVariableNotificationPluginTimeout)
+    config_variable_registry.register(ConfigVariableNotificationParallelPlugins)
+    config_variable_registry.register(ConfigVariableNotificationPluginConcurrency)
+    config_variable_registry.register(ConfigVariableNotificationInProcessPlugins)
     config_variable_registry.register(ConfigVariableNotificationLogging)
     config_variable_registry.register(ConfigVariableFailedNotificationHorizon)
 
@@ -133,6 +141,70 @@ ConfigVariableNotificationPluginTimeout = ConfigVariable(
     ),
 )
 
+ConfigVariableNotificationParallelPlugins = ConfigVariable(
+    group=ConfigVariableGroupNotifications,
+    domain=ConfigDomainCore,
+    ident="notification_parallel_plugins",
+    valuespec=lambda: Integer(
+        title=_("Parallel execution of notification plug-ins"),
+        help=_(
+            "By default the notification plug-ins are executed one after the other when "
+            "notifications are delivered directly without the notification spooler. A single "
+            "slow plug-in then delays all following notifications. Set this to a number greater "
+            "than zero to execute up to this number of plug-ins in parallel. Notifications for "
+            "the same contact and object are still delivered in their original order."
+        ),
+        minvalue=0,
+    ),
+)
+
+ConfigVariableNotificationPluginConcurrency = ConfigVariable(
+    group=ConfigVariableGroupNotifications,
+    domain=ConfigDomainCore,
+    ident="notification_plugin_concurrency",
+    valuespec=lambda: Transform(
+        valuespec=ListOf(
+            valuespec=Tuple(
+                elements=[
+                    DropdownChoice(
+                        title=_("Notification method"),
+                        choices=notification_script_choices,
+                    ),
+                    Integer(title=_("Maximum parallel executions"), minvalue=1, default_value=1),
+                ],
+                orientation="horizontal",
+            ),
+            title=_("Parallel executions per notification plug-in"),
+            help=_(
+                "Limits the number of parallel executions of single notification plug-ins, "
+                "e.g. to respect rate limits of the target system. This only has an effect "
+                "if the parallel execution of notification plug-ins is enabled."
+            ),
+            movable=False,
+        ),
+        to_valuespec=lambda d: sorted(d.items()),
+        from_valuespec=dict,
+    ),
+)
+
+ConfigVariableNotificationInProcessPlugins = ConfigVariable(
+    group=ConfigVariableGroupNotifications,
+    domain=ConfigDomainCore,
+    ident="notification_in_process_plugins",
+    valuespec=lambda: Checkbox(
+        title=_("Execute HTTP based notification plug-ins in-process"),
+        label=_("Execute in-process"),
+        help=_(
+            "The notification plug-ins for Slack, Microsoft Teams, PagerDuty, Opsgenie, iLert, "
+            "SIGNL4, Splunk On-Call and Cisco Webex Teams are usually started as a new process "
+            "for each notification. If you enable this option, these plug-ins are executed "
+            "within the notification process instead, which keeps the connections to the "
+            "target systems open between notifications. Plug-ins overridden in the local "
+            "hierarchy of the site are still executed as processes."
+        ),
+    ),
+)
+
 ConfigVariableNotificationLogging = ConfigVariable(
     group=ConfigVariableGroupNotifications,
     domain=ConfigDomainCore,
@@ -20,7 +20,6 @@ from livestatus import LivestatusResponse, SiteConfiguration, SiteConfigurations
 import cmk.gui.view_utils
 import cmk.gui.watolib.audit_log as _audit_log
 import cmk.gui.watolib.changes as _changes
-from cmk.ccc import store
 from cmk.ccc.exceptions import MKGeneralException
 from cmk.ccc.site import SiteId
 from cmk.ccc.user import UserId
@@ -176,7 +175,7 @@ from cmk.shared_typing.notifications import (
 )
 from cmk.utils import paths
 from cmk.utils.labels import Labels
-from cmk.utils.notify import NotificationContext
+from cmk.utils.notify import NotificationBacklog, NotificationContext
 from cmk.utils.notify_types import (
     EventRule,
     get_rules_related_to_parameter,
@@ -1424,10 +1423,7 @@ class ModeAnalyzeNotifications(ModeNotifications):
 
     def _show_notification_backlog(self, escape_plugin_output: bool) -> None:
         """Show recent notifications. We can use them for rule analysis"""
-        backlog = store.load_object_from_file(
-            cmk.utils.paths.var_dir / "notify/backlog.mk",
-            default=[],
-        )
+        backlog = NotificationBacklog(paths.var_dir / "notify/backlog").load()
         if not backlog:
             return
 
@@ -1474,7 +1470,7 @@ class ModeAnalyzeNotifications(ModeNotifications):
                         state = context["SERVICESTATEID"]
                         css = [f"state svcstate state{state}"]
                     else:
-                        statename = context.get("HOSTSTATE")[:4]
+                        statename = context.get("HOSTSTATE", "")[:4]
                         state = context["HOSTSTATEID"]
                         css = [f"state hstate hstate{state}"]
                     table.cell(
@@ -7,11 +7,17 @@
 
 import logging
 from collections.abc import Sequence
+from pathlib import Path
 from typing import assert_never, Final
 
 import requests
 
-from cmk.automations.helper_api import AutomationPayload, AutomationResponse
+from cmk.automations.helper_api import (
+    AutomationPayload,
+    AutomationResponse,
+    UNIX_SOCKET_NAME,
+    unix_socket_name,
+)
 from cmk.gui.exceptions import MKInternalError
 from cmk.gui.i18n import _
 from cmk.gui.utils.unixsocket_http import make_session as make_unixsocket_session
@@ -21,7 +27,7 @@ from .automation_executor import arguments_with_timeout, AutomationExecutor, Loc
 
 
 class HelperExecutor(AutomationExecutor):
-    _SOCKET_PATH = paths.omd_root.joinpath("tmp/run/automation-helper.sock")
+    _SOCKET_DIR = paths.omd_root.joinpath("tmp/run")
     _BASE_URL: Final = "http://local-automation"
 
     def execute(
@@ -32,8 +38,9 @@ class HelperExecutor(AutomationExecutor):
         logger: logging.Logger,
         timeout: int | None,
     ) -> LocalAutomationResult:
+        socket_path = self._socket_path(command)
         session = make_unixsocket_session(
-            self._SOCKET_PATH,
+            socket_path,
             self._BASE_URL,
         )
 
@@ -54,7 +61,7 @@ class HelperExecutor(AutomationExecutor):
                     "please make sure that all site services are started. "
                     "Tried to connect via <tt>%s</tt>. Reported error was: %s."
                 )
-                % (self._SOCKET_PATH, e)
+                % (socket_path, e)
             )
         response.raise_for_status()
         response_data = AutomationResponse.model_validate(response.json())
@@ -77,6 +84,12 @@ class HelperExecutor(AutomationExecutor):
             case _:
                 assert_never(response_data.serialized_result_or_error_code)
 
+    def _socket_path(self, command: str) -> Path:
+        # Long running automations have workers of their own, unless the helper does not offer them
+        if (socket_path := self._SOCKET_DIR / unix_socket_name(command)).exists():
+            return socket_path
+        return self._SOCKET_DIR / UNIX_SOCKET_NAME
+
     def command_description(
         self, command: str, args: Sequence[str], logger: logging.Logger, timeout: int | None
     ) -> str:
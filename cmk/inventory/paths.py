@@ -56,6 +56,7 @@ class Paths:
         self.status_data_dir = omd_root / "tmp/check_mk/status_data"
         self.archive_dir = omd_root / "var/check_mk/inventory_archive"
         self.delta_cache_dir = omd_root / "var/check_mk/inventory_delta_cache"
+        self.index_file = omd_root / "var/check_mk/inventory_index.sqlite"
         self.auto_dir = omd_root / "var/check_mk/autoinventory"
 
     @property
@@ -11,16 +11,20 @@ from __future__ import annotations
 
 import ast
 import gzip
+import hashlib
 import io
 import json
 import os
 import pprint
 import shutil
+import sqlite3
 from collections import Counter
 from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass, field
+from itertools import batched
 from pathlib import Path
-from typing import Generic, Literal, NewType, Self, TypedDict, TypeVar
+from typing import Final, Generic, Literal, NewType, Self, TypedDict, TypeVar
 
 from cmk.ccc import store
 from cmk.ccc.exceptions import MKGeneralException
@@ -1660,6 +1664,9 @@ def rename(
         except FileNotFoundError:
             pass
 
+    with suppress(sqlite3.Error):
+        InventoryIndex(omd_root).rename(old_host_name=old_host_name, new_host_name=new_host_name)
+
     return list(actions)
 
 
@@ -1720,13 +1727,115 @@ def _archive_inventory_tree(inv_paths: InventoryPaths, host_name: HostName) -> N
         tree_path_gz.path.unlink(missing_ok=True)
         tree_path.legacy.unlink(missing_ok=True)
         tree_path_gz.legacy.unlink(missing_ok=True)
-        return
-
-    if raw_tree := store.load_object_from_file(tree_path.legacy, default=None):
+    elif raw_tree := store.load_object_from_file(tree_path.legacy, default=None):
         inv_paths.archive_host(host_name).mkdir(parents=True, exist_ok=True)
         store.save_text_to_file(archive_tree.path, json.dumps(raw_tree))
         tree_path.legacy.unlink(missing_ok=True)
         tree_path_gz.legacy.unlink(missing_ok=True)
+    else:
+        return
+
+    compact_inventory_archive(inv_paths, host_name)
+
+
+# Every n-th archived inventory tree is kept in full, the ones in between are only
+# kept as delta records (see 'compact_inventory_archive').
+ARCHIVE_SNAPSHOT_INTERVAL = 10
+
+
+def _parse_delta_cache_file_name(file_path: Path) -> tuple[int, int]:
+    previous_name, current_name = file_path.with_suffix("").name.split("_")
+    return -1 if previous_name == "None" else int(previous_name), int(current_name)
+
+
+def _collect_archive_file_paths(inv_paths: InventoryPaths, host_name: HostName) -> dict[int, Path]:
+    try:
+        file_paths = list(inv_paths.archive_host(host_name).iterdir())
+    except FileNotFoundError:
+        return {}
+
+    archive_file_paths = {}
+    for file_path in file_paths:
+        try:
+            archive_file_paths[int(file_path.with_suffix("").name)] = file_path
+        except ValueError:
+            continue
+    return archive_file_paths
+
+
+def _collect_delta_record_timestamps(inv_paths: InventoryPaths, host_name: HostName) -> set[int]:
+    try:
+        file_paths = list(inv_paths.delta_cache_host(host_name).iterdir())
+    except FileNotFoundError:
+        return set()
+
+    current_timestamps = set()
+    for file_path in file_paths:
+        try:
+            current_timestamps.add(_parse_delta_cache_file_name(file_path)[1])
+        except ValueError:
+            continue
+    return current_timestamps
+
+
+def compact_inventory_archive(
+    inv_paths: InventoryPaths,
+    host_name: HostName,
+    *,
+    snapshot_interval: int = ARCHIVE_SNAPSHOT_INTERVAL,
+) -> None:
+    """Replace archived inventory trees by delta records
+
+    Each archived tree gets a delta record to its predecessor, thus the history can be
+    read without loading and comparing full trees. Afterwards only every
+    'snapshot_interval'-th and the latest archived tree are kept in full.
+    """
+    archive_file_paths = _collect_archive_file_paths(inv_paths, host_name)
+    if not archive_file_paths:
+        return
+
+    recorded_timestamps = _collect_delta_record_timestamps(inv_paths, host_name)
+    archive_timestamps = sorted(archive_file_paths)
+    trees: dict[int, ImmutableTree] = {-1: ImmutableTree()}
+
+    def _lookup_tree(timestamp: int) -> ImmutableTree:
+        if timestamp not in trees:
+            trees[timestamp] = _load_tree_from_tree_path(
+                TreePath.from_archive_or_delta_cache_file_path(archive_file_paths[timestamp])
+            )
+        return trees[timestamp]
+
+    for previous, current in zip([-1, *archive_timestamps], archive_timestamps):
+        if current in recorded_timestamps:
+            continue
+        try:
+            delta_tree = _compare_trees(_lookup_tree(current), _lookup_tree(previous))
+        except (MKGeneralException, ValueError):
+            # Unreadable trees are kept as they are
+            continue
+        entry = HistoryEntry.from_delta_tree(
+            previous_timestamp=previous,
+            current_timestamp=current,
+            delta_tree=delta_tree,
+        )
+        if entry.new or entry.changed or entry.removed:
+            _save_history_entry(inv_paths, host_name, entry)
+            recorded_timestamps.add(current)
+        trees.pop(previous, None)
+
+    timeline = sorted({-1, *archive_timestamps, *recorded_timestamps})
+    latest_snapshot_index = 0
+    for index, timestamp in enumerate(timeline[:-1]):
+        if timestamp not in archive_file_paths or timestamp == archive_timestamps[-1]:
+            continue
+        if (
+            index - latest_snapshot_index < snapshot_interval
+            and timestamp in recorded_timestamps
+            and timeline[index + 1] in recorded_timestamps
+        ):
+            archive_file_paths[timestamp].unlink(missing_ok=True)
+        else:
+            latest_snapshot_index = index
 
 
 def make_meta(*, do_archive: bool) -> SDMeta:
@@ -1803,9 +1912,257 @@ def parse_from_raw_status_data_tree(dump: bytes) -> ImmutableTree:
     return deserialize_tree(_parse_dump(dump))
 
 
+# The attributes and tables of these nodes are kept in the inventory index
+INDEXED_PATHS: Final[Sequence[SDPath]] = [
+    (SDNodeName("hardware"), SDNodeName("cpu")),
+    (SDNodeName("hardware"), SDNodeName("memory")),
+    (SDNodeName("hardware"), SDNodeName("system")),
+    (SDNodeName("networking"), SDNodeName("interfaces")),
+    (SDNodeName("software"), SDNodeName("os")),
+    (SDNodeName("software"), SDNodeName("packages")),
+]
+
+_INDEX_SCHEMA: Final = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+CREATE TABLE IF NOT EXISTS trees (
+    host_name TEXT PRIMARY KEY, timestamp REAL NOT NULL, digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attributes (
+    host_name TEXT NOT NULL, path TEXT NOT NULL, key TEXT NOT NULL, value TEXT, retention TEXT
+);
+CREATE TABLE IF NOT EXISTS cells (
+    host_name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    retention TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_attributes_host_path ON attributes (host_name, path);
+CREATE INDEX IF NOT EXISTS idx_attributes_path_key ON attributes (path, key);
+CREATE INDEX IF NOT EXISTS idx_cells_host_path ON cells (host_name, path);
+CREATE INDEX IF NOT EXISTS idx_cells_path_key ON cells (path, key);
+"""
+
+# Stay below the maximum number of parameters of older SQLite versions
+_INDEX_QUERY_BATCH_SIZE: Final = 500
+
+type IndexedValues = Mapping[SDKey, tuple[SDValue, RetentionInterval | None]]
+
+
+def _dump_index_retention(retention_interval: RetentionInterval | None) -> str | None:
+    return (
+        None
+        if retention_interval is None
+        else json.dumps(_serialize_retention_interval(retention_interval))
+    )
+
+
+def _load_index_retention(raw: str | None) -> RetentionInterval | None:
+    return None if raw is None else _deserialize_retention_interval(json.loads(raw))
+
+
+class InventoryIndex:
+    """Site-wide index of the attributes and tables below the indexed paths
+
+    The index is updated whenever the inventory tree of a host is saved. It allows to
+    query the values of many hosts without loading and deserializing their trees.
+    Values are returned in the same form as 'rows_with_retentions' of a table.
+    """
+
+    def __init__(self, omd_root: Path, paths: Sequence[SDPath] = INDEXED_PATHS) -> None:
+        self.inv_paths = InventoryPaths(omd_root)
+        self.paths = paths
+
+    def is_indexed(self, path: SDPath) -> bool:
+        return path in self.paths
+
+    @contextmanager
+    def _connect(self, *, write: bool) -> Iterator[sqlite3.Connection]:
+        # Readers only query existing index files, so only writers have to set them up.
+        if write:
+            self.inv_paths.index_file.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.inv_paths.index_file, timeout=10)
+        try:
+            if write:
+                connection.executescript(_INDEX_SCHEMA)
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def update(
+        self, *, host_name: HostName, tree: MutableTree | ImmutableTree, timestamp: float
+    ) -> None:
+        attributes: list[tuple[str, str, str, str, str | None]] = []
+        cells: list[tuple[str, str, int, str, str, str | None]] = []
+        for path in self.paths:
+            node = tree.get_tree(path)
+            raw_path = ".".join(path)
+            attributes.extend(
+                (
+                    str(host_name),
+                    raw_path,
+                    str(key),
+                    json.dumps(value),
+                    _dump_index_retention(node.attributes.retentions.get(key)),
+                )
+                for key, value in node.attributes.pairs.items()
+            )
+            for row_index, (ident, row) in enumerate(node.table.rows_by_ident.items()):
+                retentions = node.table.retentions.get(ident, {})
+                cells.extend(
+                    (
+                        str(host_name),
+                        raw_path,
+                        row_index,
+                        str(key),
+                        json.dumps(value),
+                        _dump_index_retention(retentions.get(key)),
+                    )
+                    for key, value in row.items()
+                )
+
+        # Most trees do not change between two inventories: Only their timestamp is updated then.
+        digest = hashlib.sha256(repr((attributes, cells)).encode()).hexdigest()
+        with self._connect(write=True) as connection:
+            if connection.execute(
+                "UPDATE trees SET timestamp = ? WHERE host_name = ? AND digest = ?",
+                (timestamp, str(host_name), digest),
+            ).rowcount:
+                return
+            self._delete(connection, host_name)
+            connection.execute(
+                "INSERT INTO trees VALUES (?, ?, ?)", (str(host_name), timestamp, digest)
+            )
+            connection.executemany("INSERT INTO attributes VALUES (?, ?, ?, ?, ?)", attributes)
+            connection.executemany("INSERT INTO cells VALUES (?, ?, ?, ?, ?, ?)", cells)
+
+    @staticmethod
+    def _delete(connection: sqlite3.Connection, host_name: HostName) -> None:
+        for table in ("trees", "attributes", "cells"):
+            connection.execute(
+                f"DELETE FROM {table} WHERE host_name = ?",  # nosec B608 # BNS:6b6392
+                (str(host_name),),
+            )
+
+    def remove(self, *, host_name: HostName) -> None:
+        if not self.inv_paths.index_file.exists():
+            return
+        with self._connect(write=True) as connection:
+            self._delete(connection, host_name)
+
+    def rename(self, *, old_host_name: HostName, new_host_name: HostName) -> None:
+        if not self.inv_paths.index_file.exists():
+            return
+        with self._connect(write=True) as connection:
+            self._delete(connection, new_host_name)
+            for table in ("trees", "attributes", "cells"):
+                connection.execute(
+                    f"UPDATE {table} SET host_name = ? WHERE host_name = ?",  # nosec B608 # BNS:6b6392
+                    (str(new_host_name), str(old_host_name)),
+                )
+
+    def _select(
+        self,
+        connection: sqlite3.Connection,
+        query: str,
+        parameters: Sequence[object],
+        host_names: Sequence[HostName] | None,
+    ) -> Iterator[tuple]:
+        if host_names is None:
+            yield from connection.execute(query, parameters)
+            return
+        for batch in batched(host_names, _INDEX_QUERY_BATCH_SIZE):
+            yield from connection.execute(
+                f"{query} AND host_name IN ({', '.join('?' * len(batch))})",
+                [*parameters, *(str(h) for h in batch)],
+            )
+
+    def _current_host_names(
+        self, connection: sqlite3.Connection, host_names: Sequence[HostName] | None
+    ) -> set[HostName]:
+        # Trees which have been written or removed without updating the index are skipped.
+        current = set()
+        for raw_host_name, timestamp in self._select(
+            connection, "SELECT host_name, timestamp FROM trees WHERE 1", [], host_names
+        ):
+            host_name = HostName(raw_host_name)
+            try:
+                mtime = self.inv_paths.inventory_tree(host_name).path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if mtime == timestamp:
+                current.add(host_name)
+        return current
+
+    def query_attributes(
+        self, path: SDPath, *, host_names: Sequence[HostName] | None = None
+    ) -> Mapping[HostName, IndexedValues]:
+        """Return the attributes of the indexed hosts
+
+        Hosts which are not indexed are missing in the result."""
+        if not self.is_indexed(path):
+            raise ValueError(path)
+        if not self.inv_paths.index_file.exists():
+            return {}
+
+        with self._connect(write=False) as connection:
+            attributes: dict[HostName, dict[SDKey, tuple[SDValue, RetentionInterval | None]]] = {
+                h: {} for h in self._current_host_names(connection, host_names)
+            }
+            for raw_host_name, key, value, retention in self._select(
+                connection,
+                "SELECT host_name, key, value, retention FROM attributes WHERE path = ?",
+                [".".join(path)],
+                host_names,
+            ):
+                if (pairs := attributes.get(HostName(raw_host_name))) is not None:
+                    pairs[SDKey(key)] = (json.loads(value), _load_index_retention(retention))
+        return attributes
+
+    def query_table(
+        self, path: SDPath, *, host_names: Sequence[HostName] | None = None
+    ) -> Mapping[HostName, Sequence[IndexedValues]]:
+        """Return the table rows of the indexed hosts
+
+        Hosts which are not indexed are missing in the result."""
+        if not self.is_indexed(path):
+            raise ValueError(path)
+        if not self.inv_paths.index_file.exists():
+            return {}
+
+        with self._connect(write=False) as connection:
+            rows: dict[HostName, dict[int, dict[SDKey, tuple[SDValue, RetentionInterval | None]]]]
+            rows = {h: {} for h in self._current_host_names(connection, host_names)}
+            for raw_host_name, row_index, key, value, retention in self._select(
+                connection,
+                "SELECT host_name, row, key, value, retention FROM cells WHERE path = ?",
+                [".".join(path)],
+                host_names,
+            ):
+                if (rows_of_host := rows.get(HostName(raw_host_name))) is not None:
+                    rows_of_host.setdefault(row_index, {})[SDKey(key)] = (
+                        json.loads(value),
+                        _load_index_retention(retention),
+                    )
+        return {h: [r for _i, r in sorted(rs.items())] for h, rs in rows.items()}
+
+
+def _update_inventory_index(
+    index: InventoryIndex, host_name: HostName, tree: MutableTree | ImmutableTree, tree_file: Path
+) -> None:
+    # The index is only a shortcut: Outdated entries are detected by the timestamp of the
+    # inventory tree and then the tree itself is used.
+    with suppress(sqlite3.Error):
+        index.update(host_name=host_name, tree=tree, timestamp=tree_file.stat().st_mtime)
+
+
 class RawInventoryStore:
     def __init__(self, omd_root: Path) -> None:
         self.inv_paths = InventoryPaths(omd_root)
+        self.index = InventoryIndex(omd_root)
 
     def save_meta_and_raw_inventory_tree(
         self, *, host_name: HostName, meta_and_raw_tree: SDMetaAndRawTree, timestamp: int
@@ -1820,6 +2177,13 @@ class RawInventoryStore:
         tree_path_gz.legacy.unlink(missing_ok=True)
         os.utime(tree_path_gz.path, (timestamp, timestamp))
 
+        _update_inventory_index(
+            self.index,
+            host_name,
+            deserialize_tree(meta_and_raw_tree["raw_tree"]),
+            tree_path.path,
+        )
+
     def archive_inventory_tree(self, *, host_name: HostName) -> None:
         _archive_inventory_tree(self.inv_paths, host_name)
 
@@ -1827,6 +2191,7 @@ class RawInventoryStore:
 class InventoryStore:
     def __init__(self, omd_root: Path) -> None:
         self.inv_paths = InventoryPaths(omd_root)
+        self.index = InventoryIndex(omd_root)
 
     def load_inventory_tree(self, *, host_name: HostName) -> ImmutableTree:
         return _load_tree_from_tree_path(self.inv_paths.inventory_tree(host_name))
@@ -1844,6 +2209,8 @@ class InventoryStore:
         _save_raw_tree_gz(tree_path_gz, SDMetaAndRawTree(meta=meta, raw_tree=raw_tree))
         tree_path_gz.legacy.unlink(missing_ok=True)
 
+        _update_inventory_index(self.index, host_name, tree, tree_path.path)
+
         # Inform Livestatus about the latest inventory update
         self.inv_paths.inventory_marker_file.touch()
 
@@ -1856,6 +2223,9 @@ class InventoryStore:
         tree_path_gz.path.unlink(missing_ok=True)
         tree_path_gz.legacy.unlink(missing_ok=True)
 
+        with suppress(sqlite3.Error):
+            self.index.remove(host_name=host_name)
+
     def load_status_data_tree(self, *, host_name: HostName) -> ImmutableTree:
         return _load_tree_from_tree_path(self.inv_paths.status_data_tree(host_name))
 
@@ -1978,9 +2348,7 @@ class HistoryStore:
 
         for file_path in file_paths:
             try:
-                previous_name, current_name = file_path.with_suffix("").name.split("_")
-                previous_timestamp = -1 if previous_name == "None" else int(previous_name)
-                current_timestamp = int(current_name)
+                previous_timestamp, current_timestamp = _parse_delta_cache_file_name(file_path)
             except ValueError:
                 yield Error(file_path)
                 continue
@@ -2053,9 +2421,14 @@ class HistoryStore:
         sorted_paths_from_archive = sorted(
             [r.ok for r in results_from_archive if r.is_ok()], key=lambda p: p.timestamp
         )
+        # Archived trees in between may have been replaced by delta records, thus only
+        # compare full trees if there is no delta record for the current one.
+        recorded_timestamps = {k[-1] for k in known_paths}
         for previous, current in zip(sorted_paths_from_archive, sorted_paths_from_archive[1:]):
-            if (key := (host_name, previous.timestamp, current.timestamp)) not in known_paths:
-                known_paths[key] = HistoryArchivePath(previous=previous, current=current)
+            if current.timestamp not in recorded_timestamps:
+                known_paths[(host_name, previous.timestamp, current.timestamp)] = (
+                    HistoryArchivePath(previous=previous, current=current)
+                )
 
         for key in sorted(known_paths, key=lambda k: k[-1]):
             yield OK(known_paths[key])
@@ -2124,24 +2497,30 @@ class HistoryStore:
                 )
 
     def save_history_entry(self, *, host_name: HostName, history_entry: HistoryEntry) -> None:
-        delta_cache_tree = self.inv_paths.delta_cache_tree(
-            host_name,
-            history_entry.previous_timestamp,
-            history_entry.current_timestamp,
-        )
-        self.inv_paths.delta_cache_host(host_name).mkdir(parents=True, exist_ok=True)
-        store.save_text_to_file(
-            delta_cache_tree.path,
-            json.dumps(
-                (
-                    history_entry.new,
-                    history_entry.changed,
-                    history_entry.removed,
-                    serialize_delta_tree(history_entry.delta_tree),
-                )
-            ),
-        )
-        delta_cache_tree.legacy.unlink(missing_ok=True)
+        _save_history_entry(self.inv_paths, host_name, history_entry)
+
+
+def _save_history_entry(
+    inv_paths: InventoryPaths, host_name: HostName, history_entry: HistoryEntry
+) -> None:
+    delta_cache_tree = inv_paths.delta_cache_tree(
+        host_name,
+        history_entry.previous_timestamp,
+        history_entry.current_timestamp,
+    )
+    inv_paths.delta_cache_host(host_name).mkdir(parents=True, exist_ok=True)
+    store.save_text_to_file(
+        delta_cache_tree.path,
+        json.dumps(
+            (
+                history_entry.new,
+                history_entry.changed,
+                history_entry.removed,
+                serialize_delta_tree(history_entry.delta_tree),
+            )
+        ),
+    )
+    delta_cache_tree.legacy.unlink(missing_ok=True)
 
 
 @dataclass(frozen=True)
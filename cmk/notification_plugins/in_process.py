@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Execute notification plug-ins within the notification process
+
+Executing a plug-in script means starting a new interpreter, importing
+requests and creating a new connection to the endpoint for every single
+notification. The plug-ins listed here only talk HTTP via post_request(),
+so they can instead be executed by calling their main function within the
+calling process. Plug-ins using other client libraries (e.g. the Opsgenie
+SDK) are not listed, as their requests are not bound by the plug-in timeout.
+
+When executed in-process:
+
+* The plug-in context is passed as dict instead of NOTIFY_* environment variables.
+* HTTP connections are kept open between notifications, see utils.http_session().
+* The output to stdout and stderr is captured per thread.
+* The exit code is derived from the return value or the SystemExit of the
+  main function, just like the interpreter would do it for the script.
+"""
+
+import functools
+import importlib
+import io
+import sys
+import threading
+import traceback
+from collections.abc import Callable
+from typing import Final, TextIO
+
+from cmk.notification_plugins.utils import plugin_context_var, request_timeout_var
+from cmk.utils.notify_types import PluginNotificationContext
+
+IN_PROCESS_PLUGINS: Final = frozenset(
+    {
+        "cisco_webex_teams",
+        "ilert",
+        "msteams",
+        "pagerduty",
+        "signl4",
+        "slack",
+        "victorops",
+    }
+)
+
+_output_lock = threading.Lock()
+
+
+class _ThreadOutput:
+    """Sends the writes of threads executing a plug-in to their own buffer"""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream: Final = stream
+        self._local = threading.local()
+
+    @property
+    def capture(self) -> io.StringIO | None:
+        return getattr(self._local, "capture", None)
+
+    @capture.setter
+    def capture(self, capture: io.StringIO | None) -> None:
+        self._local.capture = capture
+
+    def write(self, s: str) -> int:
+        if (capture := self.capture) is not None:
+            return capture.write(s)
+        return self.stream.write(s)
+
+    def flush(self) -> None:
+        if self.capture is None:
+            self.stream.flush()
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self.stream, name)
+
+
+def _thread_outputs() -> tuple[_ThreadOutput, _ThreadOutput]:
+    with _output_lock:
+        if not isinstance(sys.stdout, _ThreadOutput):
+            sys.stdout = _ThreadOutput(sys.stdout)
+        if not isinstance(sys.stderr, _ThreadOutput):
+            sys.stderr = _ThreadOutput(sys.stderr)
+        return sys.stdout, sys.stderr
+
+
+@functools.cache
+def _load_main(plugin_name: str) -> Callable[[], object]:
+    module = importlib.import_module(f"cmk.notification_plugins.{plugin_name}")
+    main: Callable[[], object] = module.main
+    return main
+
+
+def _exit_code(code: object, output: io.StringIO) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    # Same as the interpreter does for sys.exit("message")
+    output.write(f"{code}\n")
+    return 1
+
+
+def run_plugin(
+    plugin_name: str, plugin_context: PluginNotificationContext, *, timeout: int
+) -> tuple[int, list[str]]:
+    """Execute the plug-in and return its exit code and output lines
+
+    The plug-in can not be interrupted like a subprocess, so the timeout is
+    applied to its HTTP requests instead.
+    """
+    if plugin_name not in IN_PROCESS_PLUGINS:
+        raise ValueError(f"Notification plug-in {plugin_name!r} can not be executed in-process")
+
+    main = _load_main(plugin_name)
+    stdout, stderr = _thread_outputs()
+    output = io.StringIO()
+    stdout.capture = stderr.capture = output
+    context_token = plugin_context_var.set(plugin_context)
+    timeout_token = request_timeout_var.set(timeout)
+    try:
+        exit_code = _exit_code(main(), output)
+    except SystemExit as e:
+        exit_code = _exit_code(e.code, output)
+    except Exception:
+        output.write(traceback.format_exc())
+        exit_code = 1
+    finally:
+        request_timeout_var.reset(timeout_token)
+        plugin_context_var.reset(context_token)
+        stdout.capture = stderr.capture = None
+
+    return exit_code, output.getvalue().splitlines()
@@ -7,13 +7,16 @@ import base64
 import os
 import re
 import sys
+import threading
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Container, Iterable
+from collections.abc import Callable, Container, Iterable, Mapping
+from contextvars import ContextVar
 from dataclasses import dataclass
 from email.utils import formataddr
 from http.client import responses as http_responses
 from quopri import encodestring
 from typing import Any, NamedTuple, NoReturn, override
+from urllib.parse import urlsplit
 
 import requests
 from requests import JSONDecodeError
@@ -31,13 +34,48 @@ from cmk.utils.paths import omd_root
 
 format_plugin_output = replace_state_markers
 
+# Set when a plug-in is executed within the notification process instead of
+# a subprocess. The context is then passed directly instead of via NOTIFY_*
+# environment variables. See cmk.notification_plugins.in_process.
+plugin_context_var: ContextVar[PluginNotificationContext | None] = ContextVar(
+    "plugin_context", default=None
+)
+request_timeout_var: ContextVar[int] = ContextVar("request_timeout", default=110)
+
+_sessions: dict[tuple[str, str], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
 
 def collect_context() -> PluginNotificationContext:
-    context = {var[7:]: value for var, value in os.environ.items() if var.startswith("NOTIFY_")}
+    if (plugin_context := plugin_context_var.get()) is not None:
+        context = dict(plugin_context)
+    else:
+        context = {var[7:]: value for var, value in os.environ.items() if var.startswith("NOTIFY_")}
     set_event_text_context_variable(context)
     return context
 
 
+def _plugin_environ() -> Mapping[str, str]:
+    if (plugin_context := plugin_context_var.get()) is not None:
+        return {"NOTIFY_" + variable: value for variable, value in plugin_context.items()}
+    return os.environ
+
+
+def http_session(url: str) -> requests.Session:
+    """Session shared by all requests to the endpoint of the URL
+
+    Within a plug-in subprocess this is only used once. Plug-ins executed
+    in-process keep the connections to their endpoint open between
+    notifications.
+    """
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    with _sessions_lock:
+        if (session := _sessions.get(key)) is None:
+            session = _sessions[key] = requests.Session()
+        return session
+
+
 def format_link(template: str, url: str, text: str) -> str:
     return template % (url, text) if url else text
 
@@ -348,7 +386,7 @@ def get_password_from_env_or_context(key: str, context: dict[str, str] | None =
     Since 2.4 the passwords are stored in FormSpec format, this leads to
     multiple keys in the notification context
     """
-    source = context if context else os.environ
+    source = context if context else _plugin_environ()
     password_parameter_list = [source[k] for k in source if k.startswith(key)]
     return retrieve_from_passwordstore(password_parameter_list)
 
@@ -373,13 +411,13 @@ def post_request(
         verify = False
 
     try:
-        response = requests.post(
+        response = http_session(url).post(
             url=url,
             json=message_constructor(context),
             proxies=deserialize_http_proxy_config(serialized_proxy_config).to_requests_proxies(),
             headers=headers,
             verify=verify,
-            timeout=110,
+            timeout=request_timeout_var.get(),
         )
     except requests.exceptions.ProxyError:
         sys.stderr.write("Cannot connect to proxy: %s\n" % serialized_proxy_config)
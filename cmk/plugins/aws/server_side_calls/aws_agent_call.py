@@ -62,6 +62,8 @@ class AwsParams(BaseModel):
     piggyback_naming_convention: Literal["ip_region_instance", "private_dns_name"]
     overall_tags: list[Tag] | None = None
     import_tags: tuple[str, str | None] | None = None
+    max_workers: int | None = None
+    region_timeout: float | None = None
     connection_test: bool = False  # only used by quick setup
 
 
@@ -207,6 +209,11 @@ def aws_arguments(
         )
     )
 
+    if params.max_workers is not None:
+        args.extend(("--max-workers", str(params.max_workers)))
+    if params.region_timeout is not None:
+        args.extend(("--region-timeout", str(params.region_timeout)))
+
     if params.connection_test:
         args.append("--connection-test")
 
@@ -12,19 +12,23 @@ Special agent for monitoring Amazon web services (AWS) with Check_MK.
 
 import abc
 import argparse
+import functools
 import hashlib
 import itertools
 import json
 import logging
+import queue
 import re
 import sys
+import threading
 from collections import Counter, defaultdict
 from collections.abc import Callable, Collection, Iterable, Iterator, Mapping, Sequence
-from dataclasses import dataclass
+from concurrent.futures import Future, wait
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum, StrEnum
 from pathlib import Path
-from time import sleep
+from time import monotonic, sleep
 from typing import (
     Any,
     assert_never,
@@ -668,6 +672,9 @@ class ResultDistributor:
     def add(self, sender_name: str, colleague: "AWSSection") -> None:
         self._colleagues[sender_name].append(colleague)
 
+    def colleagues_of(self, sender: "AWSSection") -> Sequence["AWSSection"]:
+        return [c for c in self._colleagues.get(sender.name, []) if c.name != sender.name]
+
     def distribute(self, sender: "AWSSection", result: "AWSComputedContent") -> None:
         for colleague in self._colleagues[sender.name]:
             if colleague.name != sender.name:
@@ -831,6 +838,11 @@ class AWSSection(DataCache):
             )
         return period
 
+    @property
+    def colleagues(self) -> Sequence["AWSSection"]:
+        """The sections receiving the results of this section"""
+        return self._distributor.colleagues_of(self)
+
     def _send(self, content: AWSComputedContent) -> None:
         self._distributor.distribute(self, content)
 
@@ -6577,13 +6589,27 @@ class AWSSections(abc.ABC):
             logging.info("Invalid region name or client key %s: %s", client_key, e)
             raise
 
+    @property
+    def sections(self) -> Sequence[AWSSection]:
+        return self._sections
+
     def run(self, use_cache: bool = True) -> None:
+        self.write(
+            *self.collect(
+                (section, functools.partial(section.run, use_cache=use_cache))
+                for section in self._sections
+            )
+        )
+
+    def collect(
+        self, section_runs: Iterable[tuple[AWSSection, Callable[[], AWSSectionResults]]]
+    ) -> tuple[Sequence[Exception], Results]:
         exceptions: list[AssertionError | Exception] = []
         results: Results = {}
 
-        for section in self._sections:
+        for section, run in section_runs:
             try:
-                section_result = section.run(use_cache=use_cache)
+                section_result = run()
             except AssertionError as e:
                 logging.info(e)
                 if self._debug:
@@ -6599,6 +6625,9 @@ class AWSSections(abc.ABC):
                     section_result.results,
                 )
 
+        return exceptions, results
+
+    def write(self, exceptions: Sequence[Exception], results: Results) -> None:
         self._write_exceptions(exceptions)
         self._write_host_labels(results)
         self._write_section_results(results)
@@ -7104,6 +7133,157 @@ class AWSSectionsGeneric(AWSSections):
             self._sections.append(elasticache)
 
 
+@dataclass
+class RegionBudget:
+    """The time the sections of a region may take when run concurrently
+
+    The budget starts when the first section of the region starts running, so regions
+    waiting for a free worker do not lose their time while queued.
+    """
+
+    seconds: float | None
+    _deadline: float | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._deadline is None and self.seconds is not None:
+                self._deadline = monotonic() + self.seconds
+
+    def remaining(self) -> float | None:
+        if self._deadline is None:
+            return self.seconds
+        return max(0.0, self._deadline - monotonic())
+
+    def expired(self) -> bool:
+        return self._deadline is not None and monotonic() >= self._deadline
+
+
+class _DaemonWorkers:
+    """A minimal thread pool whose workers do not keep the agent alive
+
+    The workers of a ThreadPoolExecutor are joined when the interpreter exits, so a
+    section hanging in an API call would delay the agent beyond the region budget.
+    Sections exceeding their budget are abandoned to these daemon threads instead.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self._queue: queue.SimpleQueue[tuple[Future[Any], Callable[[], Any]] | None] = (
+            queue.SimpleQueue()
+        )
+        self._max_workers = max_workers
+        self._threads: list[threading.Thread] = []
+
+    def submit(self, fn: Callable[[], T]) -> Future[T]:
+        future: Future[T] = Future()
+        self._queue.put((future, fn))
+        if len(self._threads) < self._max_workers:
+            thread = threading.Thread(
+                target=self._work, name=f"agent_aws_{len(self._threads)}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        return future
+
+    def _work(self) -> None:
+        while (item := self._queue.get()) is not None:
+            future, fn = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+
+    def shutdown(self) -> None:
+        """Cancel the pending calls and let the idle workers end, without waiting"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+        for _thread in self._threads:
+            self._queue.put(None)
+
+
+def _run_section(
+    section: AWSSection,
+    senders: Sequence[Future[AWSSectionResults]],
+    budget: RegionBudget,
+    use_cache: bool,
+) -> AWSSectionResults:
+    budget.start()
+    wait(senders, timeout=budget.remaining())
+    if budget.expired():
+        raise TimeoutError(f"{section.name}: Time budget of region {section.region} exceeded")
+    return section.run(use_cache=use_cache)
+
+
+def _section_result(
+    section: AWSSection, future: Future[AWSSectionResults], budget: RegionBudget
+) -> AWSSectionResults:
+    while not future.done():
+        wait([future], timeout=budget.remaining())
+        if budget.expired() and not future.done():
+            raise TimeoutError(f"{section.name}: Time budget of region {section.region} exceeded")
+    return future.result()
+
+
+def run_sections_concurrently(
+    aws_sections: Sequence[AWSSections],
+    *,
+    use_cache: bool,
+    max_workers: int,
+    region_timeout: float | None,
+) -> None:
+    """Run the sections of all regions with a bounded number of workers
+
+    The sections are submitted in the order the serial mode runs them. A section waits
+    for the sections sending results to it (see ResultDistributor) if these come first
+    in that order. This includes S3Limits which only runs for the first region and
+    distributes its results to the S3Summary sections of all regions. As the workers
+    pick up sections in submission order, a section only waits for sections already
+    started and the waiting can not deadlock.
+
+    The output is written region by region in the serial order once all sections of
+    a region are done or its time budget is exceeded.
+    """
+    executor = _DaemonWorkers(max_workers)
+    try:
+        futures: dict[int, Future[AWSSectionResults]] = {}
+        senders_of: dict[int, list[Future[AWSSectionResults]]] = defaultdict(list)
+        budgets = []
+        for sections in aws_sections:
+            budget = RegionBudget(region_timeout)
+            budgets.append(budget)
+            for section in sections.sections:
+                future = executor.submit(
+                    functools.partial(
+                        _run_section, section, senders_of.pop(id(section), []), budget, use_cache
+                    )
+                )
+                futures[id(section)] = future
+                for colleague in section.colleagues:
+                    senders_of[id(colleague)].append(future)
+
+        for sections, budget in zip(aws_sections, budgets):
+            sections.write(
+                *sections.collect(
+                    (
+                        section,
+                        functools.partial(_section_result, section, futures[id(section)], budget),
+                    )
+                    for section in sections.sections
+                )
+            )
+    finally:
+        # Sections exceeding their budget can not be interrupted. They run in daemon threads,
+        # so they neither are waited for here nor when the agent exits.
+        executor.shutdown()
+
+
 # .
 #   .--main----------------------------------------------------------------.
 #   |                                       _                              |
@@ -7417,6 +7597,19 @@ def parse_arguments(argv: Sequence[str] | None) -> Args:
                 help="Monitor limits for %s" % service.title,
             )
 
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=1,
+        help="Number of sections to fetch at the same time across all regions. With the default\n"
+        "of 1 the regions and their sections are fetched one after another.",
+    )
+    parser.add_argument(
+        "--region-timeout",
+        type=float,
+        help="Time budget in seconds for fetching the sections of a region if more than one\n"
+        "worker is used. Sections exceeding it are reported as exceptions.",
+    )
     parser.add_argument(
         "--connection-test",
         action="store_true",
@@ -7602,6 +7795,15 @@ def _get_proxy(args: argparse.Namespace) -> botocore.config.Config | None:
     return None
 
 
+def _with_max_pool_connections(
+    config: botocore.config.Config | None, max_workers: int
+) -> botocore.config.Config | None:
+    if max_workers <= 1:
+        return config
+    pool_config = botocore.config.Config(max_pool_connections=max(10, max_workers))
+    return pool_config if config is None else config.merge(pool_config)
+
+
 def _configure_aws(args: Args) -> AWSConfig:
     aws_config = AWSConfig(
         args.hostname,
@@ -7750,35 +7952,59 @@ def agent_aws_main(args: Args) -> int:
             ", ".join(regional_services),
         )
 
-    has_exceptions = False
-    for aws_services, aws_regions, aws_sections in [
-        (global_services, [args.global_service_region], AWSSectionsUSEast),
-        (regional_services, args.regions, AWSSectionsGeneric),
-    ]:
-        if not aws_services or not aws_regions:
-            continue
+    # Clients of a region are shared by its sections, so allow as many connections as workers
+    client_config = _with_max_pool_connections(proxy_config, args.max_workers)
+    concurrent_sections: list[AWSSections] = []
 
-        for region in aws_regions:
-            try:
-                session = _create_session_from_args(args, region, proxy_config)
-                sections = aws_sections(
-                    args.hostname, session, account_id, debug=args.debug, config=proxy_config
-                )
-                sections.init_sections(aws_services, region, aws_config, s3_limits_distributor)
-                sections.run(use_cache=use_cache)
-            except AwsAccessError as ae:
-                # can not access AWS, retreat
-                sys.stdout.write("<<<aws_exceptions>>>\n")
-                sys.stdout.write("Exception: %s\n" % ae)
-                return 0
-            except AssertionError:
-                if args.debug:
-                    raise
-            except Exception as e:
-                logging.info(e)
-                has_exceptions = True
-                if args.debug:
-                    raise
+    def _init_region(
+        aws_services: Sequence[str], region: str, aws_sections: Callable[..., AWSSections]
+    ) -> None:
+        session = _create_session_from_args(args, region, proxy_config)
+        sections = aws_sections(
+            args.hostname, session, account_id, debug=args.debug, config=client_config
+        )
+        sections.init_sections(aws_services, region, aws_config, s3_limits_distributor)
+        if args.max_workers > 1:
+            concurrent_sections.append(sections)
+        else:
+            sections.run(use_cache=use_cache)
+
+    steps: list[Callable[[], None]] = [
+        functools.partial(_init_region, aws_services, region, aws_sections)
+        for aws_services, aws_regions, aws_sections in [
+            (global_services, [args.global_service_region], AWSSectionsUSEast),
+            (regional_services, args.regions, AWSSectionsGeneric),
+        ]
+        if aws_services and aws_regions
+        for region in aws_regions
+    ]
+    if args.max_workers > 1:
+        steps.append(
+            lambda: run_sections_concurrently(
+                concurrent_sections,
+                use_cache=use_cache,
+                max_workers=args.max_workers,
+                region_timeout=args.region_timeout,
+            )
+        )
+
+    has_exceptions = False
+    for step in steps:
+        try:
+            step()
+        except AwsAccessError as ae:
+            # can not access AWS, retreat
+            sys.stdout.write("<<<aws_exceptions>>>\n")
+            sys.stdout.write("Exception: %s\n" % ae)
+            return 0
+        except AssertionError:
+            if args.debug:
+                raise
+        except Exception as e:
+            logging.info(e)
+            has_exceptions = True
+            if args.debug:
+                raise
 
     return 1 if has_exceptions else 0
 
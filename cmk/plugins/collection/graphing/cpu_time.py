@@ -6,6 +6,7 @@
 from cmk.graphing.v1 import graphs, metrics, perfometers, Title
 
 UNIT_TIME = metrics.Unit(metrics.TimeNotation())
+UNIT_COUNTER = metrics.Unit(metrics.DecimalNotation(""), metrics.StrictPrecision(2))
 
 metric_children_system_time = metrics.Metric(
     name="children_system_time",
@@ -37,6 +38,18 @@ metric_cmk_time_snmp = metrics.Metric(
     unit=UNIT_TIME,
     color=metrics.Color.BROWN,
 )
+metric_cmk_time_submission = metrics.Metric(
+    name="cmk_time_submission",
+    title=Title("Time spent submitting check results"),
+    unit=UNIT_TIME,
+    color=metrics.Color.PURPLE,
+)
+metric_cmk_submission_writes = metrics.Metric(
+    name="cmk_submission_writes",
+    title=Title("Writes for submitting check results"),
+    unit=UNIT_COUNTER,
+    color=metrics.Color.DARK_PURPLE,
+)
 metric_execution_time = metrics.Metric(
     name="execution_time",
     title=Title("Total execution time"),
@@ -5,20 +5,25 @@
 """Check_MK vSphere Special Agent"""
 
 import argparse
+import codecs
 import collections
+import itertools
 import json
 import re
+import resource
 import socket
 import sys
 import time
 from collections import Counter
-from collections.abc import Callable, Iterator, Mapping, Sequence
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any
 from xml.dom import minidom
 
 # TODO: minicompat include internal impl details. But NodeList is only defined there for <3.11
 from xml.dom.minicompat import NodeList
+from xml.etree import ElementTree
 
 import dateutil.parser
 import requests
@@ -89,6 +94,11 @@ REQUESTED_COUNTERS_KEYS = (
 
 COOKIE_MAX_AGE_HOURS = 4
 
+# Responses are processed in chunks of this size while they are received
+RESPONSE_CHUNK_SIZE = 64 * 1024
+# The part of a response searched for faults and continuation tokens
+RESPONSE_HEAD_SIZE = 512
+
 
 class SoapTemplates:
     # fmt: off
@@ -293,13 +303,15 @@ class SoapTemplates:
     )
     PERFCOUNTERDATA = (
         '<ns1:QueryPerf xsi:type="ns1:QueryPerfRequestType">'
-        '  <ns1:_this type="PerformanceManager">%(perfManager)s</ns1:_this>'
+        '  <ns1:_this type="PerformanceManager">%(perfManager)s</ns1:_this>%%(specs)s'
+        '</ns1:QueryPerf>'
+    )
+    PERFCOUNTERSPEC = (
         '  <ns1:querySpec>'
-        '    <ns1:entity type="HostSystem">%%(esxhost)s</ns1:entity>'
-        '    <ns1:maxSample>%%(samples)s</ns1:maxSample>%%(counters)s'
+        '    <ns1:entity type="HostSystem">%(esxhost)s</ns1:entity>'
+        '    <ns1:maxSample>%(samples)s</ns1:maxSample>%(counters)s'
         '    <ns1:intervalId>20</ns1:intervalId>'
         '  </ns1:querySpec>'
-        '</ns1:QueryPerf>'
     )
     NETWORKSYSTEM = (
         '<ns1:RetrievePropertiesEx xsi:type="ns1:RetrievePropertiesExRequestType">'
@@ -1013,6 +1025,18 @@ def parse_arguments(argv: Sequence[str]) -> argparse.Namespace:
         help="""If provided, virtual machine snapshots summary service will be generated on the ESX
         host. By default, it will only be created for the vCenter.""",
     )
+    parser.add_argument(
+        "--counter-workers",
+        type=int,
+        default=4,
+        help="""Number of performance counter queries sent to vSphere at the same time.""",
+    )
+    parser.add_argument(
+        "--counter-batch-size",
+        type=int,
+        default=10,
+        help="""Number of host systems whose performance counters are fetched with one query.""",
+    )
     parser.add_argument(
         "-H",
         "--hostname",
@@ -1045,6 +1069,73 @@ def parse_arguments(argv: Sequence[str]) -> argparse.Namespace:
 #   |                                                                      |
 #   '----------------------------------------------------------------------'
 
+# The counter ID, instance and values of the performance counters of an entity
+PerfMetrics = list[tuple[str, str, list[str]]]
+
+
+def iter_elements(chunks: Iterable[str], tag: str) -> Iterator[str]:
+    """Yield the content of the <tag> elements of a document received in chunks
+
+    Just like the regular expressions used for the complete responses, this does not
+    support elements nested in elements of the same tag.
+
+    >>> list(iter_elements(["<a><o>1</o><o", ">2</o><o>3", "</o></a>"], "o"))
+    ['1', '2', '3']
+    """
+    start, end = f"<{tag}>", f"</{tag}>"
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        pos = 0
+        while (begin := buffer.find(start, pos)) != -1:
+            if (stop := buffer.find(end, begin + len(start))) == -1:
+                pos = begin
+                break
+            yield buffer[begin + len(start) : stop]
+            pos = stop + len(end)
+        else:
+            # Keep what may be the beginning of the next start tag
+            pos = max(pos, len(buffer) - len(start) + 1)
+        buffer = buffer[pos:]
+
+
+def iter_perf_entity_metrics(chunks: Iterable[str]) -> Iterator[tuple[str, PerfMetrics]]:
+    """Parse a QueryPerf response while it is received
+
+    The metrics of an entity are yielded as soon as they are complete and are dropped
+    from the parsed document afterwards.
+
+    >>> response = (
+    ...     '<QueryPerfResponse xmlns="urn:vim25"><returnval><entity>host-1</entity>'
+    ...     '<value><id><counterId>6</counterId><instance></instance></id>'
+    ...     '<value>1</value><value>2</value></value></returnval></QueryPerfResponse>'
+    ... )
+    >>> list(iter_perf_entity_metrics([response[:100], response[100:]]))
+    [('host-1', [('6', '', ['1', '2'])])]
+    """
+    parser = ElementTree.XMLPullParser(events=("end",))
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event in parser.read_events():
+            element = event[-1]
+            if (
+                not isinstance(element, ElementTree.Element)
+                or element.tag.rpartition("}")[2] != "returnval"
+            ):
+                continue
+            yield (
+                element.findtext("{*}entity", ""),
+                [
+                    (
+                        series.findtext("{*}id/{*}counterId", ""),
+                        series.findtext("{*}id/{*}instance", ""),
+                        [value.text or "" for value in series.iterfind("{*}value")],
+                    )
+                    for series in element.iterfind("{*}value")
+                ],
+            )
+            element.clear()
+
 
 class ESXCookieInvalid(RuntimeError):
     pass
@@ -1067,7 +1158,9 @@ class ESXSession(requests.Session):
         "</SOAP-ENV:Envelope>"
     )
 
-    def __init__(self, address: str, port: int, *, cert_check: bool | str = True) -> None:
+    def __init__(
+        self, address: str, port: int, *, cert_check: bool | str = True, pool_size: int = 10
+    ) -> None:
         super().__init__()
 
         if address.count(":") == 0:
@@ -1083,6 +1176,9 @@ class ESXSession(requests.Session):
             self.mount(service, HostnameValidationAdapter(cert_check))
 
         self._post_url = f"{service}/sdk"
+        # Keep a connection for each of the concurrent queries
+        if isinstance(adapter := self.get_adapter(self._post_url), requests.adapters.HTTPAdapter):
+            adapter.init_poolmanager(pool_size, pool_size)
         self.headers.update(
             {
                 "Content-Type": 'text/xml; charset="utf-8"',
@@ -1091,11 +1187,11 @@ class ESXSession(requests.Session):
             }
         )
 
-    def postsoap(self, request: str) -> requests.Response:
+    def postsoap(self, request: str, *, stream: bool = False) -> requests.Response:
         soapdata = ESXSession.ENVELOPE % request
         # Watch out: we must provide the verify keyword to every individual request call!
         # Else it will be overwritten by the REQUESTS_CA_BUNDLE env variable
-        return super().post(self._post_url, data=soapdata, verify=self.verify)
+        return super().post(self._post_url, data=soapdata, verify=self.verify, stream=stream)
 
 
 class ESXConnection:
@@ -1129,7 +1225,10 @@ class ESXConnection:
         self._perf_samples: None | int = None
 
         self._session = ESXSession(
-            address, port, cert_check=opt.cert_server_name or not opt.no_cert_check
+            address,
+            port,
+            cert_check=opt.cert_server_name or not opt.no_cert_check,
+            pool_size=max(10, opt.counter_workers),
         )
         self.system_info = self._fetch_systeminfo()
         self._soap_templates = SoapTemplates(self.system_info)
@@ -1187,6 +1286,48 @@ class ESXConnection:
 
         return "".join(response_data)
 
+    def _iter_response(self, payload: str) -> Iterator[str]:
+        """Yield the response to a request in chunks while it is received
+
+        The first chunk is at least RESPONSE_HEAD_SIZE characters long, unless the whole
+        response is shorter.
+        """
+        with self._session.postsoap(payload, stream=True) as response:
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+            chunks = (decoder.decode(c) for c in response.iter_content(RESPONSE_CHUNK_SIZE))
+            head = ""
+            for chunk in chunks:
+                head += chunk
+                if len(head) >= RESPONSE_HEAD_SIZE:
+                    break
+            self._check_not_authenticated(head[:RESPONSE_HEAD_SIZE])
+            yield head
+            yield from chunks
+            yield decoder.decode(b"", final=True)
+
+    def iter_objects(self, method: str, **kwargs: str) -> Iterator[str]:
+        """Yield the content of the <objects> of a RetrievePropertiesEx query one by one
+
+        The objects are extracted while the response is received and the following pages
+        are only requested once the previous one is processed. Neither a whole response
+        nor all of its pages have to be kept in memory.
+        """
+        payload = getattr(self._soap_templates, method) % kwargs
+        while True:
+            chunks = self._iter_response(payload)
+            head = next(chunks)
+            token = re.findall("<token>(.*)</token>", head[:RESPONSE_HEAD_SIZE])
+            yield from iter_elements(itertools.chain([head], chunks), "objects")
+            if not token:
+                break
+            payload = self._soap_templates.continuetoken % {"token": token[0]}
+
+    def iter_perf_metrics(self, specs: str) -> Iterator[tuple[str, PerfMetrics]]:
+        """Yield the performance counters of the entities of a QueryPerf query one by one"""
+        return iter_perf_entity_metrics(
+            self._iter_response(self._soap_templates.perfcounterdata % {"specs": specs})
+        )
+
     @property
     def perf_samples(self) -> int:
         """Return and cache the needed number of real-time samples
@@ -1248,21 +1389,17 @@ class ESXConnection:
 #   '----------------------------------------------------------------------'
 
 
-def fetch_available_counters(
-    connection: ESXConnection, hostsystems: Mapping[str, str]
-) -> dict[str, dict[str, list[str]]]:
-    counters_available_by_host: dict[str, dict[str, list[str]]] = {}
-    for host in hostsystems:
-        counter_avail_response = connection.query_server("perfcounteravail", esxhost=host)
-        elements = get_pattern(
-            "<counterId>([0-9]*)</counterId><instance>([^<]*)", counter_avail_response
-        )
+def fetch_available_counters(connection: ESXConnection, host: str) -> dict[str, list[str]]:
+    counter_avail_response = connection.query_server("perfcounteravail", esxhost=host)
+    elements = get_pattern(
+        "<counterId>([0-9]*)</counterId><instance>([^<]*)", counter_avail_response
+    )
 
-        data = counters_available_by_host.setdefault(host, {})
-        for counter, instance in elements:
-            data.setdefault(counter, []).append(instance)
+    counters_available: dict[str, list[str]] = {}
+    for counter, instance in elements:
+        counters_available.setdefault(counter, []).append(instance)
 
-    return counters_available_by_host
+    return counters_available
 
 
 def fetch_counters_syntax(
@@ -1310,39 +1447,25 @@ def fetch_extra_interface_counters(connection: ESXConnection, opt: argparse.Name
 
 
 def fetch_counters(
-    connection: ESXConnection, host: str, counters_selected: Sequence[tuple[str, list[str]]]
-) -> list[tuple[str, str, list[str]]]:
-    counter_data: list[str] = []
-    for entry, instances in counters_selected:
-        counter_data.extend(
+    connection: ESXConnection,
+    counters_selected_by_host: Mapping[str, Sequence[tuple[str, list[str]]]],
+    samples: int,
+) -> dict[str, PerfMetrics]:
+    """Fetch the counters of a batch of host systems with a single query"""
+    specs = []
+    for host, counters_selected in counters_selected_by_host.items():
+        counter_data = [
             "<ns1:metricId><ns1:counterId>%s</ns1:counterId><ns1:instance>%s</ns1:instance>"
             "</ns1:metricId>" % (entry, instance)
+            for entry, instances in counters_selected
             for instance in instances
+        ]
+        specs.append(
+            SoapTemplates.PERFCOUNTERSPEC
+            % {"esxhost": host, "counters": "".join(counter_data), "samples": str(samples)}
         )
 
-    response_text = connection.query_server(
-        "perfcounterdata",
-        esxhost=host,
-        counters="".join(counter_data),
-        samples=str(connection.perf_samples),
-    )
-
-    # Python regex only supports up to 100 match groups in a regex..
-    # We are only extracting the whole value line and split it later on
-    # This is a perfect candidate for "Catastrophic Backtracking" :)
-    # Someday we should replace all of these get_pattern calls with
-    # one of these new and fancy xml parsers I've heard from
-    elements: list[tuple[str, str, str]] = get_pattern(
-        "<id><counterId>(.*?)</counterId><instance>(.*?)</instance></id>(%s)"
-        % ("<value>.*?</value>" * connection.perf_samples),
-        response_text,
-    )
-    counters_value = []
-    for id_, instance, valuestring in elements:
-        values = get_pattern("<value>(.*?)</value>", valuestring)
-        counters_value.append((id_, instance, values))
-
-    return counters_value
+    return dict(connection.iter_perf_metrics("".join(specs)))
 
 
 def get_section_counters(
@@ -1352,26 +1475,41 @@ def get_section_counters(
     opt: argparse.Namespace,
 ) -> list[str]:
     section_lines = []
-    counters_available_by_host = fetch_available_counters(connection, hostsystems)
-    counters_available_all = {
-        counter  #
-        for by_host in counters_available_by_host.values()  #
-        for counter in by_host.keys()
-    }
-
-    net_extra_info = fetch_extra_interface_counters(connection, opt)
-    counters_description = fetch_counters_syntax(connection, counters_available_all)
+    hosts = list(hostsystems)
+    # Determine the number of samples once, before the queries are sent concurrently
+    samples = connection.perf_samples
+    with ThreadPoolExecutor(max_workers=opt.counter_workers) as executor:
+        counters_available_by_host = dict(
+            zip(hosts, executor.map(lambda h: fetch_available_counters(connection, h), hosts))
+        )
+        counters_available_all = {
+            counter  #
+            for by_host in counters_available_by_host.values()  #
+            for counter in by_host.keys()
+        }
 
-    for host in hostsystems:
-        counters_avail = counters_available_by_host[host]
+        net_extra_info = fetch_extra_interface_counters(connection, opt)
+        counters_description = fetch_counters_syntax(connection, counters_available_all)
 
-        counters_selected = [
-            (id_, instances)
-            for id_, instances in counters_avail.items()
-            if counters_description.get(id_, {}).get("key") in REQUESTED_COUNTERS_KEYS
-        ]
+        counters_selected_by_host = {
+            host: [
+                (id_, instances)
+                for id_, instances in counters_available_by_host[host].items()
+                if counters_description.get(id_, {}).get("key") in REQUESTED_COUNTERS_KEYS
+            ]
+            for host in hosts
+        }
+        counters_value_by_host: dict[str, PerfMetrics] = {}
+        for counters_values in executor.map(
+            lambda batch: fetch_counters(
+                connection, {h: counters_selected_by_host[h] for h in batch}, samples
+            ),
+            itertools.batched(hosts, opt.counter_batch_size),
+        ):
+            counters_value_by_host.update(counters_values)
 
-        counters_value = fetch_counters(connection, host, counters_selected)
+    for host in hosts:
+        counters_value = counters_value_by_host.get(host, [])
 
         counters_output = {}
         for id_, instance, counter_values in counters_value:
@@ -1525,12 +1663,9 @@ EVAL_FUNCTIONS: Mapping[
 def fetch_hostsystem_data(
     connection: ESXConnection,
 ) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
-    esxhostdetails_response = connection.query_server("esxhostdetails")
-    hostsystems_objects = get_pattern("<objects>(.*?)</objects>", esxhostdetails_response)
-
     hostsystems_properties: dict[str, dict[Any, Any]] = {}
     hostsystems_sensors: dict[str, dict[Any, Any]] = {}
-    for entry in hostsystems_objects:
+    for entry in connection.iter_objects("esxhostdetails"):
         hostname = get_pattern('<obj type="HostSystem">(.*)</obj>', entry[:512])[0]
         hostsystems_properties[hostname] = {}
         hostsystems_sensors[hostname] = {}
@@ -1876,10 +2011,7 @@ def fetch_virtual_machines(
     vm_esx_host: dict[str, list[str]] = {}
 
     # <objects><propSet><name>...</name><val ..>...</val></propSet></objects>
-    vmdetails_response = connection.query_server("vmdetails")
-
-    elements = get_pattern("<objects>(.*?)</objects>", vmdetails_response)
-    for entry in elements:
+    for entry in connection.iter_objects("vmdetails"):
         vm_data = dict(get_pattern("<name>(.*?)</name><val.*?>(.*?)</val>", entry))
         if opt.skip_placeholder_vm and is_placeholder_vm(vm_data.get("config.hardware.device", "")):
             continue
@@ -2079,6 +2211,7 @@ def main(argv: Sequence[str] | None = None) -> int:
         argv = sys.argv[1:]
 
     opt = parse_arguments(argv)
+    start_time = time.monotonic()
 
     socket.setdefaulttimeout(opt.timeout)
 
@@ -2101,6 +2234,12 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     sys.stdout.writelines("%s\n" % line for line in vsphere_output)
 
+    if opt.debug:
+        sys.stderr.write(
+            "Runtime: %.2f s, peak memory usage: %d KiB\n"
+            % (time.monotonic() - start_time, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+        )
+
     return 0
 
 
@@ -4,6 +4,7 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 
+import os
 import signal
 from types import FrameType
 from typing import NoReturn
@@ -22,4 +23,6 @@ def _handle_keepalive_interrupt(signum: int, frame: FrameType | None) -> NoRetur
 
 def create_rrd(rrd_interface: RRDInterface) -> None:
     signal.signal(signal.SIGINT, _handle_keepalive_interrupt)
-    RRDCreator(rrd_interface).create_rrds_keepalive(RRDConfig)
+    RRDCreator(rrd_interface, max_workers=min(4, os.cpu_count() or 1)).create_rrds_keepalive(
+        RRDConfig
+    )
@@ -20,7 +20,9 @@ import sys
 import time
 import traceback
 import xml.etree.ElementTree as ET
+from collections import deque
 from collections.abc import Callable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import assert_never, cast, Literal, NewType, Self, TypedDict
@@ -207,8 +209,7 @@ def _create_rrd(
         for nr, varname in enumerate(existing_metrics, 1):
             migration_mapping[varname] = nr
 
-    if not os.path.exists(host_dir):
-        os.makedirs(host_dir)
+    os.makedirs(host_dir, exist_ok=True)
 
     if config.cmc_log_rrdcreation():
         log(f"Creating {rrd_file_name}")
@@ -729,15 +730,21 @@ def _write_line(text: str) -> None:
 ####################################################################################################
 
 
+# Number of queued jobs handled in one go. Keep it small enough so that the answers
+# reach the core in time and we do not stop reading from stdin for too long.
+_MAX_JOB_BATCH_SIZE = 256
+
+
 class RRDCreator:
-    def __init__(self, rrd_interface: RRDInterface):
+    def __init__(self, rrd_interface: RRDInterface, max_workers: int = 1):
         self._rrd_interface = rrd_interface
+        self._max_workers = max_workers
         self._rrd_helper_output_buffer = b""
 
     def create_rrds_keepalive(self, config_class: type[RRDConfig]) -> None:
         input_buffer = b""
         self._rrd_helper_output_buffer = b""
-        job_queue = list[bytes]()
+        job_queue = deque[bytes]()
         console.verbose("Started Check_MK RRD creator.")
         try:
             # We read asynchronously from stdin and put the jobs into a queue.
@@ -762,13 +769,18 @@ class RRDCreator:
                         console.verbose("Core closed stdin, all jobs finished. Exiting.")
                         break
                     parts = (input_buffer + new_bytes).split(b"\n")
-                    job_queue += parts[:-1]
+                    job_queue.extend(parts[:-1])
                     input_buffer = parts[-1]
 
-                # Create *one* RRD file
+                # Create a batch of RRD files
                 if job_queue:
-                    self._handle_job(job_queue[0].decode("utf-8"), config_class)
-                    del job_queue[0]
+                    self._handle_jobs(
+                        [
+                            job_queue.popleft().decode("utf-8")
+                            for _ in range(min(len(job_queue), _MAX_JOB_BATCH_SIZE))
+                        ],
+                        config_class,
+                    )
 
         except Exception:
             if cmk.ccc.debug.enabled():
@@ -785,27 +797,64 @@ class RRDCreator:
         written = os.write(1, self._rrd_helper_output_buffer[:size])
         self._rrd_helper_output_buffer = self._rrd_helper_output_buffer[written:]
 
-    def _handle_job(self, spec: str, config_class: type[RRDConfig]) -> None:
-        parsed_spec = RRDSpec.parse(spec)
-        config = config_class(parsed_spec.host)
+    def _handle_jobs(self, jobs: Sequence[str], config_class: type[RRDConfig]) -> None:
+        """Create the RRDs of a batch of jobs
+
+        The jobs are grouped by their host directory: The jobs of one group are handled
+        one after another with a single config lookup per host, while the groups are
+        distributed over the worker pool. The answers are sent to the core in the order
+        of the jobs, no matter which job finished first."""
+        parsed_specs = [RRDSpec.parse(spec) for spec in jobs]
+        job_groups: dict[str, list[int]] = {}
+        for nr, parsed_spec in enumerate(parsed_specs):
+            job_groups.setdefault(pnp_cleanup(parsed_spec.host), []).append(nr)
+        responses: list[list[str]] = [[] for _ in jobs]
+
+        def handle_job_group(job_numbers: Sequence[int]) -> None:
+            configs: dict[HostName, RRDConfig] = {}
+            for nr in job_numbers:
+                host = parsed_specs[nr].host
+                if (config := configs.get(host)) is None:
+                    config = configs[host] = config_class(host)
+                self._handle_job(jobs[nr], parsed_specs[nr], config, responses[nr].append)
+
+        try:
+            if self._max_workers > 1 and len(job_groups) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=min(self._max_workers, len(job_groups))
+                ) as executor:
+                    for future in [
+                        executor.submit(handle_job_group, job_numbers)
+                        for job_numbers in job_groups.values()
+                    ]:
+                        future.result()
+            else:
+                for job_numbers in job_groups.values():
+                    handle_job_group(job_numbers)
+        finally:
+            for job_responses in responses:
+                for response in job_responses:
+                    self._queue_rrd_helper_response(response)
+
+    def _handle_job(
+        self, spec: str, parsed_spec: RRDSpec, config: RRDConfig, log: Callable[[str], None]
+    ) -> None:
         try:
-            self._create_rrd_from_spec(config, parsed_spec)
+            self._create_rrd_from_spec(config, parsed_spec, log)
         except self._rrd_interface.OperationalError as exc:
-            self._queue_rrd_helper_response(f"Error creating RRD: {exc!s}")
+            log(f"Error creating RRD: {exc!s}")
         except OSError as exc:
-            self._queue_rrd_helper_response(f"Error creating RRD: {exc.strerror}")
+            log(f"Error creating RRD: {exc.strerror}")
         except Exception as e:
             if cmk.ccc.debug.enabled():
                 raise
             create_crash_report()
-            self._queue_rrd_helper_response(
-                f"Error creating RRD for {spec}: {str(e) or traceback.format_exc()}"
-            )
+            log(f"Error creating RRD for {spec}: {str(e) or traceback.format_exc()}")
 
-    def _create_rrd_from_spec(self, config: RRDConfig, spec: RRDSpec) -> None:
-        rrd_file_name = _create_rrd(
-            self._rrd_interface, config, spec, self._queue_rrd_helper_response
-        )
+    def _create_rrd_from_spec(
+        self, config: RRDConfig, spec: RRDSpec, log: Callable[[str], None]
+    ) -> None:
+        rrd_file_name = _create_rrd(self._rrd_interface, config, spec, log)
 
         # Do first update right now
         now = time.time()
@@ -822,9 +871,7 @@ class RRDCreator:
         ]
         self._rrd_interface.update(*args)
 
-        self._queue_rrd_helper_response(
-            f"CREATED {spec.format} {spec.host};{spec.service};{';'.join(spec.metric_names)}",
-        )
+        log(f"CREATED {spec.format} {spec.host};{spec.service};{';'.join(spec.metric_names)}")
 
     def _queue_rrd_helper_response(self, response: str) -> None:
         self._rrd_helper_output_buffer += (response + "\n").encode("utf-8")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+from logging import Logger
+from pathlib import Path
+from typing import override
+
+import cmk.utils.paths
+from cmk.ccc.hostaddress import HostName
+from cmk.inventory.paths import Paths as InventoryPaths
+from cmk.inventory.structured_data import compact_inventory_archive
+from cmk.update_config.lib import ExpiryVersion
+from cmk.update_config.registry import update_action_registry, UpdateAction
+
+
+class CompactInventoryArchive(UpdateAction):
+    """
+    Replace archived HW/SW inventory trees by delta records.
+
+    Up to now every change of the inventory tree of a host has been archived as a full
+    copy of the previous tree. Only periodic snapshots are kept in full from now on.
+    """
+
+    @override
+    def __call__(self, logger: Logger) -> None:
+        self.compact_archives(cmk.utils.paths.omd_root, logger)
+
+    @staticmethod
+    def compact_archives(omd_root: Path, logger: Logger) -> None:
+        inv_paths = InventoryPaths(omd_root)
+        try:
+            host_dirs = list(inv_paths.archive_dir.iterdir())
+        except FileNotFoundError:
+            return
+
+        for host_dir in host_dirs:
+            if not host_dir.is_dir():
+                continue
+            logger.debug("Compact inventory archive of %s", host_dir.name)
+            compact_inventory_archive(inv_paths, HostName(host_dir.name))
+
+
+update_action_registry.register(
+    CompactInventoryArchive(
+        name="compact_inventory_archive",
+        title="Compact HW/SW inventory archive",
+        sort_index=101,  # can run whenever
+        expiry_version=ExpiryVersion.NEVER,
+    )
+)
@@ -10,11 +10,14 @@ import collections
 import itertools
 import sys
 from collections.abc import Callable, Iterator
+from dataclasses import dataclass
 from functools import lru_cache, wraps
 from typing import Any, ParamSpec, TypeVar
 
 P = ParamSpec("P")
 R = TypeVar("R")
+K = TypeVar("K")
+V = TypeVar("V")
 
 
 # Used as decorator wrapper for functools.lru_cache in order to bind the cache to an instance method
@@ -38,16 +41,54 @@ def instance_method_lru_cache(
     return wrap
 
 
+@dataclass(frozen=True)
+class CacheStatistics:
+    hits: int | None
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int | None
+
+
 class CacheManager:
     def __init__(self) -> None:
-        self._caches: dict[str, DictCache] = collections.defaultdict(DictCache)
+        self._caches: dict[str, DictCache[Any, Any]] = {}
+        self._maxsizes: dict[str, int] = {}
 
     def __contains__(self, name: str) -> bool:
         return name in self._caches
 
-    def obtain_cache(self, name: str) -> DictCache:
-        """get or create cache with provided name"""
-        return self._caches[name]
+    def obtain_cache(self, name: str, maxsize: int | None = None) -> DictCache[Any, Any]:
+        """get or create cache with provided name
+
+        A cache created with a maxsize evicts its least recently used entries
+        once it holds more than maxsize entries. Without a maxsize, the one set
+        by set_maxsize() applies. Obtaining an existing cache with a different
+        maxsize is an error."""
+        if maxsize is None:
+            maxsize = self._maxsizes.get(name)
+        try:
+            cache = self._caches[name]
+        except KeyError:
+            return self._caches.setdefault(
+                name, DictCache() if maxsize is None else LRUDictCache(maxsize)
+            )
+        if cache.maxsize != maxsize:
+            raise ValueError(
+                f"Cache {name!r} already exists with maxsize {cache.maxsize}, requested {maxsize}"
+            )
+        return cache
+
+    def set_maxsize(self, name: str, maxsize: int) -> None:
+        """bound the cache with the provided name, also after clear()
+
+        Only long running processes should do this: a bound below the number of
+        keys walked by a run of cmk makes every lookup of the walk a miss."""
+        if name in self._caches and self._caches[name].maxsize != maxsize:
+            raise ValueError(
+                f"Cache {name!r} already exists with maxsize {self._caches[name].maxsize}"
+            )
+        self._maxsizes[name] = maxsize
 
     def clear(self) -> None:
         self._caches.clear()
@@ -59,6 +100,9 @@ class CacheManager:
     def dump_sizes(self) -> dict[str, int]:
         return {name: _total_size(cache) for name, cache in self._caches.items()}
 
+    def dump_statistics(self) -> dict[str, CacheStatistics]:
+        return {name: cache.statistics() for name, cache in self._caches.items()}
+
 
 def _total_size(o: object) -> int:
     """Returns the approximate memory footprint an object and all of its contents.
@@ -91,8 +135,29 @@ def _total_size(o: object) -> int:
     return sizeof(o)
 
 
-class DictCache(dict):
+class DictCache(dict[K, V]):
+    """A dict counting the misses of the lookups by key
+
+    The hits are not counted: the lookups stay those of dict."""
+
     _populated = False
+    maxsize: int | None = None
+    hits: int | None = None
+    misses = 0
+    evictions = 0
+
+    def __missing__(self, key: K) -> V:
+        self.misses += 1
+        raise KeyError(key)
+
+    def statistics(self) -> CacheStatistics:
+        return CacheStatistics(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self),
+            maxsize=self.maxsize,
+        )
 
     def is_empty(self) -> bool:
         """Whether or not there is something in the collection at the moment"""
@@ -115,6 +180,75 @@ class DictCache(dict):
         self.set_not_populated()
 
 
+class LRUDictCache(DictCache[K, V]):
+    """A DictCache holding at most maxsize entries
+
+    The order of use is tracked separately: evicting from the front of a plain dict
+    gets slower with every entry deleted there."""
+
+    maxsize: int
+
+    hits: int
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+        self.hits = 0
+        self._order: collections.OrderedDict[K, None] = collections.OrderedDict()
+
+    def __getitem__(self, key: K) -> V:
+        value = super().__getitem__(key)
+        self.hits += 1
+        self._order.move_to_end(key)
+        return value
+
+    def get(self, key: K, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: K, value: V) -> None:
+        super().__setitem__(key, value)
+        self._order[key] = None
+        self._order.move_to_end(key)
+        self._evict()
+
+    def __delitem__(self, key: K) -> None:
+        super().__delitem__(key)
+        del self._order[key]
+
+    def setdefault(self, key: K, default: V) -> V:
+        if key in self:
+            self._order.move_to_end(key)
+            return super().__getitem__(key)
+        self[key] = default
+        return default
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def pop(self, key: K, *default: Any) -> Any:
+        self._order.pop(key, None)
+        return super().pop(key, *default)
+
+    def popitem(self) -> tuple[K, V]:
+        key, value = super().popitem()
+        del self._order[key]
+        return key, value
+
+    def clear(self) -> None:
+        super().clear()
+        self._order.clear()
+
+    def _evict(self) -> None:
+        while len(self._order) > self.maxsize:
+            key, _none = self._order.popitem(last=False)
+            super().__delitem__(key)
+            self.evictions += 1
+
+
 # This cache manager holds all caches that rely on the configuration
 # and have to be flushed once the configuration is reloaded in the
 # keepalive mode
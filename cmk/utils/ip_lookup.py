@@ -8,6 +8,8 @@ from __future__ import annotations
 import enum
 import ipaddress
 import socket
+import struct
+import time
 from collections.abc import (
     Callable,
     Container,
@@ -17,9 +19,10 @@ from collections.abc import (
     MutableMapping,
     Sequence,
 )
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, assert_never, Final, Generic, Literal, Protocol, TypeVar
+from typing import Any, assert_never, Final, Generic, Literal, NamedTuple, Protocol, TypeVar
 
 import cmk.ccc.debug
 import cmk.utils.paths
@@ -31,6 +34,13 @@ from cmk.utils.log import console
 
 IPLookupCacheId = tuple[HostName | HostAddress, socket.AddressFamily]
 
+# getaddrinfo() does not tell us the TTL of the DNS records, so all entries of
+# the persisted cache are considered valid for this long (in seconds).
+DNS_CACHE_TTL: Final = 24 * 3600
+
+# Number of concurrent lookups of prefetch_dns_lookups()
+_DNS_LOOKUP_WORKERS: Final = 32
+
 
 _FALLBACK_V4 = HostAddress("0.0.0.0")
 _FALLBACK_V6 = HostAddress("::")
@@ -134,27 +144,58 @@ def make_lookup_ip_address(
         return lambda host_name, family: ip_config.fake_dns
     if ip_config.simulation_mode:
         return local_ip_for
+    return DNSLookup(ip_config)
+
+
+class DNSLookup:
+    """Look up the IP address of a host as configured, using DNS if needed"""
+
+    def __init__(self, ip_config: IPLookupConfig) -> None:
+        self._config: Final = ip_config
+
+    def _configured_ip_address(
+        self,
+        host_name: HostName,
+        family: Literal[socket.AddressFamily.AF_INET, socket.AddressFamily.AF_INET6],
+    ) -> HostAddress | None:
+        return (
+            self._config.ipv4_addresses
+            if family is socket.AddressFamily.AF_INET
+            else self._config.ipv6_addresses
+        ).get(host_name)
 
-    def _wrapped_lookup(
+    def _is_snmp_usewalk_host(self, host_name: HostName) -> bool:
+        return self._config.is_use_walk_host(host_name) and self._config.is_snmp_host(host_name)
+
+    def __call__(
+        self,
         host_name: HostName,
         family: Literal[socket.AddressFamily.AF_INET, socket.AddressFamily.AF_INET6],
     ) -> HostAddress:
         return _lookup_ip_address(
             host_name=host_name,
             family=family,
-            configured_ip_address=(
-                ip_config.ipv4_addresses
-                if family is socket.AddressFamily.AF_INET
-                else ip_config.ipv6_addresses
-            ).get(host_name),
-            is_snmp_usewalk_host=(
-                ip_config.is_use_walk_host(host_name) and ip_config.is_snmp_host(host_name)
-            ),
-            is_dyndns_host=ip_config.is_dyndns_host(host_name),
-            force_file_cache_renewal=not ip_config.use_dns_cache,
+            configured_ip_address=self._configured_ip_address(host_name, family),
+            is_snmp_usewalk_host=self._is_snmp_usewalk_host(host_name),
+            is_dyndns_host=self._config.is_dyndns_host(host_name),
+            force_file_cache_renewal=not self._config.use_dns_cache,
         )
 
-    return _wrapped_lookup
+    def prefetch(self, host_names: Iterable[HostName]) -> None:
+        """Resolve the addresses of all given hosts that need DNS at once
+
+        The later calls to this lookup are then answered from the config cache.
+        """
+        prefetch_dns_lookups(
+            (
+                (host_name, family)
+                for host_name, family in _annotate_family(host_names, self._config.ip_stack_config)
+                if not self._is_snmp_usewalk_host(host_name)
+                and not self._configured_ip_address(host_name, family)
+                and not self._config.is_dyndns_host(host_name)
+            ),
+            force_file_cache_renewal=not self._config.use_dns_cache,
+        )
 
 
 class ConfiguredIPLookup(Generic[_TErrHandler]):
@@ -186,6 +227,10 @@ class ConfiguredIPLookup(Generic[_TErrHandler]):
 
         return fallback_ip_for(family)
 
+    def prefetch(self, host_names: Iterable[HostName]) -> None:
+        if isinstance(self._lookup, DNSLookup):
+            self._lookup.prefetch(host_names)
+
 
 def fallback_ip_for(
     family: Literal[socket.AddressFamily.AF_INET, socket.AddressFamily.AF_INET6],
@@ -352,28 +397,128 @@ def _actual_dns_lookup(
         )
 
 
+def _try_dns_lookup(cache_id: IPLookupCacheId) -> HostAddress | MKIPAddressLookupError:
+    host_name, family = cache_id
+    try:
+        return _actual_dns_lookup(host_name=host_name, family=family)
+    except MKIPAddressLookupError as e:
+        return e
+
+
+def prefetch_dns_lookups(
+    cache_ids: Iterable[IPLookupCacheId],
+    *,
+    force_file_cache_renewal: bool,
+    max_workers: int = _DNS_LOOKUP_WORKERS,
+) -> None:
+    """Resolve many host names concurrently and fill both layers of cached_dns_lookup()
+
+    Only the lookups that cached_dns_lookup() would not answer from its caches are
+    made. In addition, entries of the file based cache are refreshed once their TTL
+    has expired. Just like for single lookups, a failed lookup falls back to the
+    previously cached address.
+    """
+    config_cache: dict[IPLookupCacheId, HostAddress | MKIPAddressLookupError] = (
+        cache_manager.obtain_cache("cached_dns_lookup")
+    )
+    ip_lookup_cache = _get_ip_lookup_cache()
+    now = time.time()
+    to_resolve = [
+        cache_id
+        for cache_id in dict.fromkeys(cache_ids)
+        if cache_id not in config_cache
+        and (force_file_cache_renewal or ip_lookup_cache.is_expired(cache_id, now))
+    ]
+    if not to_resolve:
+        return
+
+    console.verbose(f"Resolving {len(to_resolve)} host addresses via DNS...")
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(to_resolve))) as executor:
+        results = list(executor.map(_try_dns_lookup, to_resolve))
+
+    resolved: dict[IPLookupCacheId, HostAddress] = {}
+    for cache_id, result in zip(to_resolve, results):
+        cached_ip = ip_lookup_cache.get(cache_id)
+        if isinstance(result, HostAddress):
+            if result != cached_ip:
+                console.verbose(f"Updating DNS cache for {cache_id[0]}: {result}")
+            resolved[cache_id] = config_cache[cache_id] = result
+        else:
+            config_cache[cache_id] = cached_ip or result
+
+    ip_lookup_cache.update(resolved)
+
+
+class IPLookupCacheEntry(NamedTuple):
+    address: HostAddress
+    verified: float
+    ttl: int
+
+
 class IPLookupCacheSerializer:
+    """Packs the cache entries into a compact binary format
+
+    The format starts with a magic line followed by one record per entry:
+    address family (4 or 6), time of the last verification, TTL, length of the
+    host name, length of the address, the host name and the address.
+    Files in the former repr() based format are still read.
+    """
+
+    MAGIC: Final = b"\x00cmk-ip-lookup-cache-1\n"
+    _RECORD: Final = struct.Struct("<BdIHB")
+
     def __init__(self) -> None:
         self._dim_serializer = store.DimSerializer()
 
-    def serialize(self, data: Mapping[IPLookupCacheId, HostAddress]) -> bytes:
-        return self._dim_serializer.serialize(
-            {
-                (str(hn), {socket.AF_INET: 4, socket.AF_INET6: 6}[f]): v
-                for (hn, f), v in data.items()
-            }
-        )
+    def serialize(self, data: Mapping[IPLookupCacheId, IPLookupCacheEntry]) -> bytes:
+        chunks = [self.MAGIC]
+        for (host_name, family), entry in data.items():
+            name = str(host_name).encode("utf-8")
+            address = str(entry.address).encode("utf-8")
+            chunks.append(
+                self._RECORD.pack(
+                    {socket.AF_INET: 4, socket.AF_INET6: 6}[family],
+                    entry.verified,
+                    entry.ttl,
+                    len(name),
+                    len(address),
+                )
+            )
+            chunks.append(name)
+            chunks.append(address)
+        return b"".join(chunks)
+
+    def deserialize(self, raw: bytes) -> Mapping[IPLookupCacheId, IPLookupCacheEntry]:
+        if not raw.startswith(self.MAGIC):
+            return self._deserialize_legacy(raw)
+
+        data: dict[IPLookupCacheId, IPLookupCacheEntry] = {}
+        offset = len(self.MAGIC)
+        while offset < len(raw):
+            family, verified, ttl, name_length, address_length = self._RECORD.unpack_from(
+                raw, offset
+            )
+            offset += self._RECORD.size
+            name = raw[offset : offset + name_length].decode("utf-8")
+            offset += name_length
+            address = raw[offset : offset + address_length].decode("utf-8")
+            offset += address_length
+            data[(HostName(name), {4: socket.AF_INET, 6: socket.AF_INET6}[family])] = (
+                IPLookupCacheEntry(HostAddress(address), verified, ttl)
+            )
+        return data
 
-    def deserialize(self, raw: bytes) -> Mapping[IPLookupCacheId, HostAddress]:
+    def _deserialize_legacy(self, raw: bytes) -> Mapping[IPLookupCacheId, IPLookupCacheEntry]:
         loaded_object = self._dim_serializer.deserialize(raw)
         assert isinstance(loaded_object, dict)
 
+        # We do not know when these have been verified, so they are refreshed soon
         return {
             (
                 (HostName(k), socket.AF_INET)  # old pre IPv6 style
                 if isinstance(k, str)
                 else (HostName(k[0]), {4: socket.AF_INET, 6: socket.AF_INET6}[k[1]])
-            ): HostAddress(v)
+            ): IPLookupCacheEntry(HostAddress(v), 0.0, DNS_CACHE_TTL)
             for k, v in loaded_object.items()
         }
 
@@ -381,8 +526,14 @@ class IPLookupCacheSerializer:
 class IPLookupCache:
     PATH = cmk.utils.paths.var_dir / "ipaddresses.cache"
 
-    def __init__(self, cache: MutableMapping[IPLookupCacheId, HostAddress]) -> None:
+    def __init__(
+        self,
+        cache: MutableMapping[IPLookupCacheId, HostAddress],
+        verified: MutableMapping[IPLookupCacheId, tuple[float, int]] | None = None,
+    ) -> None:
         self._cache = cache
+        # Time of the last verification and TTL of the entries in _cache
+        self._verified = {} if verified is None else verified
         self._persist_on_update = True
         self._store = store.ObjectStore(self.PATH, serializer=IPLookupCacheSerializer())
 
@@ -410,9 +561,27 @@ class IPLookupCache:
     def get(self, key: IPLookupCacheId) -> HostAddress | None:
         return self._cache.get(key)
 
+    def is_expired(self, key: IPLookupCacheId, now: float) -> bool:
+        """Missing entries are considered to be expired"""
+        if key not in self._cache:
+            return True
+        verified, ttl = self._verified.get(key, (0.0, DNS_CACHE_TTL))
+        return not 0 <= now - verified < ttl
+
+    def _update_from(self, entries: Mapping[IPLookupCacheId, IPLookupCacheEntry]) -> None:
+        for cache_id, entry in entries.items():
+            self._cache[cache_id] = entry.address
+            self._verified[cache_id] = entry.verified, entry.ttl
+
+    def _set(self, entries: Mapping[IPLookupCacheId, HostAddress]) -> None:
+        now = time.time()
+        for cache_id, ipa in entries.items():
+            self._cache[cache_id] = ipa
+            self._verified[cache_id] = now, DNS_CACHE_TTL
+
     def load_persisted(self) -> None:
         try:
-            self._cache.update(self._store.read_obj(default={}))
+            self._update_from(self._store.read_obj(default={}))
         except (MKTerminate, MKTimeout):
             # We should be more specific with the exception handler below, then we
             # could drop this special handling here
@@ -442,33 +611,57 @@ class IPLookupCache:
         The cache can only be cleaned up with the "Update DNS cache" option in WATO
         or the "cmk --update-dns-cache" call that both call update_dns_cache().
         """
+        self.update({cache_id: ipa})
+
+    def update(self, entries: Mapping[IPLookupCacheId, HostAddress]) -> None:
+        """Add new / verified entries, see __setitem__"""
         if not self._persist_on_update:
-            self._cache[cache_id] = ipa
+            self._set(entries)
             return
 
         with self._store.locked():
-            self._cache.update(self._store.read_obj(default={}))
-            self._cache[cache_id] = ipa
+            self._update_from(self._store.read_obj(default={}))
+            self._set(entries)
             self.save_persisted()
 
     def save_persisted(self) -> None:
-        self._store.write_obj(self._cache)
+        self._store.write_obj(
+            {
+                cache_id: IPLookupCacheEntry(
+                    ipa, *self._verified.get(cache_id, (0.0, DNS_CACHE_TTL))
+                )
+                for cache_id, ipa in self._cache.items()
+            }
+        )
 
     def clear(self) -> None:
         """Clear the persisted AND in memory cache"""
         self._cache.clear()
+        self._verified.clear()
         self.save_persisted()
 
 
+# All callers share one instance, so that disabling the persistence (see
+# update_dns_cache()) applies to all lookups, including the prefetch.
+_ip_lookup_cache: IPLookupCache | None = None
+
+
 def _get_ip_lookup_cache() -> IPLookupCache:
     """A file based fall-back DNS cache in case resolution fails"""
-    if "ip_lookup" in cache_manager:
-        # Return already created and initialized cache
-        return IPLookupCache(cache_manager.obtain_cache("ip_lookup"))
+    global _ip_lookup_cache
+    if _ip_lookup_cache is None:
+        _ip_lookup_cache = IPLookupCache(
+            cache_manager.obtain_cache("ip_lookup"),
+            cache_manager.obtain_cache("ip_lookup_verified"),
+        )
+        _ip_lookup_cache.load_persisted()
+    return _ip_lookup_cache
+
 
-    cache = IPLookupCache(cache_manager.obtain_cache("ip_lookup"))
-    cache.load_persisted()
-    return cache
+def reset_ip_lookup_cache() -> None:
+    """Drop the shared IP lookup cache, to be called when clearing the cache manager"""
+    global _ip_lookup_cache
+    _ip_lookup_cache = None
 
 
 def update_dns_cache(
@@ -478,6 +671,7 @@ def update_dns_cache(
     lookup_ip_address: IPLookup,
 ) -> tuple[int, Sequence[HostName]]:
     failed = []
+    hosts = list(hosts)
 
     ip_lookup_cache = _get_ip_lookup_cache()
 
@@ -486,6 +680,8 @@ def update_dns_cache(
         ip_lookup_cache.clear()
 
         console.verbose("Updating DNS cache...")
+        if isinstance(lookup_ip_address, DNSLookup):
+            lookup_ip_address.prefetch(hosts)
         # `_annotate_family()` handles DUAL_STACK and NO_IP
         for host_name, family in _annotate_family(hosts, get_ip_stack_config):
             console.verbose_no_lf(f"{host_name} ({family})...")
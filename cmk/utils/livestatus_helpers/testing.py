@@ -539,7 +539,9 @@ def execute_query(
 
         # Filtering and Aggregating
         filtered_dicts = evaluate_filter(query, tables[table].get(site_name, []))
-        result_dicts = evaluate_stats(query, query_columns, filtered_dicts)
+        result_dicts = evaluate_order_by(
+            query, evaluate_stats(query, query_columns, filtered_dicts)
+        )
 
         # Flatten the result for serialization.
         for entry in result_dicts:
@@ -1005,6 +1007,24 @@ def evaluate_stats(query: str, columns: list[ColumnName], result: ResultList) ->
     return aggregated
 
 
+def evaluate_order_by(query: str, result: ResultList) -> ResultList:
+    """Sort the result like Livestatus does for the OrderBy: header
+
+    Examples:
+
+        >>> evaluate_order_by("GET hosts\\nOrderBy: name desc", [{"name": "a"}, {"name": "b"}])
+        [{'name': 'b'}, {'name': 'a'}]
+
+        >>> evaluate_order_by("GET hosts", [{"name": "a"}, {"name": "b"}])
+        [{'name': 'a'}, {'name': 'b'}]
+
+    """
+    if not (order_by := pick_header(query, "OrderBy", "")):
+        return result
+    column, *direction = order_by.split()
+    return sorted(result, key=lambda entry: entry[column], reverse=direction == ["desc"])
+
+
 def make_reducer_func(line: str) -> ReduceFunc:
     """
 
@@ -7,15 +7,16 @@ import dataclasses
 import logging
 import os
 import subprocess
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from logging import Logger
 from pathlib import Path
+from typing import Final, NamedTuple
 
 from cmk.ccc.config_path import VersionedConfigPath
 from cmk.ccc.exceptions import MKGeneralException
 from cmk.ccc.hostaddress import HostName
 from cmk.ccc.i18n import _
-from cmk.ccc.store import load_object_from_file, save_object_to_file
+from cmk.ccc.store import load_object_from_file, locked, save_object_to_file
 from cmk.utils.labels import Labels
 from cmk.utils.notify_types import NotificationContext as NotificationContext
 from cmk.utils.paths import omd_root
@@ -121,3 +122,86 @@ def _get_host_file_path(config_path: Path | None = None, host_name: HostName | N
     if host_name:
         return root_path / "notify" / "host_config" / host_name
     return root_path / "notify" / "host_config"
+
+
+class _BacklogHead(NamedTuple):
+    next: int
+    size: int
+
+
+class NotificationBacklog:
+    """The most recent notification contexts, kept for analysis and replay
+
+    The contexts are stored in a ring of slot files, so storing a context only
+    writes this very context instead of rewriting the whole backlog. The "head"
+    file keeps the number of the next slot to write and the size of the ring.
+    Index 0 always refers to the most recent context.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path: Final = path
+        self._head_path: Final = path / "head"
+        self._lock_path: Final = path / "backlog.lock"
+        # The backlog used to be a single file holding all contexts, newest first
+        self._legacy_path: Final = path.with_suffix(".mk")
+
+    def append(self, context: Mapping[str, object], *, size: int) -> None:
+        with locked(self._lock_path):
+            if not size:
+                # Only clear the backlog once, not with every notification
+                if self._legacy_path.exists() or self._read_head().size:
+                    self._write([], 0)
+                    self._legacy_path.unlink(missing_ok=True)
+                return
+
+            head = self._read_head()
+            if head.size != size:
+                head = self._write(self._read(head), size)
+            save_object_to_file(self._slot_path(head.next % size), context)
+            self._save_head(_BacklogHead(head.next + 1, size))
+
+    def load(self) -> list[NotificationContext]:
+        with locked(self._lock_path):
+            return self._read(self._read_head())
+
+    def get(self, nr: int) -> NotificationContext | None:
+        with locked(self._lock_path):
+            head = self._read_head()
+            if nr < 0 or nr >= min(head.next, head.size):
+                return None
+            context: NotificationContext = load_object_from_file(
+                self._slot_path((head.next - 1 - nr) % head.size), default={}
+            )
+            return context
+
+    def _slot_path(self, slot: int) -> Path:
+        return self.path / f"{slot}.mk"
+
+    def _read_head(self) -> _BacklogHead:
+        if self._legacy_path.exists():
+            contexts = load_object_from_file(self._legacy_path, default=[])
+            head = self._write(contexts, len(contexts))
+            self._legacy_path.unlink()
+            logger.info("Migrated notification backlog from %s", self._legacy_path)
+            return head
+        return _BacklogHead(*load_object_from_file(self._head_path, default=(0, 0)))
+
+    def _save_head(self, head: _BacklogHead) -> None:
+        save_object_to_file(self._head_path, tuple(head))
+
+    def _read(self, head: _BacklogHead) -> list[NotificationContext]:
+        return [
+            load_object_from_file(self._slot_path((head.next - 1 - nr) % head.size), default={})
+            for nr in range(min(head.next, head.size))
+        ]
+
+    def _write(self, contexts: Sequence[Mapping[str, object]], size: int) -> _BacklogHead:
+        """Replace the whole ring, e.g. after the size has been changed"""
+        for slot_path in self.path.glob("*.mk"):
+            slot_path.unlink()
+        contexts = contexts[:size]
+        for slot, context in enumerate(reversed(contexts)):
+            save_object_to_file(self._slot_path(slot), context)
+        head = _BacklogHead(len(contexts), size)
+        self._save_head(head)
+        return head
@@ -186,6 +186,16 @@ class RulesetMatcher:
         # self._service_match_cache works also in the case of changed labels, so we DON'T need to clear it.
         self.ruleset_optimizer.clear_caches()
 
+    def cache_sizes(self) -> dict[str, int]:
+        """The number of entries of the caches, for introspection
+
+        These caches are looked up in the innermost loops of the rule matching, so
+        they are plain dicts without any statistics."""
+        return {
+            "service_match": len(self._service_match_cache),
+            **self.ruleset_optimizer.cache_sizes(),
+        }
+
     def get_host_bool_value(
         self,
         hostname: HostName,
@@ -432,6 +442,13 @@ class RulesetOptimizer:
         self.__host_ruleset_cache.clear()
         self._all_matching_hosts_match_cache.clear()
 
+    def cache_sizes(self) -> dict[str, int]:
+        return {
+            "service_ruleset": len(self.__service_ruleset_cache),
+            "host_ruleset": len(self.__host_ruleset_cache),
+            "all_matching_hosts": len(self._all_matching_hosts_match_cache),
+        }
+
     def set_all_processed_hosts(self, all_processed_hosts: set[HostName]) -> None:
         involved_clusters: set[HostName] = set()
         involved_nodes: set[HostName] = set()
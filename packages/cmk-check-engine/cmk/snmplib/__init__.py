@@ -8,6 +8,7 @@ from ._detect import SNMPDetectAtom as SNMPDetectAtom
 from ._detect import SNMPDetectBaseType as SNMPDetectBaseType
 from ._detect import SNMPDetectSpec as SNMPDetectSpec
 from ._getoid import get_single_oid as get_single_oid
+from ._getoid import prefetch_oids as prefetch_oids
 from ._table import get_snmp_table as get_snmp_table
 from ._table import SNMPDecodedString as SNMPDecodedString
 from ._table import SNMPRawData as SNMPRawData
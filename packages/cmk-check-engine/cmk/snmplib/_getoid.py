@@ -3,7 +3,7 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from contextlib import suppress
 
 import cmk.ccc.cleanup
@@ -12,7 +12,7 @@ from cmk.ccc import tty
 from cmk.ccc.exceptions import MKGeneralException
 
 from ._table import SNMPDecodedString
-from ._typedefs import ensure_str, OID, SNMPBackend, SNMPSectionName
+from ._typedefs import ensure_str, OID, SNMPBackend, SNMPContext, SNMPSectionName
 
 
 # Contextes can only be used when check_plugin_name is given.
@@ -67,3 +67,40 @@ def get_single_oid(
 
     single_oid_cache[oid] = decoded_value
     return decoded_value
+
+
+def prefetch_oids(
+    oids: Iterable[str],
+    *,
+    context: SNMPContext,
+    single_oid_cache: dict[OID, SNMPDecodedString | None],
+    backend: SNMPBackend,
+    log: Callable[[str], None],
+) -> None:
+    """Fetch the OIDs with as few requests as possible and put them into the cache
+
+    Only the OIDs answered by the device are cached. All others are left to
+    get_single_oid(), which also handles errors and multiple SNMP contexts.
+    """
+    missing = {oid for oid in oids if oid.startswith(".")} - single_oid_cache.keys()
+    if not missing:
+        return
+
+    log(f"       Getting {len(missing)} OIDs...")
+    try:
+        values = backend.get_many(sorted(missing), context=context)
+    except Exception:
+        if cmk.ccc.debug.enabled():
+            raise
+        log("       Getting OIDs failed.")
+        return
+
+    for oid, value in values.items():
+        if oid not in missing:
+            continue
+        if value is None:
+            log(f"       Getting OID {oid} failed.")
+            single_oid_cache[oid] = None
+            continue
+        log(f"       Got OID {oid}: {tty.bold}{tty.green}{value!r}{tty.normal}")
+        single_oid_cache[oid] = ensure_str(value, encoding=backend.config.character_encoding)
@@ -237,6 +237,16 @@ class SNMPBackend(abc.ABC):
         """
         raise NotImplementedError()
 
+    def get_many(
+        self, /, oids: Sequence[OID], *, context: SNMPContext
+    ) -> Mapping[OID, SNMPRawValue | None]:
+        """Fetch several OIDs from the given host in the given SNMP context
+        Backends may override this to fetch them with as few requests as possible.
+        OIDs missing in the result could not be fetched this way and have to be
+        fetched using get().
+        """
+        return {oid: self.get(oid, context=context) for oid in oids}
+
     @abc.abstractmethod
     def walk(
         self,
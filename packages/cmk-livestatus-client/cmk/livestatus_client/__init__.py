@@ -8,6 +8,8 @@ from __future__ import annotations
 
 import ast
 import contextlib
+import heapq
+import itertools
 import json
 import os
 import re
@@ -22,6 +24,7 @@ from datetime import datetime
 from enum import Enum
 from functools import cache
 from io import BytesIO
+from operator import itemgetter
 from typing import Any, Literal, NamedTuple, NewType, NotRequired, override, TypedDict
 
 from cmk import trace
@@ -502,6 +505,25 @@ class Query:
             return False
         return self._query.supports_json_format()
 
+    @property
+    def columns(self) -> Sequence[str]:
+        if isinstance(self._query, QuerySpecification):
+            return self._query.columns
+        for line in self._query.splitlines():
+            if line.startswith("Columns:"):
+                return line[len("Columns:") :].split()
+        return []
+
+
+class OrderBy(NamedTuple):
+    """Let the sites sort the rows of a query by one of the queried columns"""
+
+    column: str
+    descending: bool = False
+
+    def header(self) -> str:
+        return f"OrderBy: {self.column} {'desc' if self.descending else 'asc'}\n"
+
 
 QueryTypes = str | Query
 OnlySites = list[SiteId] | None
@@ -584,6 +606,7 @@ class SingleSiteConnection(Helpers):
         # never filled, just to have the same API as MultiSiteConnection (TODO: Cleanup)
         self.deadsites: dict[SiteId, DeadSite] = {}
         self.limit: int | None = None
+        self.order_by: OrderBy | None = None
         self.auth_header = ""
         self.persist = persist
         self.allow_cache = allow_cache
@@ -920,12 +943,18 @@ class SingleSiteConnection(Helpers):
     def set_limit(self, limit: int | None = None) -> None:
         self.limit = limit
 
+    def set_order_by(self, order_by: OrderBy | None = None) -> None:
+        self.order_by = order_by
+
     @override
     def query(self, query: QueryTypes, add_headers: str = "") -> LivestatusResponse:
         # Normalize argument types
         normalized_add_headers = add_headers
         normalized_query = Query(query) if not isinstance(query, Query) else query
 
+        if self.order_by is not None:
+            normalized_add_headers += self.order_by.header()
+
         if self.limit is not None:
             normalized_query = Query(
                 "%sLimit: %d\n" % (normalized_query, self.limit),
@@ -1045,6 +1074,7 @@ class MultiSiteConnection(Helpers):
         self.prepend_site = False
         self.only_sites: OnlySites = None
         self.limit: int | None = None
+        self.order_by: OrderBy | None = None
         self.parallelize = True
         self._only_sites_postprocess = only_sites_postprocess
 
@@ -1218,6 +1248,15 @@ class MultiSiteConnection(Helpers):
         """Impose Limit on number of returned datasets (distributed among sites)"""
         self.limit = limit
 
+    def set_order_by(self, order_by: OrderBy | None = None) -> None:
+        """Let the sites sort the rows and merge their sorted rows
+
+        The limit is then applied to the merged rows, so the result only
+        contains the first rows of all sites together. The column to order
+        by has to be part of the queried columns.
+        """
+        self.order_by = order_by
+
     def dead_sites(self) -> dict[SiteId, DeadSite]:
         return self.deadsites
 
@@ -1260,6 +1299,9 @@ class MultiSiteConnection(Helpers):
             return self.query_non_parallel(normalized_query, normalized_add_headers)
 
     def query_non_parallel(self, query: Query, add_headers: str = "") -> LivestatusResponse:
+        if self.order_by is not None:
+            return self._query_ordered(query, add_headers, self.order_by)
+
         result = LivestatusResponse([])
         stillalive = []
         limit = self.limit
@@ -1298,6 +1340,57 @@ class MultiSiteConnection(Helpers):
         Limit: is simply applied to all sites - resulting in possibly more results then Limit
         requests.
         """
+        if self.order_by is not None:
+            return self._query_ordered(query, add_headers, self.order_by)
+
+        return LivestatusResponse(
+            [row for rows in self._query_sites(query, add_headers) for row in rows]
+        )
+
+    def _query_ordered(
+        self, query: Query, add_headers: str, order_by: OrderBy
+    ) -> LivestatusResponse:
+        """Let every site sort its rows and merge the sorted rows of all sites
+
+        Every site returns up to Limit: rows, so the first Limit: rows of the
+        merged rows are the first rows of all sites together. Sites rejecting the
+        OrderBy: header, e.g. sites of older versions, are queried without it and
+        their rows are sorted here.
+        """
+        try:
+            key_index = list(query.columns).index(order_by.column)
+        except ValueError:
+            # Nothing to sort by, the caller has to sort the rows on its own
+            return LivestatusResponse(
+                [row for rows in self._query_sites(query, add_headers) for row in rows]
+            )
+        if self.prepend_site:
+            key_index += 1
+        key = itemgetter(key_index)
+
+        rejecting_sites: ConnectedSites = []
+        sorted_rows = self._query_sites(query, add_headers + order_by.header(), rejecting_sites)
+        if rejecting_sites:
+            only_sites = self.only_sites
+            self.only_sites = [connected_site.id for connected_site in rejecting_sites]
+            try:
+                sorted_rows += [
+                    sorted(rows, key=key, reverse=order_by.descending)
+                    for rows in self._query_sites(query, add_headers)
+                ]
+            finally:
+                self.only_sites = only_sites
+
+        merged = heapq.merge(*sorted_rows, key=key, reverse=order_by.descending)
+        return LivestatusResponse(list(itertools.islice(merged, self.limit)))
+
+    def _query_sites(
+        self, query: Query, add_headers: str, rejecting_sites: ConnectedSites | None = None
+    ) -> list[list[LivestatusRow]]:
+        """Query the sites and return the rows of every site
+
+        Sites rejecting the query are added to rejecting_sites instead of being
+        considered dead, if given."""
         stillalive = []
         if self.only_sites is not None:
             connect_to_sites = [c for c in self.connections if c[0] in self.only_sites]
@@ -1316,13 +1409,15 @@ class MultiSiteConnection(Helpers):
             )
 
             # Then retrieve all raw responses. We will be as slow as the slowest of all connections.
-            site_responses = self._retrieve_responses(query, retrieve_responses, stillalive)
+            site_responses = self._retrieve_responses(
+                query, retrieve_responses, stillalive, rejecting_sites
+            )
 
             # Convert responses to python format
             result = self._parse_responses(query, site_responses, stillalive)
 
         self.connections = stillalive
-        return LivestatusResponse(result)
+        return result
 
     def _send_queries(
         self, query: Query, add_headers: str, connect_to_sites: ConnectedSites, limit_header: str
@@ -1357,6 +1452,7 @@ class MultiSiteConnection(Helpers):
         query: Query,
         retrieve_responses: list[tuple[str, trace.Span, ConnectedSite]],
         stillalive: ConnectedSites,
+        rejecting_sites: ConnectedSites | None = None,
     ) -> list[tuple[ConnectedSite, bytes]]:
         site_responses: list[tuple[ConnectedSite, bytes]] = []
         for str_query, request_span, connected_site in retrieve_responses:
@@ -1385,6 +1481,11 @@ class MultiSiteConnection(Helpers):
                 except LivestatusTestingError:
                     raise
                 except Exception as e:
+                    if rejecting_sites is not None and isinstance(e, MKLivestatusQueryError):
+                        # The site answered, it just did not accept the query
+                        stillalive.append(connected_site)
+                        rejecting_sites.append(connected_site)
+                        continue
                     connected_site.connection.disconnect()
                     self.deadsites[connected_site.id] = {
                         "exception": e,
@@ -1397,8 +1498,8 @@ class MultiSiteConnection(Helpers):
         query: Query,
         site_responses: list[tuple[ConnectedSite, bytes]],
         stillalive: ConnectedSites,
-    ) -> list[LivestatusRow]:
-        result: list[LivestatusRow] = []
+    ) -> list[list[LivestatusRow]]:
+        result: list[list[LivestatusRow]] = []
         for connected_site, raw_response in site_responses:
             try:
                 rows = connected_site.connection.parse_raw_response(raw_response, query)
@@ -1406,7 +1507,7 @@ class MultiSiteConnection(Helpers):
                 if self.prepend_site:
                     for row in rows:
                         row.insert(0, connected_site.id)
-                result.extend(rows)
+                result.append(rows)
             except query.suppress_exceptions:
                 stillalive.append(connected_site)
                 continue
@@ -3,9 +3,9 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
-import ast
 import logging
 import re
+import socket
 from collections.abc import Iterator, MutableMapping, Sequence
 
 import pytest
@@ -16,6 +16,7 @@ from cmk.ccc.hostaddress import HostName
 from cmk.checkengine.discovery import DiscoveryReport, DiscoverySettings
 from cmk.checkengine.discovery._autochecks import _AutochecksSerializer
 from cmk.checkengine.plugins import AutocheckEntry, CheckPluginName
+from cmk.utils import ip_lookup
 from cmk.utils.rulesets.definition import RuleGroup
 from cmk.utils.servicename import ServiceName
 from tests.testlib.site import Site
@@ -445,10 +446,11 @@ def test_automation_update_dns_cache(site: Site) -> None:
 
         assert site.file_exists(cache_path)
 
-        cache = ast.literal_eval(site.read_file(cache_path))
-        assert isinstance(cache, dict)
-        assert cache[("localhost", 4)] == "127.0.0.1"
-        assert ("bla", 4) not in cache
+        cache = ip_lookup.IPLookupCacheSerializer().deserialize(
+            site.read_file(cache_path, encoding=None)
+        )
+        assert cache[(HostName("localhost"), socket.AF_INET)].address == "127.0.0.1"
+        assert (HostName("bla"), socket.AF_INET) not in cache
     finally:
         site.openapi.hosts.delete("localhost")
         site.openapi.hosts.delete(unknown_host)
@@ -33,6 +33,155 @@ logger = logging.getLogger(__name__)
 dump_path_repo = qa_test_data_path() / "plugins_integration/dumps/piggyback"
 
 
+_LINUX_HOST_CHECK_PLUGINS = ["cpu_loads", "cpu_threads", "df", "kernel_util", "mem_linux", "uptime"]
+
+_PLUGIN_LOADING_SCRIPT = """
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cmk.utils.paths
+from cmk.base.config import load_and_convert_legacy_checks
+from cmk.base.modes.check_mk import load_checks, load_plugin_manifest
+from cmk.checkengine.plugin_backend import load_selected_plugins
+from cmk.checkengine.plugins import CheckPluginName
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    # Compile the legacy checks to a copy of the precompiled checks
+    precompiled_checks_dir = Path(tmp_dir, "precompiled_checks")
+    if cmk.utils.paths.precompiled_checks_dir.exists():
+        shutil.copytree(cmk.utils.paths.precompiled_checks_dir, precompiled_checks_dir)
+    cmk.utils.paths.precompiled_checks_dir = precompiled_checks_dir
+
+    start = time.perf_counter()
+    if sys.argv[1] == "lazy":
+        manifest = load_plugin_manifest()
+        assert manifest is not None
+        index = manifest.plugin_index([CheckPluginName(n) for n in sys.argv[2:]], inventory=False)
+        _errors, sections, checks = load_and_convert_legacy_checks(index.legacy)
+        load_selected_plugins(index.locations, sections, checks, validate=False)
+    else:
+        load_checks()
+    print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+_PACKED_CONFIG_LOADING_SCRIPT = """
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from cmk.base.config import PackedConfigStore
+from cmk.ccc.hostaddress import HostName
+
+hosts = [f"host{i:06}" for i in range(int(sys.argv[2]))]
+helper_config = {
+    "all_hosts": [f"{h}|lan|prod|linux|site:heute" for h in hosts],
+    "ipaddresses": {h: f"10.{i // 65536}.{i // 256 % 256}.{i % 256}" for i, h in enumerate(hosts)},
+    "host_labels": {h: {"cmk/os_family": "linux", "location": h[-2:]} for h in hosts},
+    "host_paths": {h: f"/wato/folder{i % 100}/hosts.mk" for i, h in enumerate(hosts)},
+    "host_attributes": {h: {"alias": h, "meta_data": {"created_at": 1.0}} for h in hosts},
+}
+with tempfile.TemporaryDirectory() as tmp_dir:
+    store = PackedConfigStore(Path(tmp_dir, "precompiled_check_config.mk"))
+    if sys.argv[1] == "pickle":
+        store.path.write_bytes(pickle.dumps(helper_config))
+    else:
+        store.write(helper_config)
+
+    start = time.perf_counter()
+    store.read([HostName(hosts[0])])
+    print(time.perf_counter() - start)
+"""
+
+
+_VIEW_SORTING_SCRIPT = """
+import random
+import sys
+import time
+
+from cmk.gui.utils.script_helpers import gui_context
+from cmk.gui.views.page_show_view import _sort_data_by_cmp, _sort_data_by_keys
+from cmk.gui.views.sorter import Sorter, SorterEntry
+from cmk.gui.views.sorter.sorters import (
+    cmp_service_name,
+    key_service_name,
+    SorterSiteHost,
+    SorterSvcstate,
+)
+
+rand = random.Random(42)
+rows = [
+    {
+        "site": f"site{rand.randrange(5)}",
+        "host_name": f"host{rand.randrange(2000)}",
+        "service_description": f"Filesystem /data{rand.randrange(50)}",
+        "service_state": rand.randrange(4),
+        "service_has_been_checked": 1,
+    }
+    for _ in range(int(sys.argv[2]))
+]
+svcdescr = Sorter(
+    ident="svcdescr",
+    title="Service name",
+    columns=["service_description"],
+    sort_function=lambda r1, r2, **_kwargs: cmp_service_name("service_description", r1, r2),
+    sort_key=lambda row, **_kwargs: key_service_name("service_description", row),
+)
+sorters = [
+    SorterEntry(SorterSvcstate, negate=True, join_key=None, parameters=None),
+    SorterEntry(SorterSiteHost, negate=False, join_key=None, parameters=None),
+    SorterEntry(svcdescr, negate=False, join_key=None, parameters=None),
+]
+sort_data = _sort_data_by_keys if sys.argv[1] == "keys" else _sort_data_by_cmp
+
+with gui_context():
+    start = time.perf_counter()
+    sort_data(rows, sorters)
+    print(time.perf_counter() - start)
+"""
+
+_LIVESTATUS_ORDER_BY_SCRIPT = """
+import os
+import resource
+import sys
+import time
+from operator import itemgetter
+
+import livestatus
+from cmk.ccc.site import SiteId
+
+limit = int(sys.argv[2])
+site_id = SiteId(os.environ["OMD_SITE"])
+connection = livestatus.MultiSiteConnection(
+    livestatus.SiteConfigurations(
+        {
+            site_id: livestatus.SiteConfiguration(
+                id=site_id, socket=f"unix:{os.environ['OMD_ROOT']}/tmp/run/live"
+            )
+        }
+    )
+)
+connection.set_prepend_site(True)
+query = "GET services\\nColumns: host_name service_description state\\n"
+
+start = time.perf_counter()
+if sys.argv[1] == "livestatus":
+    connection.set_limit(limit)
+    connection.set_order_by(livestatus.OrderBy("service_description"))
+    rows = connection.query(query)
+else:
+    rows = sorted(connection.query(query), key=itemgetter(2))[:limit]
+assert len(rows) <= limit
+print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
 class PerformanceTest:
     def __init__(self, sites: list[Site], config: pytest.Config) -> None:
         """Initialize the performance test with a list of sites.
@@ -284,6 +433,58 @@ class PerformanceTest:
             except Exception as exc:
                 logger.warning("UI response request %s raised %r (%s)", i, exc, unique_url)
 
+    def scenario_plugin_loading(self, loading: str) -> tuple[float, int]:
+        """Scenario: Plug-in loading at helper startup
+
+        Load either all agent based plug-ins or only the ones needed for the
+        checks of a typical Linux host, using the plug-in manifest.
+        Return the loading time in seconds and the maximum RSS in KiB.
+        """
+        seconds, max_rss = self.central_site.check_output(
+            ["python3", "-c", _PLUGIN_LOADING_SCRIPT, loading, *_LINUX_HOST_CHECK_PLUGINS]
+        ).split()
+        logger.info("Loading %s plug-ins took %ss (max RSS %s KiB)", loading, seconds, max_rss)
+        return float(seconds), int(max_rss)
+
+    def scenario_packed_config_loading(self, packed_format: str) -> float:
+        """Scenario: Packed configuration loading at helper startup
+
+        Read the configuration of a single host from a packed configuration of
+        many hosts, either stored as one pickled dictionary or in the indexed format.
+        Return the loading time in seconds.
+        """
+        seconds = self.central_site.check_output(
+            ["python3", "-c", _PACKED_CONFIG_LOADING_SCRIPT, packed_format, "50000"]
+        ).strip()
+        logger.info("Loading %s packed config took %ss", packed_format, seconds)
+        return float(seconds)
+
+    def scenario_view_sorting(self, sorting: str) -> float:
+        """Scenario: Sorting the rows of a large service view
+
+        Sort the rows of a view with 50000 services by state, site and host and
+        service name, either using the compare functions or the sort keys of the sorters.
+        Return the sorting time in seconds.
+        """
+        seconds = self.central_site.check_output(
+            ["python3", "-c", _VIEW_SORTING_SCRIPT, sorting, "50000"]
+        ).strip()
+        logger.info("Sorting view rows by %s took %ss", sorting, seconds)
+        return float(seconds)
+
+    def scenario_livestatus_order_by(self, sorting: str) -> tuple[float, int]:
+        """Scenario: The first rows of a large service view
+
+        Fetch the first 1000 services by name, either sorted by Livestatus using the
+        OrderBy: header or by fetching all services and sorting them in Python.
+        Return the query time in seconds and the maximum RSS in KiB.
+        """
+        seconds, max_rss = self.central_site.check_output(
+            ["python3", "-c", _LIVESTATUS_ORDER_BY_SCRIPT, sorting, "1000"]
+        ).split()
+        logger.info("Sorting services in %s took %ss (max RSS %s KiB)", sorting, seconds, max_rss)
+        return float(seconds), int(max_rss)
+
 
 @pytest.fixture(name="perftest", scope="session")
 def _perftest(central_site: Site, pytestconfig: pytest.Config) -> Iterator[PerformanceTest]:
@@ -357,3 +558,57 @@ def test_performance_ui_response(
         rounds=perftest.rounds,
         iterations=perftest.iterations,
     )
+
+
+@pytest.mark.parametrize("loading", ["full", "lazy"])
+def test_performance_plugin_loading(
+    perftest: PerformanceTest, benchmark: BenchmarkFixture, loading: str
+) -> None:
+    """Helper startup with all plug-ins vs. the plug-ins of a single host"""
+    _seconds, max_rss = benchmark.pedantic(
+        perftest.scenario_plugin_loading,
+        args=[loading],
+        rounds=perftest.rounds,
+        iterations=perftest.iterations,
+    )
+    benchmark.extra_info["max_rss_kib"] = max_rss
+
+
+@pytest.mark.parametrize("packed_format", ["pickle", "indexed"])
+def test_performance_packed_config_loading(
+    perftest: PerformanceTest, benchmark: BenchmarkFixture, packed_format: str
+) -> None:
+    """Helper startup with the packed configuration of many hosts"""
+    benchmark.pedantic(
+        perftest.scenario_packed_config_loading,
+        args=[packed_format],
+        rounds=perftest.rounds,
+        iterations=perftest.iterations,
+    )
+
+
+@pytest.mark.parametrize("sorting", ["cmp", "keys"])
+def test_performance_view_sorting(
+    perftest: PerformanceTest, benchmark: BenchmarkFixture, sorting: str
+) -> None:
+    """Sorting a large service view with compare functions vs. sort keys"""
+    benchmark.pedantic(
+        perftest.scenario_view_sorting,
+        args=[sorting],
+        rounds=perftest.rounds,
+        iterations=perftest.iterations,
+    )
+
+
+@pytest.mark.parametrize("sorting", ["python", "livestatus"])
+def test_performance_livestatus_order_by(
+    perftest: PerformanceTest, benchmark: BenchmarkFixture, sorting: str
+) -> None:
+    """The first rows of all services sorted in Python vs. sorted by Livestatus"""
+    _seconds, max_rss = benchmark.pedantic(
+        perftest.scenario_livestatus_order_by,
+        args=[sorting],
+        rounds=perftest.rounds,
+        iterations=perftest.iterations,
+    )
+    benchmark.extra_info["max_rss_kib"] = max_rss
@@ -5,6 +5,7 @@
 
 import asyncio
 import logging
+import os
 import sys
 import time
 from collections.abc import Callable
@@ -21,6 +22,7 @@ from cmk.base.automation_helper._app import (
     _reloader_task,
     _State,
     AutomationEngine,
+    CacheStatisticsResponse,
     HealthCheckResponse,
     make_application,
 )
@@ -30,6 +32,7 @@ from cmk.base.automations import AutomationError
 from cmk.base.config import ConfigCache, LoadingResult
 from cmk.ccc.version import Version
 from cmk.checkengine.plugins import AgentBasedPlugins
+from cmk.utils.caching import cache_manager, CacheStatistics
 from tests.testlib.common.utils import wait_until
 from tests.unit.cmk.base.empty_config import EMPTY_CONFIG
 
@@ -415,3 +418,28 @@ class _LockWithCounter(asyncio.Lock):
     async def __aenter__(self) -> None:
         self.counter += 1
         return await super().__aenter__()
+
+
+def test_caches(cache: Cache) -> None:
+    loaded_config = EMPTY_CONFIG
+    with _make_test_client(
+        _DummyAutomationEngineSuccess(),
+        cache,
+        lambda plugins: LoadingResult(
+            loaded_config=loaded_config, config_cache=ConfigCache(loaded_config)
+        ),
+        lambda ruleset_matcher: None,
+    ) as client:
+        test_cache = cache_manager.obtain_cache("test_caches", maxsize=1)
+        test_cache["a"] = 1
+        test_cache["b"] = 2
+        assert test_cache.get("b") == 2
+        resp = client.get("/caches")
+
+    assert resp.status_code == 200
+    response = CacheStatisticsResponse.model_validate(resp.json())
+    assert response.pid == os.getpid()
+    assert response.caches["test_caches"] == CacheStatistics(
+        hits=1, misses=0, evictions=1, size=1, maxsize=1
+    )
+    assert "ruleset_matcher.service_match" in response.config_cache_sizes
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import json
+from pathlib import Path
+
+from cmk.base.automation_helper._config import (
+    config_from_disk_or_default_config,
+    RELATIVE_CONFIG_PATH_FOR_TESTING,
+)
+
+
+def test_config_from_disk_without_long_running_socket(tmp_path: Path) -> None:
+    # as written before long running automations had a pool of their own
+    (tmp_path / RELATIVE_CONFIG_PATH_FOR_TESTING).write_text(
+        json.dumps(
+            {
+                "server_config": {
+                    "unix_socket_path": str(tmp_path / "automation-helper.sock"),
+                    "unix_socket_permissions": 0o600,
+                    "pid_file": str(tmp_path / "automation-helper.pid"),
+                    "access_log": str(tmp_path / "access.log"),
+                    "error_log": str(tmp_path / "error.log"),
+                    "num_workers": 1,
+                },
+                "watcher_config": {"schedules": []},
+                "reloader_config": {
+                    "active": False,
+                    "poll_interval": 1.0,
+                    "cooldown_interval": 5.0,
+                },
+            }
+        )
+    )
+
+    config = config_from_disk_or_default_config(
+        omd_root=tmp_path, run_directory=tmp_path, log_directory=tmp_path
+    )
+
+    assert config.server_config.long_running_unix_socket_path is None
+    assert config.server_config.num_long_running_workers == 1
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import multiprocessing
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from cmk.base.automation_helper import _server
+from cmk.base.automation_helper._config import ServerConfig
+
+
+def _server_config(tmp_path: Path) -> ServerConfig:
+    return ServerConfig(
+        unix_socket_path=tmp_path / "main.sock",
+        unix_socket_permissions=0o600,
+        pid_file=tmp_path / "automation-helper.pid",
+        access_log=tmp_path / "access.log",
+        error_log=tmp_path / "error.log",
+        num_workers=2,
+        long_running_unix_socket_path=tmp_path / "long-running.sock",
+        num_long_running_workers=1,
+    )
+
+
+def test_run_serves_both_pools(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    config = _server_config(tmp_path)
+    parent_pid = os.getpid()
+    served = []
+
+    def fake_uvicorn_server(import_path: str, *, workers: int, **kwargs: object) -> None:
+        if os.getpid() != parent_pid:
+            # the forked long running server, it is terminated by the parent
+            time.sleep(60)
+            return
+        served.append((import_path, workers))
+        assert config.unix_socket_path.exists()
+        assert config.long_running_unix_socket_path
+        assert config.long_running_unix_socket_path.exists()
+        assert [p.name for p in multiprocessing.active_children()] == [
+            "automation-helper-long-running"
+        ]
+
+    monkeypatch.setattr(_server, "run_uvicorn_server", fake_uvicorn_server)
+
+    with _server.run_long_running(config, "long:app"):
+        _server.run(config, "main:app")
+
+    assert served == [("main:app", 2)]
+    assert not multiprocessing.active_children()
+    assert not config.unix_socket_path.exists()
+    assert not config.long_running_unix_socket_path.exists()
+
+
+def test_run_shuts_down_when_long_running_server_dies(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    config = _server_config(tmp_path)
+    shut_down = threading.Event()
+    monkeypatch.setattr(_server, "run_uvicorn_server", lambda *args, **kwargs: None)
+    monkeypatch.setattr(_server, "_shut_down", shut_down.set)
+
+    with pytest.raises(SystemExit) as exit_info:
+        with _server.run_long_running(config, "long:app"):
+            assert shut_down.wait(timeout=30)
+            assert config.long_running_unix_socket_path
+            assert not config.long_running_unix_socket_path.exists()
+
+    assert exit_info.value.code == 1
+
+
+def test_run_without_long_running_socket(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    config = _server_config(tmp_path).model_copy(update={"long_running_unix_socket_path": None})
+    served = []
+    monkeypatch.setattr(
+        _server,
+        "run_uvicorn_server",
+        lambda import_path, *, workers, **kwargs: served.append((import_path, workers)),
+    )
+
+    with _server.run_long_running(config, "long:app"):
+        _server.run(config, "main:app")
+
+    assert served == [("main:app", 2)]
+    assert not multiprocessing.active_children()
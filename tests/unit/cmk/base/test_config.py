@@ -5,6 +5,7 @@
 
 
 import itertools
+import pickle
 import re
 import shutil
 import socket
@@ -2847,6 +2848,55 @@ class TestPackedConfigStore:
         assert precompiled_check_config.exists()
         assert store.read() == {"abc": 1}
 
+    @pytest.fixture()
+    def helper_config(self) -> Mapping[str, object]:
+        return {
+            "all_hosts": ["node1|lnx", "node2|lnx", "other|win", "cluster|cl"],
+            "clusters": {"cluster|cl": ["node1", "node2"]},
+            "ipaddresses": {"node1": "1.2.3.4", "other": "1.2.3.5"},
+            "host_labels": {"other": {"os": "windows"}},
+            "explicit_host_conf": {"parents": {"node2": "router", "other": "router"}},
+            "check_interval": 5,
+        }
+
+    def test_read_all_hosts(
+        self, store: config.PackedConfigStore, helper_config: Mapping[str, object]
+    ) -> None:
+        store.write(helper_config)
+        assert store.read() == helper_config
+
+    def test_read_single_host(
+        self, store: config.PackedConfigStore, helper_config: Mapping[str, object]
+    ) -> None:
+        store.write(helper_config)
+        assert store.read([HostName("other")]) == {
+            "all_hosts": ["other|win"],
+            "clusters": {},
+            "ipaddresses": {"other": "1.2.3.5"},
+            "host_labels": {"other": {"os": "windows"}},
+            "explicit_host_conf": {"parents": {"other": "router"}},
+            "check_interval": 5,
+        }
+
+    def test_read_cluster_node(
+        self, store: config.PackedConfigStore, helper_config: Mapping[str, object]
+    ) -> None:
+        store.write(helper_config)
+        assert store.read([HostName("node1")]) == {
+            "all_hosts": ["node1|lnx", "node2|lnx", "cluster|cl"],
+            "clusters": {"cluster|cl": ["node1", "node2"]},
+            "ipaddresses": {"node1": "1.2.3.4"},
+            "host_labels": {},
+            "explicit_host_conf": {"parents": {"node2": "router"}},
+            "check_interval": 5,
+        }
+
+    def test_read_unindexed_file(self, store: config.PackedConfigStore) -> None:
+        store.path.parent.mkdir(parents=True, exist_ok=True)
+        store.path.write_bytes(pickle.dumps({"abc": 1}))
+
+        assert store.read([HostName("heute")]) == {"abc": 1}
+
 
 def test__extract_check_plugins(monkeypatch: MonkeyPatch) -> None:
     duplicate_legacy_plugin = LegacyCheckDefinition(
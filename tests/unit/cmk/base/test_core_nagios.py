@@ -21,8 +21,10 @@ import cmk.ccc.debug
 import cmk.ccc.version as cmk_version
 from cmk.base import config
 from cmk.base.configlib.servicename import make_final_service_name_config
+from cmk.base.core.nagios import _create_config, _host_blocks, _precompile_host_checks
 from cmk.base.core.nagios._create_config import (
     _format_nagios_object,
+    create_config,
     create_nagios_config_commands,
     create_nagios_host_spec,
     create_nagios_servicedefs,
@@ -31,6 +33,7 @@ from cmk.base.core.nagios._create_config import (
 from cmk.base.core.nagios._precompile_host_checks import (
     dump_precompiled_hostcheck,
     HostCheckStore,
+    precompile_hostchecks,
     PrecompileMode,
 )
 from cmk.ccc.config_path import VersionedConfigPath
@@ -41,9 +44,11 @@ from cmk.server_side_calls.v1 import ActiveCheckCommand, ActiveCheckConfig
 from cmk.server_side_calls_backend import load_active_checks
 from cmk.utils import ip_lookup, paths
 from cmk.utils.labels import ABCLabelConfig, LabelManager, Labels
+from cmk.utils.rulesets.ruleset_matcher import RuleSpec
 from cmk.utils.servicename import ServiceName
 from tests.testlib.unit.base_configuration_scenario import Scenario
 from tests.unit.cmk.base.empty_config import EMPTY_CONFIG
+from tests.unit.mocks_and_helpers import DummyLicensingHandler
 
 
 def ip_address_of_never_called(
@@ -371,6 +376,110 @@ def test_create_nagios_host_spec_service_period(monkeypatch: MonkeyPatch) -> Non
     assert "service_period" not in host_spec
 
 
+def _create_config_with_previous(
+    monkeypatch: MonkeyPatch,
+    config_path: Path,
+    previous_config_path: Path,
+    host_labels: Mapping[HostName, Labels],
+    parents: Sequence[RuleSpec[str]] = (),
+) -> str:
+    ts = Scenario()
+    ts.set_ruleset("parents", list(parents))
+    for hostname in host_labels:
+        ts.add_host(hostname, labels=dict(host_labels[hostname]))
+        ts.set_autochecks(hostname, [AutocheckEntry(CheckPluginName("uptime"), None, {}, {})])
+    config_cache = ts.apply(monkeypatch)
+    hostnames = sorted(host_labels)
+    outfile = io.StringIO()
+    final_service_name_config = make_final_service_name_config(
+        config_cache._loaded_config, config_cache.ruleset_matcher
+    )
+    create_config(
+        outfile,
+        config_path,
+        config_cache,
+        final_service_name_config=final_service_name_config,
+        passive_service_name_config=config_cache.make_passive_service_name_config(
+            final_service_name_config
+        ),
+        enforced_services_table=lambda hn: {},
+        plugins=_make_plugins_for_test().check_plugins,
+        hostnames=hostnames,
+        licensing_handler=DummyLicensingHandler.make(),
+        passwords={},
+        get_ip_stack_config=lambda *a: ip_lookup.IPStackConfig.IPv4,
+        default_address_family=lambda *a: socket.AddressFamily.AF_INET,
+        ip_address_of=ip_address_of_return_local,
+        service_depends_on=lambda *a: (),
+        previous_config_path=previous_config_path,
+    )
+    return outfile.getvalue()
+
+
+def test_create_config_reuses_unchanged_host_blocks(
+    monkeypatch: MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(config, "get_resource_macros", lambda: {})
+    rendered = []
+    create_nagios_config_host = _create_config._create_nagios_config_host
+
+    def record(cfg: NagiosConfig, config_cache: config.ConfigCache, *args: Any) -> Any:
+        rendered.append(args[4])
+        return create_nagios_config_host(cfg, config_cache, *args)
+
+    monkeypatch.setattr(_create_config, "_create_nagios_config_host", record)
+    host_labels = {HostName(f"host{i}"): {"nr": str(i)} for i in range(3)}
+
+    first = _create_config_with_previous(monkeypatch, tmp_path / "1", tmp_path / "0", host_labels)
+    assert rendered == sorted(host_labels)
+
+    rendered.clear()
+    second = _create_config_with_previous(monkeypatch, tmp_path / "2", tmp_path / "1", host_labels)
+    assert not rendered
+    assert second == first
+
+    rendered.clear()
+    host_labels[HostName("host1")] = {"nr": "one"}
+    third = _create_config_with_previous(monkeypatch, tmp_path / "3", tmp_path / "2", host_labels)
+    assert rendered == [HostName("host1")]
+    assert third != first
+    assert third.count("define host {") == 3
+
+
+def test_create_config_renders_children_of_removed_parents_again(
+    monkeypatch: MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(config, "get_resource_macros", lambda: {})
+    parents: Sequence[RuleSpec[str]] = [
+        {"id": "01", "condition": {"host_name": ["child"]}, "value": "parent"}
+    ]
+    host_labels: dict[HostName, Labels] = {HostName("child"): {}, HostName("parent"): {}}
+
+    first = _create_config_with_previous(
+        monkeypatch, tmp_path / "1", tmp_path / "0", host_labels, parents
+    )
+    assert "parents" in first
+
+    del host_labels[HostName("parent")]
+    second = _create_config_with_previous(
+        monkeypatch, tmp_path / "2", tmp_path / "1", host_labels, parents
+    )
+    assert "parents" not in second
+    assert second.count("define host {") == 1
+
+
+def test_global_fingerprint_covers_check_plugin_service_name(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(config, "get_resource_macros", lambda: {})
+    plugins = _make_plugins_for_test().check_plugins
+    renamed = {name: plugin._replace(service_name="Uptime %s") for name, plugin in plugins.items()}
+    assert _host_blocks._global_fingerprint(plugins, {}) == _host_blocks._global_fingerprint(
+        plugins, {}
+    )
+    assert _host_blocks._global_fingerprint(plugins, {}) != _host_blocks._global_fingerprint(
+        renamed, {}
+    )
+
+
 @pytest.fixture(name="config_path")
 def fixture_config_path(tmp_path: Path) -> Path:
     return Path(VersionedConfigPath(tmp_path, 42))
@@ -473,6 +582,54 @@ def test_dump_precompiled_hostcheck(monkeypatch: MonkeyPatch, config_path: Path)
         assert False, f"Execution failed with error: {e}"
 
 
+def test_precompile_hostchecks_reuses_unchanged_host_checks(
+    monkeypatch: MonkeyPatch, tmp_path: Path
+) -> None:
+    hostname = HostName("localhost")
+    ts = Scenario()
+    ts.add_host(hostname)
+    ts.set_autochecks(hostname, [AutocheckEntry(CheckPluginName("uptime"), None, {}, {})])
+    config_cache = ts.apply(monkeypatch)
+    monkeypatch.setattr(_precompile_host_checks, "save_packed_config", lambda *a: None)
+    compiled = []
+    compile_host_check = HostCheckStore.compile
+
+    def compile_and_record(config_path: Path, hostname: HostName) -> None:
+        compiled.append(config_path)
+        compile_host_check(config_path, hostname)
+
+    monkeypatch.setattr(HostCheckStore, "compile", staticmethod(compile_and_record))
+
+    def precompile(config_path: Path, previous_config_path: Path, address: str) -> None:
+        precompile_hostchecks(
+            config_path,
+            config_cache,
+            passive_service_name_config=lambda *a: "",
+            enforced_services_table=lambda hn: {},
+            plugins=_make_plugins_for_test(),
+            discovery_rules={},
+            get_ip_stack_config=lambda *a: ip_lookup.IPStackConfig.IPv4,
+            ip_address_of=lambda *a: HostAddress(address),
+            precompile_mode=PrecompileMode.INSTANT,
+            previous_config_path=previous_config_path,
+        )
+
+    precompile(tmp_path / "1", tmp_path / "0", "1.2.3.4")
+    precompile(tmp_path / "2", tmp_path / "1", "1.2.3.4")
+    precompile(tmp_path / "3", tmp_path / "2", "1.2.3.5")
+    # e.g. after an update of the site's Python interpreter
+    monkeypatch.setattr(importlib.util, "MAGIC_NUMBER", b"\x00\x00\r\n")
+    precompile(tmp_path / "4", tmp_path / "3", "1.2.3.5")
+
+    assert compiled == [tmp_path / "1", tmp_path / "3", tmp_path / "4"]
+    for serial in ("1", "2", "3", "4"):
+        assert HostCheckStore.host_check_file_path(tmp_path / serial, hostname).exists()
+    assert (
+        str(tmp_path / "2")
+        in HostCheckStore.host_check_source_file_path(tmp_path / "2", hostname).read_text()
+    )
+
+
 MOCK_PLUGIN = ActiveCheckConfig(
     name="my_active_check",
     parameter_parser=lambda x: x,
@@ -3,18 +3,23 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import os
+from collections.abc import Iterator
 from typing import Final
 
 import pytest
 from pytest import MonkeyPatch
 
 import cmk.base.events
+import cmk.ccc.daemon
 from cmk.base.events import (
     _update_enriched_context_from_notify_host_file,
     add_to_event_context,
     apply_matchers,
     convert_proxy_params,
+    event_keepalive,
     event_match_hosttags,
+    KeepaliveFunctions,
     raw_context_from_string,
 )
 from cmk.events.event_context import EnrichedEventContext, EventContext
@@ -512,3 +517,74 @@ def test_apply_matchers_catches_errors() -> None:
 
     assert isinstance(why_not, str)
     assert "ValueError: This is a test" in why_not
+
+
+def _patch_keepalive_environment(
+    monkeypatch: MonkeyPatch, config_timestamps: Iterator[float], code_timestamps: Iterator[float]
+) -> None:
+    monkeypatch.setattr(cmk.base.events, "event_data_available", lambda loop_interval: True)
+    monkeypatch.setattr(cmk.base.events, "config_timestamp", lambda: next(config_timestamps))
+    monkeypatch.setattr(cmk.base.events, "code_timestamp", lambda: next(code_timestamps))
+    monkeypatch.setattr(cmk.base.events, "cleanup_timeperiod_caches", lambda: None)
+    monkeypatch.setattr(cmk.base.events, "_send_reply_ready", lambda: None)
+    data = iter([b"HOSTNAME=heute\n\n", b""])
+    monkeypatch.setattr(os, "read", lambda fd, size: next(data))
+
+
+def test_event_keepalive_reloads_configuration_in_process(monkeypatch: MonkeyPatch) -> None:
+    _patch_keepalive_environment(monkeypatch, iter([1.0, 2.0, 2.0]), iter([0.0, 0.0]))
+
+    def execvp(*args: object) -> None:
+        raise AssertionError("restarted instead of reloading")
+
+    monkeypatch.setattr(os, "execvp", execvp)
+
+    handled_by: list[str] = []
+    with pytest.raises(SystemExit):
+        event_keepalive(
+            event_function=lambda context: handled_by.append("old"),
+            reload_function=lambda: KeepaliveFunctions(
+                event_function=lambda context: handled_by.append("new"),
+                call_every_loop=None,
+                loop_interval=None,
+            ),
+        )
+
+    assert handled_by == ["new"]
+
+
+def test_event_keepalive_restarts_on_code_change(monkeypatch: MonkeyPatch) -> None:
+    _patch_keepalive_environment(monkeypatch, iter([1.0, 2.0]), iter([0.0, 1.0]))
+    monkeypatch.setattr(cmk.ccc.daemon, "closefrom", lambda fd: None)
+
+    def execvp(*args: object) -> None:
+        raise SystemExit("restart")
+
+    monkeypatch.setattr(os, "execvp", execvp)
+
+    def reload_function() -> KeepaliveFunctions:
+        raise AssertionError("reloaded changed code in-process")
+
+    with pytest.raises(SystemExit, match="restart"):
+        event_keepalive(event_function=lambda context: None, reload_function=reload_function)
+
+
+def test_event_keepalive_checks_code_once_per_config_change(monkeypatch: MonkeyPatch) -> None:
+    _patch_keepalive_environment(monkeypatch, iter([1.0, 2.0, 2.0, 2.0]), iter([0.0, 1.0]))
+    data_available = iter([False, False, True])
+    monkeypatch.setattr(
+        cmk.base.events, "event_data_available", lambda loop_interval: next(data_available)
+    )
+    monkeypatch.setattr(cmk.ccc.daemon, "closefrom", lambda fd: None)
+
+    def execvp(*args: object) -> None:
+        raise SystemExit("restart")
+
+    monkeypatch.setattr(os, "execvp", execvp)
+
+    def reload_function() -> KeepaliveFunctions:
+        raise AssertionError("reloaded changed code in-process")
+
+    # The code timestamps are exhausted after the first change of the configuration
+    with pytest.raises(SystemExit, match="restart"):
+        event_keepalive(event_function=lambda context: None, reload_function=reload_function)
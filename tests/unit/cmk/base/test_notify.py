@@ -3,8 +3,12 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import ast
 import os
+import threading
+import time
 from collections.abc import Mapping
+from pathlib import Path
 from typing import Final
 
 import pytest
@@ -44,6 +48,15 @@ def test_os_environment_does_not_override_notification_script_env(monkeypatch: M
     assert script_env == {"NOTIFY_CONTACTEMAIL": "ab@test.de"}
 
 
+def test_limit_context_values_truncates_long_values() -> None:
+    limited = notify._limit_context_values(
+        NotificationContext({"SHORT": "short", "LONG": "x" * 1000000})
+    )
+    assert limited["SHORT"] == "short"
+    assert len(limited["LONG"]) < 1000000
+    assert limited["LONG"].endswith("Removed remaining content because it was too long.")
+
+
 @pytest.mark.parametrize(
     "environ,expected",
     [
@@ -371,3 +384,214 @@ def test_rbn_match_event_console(
         )
         == expected
     )
+
+
+def test_parallel_plugin_executor_keeps_order_per_contact_and_object(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    calls: list[tuple[str, str]] = []
+
+    def call_notification_script(
+        plugin_name: str, plugin_context: NotificationContext, *, plugin_timeout: int
+    ) -> int:
+        calls.append((plugin_context["CONTACTNAME"], plugin_context["NR"]))
+        return 0
+
+    monkeypatch.setattr(notify, "call_notification_script", call_notification_script)
+
+    executor = notify.ParallelPluginExecutor(max_workers=4, plugin_limits={})
+    for nr in range(20):
+        for contact in ("alice", "bob"):
+            executor.submit(
+                "mail",
+                NotificationContext({"CONTACTNAME": contact, "HOSTNAME": "heute", "NR": str(nr)}),
+                plugin_timeout=60,
+            )
+    executor.shutdown()
+
+    assert executor.queue_depth == 0
+    for contact in ("alice", "bob"):
+        assert [nr for name, nr in calls if name == contact] == [str(nr) for nr in range(20)]
+
+
+def test_parallel_plugin_executor_respects_plugin_limit(monkeypatch: MonkeyPatch) -> None:
+    running: list[str] = []
+    max_running = 0
+
+    def call_notification_script(
+        plugin_name: str, plugin_context: NotificationContext, *, plugin_timeout: int
+    ) -> int:
+        nonlocal max_running
+        running.append(plugin_name)
+        max_running = max(max_running, running.count("slack"))
+        time.sleep(0.01)
+        running.remove(plugin_name)
+        return 0
+
+    monkeypatch.setattr(notify, "call_notification_script", call_notification_script)
+
+    executor = notify.ParallelPluginExecutor(max_workers=8, plugin_limits={"slack": 2})
+    for nr in range(10):
+        executor.submit(
+            "slack",
+            NotificationContext({"CONTACTNAME": f"user{nr}", "HOSTNAME": "heute"}),
+            plugin_timeout=60,
+        )
+    executor.shutdown()
+
+    assert max_running <= 2
+
+
+def test_parallel_plugin_executor_reconfigure_does_not_wait(monkeypatch: MonkeyPatch) -> None:
+    release = threading.Event()
+    finished: list[str] = []
+
+    def call_notification_script(
+        plugin_name: str, plugin_context: NotificationContext, *, plugin_timeout: int
+    ) -> int:
+        if plugin_context["CONTACTNAME"] == "alice":
+            assert release.wait(timeout=10)
+        finished.append(plugin_context["CONTACTNAME"])
+        return 0
+
+    monkeypatch.setattr(notify, "call_notification_script", call_notification_script)
+
+    executor = notify.ParallelPluginExecutor(max_workers=1, plugin_limits={})
+    for contact in ("alice", "bob"):
+        executor.submit(
+            "mail",
+            NotificationContext({"CONTACTNAME": contact, "HOSTNAME": "heute"}),
+            plugin_timeout=60,
+        )
+
+    executor.reconfigure(max_workers=2, plugin_limits={})
+    executor.submit(
+        "mail",
+        NotificationContext({"CONTACTNAME": "bob", "HOSTNAME": "heute"}),
+        plugin_timeout=60,
+    )
+    assert "alice" not in finished
+
+    release.set()
+    executor.shutdown()
+
+    assert sorted(finished) == ["alice", "bob", "bob"]
+
+
+def _spool_bulk_notification(contact: str, host: str) -> None:
+    notify.do_bulk_notify(
+        "mail",
+        {},
+        NotificationContext({"WHAT": "HOST", "CONTACTNAME": contact, "HOSTNAME": host}),
+        {"interval": 60, "count": 3, "groupby": ["host"]},
+    )
+
+
+def test_bulk_index_tracks_spooled_notifications(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(notify, "notification_bulkdir", str(tmp_path))
+    for _nr in range(2):
+        _spool_bulk_notification("alice", "heute")
+    _spool_bulk_notification("bob", "heute")
+
+    bulks = notify._load_bulk_index()["bulks"]
+    assert sorted((key, entry["count"], entry["max_count"]) for key, entry in bulks.items()) == [
+        ("alice/mail/60,3,host,heute", 2, 3),
+        ("bob/mail/60,3,host,heute", 1, 3),
+    ]
+
+
+def test_spooling_bulk_notification_only_appends_to_index_journal(
+    monkeypatch: MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(notify, "notification_bulkdir", str(tmp_path))
+    with notify._locked_bulk_index() as index:
+        index["scanned"] = 42.0
+    index_content = (tmp_path / ".index.mk").read_text()
+
+    for _nr in range(2):
+        _spool_bulk_notification("alice", "heute")
+
+    assert (tmp_path / ".index.mk").read_text() == index_content
+    assert len((tmp_path / ".index.journal").read_text().splitlines()) == 2
+    assert notify._load_bulk_index()["bulks"]["alice/mail/60,3,host,heute"]["count"] == 2
+
+    with notify._locked_bulk_index():
+        pass
+
+    assert not (tmp_path / ".index.journal").exists()
+    assert notify._load_bulk_index()["bulks"]["alice/mail/60,3,host,heute"]["count"] == 2
+
+
+def test_loading_bulk_index_only_applies_appended_journal_lines(
+    monkeypatch: MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(notify, "notification_bulkdir", str(tmp_path))
+    with notify._locked_bulk_index() as index:
+        index["scanned"] = 42.0
+    _spool_bulk_notification("alice", "heute")
+    assert notify._load_bulk_index()["bulks"]["alice/mail/60,3,host,heute"]["count"] == 1
+
+    literal_eval = ast.literal_eval
+    parsed: list[str] = []
+
+    def tracking_literal_eval(line: str) -> object:
+        parsed.append(line)
+        return literal_eval(line)
+
+    monkeypatch.setattr(ast, "literal_eval", tracking_literal_eval)
+    _spool_bulk_notification("alice", "heute")
+
+    assert notify._load_bulk_index()["bulks"]["alice/mail/60,3,host,heute"]["count"] == 2
+    assert notify._load_bulk_index()["bulks"]["alice/mail/60,3,host,heute"]["count"] == 2
+    assert len(parsed) == 1
+
+
+def test_find_bulks_only_reads_ripe_bulks(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(notify, "notification_bulkdir", str(tmp_path))
+    for _nr in range(3):
+        _spool_bulk_notification("alice", "heute")
+    _spool_bulk_notification("bob", "heute")
+    # Make the index look current, so find_bulks does not rebuild it
+    with notify._locked_bulk_index() as index:
+        index["scanned"] = time.time()
+
+    read: list[str] = []
+    bulk_uuids = notify.bulk_uuids
+
+    def tracking_bulk_uuids(bulk_dir: str) -> tuple[list[tuple[float, str]], float]:
+        read.append(bulk_dir)
+        return bulk_uuids(bulk_dir)
+
+    monkeypatch.setattr(notify, "bulk_uuids", tracking_bulk_uuids)
+
+    (ripe,) = notify.find_bulks(True, bulk_interval=10)
+
+    assert ripe[0] == str(tmp_path / "alice/mail/60,3,host,heute")
+    assert len(ripe[-1]) == 3
+    assert read == [ripe[0]]
+
+
+def test_find_bulks_rebuilds_missing_index(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(notify, "notification_bulkdir", str(tmp_path))
+    for _nr in range(3):
+        _spool_bulk_notification("alice", "heute")
+    (tmp_path / ".index.mk").unlink()
+
+    (ripe,) = notify.find_bulks(True, bulk_interval=10)
+
+    assert ripe[0] == str(tmp_path / "alice/mail/60,3,host,heute")
+    assert notify._load_bulk_index()["bulks"]["alice/mail/60,3,host,heute"]["count"] == 3
+
+
+def test_notify_bulk_removes_sent_bulk_from_index(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(notify, "notification_bulkdir", str(tmp_path))
+    monkeypatch.setattr(notify, "log_to_history", lambda message: None)
+    monkeypatch.setattr(notify, "call_bulk_notification_script", lambda *args, **kwargs: (0, []))
+    for _nr in range(3):
+        _spool_bulk_notification("alice", "heute")
+
+    for bulk in notify.find_bulks(True, bulk_interval=10):
+        notify.notify_bulk(bulk[0], bulk[-1], lambda _proxy: HTTP_PROXY, plugin_timeout=60)
+
+    assert not (tmp_path / "alice/mail/60,3,host,heute").exists()
+    assert notify._load_bulk_index()["bulks"] == {}
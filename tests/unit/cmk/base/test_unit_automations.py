@@ -9,6 +9,7 @@ from pytest import MonkeyPatch
 import cmk.base.automations
 import cmk.base.automations.check_mk as automations
 import cmk.ccc.version as cmk_version
+from cmk.automations.helper_api import LONG_RUNNING_AUTOMATIONS
 from cmk.automations.results import AnalyseHostResult, GetServicesLabelsResult
 from cmk.base.config import LoadingResult
 from cmk.ccc.hostaddress import HostName
@@ -71,6 +72,13 @@ def test_registered_automations() -> None:
     )
 
 
+def test_long_running_automations_are_registered() -> None:
+    assert LONG_RUNNING_AUTOMATIONS <= {
+        *cmk.base.automations.automations._automations,
+        "bake-agents",  # not available in all editions
+    }
+
+
 def test_analyse_host(monkeypatch: MonkeyPatch) -> None:
     additional_labels: dict[str, str] = {}
     additional_label_sources: dict[str, LabelSource] = {}
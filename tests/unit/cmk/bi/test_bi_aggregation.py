@@ -3,15 +3,20 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+from typing import Any
+
 import pytest
 
-from livestatus import LivestatusResponse
+from livestatus import LivestatusResponse, LivestatusRow
 
 from cmk.bi.actions import BICallARuleAction
 from cmk.bi.aggregation import BIAggregation
+from cmk.bi.computer import BIResultCache
 from cmk.bi.data_fetcher import BIStatusFetcher, BIStructureFetcher
+from cmk.bi.lib import NodeResultBundle
 from cmk.bi.packs import BIAggregationPacks
 from cmk.bi.searcher import BISearcher
+from cmk.bi.trees import BICompiledLeaf
 from cmk.ccc.site import SiteId
 
 from .bi_test_data import sample_config
@@ -84,3 +89,55 @@ def test_compute_aggregation(
     assert actual_result.acknowledged == expected_acknowledgment
     assert actual_result.in_downtime == expected_in_downtime
     assert actual_result.in_service_period == expected_service_period
+
+
+def test_compute_aggregation_with_result_cache(
+    monkeypatch: pytest.MonkeyPatch,
+    bi_packs_sample_config: BIAggregationPacks,
+    bi_structure_fetcher: BIStructureFetcher,
+    bi_searcher: BISearcher,
+    bi_status_fetcher: BIStatusFetcher,
+) -> None:
+    bi_structure_fetcher.add_site_data(SiteId("heute"), sample_config.bi_structure_states)
+    bi_searcher.set_hosts(bi_structure_fetcher.hosts)
+    bi_aggregation = bi_packs_sample_config.get_aggregation("default_aggregation")
+    assert bi_aggregation is not None
+    compiled_aggregation = bi_aggregation.compile(bi_searcher)
+    result_cache = BIResultCache()
+    result_cache.set_generation(1.0)
+
+    computed_leaves: list[BICompiledLeaf] = []
+    compute_leaf = BICompiledLeaf.compute
+
+    def recording_compute(self: BICompiledLeaf, *args: Any, **kwargs: Any) -> Any:
+        computed_leaves.append(self)
+        return compute_leaf(self, *args, **kwargs)
+
+    monkeypatch.setattr(BICompiledLeaf, "compute", recording_compute)
+
+    def compute(status_data: LivestatusResponse) -> list[NodeResultBundle]:
+        computed_leaves.clear()
+        bi_status_fetcher.states = bi_status_fetcher.create_bi_status_data(status_data)
+        return result_cache.compute_branches(
+            compiled_aggregation, compiled_aggregation.branches, bi_status_fetcher
+        )
+
+    first_results = compute(sample_config.bi_status_rows)
+    assert computed_leaves
+
+    assert compute(sample_config.bi_status_rows) == first_results
+    assert not computed_leaves
+
+    changed_results = compute(
+        LivestatusResponse(
+            [
+                LivestatusRow([*row[:5], "Host is gone", *row[6:]]) if row[1] == "heute" else row
+                for row in sample_config.bi_status_rows
+            ]
+        )
+    )
+    assert computed_leaves
+    assert {leaf.host_name for leaf in computed_leaves} == {"heute"}
+    assert changed_results == compiled_aggregation.compute_branches(
+        compiled_aggregation.branches, bi_status_fetcher
+    )
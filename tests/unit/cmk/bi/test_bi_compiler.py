@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import copy
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from fakeredis import FakeRedis
+
+from livestatus import LivestatusResponse, LivestatusRow, Query
+
+from cmk.bi.aggregation import BIAggregation
+from cmk.bi.compiler import BICompiler
+from cmk.bi.data_fetcher import BIStructureFetcher
+from cmk.bi.filesystem import BIFileSystem
+from cmk.bi.lib import SitesCallback
+from cmk.bi.searcher import BISearcher
+from cmk.bi.trees import BICompiledAggregation
+from cmk.ccc.site import SiteId
+from tests.unit.cmk.bi.bi_mocks import MockBIAggregationPack
+
+from .bi_test_data import sample_config
+
+
+def _status_query_callback(
+    query: Query,
+    only_sites: list[SiteId] | None = None,
+    fetch_full_data: bool = False,
+) -> LivestatusResponse:
+    return LivestatusResponse([LivestatusRow(["heute", 1000])])
+
+
+@pytest.fixture(name="structure_states")
+def fixture_structure_states(monkeypatch: pytest.MonkeyPatch) -> dict:
+    structure_states = copy.deepcopy(sample_config.bi_structure_states)
+
+    def update_data(self: BIStructureFetcher, required_program_starts: set) -> None:
+        self.add_site_data(SiteId("heute"), structure_states)
+
+    monkeypatch.setattr(BIStructureFetcher, "update_data", update_data)
+    return structure_states
+
+
+@pytest.fixture(name="compiled_aggregation_ids")
+def fixture_compiled_aggregation_ids(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    compiled_aggregation_ids = []
+    compile_aggregation: Callable[[BIAggregation, BISearcher], BICompiledAggregation] = (
+        BIAggregation.compile
+    )
+
+    def recording_compile(self: BIAggregation, bi_searcher: BISearcher) -> BICompiledAggregation:
+        compiled_aggregation_ids.append(self.id)
+        return compile_aggregation(self, bi_searcher)
+
+    monkeypatch.setattr(BIAggregation, "compile", recording_compile)
+    return compiled_aggregation_ids
+
+
+def _compile(fs: BIFileSystem, packs_config: dict[str, Any]) -> BICompiler:
+    compiler = BICompiler(
+        fs.etc.config,
+        SitesCallback(lambda: [(SiteId("heute"), True)], _status_query_callback, lambda s: s),
+        fs,
+        FakeRedis(),
+    )
+    compiler._bi_packs = MockBIAggregationPack(packs_config)
+    compiler.load_compiled_aggregations()
+    return compiler
+
+
+def test_compilation_reuses_unchanged_aggregations(
+    fs: BIFileSystem, structure_states: dict, compiled_aggregation_ids: list[str]
+) -> None:
+    packs_config: dict[str, Any] = copy.deepcopy(sample_config.bi_packs_config)
+    compiler = _compile(fs, packs_config)
+    assert compiled_aggregation_ids == ["default_aggregation"]
+    branch_titles = [
+        branch.properties.title
+        for branch in compiler.compiled_aggregations["default_aggregation"].branches
+    ]
+
+    compiled_aggregation_ids.clear()
+    compiler = _compile(fs, packs_config)
+    assert not compiled_aggregation_ids
+    assert [
+        branch.properties.title
+        for branch in compiler.compiled_aggregations["default_aggregation"].branches
+    ] == branch_titles
+
+    packs_config["packs"][0]["aggregations"][0]["computation_options"]["use_hard_states"] = True
+    _compile(fs, packs_config)
+    assert compiled_aggregation_ids == ["default_aggregation"]
+
+    compiled_aggregation_ids.clear()
+    structure_states.pop("heute_clone")
+    compiler = _compile(fs, packs_config)
+    assert compiled_aggregation_ids == ["default_aggregation"]
+    assert len(compiler.compiled_aggregations["default_aggregation"].branches) == 1
+
+
+def _with_changed_host(
+    structure_states: dict, host_name: str, *, tags: set | None = None, services: dict | None = None
+) -> None:
+    site, old_tags, labels, folder, old_services, *remaining = structure_states[host_name]
+    structure_states[host_name] = (
+        site,
+        old_tags if tags is None else tags,
+        labels,
+        folder,
+        old_services if services is None else services,
+        *remaining,
+    )
+
+
+def test_compilation_recompiles_aggregations_depending_on_changed_hosts(
+    fs: BIFileSystem, structure_states: dict, compiled_aggregation_ids: list[str]
+) -> None:
+    packs_config: dict[str, Any] = copy.deepcopy(sample_config.bi_packs_config)
+    heute_aggregation = copy.deepcopy(packs_config["packs"][0]["aggregations"][0])
+    heute_aggregation["id"] = "heute_aggregation"
+    heute_aggregation["node"] = {
+        "action": {
+            "params": {"arguments": ["$HOSTNAME$"]},
+            "rule_id": "applications",
+            "type": "call_a_rule",
+        },
+        "search": {
+            "conditions": {
+                "host_choice": {"type": "host_name_regex", "pattern": "heute"},
+                "host_folder": "",
+                "host_label_groups": [],
+                "host_tags": {},
+            },
+            "refer_to": "host",
+            "type": "host_search",
+        },
+    }
+    packs_config["packs"][0]["aggregations"].append(heute_aggregation)
+    _compile(fs, packs_config)
+    assert compiled_aggregation_ids == ["default_aggregation", "heute_aggregation"]
+
+    # Only the default aggregation searches all hosts with the tcp tag
+    compiled_aggregation_ids.clear()
+    clone_services = structure_states["heute_clone"][4]
+    _with_changed_host(
+        structure_states, "heute_clone", services={**clone_services, "Uptime 2": ({}, {})}
+    )
+    _compile(fs, packs_config)
+    assert compiled_aggregation_ids == ["default_aggregation"]
+
+    # A host losing the tcp tag is not found by the search of the default aggregation anymore
+    compiled_aggregation_ids.clear()
+    clone_tags = structure_states["heute_clone"][1]
+    _with_changed_host(structure_states, "heute_clone", tags=clone_tags - {("tcp", "tcp")})
+    compiler = _compile(fs, packs_config)
+    assert compiled_aggregation_ids == ["default_aggregation"]
+    assert len(compiler.compiled_aggregations["default_aggregation"].branches) == 1
+
+    compiled_aggregation_ids.clear()
+    heute_services = structure_states["heute"][4]
+    _with_changed_host(structure_states, "heute", services={**heute_services, "ORACLE": ({}, {})})
+    _compile(fs, packs_config)
+    assert compiled_aggregation_ids == ["default_aggregation", "heute_aggregation"]
@@ -3,10 +3,15 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import re
+
 import pytest
 
+from cmk.bi.lib import BIHostData
 from cmk.bi.search import BIEmptySearch, BIFixedArgumentsSearch, BIHostSearch, BIServiceSearch
 from cmk.bi.searcher import BISearcher
+from cmk.ccc.hostaddress import HostName
+from cmk.utils.tags import TagGroupID, TagID
 
 
 def test_empty_search(bi_searcher: BISearcher) -> None:
@@ -189,3 +194,96 @@ def test_service_search(
     search = BIServiceSearch(schema_config)
     results = search.execute({}, bi_searcher_with_sample_config)
     assert len(results) == expected_matches
+
+
+def _generated_hosts() -> dict[str, BIHostData]:
+    return {
+        f"host{idx:03}": BIHostData(
+            "heute",
+            {(TagGroupID("criticality"), TagID(("prod", "test", "offline")[idx % 3]))},
+            {"os": ("linux", "windows")[idx % 2], "rack": str(idx % 5)},
+            ("servers/linux/", "servers/windows/", "clients/", "")[idx % 4],
+            {},
+            (HostName("switch"),),
+            (HostName("router"),),
+            f"alias{idx}",
+            HostName(f"host{idx:03}"),
+        )
+        for idx in range(120)
+    }
+
+
+@pytest.mark.parametrize(
+    "conditions",
+    [
+        pytest.param({"host_folder": "servers"}, id="folder"),
+        pytest.param({"host_folder": "servers/linux"}, id="subfolder"),
+        pytest.param({"host_tags": {"criticality": "prod"}}, id="tag"),
+        pytest.param({"host_tags": {"criticality": {"$or": ["prod", "test"]}}}, id="tag or"),
+        pytest.param({"host_tags": {"criticality": {"$ne": "prod"}}}, id="tag ne"),
+        pytest.param(
+            {"host_label_groups": [("and", [("and", "os:linux"), ("not", "rack:1")])]},
+            id="labels",
+        ),
+        pytest.param(
+            {"host_label_groups": [("and", [("and", "os:linux")]), ("or", [("and", "rack:1")])]},
+            id="labels or",
+        ),
+        pytest.param(
+            {"host_choice": {"type": "host_name_regex", "pattern": "host0(1.)"}}, id="prefix"
+        ),
+        pytest.param(
+            {"host_choice": {"type": "host_name_regex", "pattern": "host02?.*"}},
+            id="optional prefix",
+        ),
+        pytest.param(
+            {
+                "host_choice": {"type": "host_name_regex", "pattern": "host1.*"},
+                "host_folder": "clients",
+                "host_tags": {"criticality": "test"},
+            },
+            id="combined",
+        ),
+    ],
+)
+def test_host_search_with_index(conditions: dict) -> None:
+    hosts = _generated_hosts()
+    all_conditions = {
+        "host_choice": {"type": "all_hosts"},
+        "host_folder": "",
+        "host_tags": {},
+        "host_label_groups": [],
+        **conditions,
+    }
+    bi_searcher = BISearcher()
+    bi_searcher.set_hosts(hosts)
+
+    matches = bi_searcher.search_hosts(all_conditions)
+
+    pattern = all_conditions["host_choice"].get("pattern", ".*") + "$"
+    expected = [
+        host.name
+        for host in hosts.values()
+        if re.match(pattern, host.name)
+        and list(bi_searcher.filter_host_folder([host], all_conditions["host_folder"]))
+        and list(bi_searcher.filter_host_tags([host], all_conditions["host_tags"]))
+        and list(bi_searcher.filter_host_labels([host], all_conditions["host_label_groups"]))
+    ]
+    assert expected
+    assert [match.host.name for match in matches] == expected
+
+
+def test_record_dependencies_of_looked_up_hosts() -> None:
+    hosts = _generated_hosts()
+    bi_searcher = BISearcher()
+    bi_searcher.set_hosts(hosts)
+
+    with bi_searcher.record_dependencies() as dependencies:
+        assert "host001" in bi_searcher.hosts
+        assert bi_searcher.hosts.get("missing") is None
+        assert len(bi_searcher.hosts) == len(hosts)
+        assert list(bi_searcher.hosts.values()) == list(hosts.values())
+
+    assert bi_searcher.hosts is hosts
+    assert dependencies.host_names == {"host001", "missing"}
+    assert not dependencies.all_hosts
@@ -15,10 +15,17 @@ def test_clear_compilation_cache(fs: BIFileSystem) -> None:
     (fs.cache.compiled_aggregations / "foo").write_text("bar")
     fs.cache.compilation_lock.write_text("lock")
     fs.cache.last_compilation.write_text("last")
+    fs.cache.compilation_fingerprints.write_text("fingerprints")
+    fs.cache.branch_index.write_text("index")
+    fs.cache.compiled_branches.mkdir()
+    (fs.cache.compiled_branches / "foo").write_text("bar")
 
     fs.cache.clear_compilation_cache()
 
     assert not any(fs.cache.compiled_aggregations.iterdir())
+    assert not any(fs.cache.compiled_branches.iterdir())
+    assert not fs.cache.compilation_fingerprints.exists()
+    assert not fs.cache.branch_index.exists()
     assert not fs.cache.compilation_lock.exists()
     assert not fs.cache.last_compilation.exists()
 
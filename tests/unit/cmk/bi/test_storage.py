@@ -3,6 +3,8 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+from pathlib import Path
+
 import pytest
 from fakeredis import FakeRedis
 
@@ -13,6 +15,7 @@ from cmk.bi.rule_interface import BIRuleProperties
 from cmk.bi.storage import (
     AggregationNotFound,
     AggregationStore,
+    BranchIndex,
     FrozenAggregationStore,
     generate_identifier,
     LookupStore,
@@ -20,6 +23,7 @@ from cmk.bi.storage import (
 )
 from cmk.bi.trees import BICompiledAggregation, BICompiledLeaf, BICompiledRule
 from cmk.bi.type_defs import ComputationConfigDict
+from cmk.ccc import store
 from cmk.ccc.hostaddress import HostName
 from cmk.ccc.site import SiteId
 
@@ -116,6 +120,92 @@ class TestFrozenAggregationStore:
         frozen_store.delete("heute")  # shouldn't raise
 
 
+class TestBranchIndex:
+    @pytest.fixture
+    def branch_index(self, fs: BIFileSystem) -> BranchIndex:
+        branch_index = BranchIndex(fs.cache)
+        gestern_branch = _build_branch("Gestern")
+        gestern_branch.nodes = [
+            BICompiledLeaf(
+                host_name=HostName("gestern"), site_id="heute", service_description="CPU load"
+            )
+        ]
+        branch_index.update(
+            {
+                "heute": _build_aggregation("heute", branches=[_build_branch("Heute")]),
+                "other": _build_aggregation(
+                    "other", branches=[_build_branch("Other"), gestern_branch]
+                ),
+            }
+        )
+        return branch_index
+
+    def test_find(self, branch_index: BranchIndex) -> None:
+        assert sorted(branch_index.find()) == [
+            ("heute", "Heute"),
+            ("other", "Gestern"),
+            ("other", "Other"),
+        ]
+        assert sorted(branch_index.find(aggr_ids=["other"])) == [
+            ("other", "Gestern"),
+            ("other", "Other"),
+        ]
+        assert branch_index.find(aggr_ids=["other"], branch_titles=["Heute"]) == []
+        assert sorted(branch_index.find(hosts=["heute"])) == [
+            ("heute", "Heute"),
+            ("other", "Other"),
+        ]
+        assert branch_index.find(hosts=["gestern"], services=[("gestern", "CPU load")]) == [
+            ("other", "Gestern")
+        ]
+        assert branch_index.find(services=[("heute", "CPU load")]) == []
+
+    def test_load(self, branch_index: BranchIndex) -> None:
+        assert (aggregation := branch_index.load("other", "Gestern"))
+        assert aggregation.id == "other"
+        assert [branch.properties.title for branch in aggregation.branches] == ["Gestern"]
+        assert aggregation.groups.names == ["groupA", "groupB"]
+        assert branch_index.load("heute", "Gestern") is None
+
+    def test_update_removes_vanished_branches(
+        self, branch_index: BranchIndex, fs: BIFileSystem
+    ) -> None:
+        branch_index.update(
+            {"heute": _build_aggregation("heute", branches=[_build_branch("Heute")])}
+        )
+
+        assert branch_index.find() == [("heute", "Heute")]
+        assert branch_index.load("other", "Other") is None
+        assert len(list(fs.cache.compiled_branches.iterdir())) == 1
+
+    def test_update_only_writes_changed_branches(
+        self, branch_index: BranchIndex, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        written: list[str] = []
+        save_bytes_to_file = store.save_bytes_to_file
+
+        def tracking_save_bytes_to_file(path: Path, content: bytes) -> None:
+            written.append(path.name)
+            save_bytes_to_file(path, content)
+
+        monkeypatch.setattr(store, "save_bytes_to_file", tracking_save_bytes_to_file)
+        changed_branch = _build_branch("Gestern")
+        changed_branch.nodes = [
+            BICompiledLeaf(host_name=HostName("morgen"), site_id="heute", service_description=None)
+        ]
+        branch_index.update(
+            {
+                "heute": _build_aggregation("heute", branches=[_build_branch("Heute")]),
+                "other": _build_aggregation(
+                    "other", branches=[_build_branch("Other"), changed_branch]
+                ),
+            }
+        )
+
+        assert written == [generate_identifier("other\tGestern")]
+        assert branch_index.find(hosts=["morgen"]) == [("other", "Gestern")]
+
+
 class TestMetadataStore:
     @pytest.fixture
     def metadata_store(self, fs: BIFileSystem) -> MetadataStore:
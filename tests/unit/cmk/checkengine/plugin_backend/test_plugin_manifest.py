@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import itertools
+from pathlib import Path
+
+import pytest
+
+from cmk.checkengine.plugin_backend import (
+    extract_known_discovery_rulesets,
+    filter_relevant_raw_sections,
+    load_selected_plugins,
+    plugin_manifest,
+)
+from cmk.checkengine.plugins import (
+    AgentBasedPlugins,
+    CheckPluginName,
+    LegacyPluginLocation,
+    SectionName,
+)
+from cmk.discover_plugins import PluginLocation
+
+
+def _write_and_load(
+    plugins: AgentBasedPlugins, config_path: Path
+) -> plugin_manifest.PluginManifest:
+    plugin_manifest.make_manifest_file(config_path).write_text(
+        plugin_manifest.create_plugin_manifest(plugins)
+    )
+    return plugin_manifest.load_plugin_manifest(config_path)
+
+
+def test_plugin_manifest_index_matches_plugins(
+    agent_based_plugins: AgentBasedPlugins, tmp_path: Path
+) -> None:
+    manifest = _write_and_load(agent_based_plugins, tmp_path)
+    check_plugins = [
+        agent_based_plugins.check_plugins[CheckPluginName(n)] for n in ("uptime", "df", "cpu_loads")
+    ]
+    needed = [
+        *check_plugins,
+        *filter_relevant_raw_sections(
+            consumers=check_plugins,
+            sections=itertools.chain(
+                agent_based_plugins.agent_sections.values(),
+                agent_based_plugins.snmp_sections.values(),
+            ),
+        ).values(),
+    ]
+
+    index = manifest.plugin_index((p.name for p in check_plugins), inventory=False)
+
+    assert set(manifest.discovery_rulesets) == set(
+        extract_known_discovery_rulesets(agent_based_plugins)
+    )
+    assert set(index.locations) == {
+        p.location for p in needed if isinstance(p.location, PluginLocation)
+    }
+    assert set(index.legacy) == {
+        p.location.file_name for p in needed if isinstance(p.location, LegacyPluginLocation)
+    }
+
+
+def test_plugin_manifest_index_with_inventory(
+    agent_based_plugins: AgentBasedPlugins, tmp_path: Path
+) -> None:
+    manifest = _write_and_load(agent_based_plugins, tmp_path)
+
+    index = manifest.plugin_index((), inventory=True)
+
+    assert {p.location for p in agent_based_plugins.inventory_plugins.values()} <= set(
+        index.locations
+    )
+
+
+def test_plugin_manifest_unknown_check_plugin(
+    agent_based_plugins: AgentBasedPlugins, tmp_path: Path
+) -> None:
+    manifest = _write_and_load(agent_based_plugins, tmp_path)
+
+    with pytest.raises(KeyError):
+        manifest.plugin_index([CheckPluginName("not_there_yet")], inventory=False)
+
+
+def test_load_plugins_from_plugin_manifest(
+    agent_based_plugins: AgentBasedPlugins, tmp_path: Path
+) -> None:
+    manifest = _write_and_load(agent_based_plugins, tmp_path)
+    index = manifest.plugin_index([CheckPluginName("uptime")], inventory=False)
+
+    plugins = load_selected_plugins(index.locations, (), (), validate=False)
+
+    assert set(plugins.check_plugins) == {CheckPluginName("uptime")}
+    assert SectionName("uptime") in plugins.agent_sections
+    assert not plugins.inventory_plugins
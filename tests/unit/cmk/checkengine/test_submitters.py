@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import io
+from pathlib import Path
+
+import pytest
+
+import cmk.utils.paths
+from cmk.ccc.hostaddress import HostName
+from cmk.checkengine.checkresults import SubmittableServiceCheckResult
+from cmk.checkengine.submitters import FileSubmitter, PipeSubmitter, Submittee
+from cmk.utils.servicename import ServiceName
+
+
+class _RecordingPipe(io.BytesIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes: list[bytes] = []
+
+    def write(self, b: object) -> int:
+        assert isinstance(b, bytes)
+        self.writes.append(b)
+        return len(b)
+
+
+def _submittees(count: int) -> list[Submittee]:
+    return [
+        Submittee(
+            ServiceName(f"Service {n}"),
+            SubmittableServiceCheckResult(
+                state=n % 4, output=f"Output of {n}\nwith details" + "x" * n
+            ),
+            None,
+        )
+        for n in range(count)
+    ]
+
+
+def test_pipe_submitter_batches_complete_commands(monkeypatch: pytest.MonkeyPatch) -> None:
+    pipe = _RecordingPipe()
+    monkeypatch.setattr(PipeSubmitter, "_nagios_command_pipe", pipe)
+    submitter = PipeSubmitter(HostName("heute"), perfdata_format="standard", show_perfdata=False)
+
+    submitter.submit(_submittees(300))
+
+    assert submitter.stats.writes == len(pipe.writes)
+    assert 1 < len(pipe.writes) < 300
+    assert all(len(w) <= 4096 for w in pipe.writes)
+    assert all(w.endswith(b"\n") for w in pipe.writes)
+    commands = b"".join(pipe.writes).decode().splitlines()
+    assert len(commands) == 300
+    assert commands[1].endswith(";heute;Service 1;1;Output of 1\\nwith detailsx|")
+
+
+def test_pipe_submitter_does_not_split_large_commands(monkeypatch: pytest.MonkeyPatch) -> None:
+    pipe = _RecordingPipe()
+    monkeypatch.setattr(PipeSubmitter, "_nagios_command_pipe", pipe)
+    submitter = PipeSubmitter(HostName("heute"), perfdata_format="standard", show_perfdata=False)
+
+    submitter.submit(_submittees(5000)[4990:])
+
+    assert len(pipe.writes) == 10
+    assert all(w.count(b"\n") == 1 for w in pipe.writes)
+
+
+def test_file_submitter_writes_all_results_at_once(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(cmk.utils.paths, "check_result_path", tmp_path)
+    submitter = FileSubmitter(HostName("heute"), perfdata_format="standard", show_perfdata=False)
+
+    submitter.submit(_submittees(100))
+
+    assert submitter.stats.writes == 1
+    (result_file,) = (p for p in tmp_path.iterdir() if not p.name.endswith(".ok"))
+    assert (tmp_path / f"{result_file.name}.ok").exists()
+    content = result_file.read_text()
+    assert content.count("host_name=heute\n") == 100
+    assert "service_description=Service 99\n" in content
+    assert "output=Output of 1\\nwith detailsx|\n" in content
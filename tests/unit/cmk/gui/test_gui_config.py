@@ -45,6 +45,7 @@ def test_default_config_from_plugins() -> None:
         "acknowledge_problems",
         "custom_links",
         "debug_livestatus_queries",
+        "sort_views_in_livestatus",
         "show_livestatus_errors",
         "liveproxyd_enabled",
         "visible_views",
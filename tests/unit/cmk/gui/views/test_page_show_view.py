@@ -2,10 +2,31 @@
 # Copyright (C) 2019 Checkmk GmbH - License: GNU General Public License v2
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
+
+import random
 from collections.abc import Iterable
 
+import pytest
+
+from cmk.gui.type_defs import Row, Rows, SorterFunction
 from cmk.gui.view import View
-from cmk.gui.views.page_show_view import _get_needed_regular_columns
+from cmk.gui.views.page_show_view import (
+    _get_needed_regular_columns,
+    _sort_data,
+    _sort_data_by_cmp,
+    _sort_data_by_keys,
+)
+from cmk.gui.views.sorter import (
+    cmp_num_split,
+    cmp_simple_number,
+    cmp_simple_string,
+    key_simple_number,
+    key_simple_string,
+    row_key_num_split,
+    Sorter,
+    SorterEntry,
+    SortKeyFunction,
+)
 from cmk.gui.visuals.filter import Filter
 from cmk.gui.visuals.filter.components import FilterComponent
 
@@ -69,3 +90,96 @@ def test_get_needed_regular_columns(view: View) -> None:
             "some_column",
         ]
     )
+
+
+def _column_sorter(
+    column: str, cmp_func: SorterFunction, key_func: SortKeyFunction | None
+) -> Sorter:
+    return Sorter(
+        ident=column,
+        title=column,
+        columns=[column],
+        sort_function=lambda r1, r2, **_kwargs: cmp_func(column, r1, r2),
+        sort_key=None if key_func is None else lambda row, **_kwargs: key_func(column, row),
+    )
+
+
+def _random_rows(count: int) -> Rows:
+    rand = random.Random(42)
+    rows: Rows = []
+    for _ in range(count):
+        row: Row = {
+            "host_name": rand.choice(["host1", "Host2", "host10", "host2", "router"]),
+            "service_description": rand.choice(["CPU load", "cpu load", "Uptime", "Disk"]),
+            "service_state": rand.randint(0, 3),
+            "JOIN": {},
+        }
+        if rand.random() < 0.7:
+            row["JOIN"]["Uptime"] = {"service_state": rand.randint(0, 3)}
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.usefixtures("request_context")
+def test_sort_data_by_keys_matches_cmp() -> None:
+    sorters = [
+        SorterEntry(
+            _column_sorter("service_state", cmp_simple_number, key_simple_number),
+            negate=False,
+            join_key="Uptime",
+            parameters=None,
+        ),
+        SorterEntry(
+            _column_sorter("host_name", cmp_num_split, row_key_num_split),
+            negate=True,
+            join_key=None,
+            parameters=None,
+        ),
+        SorterEntry(
+            _column_sorter("service_description", cmp_simple_string, key_simple_string),
+            negate=False,
+            join_key=None,
+            parameters=None,
+        ),
+        SorterEntry(
+            _column_sorter("service_state", cmp_simple_number, key_simple_number),
+            negate=True,
+            join_key=None,
+            parameters=None,
+        ),
+    ]
+    by_cmp = _random_rows(500)
+    by_keys = list(by_cmp)
+
+    _sort_data_by_cmp(by_cmp, sorters)
+    _sort_data_by_keys(by_keys, sorters)
+
+    assert by_keys == by_cmp
+
+
+@pytest.mark.usefixtures("request_context")
+def test_sort_data_without_sort_key() -> None:
+    rows = _random_rows(50)
+    expected = sorted(rows, key=lambda r: (-r["service_state"], r["host_name"].lower()))
+
+    _sort_data(
+        rows,
+        [
+            SorterEntry(
+                _column_sorter("service_state", cmp_simple_number, None),
+                negate=True,
+                join_key=None,
+                parameters=None,
+            ),
+            SorterEntry(
+                _column_sorter("host_name", cmp_simple_string, key_simple_string),
+                negate=False,
+                join_key=None,
+                parameters=None,
+            ),
+        ],
+    )
+
+    assert [(r["service_state"], r["host_name"].lower()) for r in rows] == [
+        (r["service_state"], r["host_name"].lower()) for r in expected
+    ]
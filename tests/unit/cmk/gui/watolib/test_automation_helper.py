@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+from pathlib import Path
+
+import pytest
+
+from cmk.automations.helper_api import LONG_RUNNING_UNIX_SOCKET_NAME, UNIX_SOCKET_NAME
+from cmk.gui.watolib.automation_helper import HelperExecutor
+
+
+@pytest.fixture(name="socket_dir")
+def fixture_socket_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    monkeypatch.setattr(HelperExecutor, "_SOCKET_DIR", tmp_path)
+    (tmp_path / UNIX_SOCKET_NAME).touch()
+    return tmp_path
+
+
+def test_socket_path_routes_long_running_automations(socket_dir: Path) -> None:
+    (socket_dir / LONG_RUNNING_UNIX_SOCKET_NAME).touch()
+    executor = HelperExecutor()
+    assert executor._socket_path("service-discovery") == socket_dir / LONG_RUNNING_UNIX_SOCKET_NAME
+    assert executor._socket_path("get-configuration") == socket_dir / UNIX_SOCKET_NAME
+
+
+@pytest.mark.parametrize(
+    "preview",
+    [
+        "service-discovery-preview",
+        "special-agent-discovery-preview",
+        "diag-host",
+        "diag-special-agent",
+        "get-agent-output",
+        "active-check",
+    ],
+)
+def test_socket_path_routes_previews_past_a_running_restart(socket_dir: Path, preview: str) -> None:
+    (socket_dir / LONG_RUNNING_UNIX_SOCKET_NAME).touch()
+    executor = HelperExecutor()
+    assert executor._socket_path("restart") == socket_dir / LONG_RUNNING_UNIX_SOCKET_NAME
+    assert executor._socket_path(preview) == socket_dir / UNIX_SOCKET_NAME
+
+
+def test_socket_path_falls_back_to_main_socket(socket_dir: Path) -> None:
+    executor = HelperExecutor()
+    assert executor._socket_path("service-discovery") == socket_dir / UNIX_SOCKET_NAME
+    assert executor._socket_path("get-configuration") == socket_dir / UNIX_SOCKET_NAME
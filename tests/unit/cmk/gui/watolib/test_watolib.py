@@ -143,7 +143,10 @@ def test_registered_configvars() -> None:
         "notification_bulk_interval",
         "notification_fallback_email",
         "notification_fallback_format",
+        "notification_in_process_plugins",
         "notification_logging",
+        "notification_parallel_plugins",
+        "notification_plugin_concurrency",
         "notification_plugin_timeout",
         "page_heading",
         "pagetitle_date_format",
@@ -179,6 +182,7 @@ def test_registered_configvars() -> None:
         "snmp_credentials",
         "socket_queue_len",
         "soft_query_limit",
+        "sort_views_in_livestatus",
         "staleness_threshold",
         "start_url",
         "statistics_interval",
@@ -6,13 +6,20 @@
 import gzip
 import io
 import json
+import os
+import sqlite3
 from pathlib import Path
 
+import pytest
+
 import cmk.ccc.store
 from cmk.ccc.hostaddress import HostName
+from cmk.inventory.paths import Paths as InventoryPaths
 from cmk.inventory.structured_data import (
+    compact_inventory_archive,
     deserialize_tree,
     HistoryStore,
+    InventoryIndex,
     InventoryStore,
     load_history,
     make_meta,
@@ -224,6 +231,64 @@ def test_archive_inventory_tree(tmp_path: Path) -> None:
         assert archive_file_path.suffixes == [".json"]
 
 
+def _save_inventory_tree(tmp_path: Path, raw_tree: SDRawTree, timestamp: int) -> None:
+    file_path = tmp_path / "var/check_mk/inventory/hostname.json"
+    cmk.ccc.store.save_text_to_file(file_path, json.dumps(raw_tree))
+    os.utime(file_path, (timestamp, timestamp))
+
+
+def _history_stats(tmp_path: Path) -> list[tuple[int, int, int, int, int]]:
+    history = load_history(
+        HistoryStore(tmp_path),
+        HostName("hostname"),
+        history_paths_filter=lambda paths: paths,
+        delta_tree_filters=None,
+    )
+    assert not history.corrupted
+    return [
+        (e.previous_timestamp, e.current_timestamp, e.new, e.changed, e.removed)
+        for e in history.entries
+    ]
+
+
+def test_archive_inventory_tree_keeps_snapshots_and_delta_records(tmp_path: Path) -> None:
+    host_name = HostName("hostname")
+    inv_store = InventoryStore(tmp_path)
+    for idx in range(1, 26):
+        _save_inventory_tree(tmp_path, _raw_tree(f"val-{idx}"), 100 * idx)
+        inv_store.archive_inventory_tree(host_name=host_name)
+    _save_inventory_tree(tmp_path, _raw_tree("val"), 2600)
+
+    assert sorted(
+        int(p.stem) for p in (tmp_path / "var/check_mk/inventory_archive/hostname").iterdir()
+    ) == [1000, 2000, 2500]
+    assert len(list((tmp_path / "var/check_mk/inventory_delta_cache/hostname").iterdir())) == 25
+    assert inv_store.load_previous_inventory_tree(host_name=host_name) == deserialize_tree(
+        _raw_tree("val")
+    )
+    assert _history_stats(tmp_path) == [
+        (-1, 100, 10, 0, 0),
+        *((100 * idx, 100 * (idx + 1), 0, 1, 0) for idx in range(1, 26)),
+    ]
+
+
+def test_compact_inventory_archive(tmp_path: Path) -> None:
+    for idx in range(1, 6):
+        cmk.ccc.store.save_text_to_file(
+            tmp_path / f"var/check_mk/inventory_archive/hostname/{idx}.json",
+            json.dumps(_raw_tree(f"val-{idx}")),
+        )
+    _save_inventory_tree(tmp_path, _raw_tree("val"), 6)
+    history_stats = _history_stats(tmp_path)
+
+    compact_inventory_archive(InventoryPaths(tmp_path), HostName("hostname"), snapshot_interval=2)
+
+    assert sorted(
+        int(p.stem) for p in (tmp_path / "var/check_mk/inventory_archive/hostname").iterdir()
+    ) == [2, 4, 5]
+    assert _history_stats(tmp_path) == history_stats
+
+
 def test_load_history(tmp_path: Path) -> None:
     host_name = HostName("hostname")
     for idx in range(5):
@@ -364,3 +429,127 @@ def test_rename(tmp_path: Path) -> None:
         assert (
             tmp_path / f"var/check_mk/inventory_delta_cache/{new_host_name}/{prev}_{cur}.json"
         ).exists()
+
+
+def _raw_tree_with_packages(version: str) -> SDRawTree:
+    return SDRawTree(
+        Attributes={},
+        Table={},
+        Nodes={
+            SDNodeName("software"): SDRawTree(
+                Attributes={},
+                Table={},
+                Nodes={
+                    SDNodeName("os"): SDRawTree(
+                        Attributes={"Pairs": {SDKey("name"): "Linux"}},
+                        Table={},
+                        Nodes={},
+                    ),
+                    SDNodeName("packages"): SDRawTree(
+                        Attributes={},
+                        Table={
+                            "KeyColumns": [SDKey("name")],
+                            "Rows": [
+                                {SDKey("name"): "bash", SDKey("version"): version},
+                                {SDKey("name"): "zsh", SDKey("installed"): True},
+                            ],
+                        },
+                        Nodes={},
+                    ),
+                },
+            ),
+        },
+    )
+
+
+def test_inventory_index(tmp_path: Path) -> None:
+    inv_store = InventoryStore(tmp_path)
+    for host_name, version in (("host1", "5.1"), ("host2", "5.2")):
+        inv_store.save_inventory_tree(
+            host_name=HostName(host_name),
+            tree=deserialize_tree(_raw_tree_with_packages(version)),
+            meta=make_meta(do_archive=False),
+        )
+    inv_store.save_inventory_tree(
+        host_name=HostName("host2"),
+        tree=deserialize_tree(_raw_tree_with_packages("5.3")),
+        meta=make_meta(do_archive=False),
+    )
+    packages = (SDNodeName("software"), SDNodeName("packages"))
+    index = InventoryIndex(tmp_path)
+
+    assert index.query_table(packages) == {
+        HostName("host1"): [
+            {SDKey("name"): ("bash", None), SDKey("version"): ("5.1", None)},
+            {SDKey("name"): ("zsh", None), SDKey("installed"): (True, None)},
+        ],
+        HostName("host2"): [
+            {SDKey("name"): ("bash", None), SDKey("version"): ("5.3", None)},
+            {SDKey("name"): ("zsh", None), SDKey("installed"): (True, None)},
+        ],
+    }
+    assert index.query_attributes(
+        (SDNodeName("software"), SDNodeName("os")), host_names=[HostName("host2")]
+    ) == {HostName("host2"): {SDKey("name"): ("Linux", None)}}
+    assert index.query_table(
+        (SDNodeName("hardware"), SDNodeName("cpu")), host_names=[HostName("host1")]
+    ) == {HostName("host1"): []}
+
+    inv_store.remove_inventory_tree(host_name=HostName("host1"))
+    assert list(index.query_table(packages)) == [HostName("host2")]
+
+
+def test_inventory_index_keeps_rows_of_unchanged_trees(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    inv_store = InventoryStore(tmp_path)
+    deleted = []
+    delete = InventoryIndex._delete
+
+    def record_delete(connection: sqlite3.Connection, host_name: HostName) -> None:
+        deleted.append(host_name)
+        delete(connection, host_name)
+
+    monkeypatch.setattr(InventoryIndex, "_delete", staticmethod(record_delete))
+
+    for version in ("5.1", "5.1", "5.2"):
+        inv_store.save_inventory_tree(
+            host_name=HostName("hostname"),
+            tree=deserialize_tree(_raw_tree_with_packages(version)),
+            meta=make_meta(do_archive=False),
+        )
+
+    assert deleted == [HostName("hostname"), HostName("hostname")]
+    # The timestamp is updated in any case, otherwise the entries were considered outdated
+    assert list(
+        InventoryIndex(tmp_path).query_table((SDNodeName("software"), SDNodeName("packages")))
+    ) == [HostName("hostname")]
+
+
+def test_inventory_index_skips_outdated_trees(tmp_path: Path) -> None:
+    InventoryStore(tmp_path).save_inventory_tree(
+        host_name=HostName("hostname"),
+        tree=deserialize_tree(_raw_tree_with_packages("5.1")),
+        meta=make_meta(do_archive=False),
+    )
+    os.utime(tmp_path / "var/check_mk/inventory/hostname.json", (123, 123))
+
+    assert not InventoryIndex(tmp_path).query_table(
+        (SDNodeName("software"), SDNodeName("packages"))
+    )
+
+
+def test_inventory_index_rename(tmp_path: Path) -> None:
+    InventoryStore(tmp_path).save_inventory_tree(
+        host_name=HostName("old_host_name"),
+        tree=deserialize_tree(_raw_tree_with_packages("5.1")),
+        meta=make_meta(do_archive=False),
+    )
+
+    rename(
+        tmp_path, old_host_name=HostName("old_host_name"), new_host_name=HostName("new_host_name")
+    )
+
+    assert list(
+        InventoryIndex(tmp_path).query_table((SDNodeName("software"), SDNodeName("packages")))
+    ) == [HostName("new_host_name")]
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import sys
+from collections.abc import Callable
+from unittest.mock import Mock
+
+import pytest
+import requests
+from pytest import MonkeyPatch
+
+from cmk.notification_plugins import in_process, slack, utils
+from cmk.utils.notify_types import PluginNotificationContext
+
+
+def _patch_main(monkeypatch: MonkeyPatch, main: Callable[[], object]) -> None:
+    monkeypatch.setattr(in_process, "_load_main", lambda plugin_name: main)
+
+
+@pytest.mark.parametrize(
+    "main, expected",
+    [
+        pytest.param(lambda: 0, (0, []), id="return 0"),
+        pytest.param(lambda: None, (0, []), id="return None"),
+        pytest.param(lambda: sys.stderr.write("200: OK") and 0, (0, ["200: OK"]), id="stderr"),
+        pytest.param(lambda: sys.exit(2), (2, []), id="sys.exit"),
+        pytest.param(lambda: sys.exit("failed"), (1, ["failed"]), id="sys.exit message"),
+    ],
+)
+def test_run_plugin_exit_code_and_output(
+    monkeypatch: MonkeyPatch, main: Callable[[], object], expected: tuple[int, list[str]]
+) -> None:
+    _patch_main(monkeypatch, main)
+    assert in_process.run_plugin("slack", {}, timeout=10) == expected
+
+
+def test_run_plugin_exception(monkeypatch: MonkeyPatch) -> None:
+    def main() -> int:
+        raise ValueError("broken")
+
+    _patch_main(monkeypatch, main)
+    exit_code, output = in_process.run_plugin("slack", {}, timeout=10)
+    assert exit_code == 1
+    assert output[-1] == "ValueError: broken"
+
+
+def test_run_plugin_passes_context(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.delenv("NOTIFY_PARAMETER_ROUTING_KEY", raising=False)
+    collected: list[PluginNotificationContext] = []
+
+    def main() -> int:
+        collected.append(utils.collect_context())
+        assert utils.get_password_from_env_or_context("NOTIFY_PARAMETER_ROUTING_KEY") == "secret"
+        return 0
+
+    _patch_main(monkeypatch, main)
+    in_process.run_plugin(
+        "pagerduty",
+        {
+            "NOTIFICATIONTYPE": "CUSTOM",
+            "WHAT": "HOST",
+            "HOSTSHORTSTATE": "UP",
+            "PARAMETER_ROUTING_KEY_1": "explicit_password",
+            "PARAMETER_ROUTING_KEY_2": "uuid",
+            "PARAMETER_ROUTING_KEY_3": "secret",
+        },
+        timeout=10,
+    )
+
+    assert collected[0]["EVENT_TXT"] == "Custom Notification (UP)"
+    assert utils.plugin_context_var.get() is None
+
+
+def test_run_plugin_rejects_unknown_plugin() -> None:
+    with pytest.raises(ValueError):
+        in_process.run_plugin("mail", {}, timeout=10)
+
+
+def test_run_plugin_reuses_session(monkeypatch: MonkeyPatch) -> None:
+    response = Mock(status_code=200, text="")
+    post = Mock(return_value=response)
+    monkeypatch.setattr(requests.Session, "post", post)
+    monkeypatch.setattr(utils, "_sessions", {})
+    context = {
+        "NOTIFICATIONTYPE": "PROBLEM",
+        "WHAT": "HOST",
+        "PARAMETER_WEBHOOK_URL": "https://hooks.slack.com/services/abc",
+    }
+    monkeypatch.setattr(slack, "_message", lambda context: {})
+
+    for _ in range(2):
+        assert in_process.run_plugin("slack", context, timeout=10) == (0, ["200: OK"])
+
+    assert len(utils._sessions) == 1
+    assert post.call_count == 2
+    assert post.call_args.kwargs["timeout"] == 10
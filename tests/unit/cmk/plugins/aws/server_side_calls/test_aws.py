@@ -223,6 +223,26 @@ from cmk.server_side_calls_backend.config_processing import process_configuratio
             ],
             id="minimal_config_sts_all_cloudwatch_alarms",
         ),
+        pytest.param(
+            {
+                "auth": ("none"),
+                "piggyback_naming_convention": "ip_region_instance",
+                "max_workers": 8,
+                "region_timeout": 60,
+            },
+            [
+                "--ignore-all-tags",
+                "--hostname",
+                "foo",
+                "--piggyback-naming-convention",
+                "ip_region_instance",
+                "--max-workers",
+                "8",
+                "--region-timeout",
+                "60.0",
+            ],
+            id="concurrent_sections",
+        ),
         pytest.param(
             {
                 "auth": ("none"),
@@ -4,12 +4,27 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 
+import threading
+from argparse import Namespace as Args
 from collections.abc import Sequence
+from time import monotonic, sleep
 from unittest import mock
 
 import pytest
 
-from cmk.plugins.aws.special_agent.agent_aws import AWSSectionResult, AWSSectionsGeneric, Results
+from cmk.plugins.aws.special_agent.agent_aws import (
+    AWSConfig,
+    AWSSectionResult,
+    AWSSections,
+    AWSSectionsGeneric,
+    NamingConvention,
+    ResultDistributorS3Limits,
+    Results,
+    run_sections_concurrently,
+)
+
+from .agent_aws_fake_clients import FakeCloudwatchClient
+from .test_agent_aws_s3 import FakeS3Client
 
 
 class TestAWSSections:
@@ -127,3 +142,95 @@ class TestAWSHostLabelSections:
         generic_section._write_host_labels(cached_data)
         section_stdout = capsys.readouterr().out
         assert section_stdout.strip().split("\n") == expected_lines
+
+
+class _CountingS3Client(FakeS3Client):
+    def __init__(self) -> None:
+        self.list_buckets_calls = 0
+
+    def list_buckets(self):
+        self.list_buckets_calls += 1
+        sleep(0.05)
+        return super().list_buckets()
+
+
+def _s3_region_sections(regions: Sequence[str], s3_client: _CountingS3Client) -> list[AWSSections]:
+    config = AWSConfig("hostname", Args(), ([], []), NamingConvention.ip_region_instance)
+    for service in ("ebs", "s3"):
+        config.add_single_service_config(f"{service}_names", None)
+        config.add_service_tags(f"{service}_tags", (None, None))
+    config.add_single_service_config("s3_limits", True)
+    config.add_single_service_config("s3_requests", False)
+
+    session = mock.Mock()
+    session.client.side_effect = lambda key, config: (
+        s3_client if key == "s3" else FakeCloudwatchClient()
+    )
+    s3_limits_distributor = ResultDistributorS3Limits()
+    region_sections: list[AWSSections] = []
+    for region in regions:
+        sections = AWSSectionsGeneric("hostname", session, "test-account")
+        sections.init_sections(["s3"], region, config, s3_limits_distributor)
+        region_sections.append(sections)
+    return region_sections
+
+
+def test_run_sections_concurrently_like_serial(capsys: pytest.CaptureFixture[str]) -> None:
+    regions = ["region-1", "region-2", "region-3"]
+    serial_client = _CountingS3Client()
+    for sections in _s3_region_sections(regions, serial_client):
+        sections.run(use_cache=False)
+    serial_output = capsys.readouterr().out
+
+    concurrent_client = _CountingS3Client()
+    run_sections_concurrently(
+        _s3_region_sections(regions, concurrent_client),
+        use_cache=False,
+        max_workers=4,
+        region_timeout=None,
+    )
+
+    assert capsys.readouterr().out == serial_output
+    # S3Limits lists the buckets once for all S3Summary sections of the regions
+    assert concurrent_client.list_buckets_calls == serial_client.list_buckets_calls == 1
+
+
+def test_run_sections_concurrently_region_timeout(capsys: pytest.CaptureFixture[str]) -> None:
+    run_sections_concurrently(
+        _s3_region_sections(["region-1"], _CountingS3Client()),
+        use_cache=False,
+        max_workers=2,
+        region_timeout=0,
+    )
+
+    exceptions = capsys.readouterr().out.split("\n")[1]
+    assert exceptions.startswith("AWSSectionsGeneric: TimeoutError(")
+    assert "s3_limits: Time budget of region region-1 exceeded" in exceptions
+
+
+def test_run_sections_concurrently_abandons_hung_section(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    release = threading.Event()
+
+    class _HangingS3Client(_CountingS3Client):
+        def list_buckets(self):
+            release.wait()
+            return super().list_buckets()
+
+    try:
+        started = monotonic()
+        run_sections_concurrently(
+            _s3_region_sections(["region-1"], _HangingS3Client()),
+            use_cache=False,
+            max_workers=2,
+            region_timeout=0.2,
+        )
+        assert monotonic() - started < 5
+        # The hung worker must not keep the agent alive on exit
+        assert all(
+            t.daemon for t in threading.enumerate() if t.name.startswith("agent_aws")
+        )
+        assert "Time budget of region region-1 exceeded" in capsys.readouterr().out
+    finally:
+        release.set()
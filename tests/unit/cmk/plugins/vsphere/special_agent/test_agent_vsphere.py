@@ -10,7 +10,10 @@ import pytest
 from cmk.plugins.vsphere.special_agent.agent_vsphere import (
     eval_multipath_info,
     fetch_virtual_machines,
+    get_pattern,
     get_section_snapshot_summary,
+    iter_elements,
+    iter_perf_entity_metrics,
 )
 
 
@@ -96,7 +99,10 @@ def test_cloning_vm_is_processed(mocker: Mock) -> None:
     )
 
     connection = mocker.Mock()
-    connection.query_server = mocker.Mock(return_value=data)
+    # The response is received in chunks that split the objects
+    connection.iter_objects = mocker.Mock(
+        return_value=iter_elements((data[i : i + 300] for i in range(0, len(data), 300)), "objects")
+    )
     opt = mocker.Mock()
     opt.skip_placeholder_vm = False
 
@@ -184,3 +190,40 @@ def test_get_section_snapshot_summary(
     expected_output: Sequence[str],
 ) -> None:
     assert get_section_snapshot_summary(virtual_machines, systime) == expected_output
+
+
+def test_iter_elements_like_pattern() -> None:
+    data = "<r><token>0</token>" + "".join(
+        f"<objects><obj>vm-{n}</obj>{'<x/>' * n}</objects>" for n in range(20)
+    )
+    expected = get_pattern("<objects>(.*?)</objects>", data)
+
+    for size in (1, 7, 9, 64, len(data)):
+        chunks = [data[i : i + size] for i in range(0, len(data), size)]
+        assert list(iter_elements(chunks, "objects")) == expected
+
+
+def test_iter_perf_entity_metrics() -> None:
+    response = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"'
+        ' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"><soapenv:Body>'
+        '<QueryPerfResponse xmlns="urn:vim25">'
+        + "".join(
+            f'<returnval xsi:type="PerfEntityMetric"><entity type="HostSystem">host-{h}</entity>'
+            "<sampleInfo><timestamp>2025-01-01T00:00:00Z</timestamp><interval>20</interval>"
+            "</sampleInfo>"
+            '<value xsi:type="PerfMetricIntSeries"><id><counterId>6</counterId>'
+            f"<instance></instance></id><value>{h}</value><value>{h + 1}</value></value>"
+            '<value xsi:type="PerfMetricIntSeries"><id><counterId>125</counterId>'
+            "<instance>vmhba0</instance></id><value>7</value></value></returnval>"
+            for h in range(3)
+        )
+        + "</QueryPerfResponse></soapenv:Body></soapenv:Envelope>"
+    )
+
+    assert list(
+        iter_perf_entity_metrics(response[i : i + 50] for i in range(0, len(response), 50))
+    ) == [
+        (f"host-{h}", [("6", "", [str(h), str(h + 1)]), ("125", "vmhba0", ["7"])]) for h in range(3)
+    ]
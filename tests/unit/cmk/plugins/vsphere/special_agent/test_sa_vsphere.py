@@ -23,6 +23,8 @@ DEFAULT_AGRS = {
     "vm_piggyname": "alias",
     "spaces": "underscore",
     "no_cert_check": False,
+    "counter_workers": 4,
+    "counter_batch_size": 10,
     "modules": ["hostsystem", "virtualmachine", "datastore", "counters", "licenses"],
     "host_address": "test_host",
     "user": None,
@@ -51,6 +53,8 @@ DEFAULT_AGRS = {
         (["--spaces", "underscore"], {"spaces": "underscore"}),
         (["-S", "cut"], {"spaces": "cut"}),
         (["--no-cert-check"], {"no_cert_check": True}),
+        (["--counter-workers", "8"], {"counter_workers": 8}),
+        (["--counter-batch-size", "1"], {"counter_batch_size": 1}),
         (["--modules", "are,not,vectorspaces"], {"modules": ["are", "not", "vectorspaces"]}),
         (["-i", "are,not,vectorspaces"], {"modules": ["are", "not", "vectorspaces"]}),
         (["--user", "hi-its-me"], {"user": "hi-its-me"}),
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+
+import pytest
+
+from cmk.ccc.hostaddress import HostName
+from cmk.rrd.config import RRDConfig, RRDObjectConfig
+from cmk.rrd.rrd import RRDCreator
+from cmk.utils import paths
+
+
+class _FakeRRDInterface:
+    OperationalError: type[Exception] = RuntimeError
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.created: list[str] = []
+
+    def update(self, *args: str) -> None:
+        pass
+
+    def create(self, *args: str) -> None:
+        if "broken" in args[0]:
+            raise RuntimeError("broken")
+        with self._lock:
+            self.created.append(args[0])
+        Path(args[0]).touch()
+
+    def info(self, *args: str) -> Mapping[str, int]:
+        return {}
+
+
+class _FakeRRDConfig(RRDConfig):
+    instantiated: list[HostName] = []
+
+    def __init__(self, hostname: HostName) -> None:
+        self.instantiated.append(hostname)
+
+    def rrd_config(self) -> RRDObjectConfig | None:
+        return None
+
+    def rrd_config_of_service(self, description: str) -> RRDObjectConfig | None:
+        return None
+
+    def cmc_log_rrdcreation(self) -> None:
+        return None
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_handle_jobs_batched(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, max_workers: int
+) -> None:
+    monkeypatch.setattr(paths, "rrd_single_dir", tmp_path / "single")
+    monkeypatch.setattr(_FakeRRDConfig, "instantiated", [])
+    rrd_interface = _FakeRRDInterface()
+    creator = RRDCreator(rrd_interface, max_workers=max_workers)
+    jobs = [f"cmc_single;host{h};Service {s};util;{s}" for s in range(5) for h in range(10)] + [
+        "cmc_single;host3;broken;util;1"
+    ]
+
+    creator._handle_jobs(jobs, _FakeRRDConfig)
+
+    assert len(rrd_interface.created) == 50
+    assert sorted(_FakeRRDConfig.instantiated) == [HostName(f"host{h}") for h in range(10)]
+    assert creator._rrd_helper_output_buffer.decode("utf-8").splitlines() == [
+        f"CREATED cmc_single host{h};Service {s};util" for s in range(5) for h in range(10)
+    ] + ["Error creating RRD: broken"]
+    assert (tmp_path / "single" / "host3" / "Service_4.info").read_text() == (
+        "HOST host3\nSERVICE Service 4\nMETRICS util\n"
+    )
@@ -5,7 +5,7 @@
 
 
 import logging
-from collections.abc import Iterator
+from collections.abc import Iterator, Mapping, Sequence
 from pathlib import Path
 
 import pytest
@@ -23,6 +23,7 @@ from cmk.snmplib import (
     SNMPBackend,
     SNMPBackendEnum,
     SNMPHostConfig,
+    SNMPRawValue,
     SNMPSectionName,
     SNMPVersion,
 )
@@ -244,6 +245,75 @@ def test_snmp_scan_find_plugins__success(
     assert len(sections) > len(found)
 
 
+class _RecordingSNMPBackend(SNMPBackend):
+    def __init__(self, values: Mapping[OID, SNMPRawValue]) -> None:
+        super().__init__(SNMPConfig, logger)
+        self.values = values
+        self.requests: list[Sequence[OID]] = []
+
+    def get(self, /, oid, *, context):
+        self.requests.append([oid])
+        return self.values.get(oid)
+
+    def get_many(self, /, oids, *, context):
+        self.requests.append(oids)
+        return {oid: self.values.get(oid) for oid in oids}
+
+    def walk(self, /, oid, *, context, **kw):
+        raise NotImplementedError("walk")
+
+
+@pytest.mark.usefixtures("cache_oids")
+def test_snmp_scan_find_sections_fetches_oids_together() -> None:
+    backend = _RecordingSNMPBackend(
+        {".1.2.1": b"one", ".1.2.2": b"two", ".1.2.3": b"three", ".1.3.1": b"x"}
+    )
+    sections = [
+        (SNMPSectionName("first"), [[(".1.2.1", "one", True), (".1.2.2", "two", True)]]),
+        (SNMPSectionName("second"), [[(".1.2.1", "ONE", True), (".1.2.3", "four", True)]]),
+        (
+            SNMPSectionName("third"),
+            [[(".1.3.1", "y", True)], [(".1.3.2", ".*", False), (".1.2.3", "three", True)]],
+        ),
+        (SNMPSectionName("fourth"), [[(".1.2.1", "nope", True), (".1.9.9", ".*", True)]]),
+    ]
+
+    found = snmp_scan._find_sections(sections, on_error=OnError.RAISE, backend=backend)
+
+    assert found == {SNMPSectionName("first"), SNMPSectionName("third")}
+    # one request per level of the detect specs, no OID is fetched twice
+    assert backend.requests == [[".1.2.1", ".1.3.1"], [".1.2.2", ".1.2.3", ".1.3.2"]]
+    assert found == {
+        name
+        for name, specs in sections
+        if snmp_scan._evaluate_snmp_detection(
+            detect_spec=specs,
+            oid_value_getter=lambda oid: None
+            if (value := backend.values.get(oid)) is None
+            else value.decode(),
+        )
+    }
+
+
+@pytest.mark.usefixtures("cache_oids")
+def test_snmp_scan_find_sections_falls_back_to_single_requests() -> None:
+    class IncompleteBackend(_RecordingSNMPBackend):
+        def get_many(self, /, oids, *, context):
+            self.requests.append(oids)
+            return {}
+
+    backend = IncompleteBackend({".1.4.1": b"one"})
+
+    found = snmp_scan._find_sections(
+        [(SNMPSectionName("first"), [[(".1.4.1", "one", True)]])],
+        on_error=OnError.RAISE,
+        backend=backend,
+    )
+
+    assert found == {SNMPSectionName("first")}
+    assert backend.requests == [[".1.4.1"], [".1.4.1"]]
+
+
 @pytest.mark.usefixtures("cache_oids")
 def test_gather_available_raw_section_names_defaults(
     backend: SNMPBackend,
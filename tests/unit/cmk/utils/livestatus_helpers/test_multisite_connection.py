@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+from typing import Any
+
+import pytest
+
+import livestatus
+
+from cmk.ccc.site import SiteId
+from cmk.utils.livestatus_helpers.testing import MockLiveStatusConnection
+
+
+def _multisite_connection(live: MockLiveStatusConnection) -> livestatus.MultiSiteConnection:
+    return livestatus.MultiSiteConnection(
+        livestatus.SiteConfigurations(
+            {
+                SiteId(site_name): livestatus.SiteConfiguration(  # type: ignore[typeddict-item]
+                    id=SiteId(site_name), socket="unix:"
+                )
+                for site_name in live.sites
+            }
+        )
+    )
+
+
+@pytest.fixture(name="live")
+def fixture_live(mock_livestatus: MockLiveStatusConnection) -> MockLiveStatusConnection:
+    mock_livestatus.set_sites(["local", "remote"])
+    for site_name, states in (("local", [3, 0, 2]), ("remote", [1, 2, 0])):
+        mock_livestatus.add_table(
+            "services",
+            [{"host_name": f"{site_name}-{i}", "state": state} for i, state in enumerate(states)],
+            site=site_name,
+        )
+    return mock_livestatus
+
+
+@pytest.mark.parametrize("parallelize", [True, False])
+def test_query_order_by_merges_sites(live: MockLiveStatusConnection, parallelize: bool) -> None:
+    live.expect_query(
+        [
+            "GET services",
+            "Columns: host_name state",
+            "OrderBy: state desc",
+            "Limit: 4",
+        ]
+    )
+    with live(expect_status_query=False):
+        connection = _multisite_connection(live)
+        connection.parallelize = parallelize
+        connection.set_prepend_site(True)
+        connection.set_limit(4)
+        connection.set_order_by(livestatus.OrderBy("state", descending=True))
+        rows = connection.query("GET services\nColumns: host_name state\n")
+
+    assert [row[2] for row in rows] == [3, 2, 2, 1]
+    assert {row[0] for row in rows} == {"local", "remote"}
+
+
+def test_query_order_by_not_queried_column(live: MockLiveStatusConnection) -> None:
+    live.expect_query(["GET services", "Columns: host_name"])
+    with live(expect_status_query=False):
+        connection = _multisite_connection(live)
+        connection.set_order_by(livestatus.OrderBy("state"))
+        rows = connection.query("GET services\nColumns: host_name\n")
+
+    assert len(rows) == 6
+
+
+def test_query_order_by_sorts_rows_of_rejecting_sites(
+    live: MockLiveStatusConnection, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    receive_raw_response = livestatus.SingleSiteConnection.receive_raw_response
+
+    def reject_order_by_on_remote(
+        self: livestatus.SingleSiteConnection, query: str, *args: Any, **kwargs: Any
+    ) -> bytes:
+        response = receive_raw_response(self, query, *args, **kwargs)
+        if self.site_name == "remote" and "OrderBy:" in query:
+            raise livestatus.MKLivestatusQueryError("400: Invalid header 'OrderBy'")
+        return response
+
+    monkeypatch.setattr(
+        livestatus.SingleSiteConnection, "receive_raw_response", reject_order_by_on_remote
+    )
+    live.expect_query(
+        ["GET services", "Columns: host_name state", "OrderBy: state desc", "Limit: 4"]
+    )
+    live.expect_query(["GET services", "Columns: host_name state", "Limit: 4"], sites=["remote"])
+    with live(expect_status_query=False):
+        connection = _multisite_connection(live)
+        connection.set_prepend_site(True)
+        connection.set_limit(4)
+        connection.set_order_by(livestatus.OrderBy("state", descending=True))
+        rows = connection.query("GET services\nColumns: host_name state\n")
+
+    assert [row[2] for row in rows] == [3, 2, 2, 1]
+    assert not connection.dead_sites()
@@ -3,6 +3,8 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import pytest
+
 import cmk.utils.caching
 
 
@@ -45,3 +47,71 @@ def test_populated() -> None:
     assert cache.is_populated()
     cache.clear()
     assert not cache.is_populated()
+
+
+def test_statistics() -> None:
+    mgr = cmk.utils.caching.CacheManager()
+
+    cache = mgr.obtain_cache("test")
+    cache["a"] = 1
+    assert cache["a"] == 1
+    with pytest.raises(KeyError):
+        _ = cache["b"]
+    assert cache.setdefault("b", 2) == 2
+
+    assert mgr.dump_statistics() == {
+        "test": cmk.utils.caching.CacheStatistics(
+            hits=None, misses=1, evictions=0, size=2, maxsize=None
+        )
+    }
+
+
+def test_lru_eviction() -> None:
+    mgr = cmk.utils.caching.CacheManager()
+
+    cache = mgr.obtain_cache("test", maxsize=2)
+    assert isinstance(cache, cmk.utils.caching.DictCache)
+    cache["a"] = 1
+    cache.setdefault("b", 2)
+    assert cache["a"] == 1
+    cache.update({"c": 3})
+
+    assert cache == {"a": 1, "c": 3}
+    assert cache.get("b") is None
+    assert cache.statistics() == cmk.utils.caching.CacheStatistics(
+        hits=1, misses=1, evictions=1, size=2, maxsize=2
+    )
+    assert mgr.obtain_cache("test", maxsize=2) is cache
+
+
+@pytest.mark.parametrize("maxsize", [None, 5])
+def test_obtain_cache_with_conflicting_maxsize(maxsize: int | None) -> None:
+    mgr = cmk.utils.caching.CacheManager()
+    mgr.obtain_cache("test", maxsize=2)
+
+    with pytest.raises(ValueError):
+        mgr.obtain_cache("test", maxsize=maxsize)
+
+
+def test_set_maxsize() -> None:
+    mgr = cmk.utils.caching.CacheManager()
+    mgr.set_maxsize("test", 2)
+    assert mgr.obtain_cache("test").maxsize == 2
+
+    mgr.clear()
+    assert mgr.obtain_cache("test").maxsize == 2
+    assert mgr.obtain_cache("other").maxsize is None
+    with pytest.raises(ValueError):
+        mgr.set_maxsize("other", 2)
+
+
+    cache: cmk.utils.caching.LRUDictCache[str, int] = cmk.utils.caching.LRUDictCache(2)
+    cache = cmk.utils.caching.LRUDictCache(2)
+    cache.update({"a": 1, "b": 2})
+    cache.clear()
+    cache.update({"c": 3, "d": 4})
+    del cache["c"]
+    cache["e"] = 5
+
+    assert cache == {"d": 4, "e": 5}
+    assert cache.statistics().evictions == 0
@@ -4,6 +4,7 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import socket
+import time
 from collections.abc import Mapping
 from pathlib import Path
 from typing import Final, TypeAlias
@@ -366,11 +367,27 @@ def test_filecache_beats_failing_lookup(monkeypatch: MonkeyPatch) -> None:
 class TestIPLookupCacheSerialzer:
     def test_simple_cache(self) -> None:
         s = ip_lookup.IPLookupCacheSerializer()
-        cache_data: Mapping[tuple[HostName | HostAddress, socket.AddressFamily], HostAddress] = {
-            (HostName("host1"), socket.AF_INET): HostAddress("1")
+        cache_data: Mapping[
+            tuple[HostName | HostAddress, socket.AddressFamily], ip_lookup.IPLookupCacheEntry
+        ] = {
+            (HostName("host1"), socket.AF_INET): ip_lookup.IPLookupCacheEntry(
+                HostAddress("1"), 1700000000.5, 3600
+            ),
+            (HostName("host2"), socket.AF_INET6): ip_lookup.IPLookupCacheEntry(
+                HostAddress("fe80::1"), 0.0, 60
+            ),
         }
         assert s.deserialize(s.serialize(cache_data)) == cache_data
 
+    def test_legacy_cache(self) -> None:
+        assert ip_lookup.IPLookupCacheSerializer().deserialize(
+            repr({("host1", 4): "127.0.0.1"}).encode()
+        ) == {
+            (HostName("host1"), socket.AF_INET): ip_lookup.IPLookupCacheEntry(
+                HostAddress("127.0.0.1"), 0.0, ip_lookup.DNS_CACHE_TTL
+            )
+        }
+
 
 class TestIPLookupCache:
     def test_repr(self) -> None:
@@ -471,6 +488,69 @@ class TestIPLookupCache:
         ip_lookup_cache.load_persisted()
         assert not ip_lookup_cache
 
+    def test_is_expired(self, tmp_path: Path) -> None:
+        cache_id = HostName("host1"), socket.AF_INET
+        ip_lookup_cache = ip_lookup.IPLookupCache({})
+        assert ip_lookup_cache.is_expired(cache_id, time.time())
+
+        ip_lookup_cache[cache_id] = HostAddress("127.0.0.1")
+        new_cache_instance = ip_lookup.IPLookupCache({})
+        new_cache_instance.load_persisted()
+        assert not new_cache_instance.is_expired(cache_id, time.time())
+        assert new_cache_instance.is_expired(cache_id, time.time() + ip_lookup.DNS_CACHE_TTL)
+
+
+def test_prefetch_dns_lookups_refreshes_expired_entries(monkeypatch: MonkeyPatch) -> None:
+    fresh = HostName("fresh"), socket.AF_INET
+    expired = HostName("expired"), socket.AF_INET
+    missing = HostName("missing"), socket.AF_INET
+    unresolvable = HostName("unresolvable"), socket.AF_INET
+    ip_lookup.IPLookupCache({}).update({fresh: HostAddress("1.1.1.1")})
+    with ip_lookup.IPLookupCache.PATH.open("rb") as f:
+        persisted = dict(ip_lookup.IPLookupCacheSerializer().deserialize(f.read()))
+    persisted[expired] = ip_lookup.IPLookupCacheEntry(HostAddress("2.2.2.2"), 0.0, 60)
+    persisted[unresolvable] = ip_lookup.IPLookupCacheEntry(HostAddress("4.4.4.4"), 0.0, 60)
+    ip_lookup.IPLookupCache.PATH.write_bytes(
+        ip_lookup.IPLookupCacheSerializer().serialize(persisted)
+    )
+
+    looked_up: list[str] = []
+
+    def getaddrinfo(host: str, _port: None, family: socket.AddressFamily) -> object:
+        looked_up.append(host)
+        return [[0, 0, 0, 0, [{"expired": "5.5.5.5", "missing": "3.3.3.3"}[host]]]]
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    cache_manager.clear_all()
+
+    ip_lookup.prefetch_dns_lookups(
+        [fresh, expired, missing, unresolvable], force_file_cache_renewal=False
+    )
+
+    assert sorted(looked_up) == ["expired", "missing", "unresolvable"]
+    assert cache_manager.obtain_cache("cached_dns_lookup") == {
+        expired: HostAddress("5.5.5.5"),
+        missing: HostAddress("3.3.3.3"),
+        unresolvable: HostAddress("4.4.4.4"),
+    }
+    # All of them are answered without further lookups
+    for cache_id, address in [
+        (fresh, "1.1.1.1"),
+        (expired, "5.5.5.5"),
+        (missing, "3.3.3.3"),
+        (unresolvable, "4.4.4.4"),
+    ]:
+        assert ip_lookup.cached_dns_lookup(
+            cache_id[0], family=cache_id[1], force_file_cache_renewal=False
+        ) == HostAddress(address)
+    assert len(looked_up) == 3
+
+    ip_lookup_cache = ip_lookup.IPLookupCache({})
+    ip_lookup_cache.load_persisted()
+    assert ip_lookup_cache.get(missing) == HostAddress("3.3.3.3")
+    assert not ip_lookup_cache.is_expired(expired, time.time())
+    assert ip_lookup_cache.is_expired(unresolvable, time.time())
+
 
 def test_update_dns_cache(monkeypatch: MonkeyPatch) -> None:
     def ip_lookup_cache() -> ip_lookup.IPLookupCache:
@@ -504,6 +584,15 @@ def test_update_dns_cache(monkeypatch: MonkeyPatch) -> None:
 
     assert not ip_lookup_cache()
 
+    saved: list[object] = []
+    save_persisted = ip_lookup.IPLookupCache.save_persisted
+
+    def tracking_save_persisted(self: ip_lookup.IPLookupCache) -> None:
+        saved.append(self)
+        save_persisted(self)
+
+    monkeypatch.setattr(ip_lookup.IPLookupCache, "save_persisted", tracking_save_persisted)
+
     result = ip_lookup.update_dns_cache(
         hosts=(
             hn
@@ -521,6 +610,8 @@ def test_update_dns_cache(monkeypatch: MonkeyPatch) -> None:
     # Actual failure is:
     # MKIPAddressLookupError("Failed to lookup IPv6 address of dual via DNS: ('dual', <AddressFamily.AF_INET6: 10>)")
     assert result == (3, ["dual"])
+    # Cleared once and written once at the end, not by the lookups in between
+    assert len(saved) == 2
 
     # Check persisted data
     cache = ip_lookup_cache()
@@ -532,6 +623,14 @@ def test_update_dns_cache(monkeypatch: MonkeyPatch) -> None:
     assert cache.get((HostName("dual"), socket.AF_INET6)) is None
 
 
+def test_ip_lookup_cache_is_shared_until_reset() -> None:
+    cache = ip_lookup._get_ip_lookup_cache()
+    assert ip_lookup._get_ip_lookup_cache() is cache
+
+    ip_lookup.reset_ip_lookup_cache()
+    assert ip_lookup._get_ip_lookup_cache() is not cache
+
+
 @pytest.mark.parametrize(
     "hostname_str, tags, result_address",
     [
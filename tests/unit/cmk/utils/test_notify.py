@@ -11,7 +11,12 @@ from pytest import MonkeyPatch
 import cmk.utils.notify
 from cmk.ccc.config_path import VersionedConfigPath
 from cmk.ccc.hostaddress import HostName
-from cmk.utils.notify import NotificationHostConfig, read_notify_host_file, write_notify_host_file
+from cmk.utils.notify import (
+    NotificationBacklog,
+    NotificationHostConfig,
+    read_notify_host_file,
+    write_notify_host_file,
+)
 from cmk.utils.paths import omd_root
 from cmk.utils.tags import TagGroupID, TagID
 
@@ -66,3 +71,54 @@ def test_write_and_read_notify_host_file(
         lambda *args, **kw: notify_labels_path / host_name,
     )
     assert read_notify_host_file(host_name) == expected
+
+
+def test_notification_backlog_keeps_most_recent_contexts(tmp_path: Path) -> None:
+    backlog = NotificationBacklog(tmp_path / "backlog")
+    for nr in range(5):
+        backlog.append({"NR": str(nr)}, size=3)
+
+    assert backlog.load() == [{"NR": "4"}, {"NR": "3"}, {"NR": "2"}]
+    assert backlog.get(0) == {"NR": "4"}
+    assert backlog.get(2) == {"NR": "2"}
+    assert backlog.get(3) is None
+    assert len(list((tmp_path / "backlog").glob("*.mk"))) == 3
+
+
+def test_notification_backlog_resize(tmp_path: Path) -> None:
+    backlog = NotificationBacklog(tmp_path / "backlog")
+    for nr in range(5):
+        backlog.append({"NR": str(nr)}, size=4)
+
+    backlog.append({"NR": "5"}, size=2)
+    assert backlog.load() == [{"NR": "5"}, {"NR": "4"}]
+
+    backlog.append({"NR": "6"}, size=0)
+    assert not backlog.load()
+
+
+def test_notification_backlog_disabled_does_not_touch_ring(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    backlog = NotificationBacklog(tmp_path / "backlog")
+    backlog.append({"NR": "0"}, size=2)
+    backlog.append({"NR": "1"}, size=0)
+
+    def write(*args: object) -> None:
+        raise AssertionError("rewrote the disabled backlog")
+
+    monkeypatch.setattr(backlog, "_write", write)
+    backlog.append({"NR": "2"}, size=0)
+
+    assert not backlog.load()
+
+
+def test_notification_backlog_migrates_legacy_file(tmp_path: Path) -> None:
+    (tmp_path / "backlog.mk").write_text(repr([{"NR": "1"}, {"NR": "0"}]))
+    backlog = NotificationBacklog(tmp_path / "backlog")
+
+    assert backlog.get(1) == {"NR": "0"}
+    assert not (tmp_path / "backlog.mk").exists()
+
+    backlog.append({"NR": "2"}, size=10)
+    assert backlog.load() == [{"NR": "2"}, {"NR": "1"}, {"NR": "0"}]
@@ -25,6 +25,7 @@ import cmk.ccc.debug
 import cmk.ccc.version as cmk_version
 import cmk.crypto.password_hashing
 import cmk.utils.caching
+import cmk.utils.ip_lookup
 import cmk.utils.paths
 from cmk.ccc import tty
 from cmk.ccc.crash_reporting import make_crash_report_base_path
@@ -424,6 +425,7 @@ def site(request):
 
 def _clear_caches():
     cmk.utils.caching.cache_manager.clear()
+    cmk.utils.ip_lookup.reset_ip_lookup_cache()
     cmk_version.edition.cache_clear()
 
 